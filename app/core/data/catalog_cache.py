@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import threading
+from typing import Any, Callable, Hashable
+
+
+Stamp = tuple[tuple[str, int, int], ...]
+
+
+class CatalogSnapshot(dict):
+    """Catalogue partage entre sessions: un dict en lecture seule.
+
+    Toute modification leve TypeError; `dict(snapshot)` donne une copie modifiable.
+    Les valeurs ne sont pas copiees: elles ne doivent pas etre modifiees non plus.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("catalogue partage en lecture seule: copier avec dict(...) avant de le modifier")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        from copy import deepcopy
+
+        return {deepcopy(k, memo): deepcopy(v, memo) for k, v in self.items()}
+
+
+def path_stamp(path: Path, pattern: str = "*.json") -> Stamp:
+    """Empreinte (nom, mtime, taille) d'un fichier, ou des fichiers `pattern` d'un dossier."""
+    rows: list[tuple[str, int, int]] = []
+    if path.is_dir():
+        files = sorted(path.glob(pattern))
+    elif path.exists():
+        files = [path]
+    else:
+        files = []
+    for file in files:
+        try:
+            stat = file.stat()
+        except OSError:
+            continue
+        rows.append((file.name, int(stat.st_mtime_ns), int(stat.st_size)))
+    return tuple(rows)
+
+
+@dataclass
+class _CatalogEntry:
+    stamp: Stamp
+    value: Any
+
+
+@dataclass
+class _CatalogStats:
+    hits: int = 0
+    misses: int = 0
+    reloads: int = 0
+
+
+class CatalogRegistry:
+    """Catalogues JSON (objets, competences, monstres, recettes, marchands) partages par le processus.
+
+    Un catalogue est identifie par (type, chemin) et recharge seulement quand l'empreinte
+    de ses fichiers change; les sessions web et les chats Telegram recoivent le meme snapshot.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._entries: dict[Hashable, _CatalogEntry] = {}
+        self._stats: dict[str, _CatalogStats] = {}
+
+    def load(self, kind: str, path: Path, loader: Callable[[], Any], *, pattern: str = "*.json") -> Any:
+        key = (kind, str(Path(path).resolve()))
+        stamp = path_stamp(Path(path), pattern)
+        with self._lock:
+            stats = self._stats.setdefault(kind, _CatalogStats())
+            entry = self._entries.get(key)
+            if entry is not None and entry.stamp == stamp:
+                stats.hits += 1
+                return entry.value
+            # Empreinte prise avant la lecture: un fichier modifie pendant le chargement
+            # (ou ecrit par le chargeur lui-meme) sera relu au prochain appel.
+            value = loader()
+            self._entries[key] = _CatalogEntry(stamp=stamp, value=value)
+            if entry is None:
+                stats.misses += 1
+            else:
+                stats.reloads += 1
+            return value
+
+    def invalidate(self, kind: str | None = None) -> None:
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == kind]:
+                del self._entries[key]
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                kind: {"hits": row.hits, "misses": row.misses, "reloads": row.reloads}
+                for kind, row in sorted(self._stats.items())
+            }
+
+
+_registry_lock = threading.Lock()
+_registry: CatalogRegistry | None = None
+
+
+def get_catalog_registry() -> CatalogRegistry:
+    global _registry
+    if isinstance(_registry, CatalogRegistry):
+        return _registry
+
+    with _registry_lock:
+        if not isinstance(_registry, CatalogRegistry):
+            _registry = CatalogRegistry()
+    return _registry
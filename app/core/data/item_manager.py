@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from pathlib import Path
 import re
 
+from .catalog_cache import CatalogSnapshot, get_catalog_registry
+
 
 class DataError(RuntimeError):
     pass
@@ -29,13 +31,16 @@ class ItemsManager:
         self.items_dir.mkdir(parents=True, exist_ok=True)
 
     def load_all(self) -> dict[str, ItemDef]:
+        """Catalogue partage (lecture seule), relu seulement si un fichier d'objet change."""
         if not self.items_dir.exists():
             return {}
-
-        items: dict[str, ItemDef] = {}
-        for p in sorted(self.items_dir.glob("*.json")):
-            raw = json.loads(p.read_text(encoding="utf-8"))
-            item_id = raw.get("id")
+        return get_catalog_registry().load("items", self.items_dir, self._read_all)
+
+    def _read_all(self) -> CatalogSnapshot:
+        items: dict[str, ItemDef] = {}
+        for p in sorted(self.items_dir.glob("*.json")):
+            raw = json.loads(p.read_text(encoding="utf-8"))
+            item_id = raw.get("id")
             name = raw.get("name")
             stack_max = raw.get("stack_max", 1)
             item_type = str(raw.get("type") or "misc").strip().casefold()
@@ -91,7 +96,7 @@ class ItemsManager:
                 value_gold=value_gold,
             )
 
-        return items
+        return CatalogSnapshot(items)
 
     def save_item(self, payload: dict) -> ItemDef:
         item_id_raw = str(payload.get("id") or "").strip().casefold()
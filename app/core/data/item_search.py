@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import difflib
+import heapq
+import re
+import threading
+import unicodedata
+from typing import Mapping
+
+from .item_manager import ItemDef
+
+
+_INDEX_CACHE_SIZE = 8
+# Cles comparees par difflib lors d'une recherche approchee (les plus proches en trigrammes).
+_FUZZY_CANDIDATES = 48
+
+
+def normalize_search_text(text: object) -> str:
+    raw = unicodedata.normalize("NFKD", str(text or "").strip()).encode("ascii", "ignore").decode("ascii")
+    clean = re.sub(r"[^a-z0-9' ]+", " ", raw.lower())
+    clean = clean.replace("'", " ")
+    return re.sub(r"\s+", " ", clean).strip()
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ItemSearchIndex:
+    """Index de recherche d'objets, construit une fois par catalogue.
+
+    Les champs (id, nom, type, slot, description) sont normalises a la construction;
+    des index inverses (trigramme -> objets, type -> objets) limitent les comparaisons
+    aux objets candidats.
+    """
+
+    def __init__(self, items: Mapping[str, ItemDef]) -> None:
+        self.item_ids: list[str] = []
+        self.position: dict[str, int] = {}
+        self._items: dict[str, ItemDef] = dict(items)
+        self.norm_id: dict[str, str] = {}
+        self.norm_name: dict[str, str] = {}
+        self.norm_type: dict[str, str] = {}
+        self.haystack: dict[str, str] = {}
+        # Cle normalisee (id ou nom) -> item_id; en cas de collision le dernier objet l'emporte.
+        self.by_key: dict[str, str] = {}
+        self._by_type: dict[str, list[str]] = {}
+        self._hay_trigrams: dict[str, set[str]] = {}
+        self._key_trigrams: dict[str, set[str]] = {}
+
+        for item_id, item in items.items():
+            self.position[item_id] = len(self.item_ids)
+            self.item_ids.append(item_id)
+            nid = normalize_search_text(item_id)
+            name = normalize_search_text(item.name)
+            item_type = normalize_search_text(item.type)
+            self.norm_id[item_id] = nid
+            self.norm_name[item_id] = name
+            self.norm_type[item_id] = item_type
+            self.by_key[nid] = item_id
+            self.by_key[name] = item_id
+            self._by_type.setdefault(item_type, []).append(item_id)
+            hay = " ".join(
+                (nid, name, item_type, normalize_search_text(item.slot), normalize_search_text(item.description))
+            )
+            self.haystack[item_id] = hay
+            for gram in {hay[i:i + 3] for i in range(len(hay) - 2)}:
+                self._hay_trigrams.setdefault(gram, set()).add(item_id)
+        for key in self.by_key:
+            for gram in _trigrams(key):
+                self._key_trigrams.setdefault(gram, set()).add(key)
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    def is_current(self, item_id: str, item: object) -> bool:
+        """Vrai si `item` est bien l'objet indexe sous `item_id` (catalogue non modifie depuis)."""
+        return self._items.get(item_id) is item
+
+    def exact(self, query: str) -> str | None:
+        """Objet dont l'id ou le nom normalise vaut `query` (deja normalisee)."""
+        return self.by_key.get(query)
+
+    def ids_of_type(self, item_type: str) -> list[str]:
+        return list(self._by_type.get(normalize_search_text(item_type), ()))
+
+    def ids_containing(self, token: str) -> set[str]:
+        """Objets dont le texte normalise contient `token` (sous-chaine)."""
+        if not token:
+            return set()
+        if len(token) < 3:
+            return {item_id for item_id, hay in self.haystack.items() if token in hay}
+        grams = [token[i:i + 3] for i in range(len(token) - 2)]
+        postings = sorted((self._hay_trigrams.get(gram, set()) for gram in grams), key=len)
+        if not postings[0]:
+            return set()
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return candidates
+        return {item_id for item_id in candidates if token in self.haystack[item_id]}
+
+    def close_keys(self, query: str, *, n: int = 1, cutoff: float = 0.7) -> list[str]:
+        """Comme difflib.get_close_matches sur les cles (id/nom normalises), restreint aux
+        `_FUZZY_CANDIDATES` cles partageant le plus de trigrammes avec la requete."""
+        if not query:
+            return []
+        shared: dict[str, int] = {}
+        for gram in _trigrams(query):
+            for key in self._key_trigrams.get(gram, ()):
+                shared[key] = shared.get(key, 0) + 1
+        size = len(query)
+        # ratio = 2*M/(la+lb) <= 2*min(la, lb)/(la+lb): les longueurs trop differentes sont exclues.
+        eligible = [key for key in shared if 2 * min(size, len(key)) >= cutoff * (size + len(key))]
+        if len(eligible) > _FUZZY_CANDIDATES:
+            eligible = heapq.nlargest(_FUZZY_CANDIDATES, eligible, key=lambda key: (shared[key], key))
+        return difflib.get_close_matches(query, eligible, n=n, cutoff=cutoff)
+
+    def search(self, query: str, *, limit: int = 5) -> list[tuple[str, float]]:
+        """Objets classes pour une requete libre: exact (100), puis mots trouves, puis approche."""
+        q = normalize_search_text(query)
+        if not q:
+            return []
+        exact = self.exact(q)
+        if exact is not None:
+            return [(exact, 100.0)]
+        scores: dict[str, float] = {}
+        for token in q.split():
+            for item_id in self.ids_containing(token):
+                scores[item_id] = scores.get(item_id, 0.0) + 2.0
+        if not scores:
+            for key in self.close_keys(q, n=limit, cutoff=0.6):
+                item_id = self.by_key[key]
+                scores.setdefault(item_id, difflib.SequenceMatcher(a=q, b=key).ratio())
+        ranked = sorted(scores.items(), key=lambda row: (-row[1], self.position[row[0]]))
+        return ranked[: max(1, int(limit))]
+
+
+_index_lock = threading.Lock()
+_index_cache: "OrderedDict[int, tuple[Mapping[str, ItemDef], int, ItemSearchIndex]]" = OrderedDict()
+
+
+def get_item_search_index(items: Mapping[str, ItemDef]) -> ItemSearchIndex:
+    """Index partage pour un dictionnaire d'objets (reconstruit si sa taille change).
+
+    Les catalogues sont remplaces, pas modifies, a chaque rechargement ou creation
+    d'objet (`dict(item_defs)` + ajout): l'identite du dictionnaire suffit comme cle.
+    """
+    key = id(items)
+    with _index_lock:
+        cached = _index_cache.get(key)
+        if cached is not None and cached[0] is items and cached[1] == len(items):
+            _index_cache.move_to_end(key)
+            return cached[2]
+    index = ItemSearchIndex(items)
+    with _index_lock:
+        _index_cache[key] = (items, len(items), index)
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
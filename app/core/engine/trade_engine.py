@@ -384,17 +384,9 @@ class TradeEngine:
         return self.export_session()
 
     def inventory_totals(self, state) -> dict[str, int]:
-        out: dict[str, int] = {}
-        for grid in (state.carried, state.storage):
-            for stack in grid.slots:
-                if stack is None:
-                    continue
-                item_id = _clean_text(getattr(stack, "item_id", ""), max_len=120).casefold()
-                qty = max(0, _safe_int(getattr(stack, "qty", 0), 0))
-                if not item_id or qty <= 0:
-                    continue
-                out[item_id] = out.get(item_id, 0) + qty
-        return out
+        from app.ui.state.inventory import item_totals
+
+        return item_totals((state.carried, state.storage))
 
     def detect_sell_intent(self, player_text: str, inventory: dict[str, int], item_defs: dict[str, object]) -> SellIntent | None:
         plain = _norm(player_text)
@@ -964,38 +956,17 @@ class TradeEngine:
         state.player.gold = max(0, _safe_int(snapshot.get("gold"), 0))
 
     def _count_item_in_inventory(self, state, item_id: str) -> int:
-        target_id = str(item_id or "").strip().casefold()
-        if not target_id:
-            return 0
-        total = 0
-        for grid in (state.carried, state.storage):
-            for stack in grid.slots:
-                if stack is None:
-                    continue
-                sid = str(getattr(stack, "item_id", "") or "").strip().casefold()
-                if sid != target_id:
-                    continue
-                total += max(0, _safe_int(getattr(stack, "qty", 0), 0))
-        return total
+        from app.ui.state.inventory import count_item
+
+        return count_item((state.carried, state.storage), item_id)
 
     def _capacity_for_item(self, state, item_id: str, *, item_defs: dict[str, object]) -> int:
+        from app.ui.state.inventory import item_capacity
+
         target_id = str(item_id or "").strip().casefold()
         if not target_id:
             return 0
-        item_def = item_defs.get(target_id) or item_defs.get(item_id)
-        stack_max = max(1, _safe_int(getattr(item_def, "stack_max", 1), 1))
-        free = 0
-        for grid in (state.carried, state.storage):
-            for stack in grid.slots:
-                if stack is None:
-                    free += stack_max
-                    continue
-                sid = str(getattr(stack, "item_id", "") or "").strip().casefold()
-                if sid != target_id:
-                    continue
-                current_qty = max(0, _safe_int(getattr(stack, "qty", 0), 0))
-                free += max(0, stack_max - current_qty)
-        return max(0, free)
+        return item_capacity((state.carried, state.storage), target_id, stack_max=self._stack_max(item_id, item_defs))
 
     def _record_trade_transaction(
         self,
@@ -1035,76 +1006,21 @@ class TradeEngine:
         return tx_id
 
     def _remove_item_from_inventory(self, state, item_id: str, qty: int) -> int:
-        target_id = str(item_id or "").strip().casefold()
-        wanted = max(0, _safe_int(qty, 0))
-        if not target_id or wanted <= 0:
-            return 0
-        removed = 0
-        for grid in (state.carried, state.storage):
-            for idx, stack in enumerate(grid.slots):
-                if removed >= wanted:
-                    break
-                if stack is None:
-                    continue
-                sid = str(getattr(stack, "item_id", "") or "").strip().casefold()
-                if sid != target_id:
-                    continue
-                sqty = max(0, _safe_int(getattr(stack, "qty", 0), 0))
-                if sqty <= 0:
-                    grid.set(idx, None)
-                    continue
-                take = min(sqty, wanted - removed)
-                left = sqty - take
-                removed += take
-                if left > 0:
-                    stack.qty = left
-                else:
-                    grid.set(idx, None)
-            if removed >= wanted:
-                break
-        return removed
+        from app.ui.state.inventory import remove_item
+
+        return remove_item((state.carried, state.storage), item_id, max(0, _safe_int(qty, 0)))
 
     def _add_item_to_inventory(self, state, item_id: str, qty: int, *, item_defs: dict[str, object]) -> int:
-        target_id = str(item_id or "").strip().casefold()
-        wanted = max(0, _safe_int(qty, 0))
-        if not target_id or wanted <= 0:
-            return 0
-        item_def = item_defs.get(target_id) or item_defs.get(item_id)
-        stack_max = max(1, _safe_int(getattr(item_def, "stack_max", 1), 1))
-        added = 0
+        from app.ui.state.inventory import add_item
 
-        for grid in (state.carried, state.storage):
-            for stack in grid.slots:
-                if added >= wanted:
-                    break
-                if stack is None:
-                    continue
-                sid = str(getattr(stack, "item_id", "") or "").strip().casefold()
-                if sid != target_id:
-                    continue
-                current_qty = max(0, _safe_int(getattr(stack, "qty", 0), 0))
-                room = max(0, stack_max - current_qty)
-                if room <= 0:
-                    continue
-                take = min(room, wanted - added)
-                stack.qty = current_qty + take
-                added += take
-            if added >= wanted:
-                return added
-
-        for grid in (state.carried, state.storage):
-            for idx, stack in enumerate(grid.slots):
-                if added >= wanted:
-                    break
-                if stack is not None:
-                    continue
-                take = min(stack_max, wanted - added)
-                if take <= 0:
-                    continue
-                from app.ui.state.inventory import ItemStack
+        return add_item(
+            (state.carried, state.storage),
+            item_id,
+            max(0, _safe_int(qty, 0)),
+            stack_max=self._stack_max(item_id, item_defs),
+        )
 
-                grid.set(idx, ItemStack(item_id=target_id, qty=take))
-                added += take
-            if added >= wanted:
-                break
-        return added
+    def _stack_max(self, item_id: str, item_defs: dict[str, object]) -> int:
+        target_id = str(item_id or "").strip().casefold()
+        item_def = item_defs.get(target_id) or item_defs.get(item_id)
+        return max(1, _safe_int(getattr(item_def, "stack_max", 1), 1))
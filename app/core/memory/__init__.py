@@ -3,14 +3,24 @@ from .memory_admin import MemoryAdmin
 from .memory_compactor import compact_npc_memory, compact_world_memory
 from .memory_models import NpcMemory, WorldMemory
 from .memory_retrieval import retrieve_context
-from .memory_service import MemoryService, get_memory_service, set_memory_service
+from .memory_service import (
+    MemoryEntry,
+    MemoryService,
+    close_memory_service,
+    dialogue_turn_entries,
+    get_memory_service,
+    set_memory_service,
+)
 from .memory_store import MemoryStore
 from .vector_index import VectorIndex
 
 __all__ = [
     "MemoryStore",
     "MemoryService",
+    "MemoryEntry",
+    "dialogue_turn_entries",
     "get_memory_service",
+    "close_memory_service",
     "set_memory_service",
     "MemoryAdmin",
     "EmbeddingProvider",
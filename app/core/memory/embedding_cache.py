@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+LOG = logging.getLogger(__name__)
+
+# One fixed-size record per cached vector in `<name>.idx`:
+# sha1 digest of the text hash, offset (in float32 units) into `<name>.bin`, vector length.
+INDEX_DTYPE = np.dtype([("key", "S20"), ("offset", "<u8"), ("dim", "<u4"), ("pad", "<u4")])
+# Approximate Python overhead of one in-RAM vector (dict slot, key string, array header).
+ENTRY_OVERHEAD_BYTES = 200
+
+
+def _key_bytes(key: str) -> bytes | None:
+    try:
+        raw = bytes.fromhex(str(key or "").strip())
+    except ValueError:
+        return None
+    return raw if len(raw) == 20 else None
+
+
+class EmbeddingCache:
+    """Append-only binary cache of float32 vectors keyed by `text_hash`.
+
+    Writes only append the new vectors (`.bin`) and their index records (`.idx`);
+    the vector block is memory-mapped so startup only reads the small index.
+    Superseded records are dropped by `compact`, which rewrites both files.
+    A legacy `emb_cache.jsonl` next to the cache is imported once, on first load.
+
+    Recently used vectors are also copied into an in-RAM hot set, accounted (with pending
+    vectors) as `dim * 4 + ENTRY_OVERHEAD_BYTES`; past `max_bytes` the least recently used hot
+    copies are dropped. The budget never touches the on-disk entries and mapped pages are not
+    counted: an evicted vector is still served from the map. `max_bytes=0` disables the hot set.
+    """
+
+    def __init__(self, path: str | Path, *, max_bytes: int | None = None) -> None:
+        path = Path(path)
+        self.legacy_path = path if path.suffix == ".jsonl" else path.with_suffix(".jsonl")
+        self.data_path = path.with_suffix(".bin")
+        self.index_path = path.with_suffix(".idx")
+        self.max_bytes = max(0, int(max_bytes)) if max_bytes else 0
+        self._entries: dict[str, tuple[int, int]] = {}
+        self._hot: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._hot_bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._mm: np.ndarray | None = None
+        self._mapped_floats = 0
+        self._data_floats = 0
+        self._records = 0
+        self._pending: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries) + sum(1 for key in self._pending if key not in self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._pending or key in self._entries
+
+    @property
+    def dead_records(self) -> int:
+        return max(0, self._records - len(self._entries))
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    def keys(self) -> list[str]:
+        return list(dict.fromkeys([*self._entries.keys(), *self._pending.keys()]))
+
+    @property
+    def resident_bytes(self) -> int:
+        return self._hot_bytes + sum(int(arr.nbytes) + ENTRY_OVERHEAD_BYTES for arr in self._pending.values())
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_ratio": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": len(self),
+            "hot_entries": len(self._hot),
+            "resident_bytes": self.resident_bytes,
+            "max_bytes": self.max_bytes,
+            "dead_records": self.dead_records,
+        }
+
+    def _set_entry(self, key: str, offset: int, dim: int) -> None:
+        self._entries[key] = (int(offset), int(dim))
+
+    def _remember_hot(self, key: str, arr: np.ndarray) -> None:
+        if self.max_bytes <= 0:
+            return
+        previous = self._hot.pop(key, None)
+        if previous is not None:
+            self._hot_bytes -= int(previous.nbytes) + ENTRY_OVERHEAD_BYTES
+        self._hot[key] = arr
+        self._hot_bytes += int(arr.nbytes) + ENTRY_OVERHEAD_BYTES
+        self._evict()
+
+    def _evict(self) -> None:
+        if self.max_bytes <= 0:
+            return
+        while self._hot and self.resident_bytes > self.max_bytes:
+            _, arr = self._hot.popitem(last=False)
+            self._hot_bytes -= int(arr.nbytes) + ENTRY_OVERHEAD_BYTES
+            self._stats["evictions"] += 1
+
+    def load(self) -> None:
+        self._entries = {}
+        self._hot = OrderedDict()
+        self._hot_bytes = 0
+        self._pending = {}
+        self._records = 0
+        self._data_floats = 0
+        self._mm = None
+        self._mapped_floats = 0
+        if not self.index_path.exists():
+            if self.legacy_path.exists():
+                self._import_legacy()
+            return
+        try:
+            raw = self.index_path.read_bytes()
+            usable = len(raw) - (len(raw) % INDEX_DTYPE.itemsize)
+            rows = np.frombuffer(raw[:usable], dtype=INDEX_DTYPE)
+            data_floats = self.data_path.stat().st_size // 4 if self.data_path.exists() else 0
+            # Keys are sliced from the raw records: numpy strips trailing NUL bytes from "S20" values.
+            width = INDEX_DTYPE.itemsize
+            for pos, (offset, dim) in enumerate(zip(rows["offset"].tolist(), rows["dim"].tolist())):
+                if dim <= 0 or offset + dim > data_floats:
+                    continue
+                self._set_entry(raw[pos * width : pos * width + 20].hex(), offset, dim)
+            self._records = int(rows.shape[0])
+            self._data_floats = int(data_floats)
+            self._remap()
+        except Exception as exc:
+            LOG.warning("memory embeddings: binary cache unreadable, starting empty (%s)", exc)
+            self._entries = {}
+            self._records = 0
+
+    def _import_legacy(self) -> None:
+        imported = 0
+        try:
+            for line in self.legacy_path.read_text(encoding="utf-8").splitlines():
+                raw = str(line or "").strip()
+                if not raw:
+                    continue
+                row = json.loads(raw)
+                if not isinstance(row, dict):
+                    continue
+                key = str(row.get("text_hash") or "").strip().casefold()
+                vector = row.get("vector")
+                if not key or not isinstance(vector, list) or not vector:
+                    continue
+                self.put(key, vector)
+                imported += 1
+        except Exception as exc:
+            LOG.warning("memory embeddings: legacy cache import failed (%s)", exc)
+        if imported:
+            self.compact()
+            LOG.info("memory embeddings: imported %s vectors from %s", imported, self.legacy_path)
+
+    def _remap(self) -> None:
+        self._mm = None
+        self._mapped_floats = 0
+        if self._data_floats <= 0 or not self.data_path.exists():
+            return
+        self._mm = np.memmap(self.data_path, dtype=np.float32, mode="r", shape=(self._data_floats,))
+        self._mapped_floats = self._data_floats
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Return a read-only float32 array or None; counts hits/misses.
+
+        Hot or pending vectors are returned as is; others are copied out of the map into the hot set
+        (or returned as a view of the map when the hot set is disabled).
+        """
+        hot = self._hot.get(key)
+        if hot is not None:
+            self._hot.move_to_end(key)
+            self._stats["hits"] += 1
+            return hot
+        vec = self._peek(key)
+        if vec is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        if key not in self._pending and self.max_bytes > 0:
+            vec = np.array(vec, dtype=np.float32)
+            vec.flags.writeable = False
+            self._remember_hot(key, vec)
+        return vec
+
+    def _peek(self, key: str) -> np.ndarray | None:
+        pending = self._pending.get(key)
+        if pending is not None:
+            return pending
+        hot = self._hot.get(key)
+        if hot is not None:
+            return hot
+        loc = self._entries.get(key)
+        if loc is None or self._mm is None:
+            return None
+        offset, dim = loc
+        if offset + dim > self._mapped_floats:
+            return None
+        return self._mm[offset : offset + dim]
+
+    def put(self, key: str, vector) -> np.ndarray | None:
+        """Queue a vector for the next `flush`; returns the stored read-only array."""
+        if _key_bytes(key) is None:
+            return None
+        arr = np.array(vector, dtype=np.float32).reshape(-1)
+        if arr.size <= 0:
+            return None
+        arr.flags.writeable = False
+        self._pending[key] = arr
+        previous = self._hot.pop(key, None)
+        if previous is not None:
+            self._hot_bytes -= int(previous.nbytes) + ENTRY_OVERHEAD_BYTES
+        return arr
+
+    def flush(self) -> int:
+        """Append pending vectors; returns how many were written."""
+        if not self._pending:
+            return 0
+        self.data_path.parent.mkdir(parents=True, exist_ok=True)
+        records = np.zeros(len(self._pending), dtype=INDEX_DTYPE)
+        offset = self._data_floats
+        blocks: list[np.ndarray] = []
+        for pos, (key, arr) in enumerate(self._pending.items()):
+            records[pos] = (_key_bytes(key), offset, int(arr.size), 0)
+            blocks.append(arr)
+            offset += int(arr.size)
+        # Data first: a crash between the two writes only leaves unreferenced floats, and a torn
+        # index tail is ignored on load. No fsync: this is a cache, losing a tail only costs re-embeds.
+        with self.data_path.open("ab") as fh:
+            fh.write(np.concatenate(blocks).astype(np.float32).tobytes())
+        with self.index_path.open("ab") as fh:
+            fh.write(records.tobytes())
+        flushed = self._pending
+        for row, key in zip(records, list(flushed.keys())):
+            self._set_entry(key, int(row["offset"]), int(row["dim"]))
+        written = len(flushed)
+        self._records += written
+        self._data_floats = offset
+        self._pending = {}
+        # Freshly written vectors are the likeliest to be read again: they join the hot set.
+        for key, arr in flushed.items():
+            self._remember_hot(key, arr)
+        self._remap()
+        return written
+
+    def compact(self) -> int:
+        """Rewrite both files with live records only; returns the number of records kept."""
+        live: list[tuple[str, np.ndarray]] = []
+        for key in self.keys():
+            vec = self._peek(key)
+            if vec is not None:
+                live.append((key, np.array(vec, dtype=np.float32)))
+        self.data_path.parent.mkdir(parents=True, exist_ok=True)
+        records = np.zeros(len(live), dtype=INDEX_DTYPE)
+        offset = 0
+        for pos, (key, arr) in enumerate(live):
+            records[pos] = (_key_bytes(key), offset, int(arr.size), 0)
+            offset += int(arr.size)
+        data_tmp = self.data_path.with_name(self.data_path.name + ".tmp")
+        index_tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        with data_tmp.open("wb") as fh:
+            if live:
+                fh.write(np.concatenate([arr for _, arr in live]).tobytes())
+            fh.flush()
+            os.fsync(fh.fileno())
+        with index_tmp.open("wb") as fh:
+            fh.write(records.tobytes())
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._mm = None  # release the mapping before replacing the file (required on Windows)
+        os.replace(data_tmp, self.data_path)
+        os.replace(index_tmp, self.index_path)
+        self._entries = {}
+        for (key, _), row in zip(live, records):
+            self._set_entry(key, int(row["offset"]), int(row["dim"]))
+        self._pending = {}
+        self._records = len(live)
+        self._data_floats = offset
+        self._remap()
+        return len(live)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import threading
+import time
+from typing import Callable, Hashable
+
+
+LOG = logging.getLogger(__name__)
+
+
+@dataclass
+class _BackendState:
+    ok: bool | None = None
+    failures: int = 0
+    next_probe: float = 0.0
+    last_probe: float = 0.0
+
+
+class BackendHealthMonitor:
+    """Cached availability of embedding backends, re-probed from a daemon thread.
+
+    Backends are listed by preference. `active()` returns the first one known to be up
+    without ever probing on the caller's thread; a backend reported down (or failing its
+    probe) is re-probed after an exponential backoff, and lower-priority backends are only
+    probed while every backend above them is down.
+    """
+
+    def __init__(
+        self,
+        probes: dict[str, Callable[[], bool]],
+        *,
+        order: list[str],
+        assume_up: set[str] | None = None,
+        backoff_s: float = 1.0,
+        backoff_max_s: float = 60.0,
+        healthy_interval_s: float = 30.0,
+    ) -> None:
+        self._probes = dict(probes)
+        self.order = [name for name in order if name in self._probes]
+        self.backoff_s = max(0.05, float(backoff_s))
+        self.backoff_max_s = max(self.backoff_s, float(backoff_max_s))
+        self.healthy_interval_s = max(1.0, float(healthy_interval_s))
+        now = time.monotonic()
+        self._state: dict[str, _BackendState] = {}
+        for name in self.order:
+            if name in (assume_up or set()):
+                self._state[name] = _BackendState(ok=True, next_probe=now + self.healthy_interval_s)
+            else:
+                self._state[name] = _BackendState()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._ready = threading.Event()
+        if assume_up and any(name in self._state for name in assume_up):
+            self._ready.set()
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if not self.order:
+            self._ready.set()
+            return
+        if self._thread is not None or self._stopped:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="memory-embed-health", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._wake.set()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout_s: float) -> bool:
+        self.start()
+        return self._ready.wait(max(0.0, float(timeout_s)))
+
+    def active(self) -> str | None:
+        self.start()
+        with self._lock:
+            for name in self.order:
+                if self._state[name].ok:
+                    return name
+        return None
+
+    def is_up(self, name: str) -> bool:
+        with self._lock:
+            state = self._state.get(name)
+            return bool(state and state.ok)
+
+    def report_success(self, name: str) -> None:
+        with self._lock:
+            state = self._state.get(name)
+            if state is None or (state.ok and state.failures == 0):
+                return
+            state.ok = True
+            state.failures = 0
+            state.next_probe = time.monotonic() + self.healthy_interval_s
+
+    def report_failure(self, name: str) -> None:
+        """Mark a backend down after a failed call; the monitor re-probes it with backoff."""
+        with self._lock:
+            state = self._state.get(name)
+            if state is None:
+                return
+            self._record_locked(state, False, time.monotonic())
+            retry_in = self._backoff(state.failures)
+        LOG.info("memory embeddings: backend %s down, next probe in %.1fs", name, retry_in)
+        self.start()
+        self._wake.set()
+
+    def _backoff(self, failures: int) -> float:
+        return min(self.backoff_max_s, self.backoff_s * (2 ** max(0, failures - 1)))
+
+    def _record_locked(self, state: _BackendState, ok: bool, now: float) -> None:
+        state.ok = ok
+        state.last_probe = now
+        if ok:
+            state.failures = 0
+            state.next_probe = now + self.healthy_interval_s
+        else:
+            state.failures += 1
+            state.next_probe = now + self._backoff(state.failures)
+
+    def _probe_pass(self) -> float:
+        """Probe due backends in preference order; returns seconds until the next due probe."""
+        for name in self.order:
+            with self._lock:
+                state = self._state[name]
+                due = time.monotonic() >= state.next_probe
+            if due:
+                try:
+                    ok = bool(self._probes[name]())
+                except Exception:
+                    ok = False
+                with self._lock:
+                    self._record_locked(state, ok, time.monotonic())
+            if state.ok:
+                break
+        self._ready.set()
+        now = time.monotonic()
+        with self._lock:
+            waits: list[float] = []
+            for name in self.order:
+                state = self._state[name]
+                waits.append(state.next_probe - now)
+                if state.ok:
+                    break
+        return max(0.05, min(waits)) if waits else self.healthy_interval_s
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.clear()
+            delay = self._probe_pass()
+            self._wake.wait(delay)
+
+    def stats(self) -> dict[str, dict[str, object]]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    "ok": state.ok,
+                    "failures": state.failures,
+                    "next_probe_in_s": round(max(0.0, state.next_probe - now), 2),
+                }
+                for name, state in self._state.items()
+            }
+
+
+_shared_lock = threading.Lock()
+_shared: dict[Hashable, tuple[BackendHealthMonitor, int]] = {}
+
+
+def acquire_shared_monitor(key: Hashable, build: Callable[[], BackendHealthMonitor]) -> BackendHealthMonitor:
+    """One monitor per key (an endpoint), shared by every provider that targets it."""
+    with _shared_lock:
+        monitor, refs = _shared.get(key, (None, 0))
+        if monitor is None:
+            monitor = build()
+        _shared[key] = (monitor, refs + 1)
+        return monitor
+
+
+def release_shared_monitor(key: Hashable) -> None:
+    """Drop one reference; the last one stops the monitor's thread."""
+    with _shared_lock:
+        monitor, refs = _shared.get(key, (None, 0))
+        if monitor is None:
+            return
+        if refs > 1:
+            _shared[key] = (monitor, refs - 1)
+            return
+        del _shared[key]
+    monitor.stop()
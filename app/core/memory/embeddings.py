@@ -1,19 +1,91 @@
 from __future__ import annotations
 
-import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
 from pathlib import Path
+import threading
 from typing import Any
 
 import httpx
 import numpy as np
 
+from .embedding_cache import EmbeddingCache
+from .embedding_health import BackendHealthMonitor, acquire_shared_monitor, release_shared_monitor
 from .memory_models import text_hash
 
 
 LOG = logging.getLogger(__name__)
 
+EMBED_TIMEOUT_S = 8.0
+PROBE_TIMEOUT_S = 0.9
+SENTENCE_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(float(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+_sentence_lock = threading.Lock()
+_sentence_model: Any = None
+
+
+def _load_sentence_model() -> Any:
+    """sentence-transformers model, loaded once per process."""
+    global _sentence_model
+    with _sentence_lock:
+        if _sentence_model is None:
+            from sentence_transformers import SentenceTransformer  # type: ignore
+
+            _sentence_model = SentenceTransformer(SENTENCE_MODEL_NAME)
+        return _sentence_model
+
+
+def _probe_ollama(base_url: str) -> bool:
+    try:
+        res = httpx.get(f"{base_url}/api/tags", timeout=PROBE_TIMEOUT_S)
+        return bool(200 <= int(res.status_code) < 500)
+    except Exception:
+        return False
+
+
+def _probe_sentence() -> bool:
+    try:
+        _load_sentence_model()
+        return True
+    except Exception:
+        return False
+
+
+def _forced_mode() -> str:
+    return str(os.getenv("MEMORY_EMBED_MODE", "")).strip().casefold()
+
+
+def _build_health_monitor(base_url: str, forced: str) -> BackendHealthMonitor:
+    """Probes only hold the endpoint, never a provider, so one monitor can serve them all."""
+    order = ["ollama", "sentence"]
+    assume_up: set[str] | None = None
+    if forced in {"off", "none", "disabled"}:
+        order = []
+    elif forced in {"ollama", "sentence"}:
+        # An explicit mode is strict: no silent fallback to the other backend.
+        order = [forced]
+        assume_up = {forced}
+    try:
+        backoff_max_s = float(os.getenv("MEMORY_EMBED_PROBE_MAX_S", "60") or "60")
+    except ValueError:
+        backoff_max_s = 60.0
+    return BackendHealthMonitor(
+        {"ollama": lambda: _probe_ollama(base_url), "sentence": lambda: _probe_sentence()},
+        order=order,
+        assume_up=assume_up,
+        backoff_max_s=backoff_max_s,
+    )
+
 
 class EmbeddingProvider:
     def __init__(
@@ -22,89 +94,137 @@ class EmbeddingProvider:
         cache_path: str = "data/memory_index/emb_cache.jsonl",
         ollama_base_url: str = "http://127.0.0.1:11434",
         ollama_model: str = "nomic-embed-text",
+        cache_max_bytes: int | None = None,
+        max_concurrency: int | None = None,
     ) -> None:
         self.cache_path = Path(cache_path)
         self.ollama_base_url = str(ollama_base_url).rstrip("/")
         self.ollama_model = str(ollama_model or "nomic-embed-text").strip()
-        self._mode: str | None = None
-        self._sentence_model: Any = None
-        self._cache: dict[str, list[float]] = {}
-        self._cache_dirty = False
+        if cache_max_bytes is None:
+            try:
+                cache_max_bytes = int(float(os.getenv("MEMORY_EMBED_CACHE_MB", "256") or "256") * 1024 * 1024)
+            except ValueError:
+                cache_max_bytes = 256 * 1024 * 1024
+        self._cache = EmbeddingCache(self.cache_path, max_bytes=cache_max_bytes)
+        self._cache_lock = threading.RLock()
+        if max_concurrency is None:
+            max_concurrency = _env_int("MEMORY_EMBED_CONCURRENCY", 4)
+        self.max_concurrency = max(1, int(max_concurrency))
+        # Pooled keep-alive clients: one sync client (plus a small fan-out pool for the legacy
+        # per-text endpoint) and one async client, recreated when the running event loop changes.
+        self._http: httpx.Client | None = None
+        self._http_lock = threading.Lock()
+        self._fanout: ThreadPoolExecutor | None = None
+        self._async_http: httpx.AsyncClient | None = None
+        self._async_http_loop: asyncio.AbstractEventLoop | None = None
+        forced = _forced_mode()
+        self._health_key: tuple[str, str] | None = (self.ollama_base_url, forced)
+        self._health = acquire_shared_monitor(
+            self._health_key, lambda: _build_health_monitor(self.ollama_base_url, forced)
+        )
         self._load_cache()
 
+    def cache_stats(self) -> dict[str, int | float]:
+        return self._cache.stats()
+
+    def backend_stats(self) -> dict[str, Any]:
+        return {"mode": self.mode if self._health.ready else "probing", "backends": self._health.stats()}
+
     @property
     def mode(self) -> str:
-        if self._mode is None:
-            self._mode = self._detect_mode()
-        return self._mode
+        """Last known backend; never waits: "disabled" until the background probe reports one."""
+        return self._health.active() or "disabled"
 
     def enabled(self) -> bool:
         return self.mode in {"ollama", "sentence"}
 
-    def _detect_mode(self) -> str:
-        forced = str(os.getenv("MEMORY_EMBED_MODE", "")).strip().casefold()
-        if forced in {"off", "none", "disabled"}:
-            return "disabled"
-        if forced in {"ollama", "sentence"}:
-            return forced
-        if self._ollama_is_available():
-            return "ollama"
-        if self._sentence_available():
-            return "sentence"
-        return "disabled"
-
-    def _ollama_is_available(self) -> bool:
-        try:
-            with httpx.Client(timeout=0.9) as client:
-                res = client.get(f"{self.ollama_base_url}/api/tags")
-            return bool(200 <= int(res.status_code) < 500)
-        except Exception:
-            return False
+    def _http_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_concurrency * 2,
+            max_keepalive_connections=self.max_concurrency,
+            keepalive_expiry=30.0,
+        )
 
-    def _sentence_available(self) -> bool:
-        try:
-            from sentence_transformers import SentenceTransformer  # type: ignore
+    def _http_client(self) -> httpx.Client:
+        client = self._http
+        if isinstance(client, httpx.Client):
+            return client
+        with self._http_lock:
+            if not isinstance(self._http, httpx.Client):
+                self._http = httpx.Client(timeout=EMBED_TIMEOUT_S, limits=self._http_limits())
+            return self._http
+
+    def _fanout_pool(self) -> ThreadPoolExecutor:
+        pool = self._fanout
+        if isinstance(pool, ThreadPoolExecutor):
+            return pool
+        with self._http_lock:
+            if not isinstance(self._fanout, ThreadPoolExecutor):
+                self._fanout = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="memory-embed",
+                )
+            return self._fanout
 
-            if self._sentence_model is None:
-                self._sentence_model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
-            return True
-        except Exception:
+    async def _async_http_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_http
+        if isinstance(client, httpx.AsyncClient) and self._async_http_loop is loop:
+            return client
+        # A client is bound to the loop that opened its connections; never reuse it across loops.
+        stale, stale_loop = client, self._async_http_loop
+        self._async_http = httpx.AsyncClient(timeout=EMBED_TIMEOUT_S, limits=self._http_limits())
+        self._async_http_loop = loop
+        if isinstance(stale, httpx.AsyncClient) and not self._schedule_aclose(stale, stale_loop):
+            try:
+                await stale.aclose()
+            except Exception as exc:
+                LOG.debug("memory embeddings: stale async client close (%s)", exc)
+        return self._async_http
+
+    @staticmethod
+    def _schedule_aclose(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None) -> bool:
+        """Close `client` on the loop that owns it; False when that loop no longer runs."""
+        if loop is None or loop.is_closed() or not loop.is_running():
             return False
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        return True
+
+    def close(self) -> None:
+        with self._http_lock:
+            key, self._health_key = self._health_key, None
+            client, self._http = self._http, None
+            pool, self._fanout = self._fanout, None
+        if key is not None:
+            release_shared_monitor(key)
+        if isinstance(client, httpx.Client):
+            client.close()
+        if isinstance(pool, ThreadPoolExecutor):
+            pool.shutdown(wait=False)
+        async_client, async_loop = self._async_http, self._async_http_loop
+        self._async_http = None
+        self._async_http_loop = None
+        if isinstance(async_client, httpx.AsyncClient):
+            self._schedule_aclose(async_client, async_loop)
+
+    async def aclose(self) -> None:
+        client = self._async_http
+        if isinstance(client, httpx.AsyncClient) and self._async_http_loop is asyncio.get_running_loop():
+            self._async_http = None
+            self._async_http_loop = None
+            await client.aclose()
+        self.close()
 
     def _load_cache(self) -> None:
-        if not self.cache_path.exists():
-            return
-        try:
-            for line in self.cache_path.read_text(encoding="utf-8").splitlines():
-                raw = str(line or "").strip()
-                if not raw:
-                    continue
-                row = json.loads(raw)
-                if not isinstance(row, dict):
-                    continue
-                key = str(row.get("text_hash") or "").strip().casefold()
-                vector = row.get("vector")
-                if not key or not isinstance(vector, list):
-                    continue
-                parsed = [float(x) for x in vector]
-                if parsed:
-                    self._cache[key] = parsed
-        except Exception:
-            self._cache = {}
+        self._cache.load()
 
     def flush_cache(self) -> None:
-        if not self._cache_dirty:
-            return
-        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-        rows = [{"text_hash": key, "vector": vec} for key, vec in self._cache.items()]
-        rows.sort(key=lambda row: str(row.get("text_hash") or ""))
-        content = "\n".join(json.dumps(row, ensure_ascii=False) for row in rows)
-        if content:
-            content += "\n"
-        tmp = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
-        tmp.write_text(content, encoding="utf-8")
-        os.replace(tmp, self.cache_path)
-        self._cache_dirty = False
+        with self._cache_lock:
+            if not self._cache.dirty:
+                return
+            self._cache.flush()
+            if self._cache.dead_records > 1000 and self._cache.dead_records > len(self._cache):
+                self._cache.compact()
 
     def _normalize_vector(self, vector: list[float]) -> list[float]:
         if not vector:
@@ -115,49 +235,78 @@ class EmbeddingProvider:
             arr = arr / norm
         return [float(x) for x in arr.tolist()]
 
+    def _parse_batch(self, res: httpx.Response, expected: int) -> list[list[float]] | None:
+        if not 200 <= int(res.status_code) < 300:
+            return None
+        data = res.json()
+        embeds = data.get("embeddings") if isinstance(data, dict) else None
+        if not isinstance(embeds, list):
+            return None
+        out: list[list[float]] = []
+        for row in embeds:
+            if isinstance(row, list):
+                out.append(self._normalize_vector([float(x) for x in row]))
+        return out if len(out) == expected else None
+
+    def _parse_single(self, res: httpx.Response) -> list[float]:
+        res.raise_for_status()
+        data = res.json()
+        vector = data.get("embedding") if isinstance(data, dict) else None
+        if not isinstance(vector, list):
+            return []
+        return self._normalize_vector([float(x) for x in vector])
+
+    def _embed_one_with_ollama(self, text: str) -> list[float]:
+        payload = {"model": self.ollama_model, "prompt": text}
+        return self._parse_single(self._http_client().post(f"{self.ollama_base_url}/api/embeddings", json=payload))
+
     def _embed_with_ollama(self, texts: list[str]) -> list[list[float]]:
         if not texts:
             return []
         try:
-            with httpx.Client(timeout=8.0) as client:
-                payload = {"model": self.ollama_model, "input": texts}
-                res = client.post(f"{self.ollama_base_url}/api/embed", json=payload)
-                if 200 <= int(res.status_code) < 300:
-                    data = res.json()
-                    embeds = data.get("embeddings") if isinstance(data, dict) else None
-                    if isinstance(embeds, list):
-                        out: list[list[float]] = []
-                        for row in embeds:
-                            if isinstance(row, list):
-                                out.append(self._normalize_vector([float(x) for x in row]))
-                        if len(out) == len(texts):
-                            return out
-            out_rows: list[list[float]] = []
-            with httpx.Client(timeout=8.0) as client:
-                for text in texts:
-                    payload = {"model": self.ollama_model, "prompt": text}
-                    res = client.post(f"{self.ollama_base_url}/api/embeddings", json=payload)
-                    res.raise_for_status()
-                    data = res.json()
-                    vector = data.get("embedding") if isinstance(data, dict) else None
-                    if not isinstance(vector, list):
-                        out_rows.append([])
-                    else:
-                        out_rows.append(self._normalize_vector([float(x) for x in vector]))
-            return out_rows
+            payload = {"model": self.ollama_model, "input": texts}
+            res = self._http_client().post(f"{self.ollama_base_url}/api/embed", json=payload)
+            out = self._parse_batch(res, len(texts))
+            if out is not None:
+                return out
+            # Older servers only expose the per-text endpoint: fan out over the pooled connections.
+            if len(texts) == 1:
+                return [self._embed_one_with_ollama(texts[0])]
+            return list(self._fanout_pool().map(self._embed_one_with_ollama, texts))
         except Exception as exc:
             LOG.warning("memory embeddings: ollama fallback (%s)", exc)
             return []
 
-    def _embed_with_sentence(self, texts: list[str]) -> list[list[float]]:
+    async def _aembed_with_ollama(self, texts: list[str]) -> list[list[float]]:
         if not texts:
             return []
         try:
-            if self._sentence_model is None:
-                from sentence_transformers import SentenceTransformer  # type: ignore
+            client = await self._async_http_client()
+            payload = {"model": self.ollama_model, "input": texts}
+            res = await client.post(f"{self.ollama_base_url}/api/embed", json=payload)
+            out = self._parse_batch(res, len(texts))
+            if out is not None:
+                return out
+            gate = asyncio.Semaphore(self.max_concurrency)
+
+            async def _one(text: str) -> list[float]:
+                async with gate:
+                    single = await client.post(
+                        f"{self.ollama_base_url}/api/embeddings",
+                        json={"model": self.ollama_model, "prompt": text},
+                    )
+                return self._parse_single(single)
+
+            return list(await asyncio.gather(*(_one(text) for text in texts)))
+        except Exception as exc:
+            LOG.warning("memory embeddings: ollama fallback (%s)", exc)
+            return []
 
-                self._sentence_model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
-            raw = self._sentence_model.encode(texts, normalize_embeddings=True)  # type: ignore[union-attr]
+    def _embed_with_sentence(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        try:
+            raw = _load_sentence_model().encode(texts, normalize_embeddings=True)
             out: list[list[float]] = []
             for row in raw:
                 vec = [float(x) for x in row]
@@ -167,56 +316,111 @@ class EmbeddingProvider:
             LOG.warning("memory embeddings: sentence-transformers fallback (%s)", exc)
             return []
 
-    def embed_texts(self, texts: list[str]) -> list[list[float]]:
-        if not texts:
-            return []
+    def _lookup(self, texts: list[str]) -> tuple[list[str], list[np.ndarray], list[int], list[str]]:
         clean_texts = [str(row or "").strip() for row in texts]
         hashes = [text_hash(text) for text in clean_texts]
-        out: list[list[float] | None] = [None] * len(clean_texts)
-
+        empty = np.zeros(0, dtype=np.float32)
+        out: list[np.ndarray] = [empty] * len(clean_texts)
         missing_indexes: list[int] = []
         missing_texts: list[str] = []
+        missing_keys: set[str] = set()
+        with self._cache_lock:
+            for idx, key in enumerate(hashes):
+                cached = self._cache.get(key)
+                if cached is not None and cached.size > 0:
+                    out[idx] = cached
+                elif key not in missing_keys:
+                    # Repeated texts are embedded once; `_store` fills every copy.
+                    missing_keys.add(key)
+                    missing_indexes.append(idx)
+                    missing_texts.append(clean_texts[idx])
+        return hashes, out, missing_indexes, missing_texts
+
+    def _store(
+        self,
+        hashes: list[str],
+        out: list[np.ndarray],
+        missing_indexes: list[int],
+        generated: list[list[float]],
+    ) -> None:
+        filled: dict[str, np.ndarray] = {}
+        with self._cache_lock:
+            for local_idx, vec in enumerate(generated):
+                source_idx = missing_indexes[local_idx]
+                normalized = self._normalize_vector(vec)
+                if not normalized:
+                    continue
+                stored = self._cache.put(hashes[source_idx], normalized)
+                filled[hashes[source_idx]] = stored if stored is not None else np.asarray(normalized, dtype=np.float32)
         for idx, key in enumerate(hashes):
-            cached = self._cache.get(key)
-            if isinstance(cached, list) and cached:
-                out[idx] = list(cached)
+            if key in filled:
+                out[idx] = filled[key]
+
+    def _generate(self, texts: list[str]) -> list[list[float]]:
+        """Embed with the active backend, then any other backend already known to be up.
+
+        A failing backend is only reported to the health monitor, which re-probes it in the
+        background; nothing is probed inline.
+        """
+        mode = self.mode
+        if mode == "disabled":
+            return []
+        candidates = [mode] + [name for name in self._health.order if name != mode and self._health.is_up(name)]
+        for backend in candidates:
+            if backend == "ollama":
+                generated = self._embed_with_ollama(texts)
             else:
-                missing_indexes.append(idx)
-                missing_texts.append(clean_texts[idx])
+                generated = self._embed_with_sentence(texts)
+            if generated:
+                self._health.report_success(backend)
+                return generated
+            self._health.report_failure(backend)
+        return []
+
+    def embed_arrays(self, texts: list[str]) -> list[np.ndarray]:
+        """Like `embed_texts` but returns read-only float32 views (empty arrays when unavailable)."""
+        if not texts:
+            return []
+        hashes, out, missing_indexes, missing_texts = self._lookup(texts)
 
         if missing_texts:
-            generated: list[list[float]] = []
-            if self.mode == "ollama":
-                generated = self._embed_with_ollama(missing_texts)
-                if not generated and self._sentence_available():
-                    self._mode = "sentence"
-                    generated = self._embed_with_sentence(missing_texts)
-                elif not generated:
-                    self._mode = "disabled"
-            elif self.mode == "sentence":
-                generated = self._embed_with_sentence(missing_texts)
-                if not generated and self._ollama_is_available():
-                    self._mode = "ollama"
-                    generated = self._embed_with_ollama(missing_texts)
-                elif not generated:
-                    self._mode = "disabled"
-
-            if not generated:
-                generated = [[] for _ in missing_texts]
+            self._store(hashes, out, missing_indexes, self._generate(missing_texts))
 
-            for local_idx, vec in enumerate(generated):
-                source_idx = missing_indexes[local_idx]
-                normalized = self._normalize_vector(vec)
-                out[source_idx] = normalized
-                key = hashes[source_idx]
-                if normalized:
-                    self._cache[key] = normalized
-                    self._cache_dirty = True
-
-        rows = [row if isinstance(row, list) else [] for row in out]
-        if self._cache_dirty:
+        if self._cache.dirty:
             self.flush_cache()
-        return rows
+        return out
+
+    async def aembed_arrays(self, texts: list[str]) -> list[np.ndarray]:
+        """Async `embed_arrays`: Ollama requests are awaited, blocking work runs in a worker thread."""
+        if not texts:
+            return []
+        hashes, out, missing_indexes, missing_texts = self._lookup(texts)
+        if not missing_texts:
+            return out
+        if self.mode != "ollama":
+            # sentence-transformers is CPU bound; the sync path also owns the backend fallbacks.
+            return await asyncio.to_thread(self.embed_arrays, texts)
+        generated = await self._aembed_with_ollama(missing_texts)
+        if not generated:
+            self._health.report_failure("ollama")
+            return await asyncio.to_thread(self.embed_arrays, texts)
+        self._health.report_success("ollama")
+        self._store(hashes, out, missing_indexes, generated)
+        if self._cache.dirty:
+            await asyncio.to_thread(self.flush_cache)
+        return out
+
+    async def aembed_texts(self, texts: list[str]) -> list[list[float]]:
+        return [row.tolist() for row in await self.aembed_arrays(texts)]
+
+    async def aembed_text(self, text: str) -> list[float]:
+        vectors = await self.aembed_texts([text])
+        if not vectors:
+            return []
+        return vectors[0]
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return [row.tolist() for row in self.embed_arrays(texts)]
 
     def embed_text(self, text: str) -> list[float]:
         vectors = self.embed_texts([text])
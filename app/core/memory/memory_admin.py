@@ -25,12 +25,12 @@ class MemoryAdmin:
         return memory.model_dump()
 
     def compact_npc_now(self, *, profile_key: str | None, npc_id: str) -> dict:
-        memory = self.service.load_npc_memory(profile_key=profile_key, npc_id=npc_id)
         from .memory_compactor import compact_npc_memory  # local import to avoid cycles
 
-        before_short = len(memory.short)
-        result = compact_npc_memory(memory, ai_enabled=False)
-        self.service.save_npc_memory(memory)
+        with self.service.locked_npc_memory(profile_key=profile_key, npc_id=npc_id) as memory:
+            before_short = len(memory.short)
+            result = compact_npc_memory(memory, ai_enabled=False)
+            self.service.save_npc_memory(memory)
         added = self.service.rebuild_npc_index(profile_key=profile_key, npc_id=npc_id)
         return {
             "changed": bool(result.changed),
@@ -46,6 +46,20 @@ class MemoryAdmin:
     def rebuild_world_index(self) -> int:
         return self.service.rebuild_world_index()
 
+    def vacuum_indexes(self) -> int:
+        return self.service.vacuum_indexes()
+
+    def cache_stats(self) -> dict:
+        return {
+            "npc_indexes": self.service.index_cache_stats(),
+            "memories": self.service.memory_cache_stats(),
+            "embeddings": self.service.embedding_cache_stats(),
+            "embedding_backends": self.service.embedding_backend_stats(),
+        }
+
+    def flush(self) -> int:
+        return self.service.flush()
+
     def purge_short(self, *, profile_key: str | None, npc_id: str) -> bool:
         return self.service.purge_short(profile_key=profile_key, npc_id=npc_id)
 
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import atexit
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
 import logging
+import os
 from pathlib import Path
 import re
-from typing import Any, Callable
+import threading
+from typing import Any, Callable, Iterator
 from uuid import uuid4
 
 from .embeddings import EmbeddingProvider
@@ -24,11 +29,30 @@ from .memory_models import (
 )
 from .memory_retrieval import retrieve_context as retrieve_context_hybrid
 from .memory_store import MemoryStore, safe_id
-from .vector_index import VectorIndex
+from .vector_index import VectorIndex, storage_mode_from_env
 
 
 LOG = logging.getLogger(__name__)
 
+# Mutation locks are striped so unrelated NPCs rarely contend and the lock count stays bounded.
+_MUTATION_STRIPES = 64
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = str(os.getenv(name, str(default)) or str(default)).strip()
+    try:
+        return int(raw)
+    except ValueError:
+        return int(default)
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = str(os.getenv(name, str(default)) or str(default)).strip()
+    try:
+        return float(raw)
+    except ValueError:
+        return float(default)
+
 
 def _to_importance_01(value: object, default: float = 0.45) -> float:
     try:
@@ -70,6 +94,39 @@ def _extract_kind_tags(text: str) -> list[str]:
     return out
 
 
+@dataclass
+class MemoryEntry:
+    """One item for `MemoryService.append_many`.
+
+    kind: "dialogue" (NPC short memory), "world" (world short memory) or
+    "system" (long-term fact/event/promise/debt, mirrored in world events).
+    """
+
+    text: str
+    kind: str = "dialogue"
+    role: str = "npc"
+    tags: list[str] = field(default_factory=list)
+    importance: float = 0.45
+    turn_id: str | None = None
+    event_kind: str = "system"
+    world_only: bool = False
+
+
+def dialogue_turn_entries(*, player_text: str, npc_reply: str, scene_title: str = "") -> list[MemoryEntry]:
+    shared_turn_id = str(uuid4())
+    context_tags = [clean_tag(scene_title)] if scene_title else []
+    entries: list[MemoryEntry] = []
+    if player_text:
+        entries.append(
+            MemoryEntry(text=player_text, role="player", tags=list(context_tags), importance=0.5, turn_id=shared_turn_id)
+        )
+    if npc_reply:
+        entries.append(
+            MemoryEntry(text=npc_reply, role="npc", tags=list(context_tags), importance=0.48, turn_id=shared_turn_id)
+        )
+    return entries
+
+
 @dataclass
 class PromptMemoryContext:
     short_lines: list[str]
@@ -97,14 +154,59 @@ class MemoryService:
         store: MemoryStore | None = None,
         embeddings: EmbeddingProvider | None = None,
         compaction_planner: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+        vacuum_ratio: float = 0.3,
+        vacuum_min_deleted: int = 16,
+        background_vacuum: bool = True,
+        index_storage: str | None = None,
+        max_loaded_indexes: int | None = None,
+        max_index_bytes: int | None = None,
+        write_delay_s: float | None = None,
+        max_cached_memories: int | None = None,
     ) -> None:
         self.store = store if isinstance(store, MemoryStore) else MemoryStore()
         self.embeddings = embeddings if isinstance(embeddings, EmbeddingProvider) else EmbeddingProvider()
         self.compaction_planner = compaction_planner
-        self._npc_indexes: dict[str, VectorIndex] = {}
+        self.vacuum_ratio = max(0.0, min(1.0, float(vacuum_ratio)))
+        self.vacuum_min_deleted = max(1, int(vacuum_min_deleted))
+        self.background_vacuum = bool(background_vacuum)
+        self.index_storage = str(index_storage).strip().casefold() if index_storage else storage_mode_from_env()
+        self.max_loaded_indexes = max(
+            1,
+            int(max_loaded_indexes) if max_loaded_indexes is not None else _env_int("MEMORY_MAX_LOADED_INDEXES", 256),
+        )
+        self.max_index_bytes = max(
+            1,
+            int(max_index_bytes) if max_index_bytes is not None else _env_int("MEMORY_MAX_INDEX_MB", 256) * 1024 * 1024,
+        )
+        self._npc_indexes: OrderedDict[str, VectorIndex] = OrderedDict()
+        self._index_stats = {"hits": 0, "misses": 0, "evictions": 0}
         self._world_index: VectorIndex | None = None
         self._npc_index_loaded: set[str] = set()
         self._world_index_loaded = False
+        self._vacuum_lock = threading.Lock()
+        self._vacuum_pending: set[str] = set()
+        # Parsed NpcMemory/WorldMemory objects shared by all callers, written back by a
+        # coalescing timer (`write_delay_s <= 0` keeps the historical write-through behaviour).
+        self.write_delay_s = max(
+            0.0,
+            float(write_delay_s) if write_delay_s is not None else _env_float("MEMORY_WRITE_DELAY_MS", 1500.0) / 1000.0,
+        )
+        self.max_cached_memories = max(
+            1,
+            int(max_cached_memories) if max_cached_memories is not None else _env_int("MEMORY_MAX_CACHED_NPCS", 512),
+        )
+        self._memory_lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        # Held while a shared memory object is edited; the flush snapshots under the same lock.
+        self._npc_mutation_locks = [threading.RLock() for _ in range(_MUTATION_STRIPES)]
+        self._world_mutation_lock = threading.RLock()
+        self._npc_memories: OrderedDict[str, NpcMemory] = OrderedDict()
+        self._evicted_dirty: dict[str, NpcMemory] = {}
+        self._world_memory: WorldMemory | None = None
+        self._dirty_npcs: set[str] = set()
+        self._world_dirty = False
+        self._flush_timer: threading.Timer | None = None
+        self._memory_stats = {"hits": 0, "misses": 0, "evictions": 0, "writes": 0, "coalesced": 0}
 
     def scoped_npc_id(self, *, profile_key: str | None, npc_id: str | None) -> str:
         scope = safe_id(profile_key or "default")
@@ -122,19 +224,178 @@ class MemoryService:
 
     def load_npc_memory(self, *, profile_key: str | None, npc_id: str | None) -> NpcMemory:
         scoped = self.scoped_npc_id(profile_key=profile_key, npc_id=npc_id)
-        mem = self.store.load_npc_memory(scoped)
-        if not mem.npc_id:
-            mem.npc_id = scoped
-        return mem
+        key = safe_id(scoped)
+        with self._memory_lock:
+            cached = self._npc_memories.get(key)
+            if isinstance(cached, NpcMemory):
+                self._npc_memories.move_to_end(key)
+                self._memory_stats["hits"] += 1
+                return cached
+            parked = self._evicted_dirty.pop(key, None)
+            if isinstance(parked, NpcMemory):
+                self._memory_stats["hits"] += 1
+                self._npc_memories[key] = parked
+                self._evict_npc_memories()
+                return parked
+            self._memory_stats["misses"] += 1
+            mem = self.store.load_npc_memory(scoped)
+            if not mem.npc_id:
+                mem.npc_id = scoped
+            self._npc_memories[key] = mem
+            self._evict_npc_memories()
+            return mem
+
+    def _npc_mutation_lock(self, key: str) -> threading.RLock:
+        return self._npc_mutation_locks[hash(safe_id(key)) % len(self._npc_mutation_locks)]
+
+    @contextmanager
+    def locked_npc_memory(self, *, profile_key: str | None, npc_id: str | None) -> Iterator[NpcMemory]:
+        """Shared NPC memory, held against concurrent edits and write-behind snapshots."""
+        scoped = self.scoped_npc_id(profile_key=profile_key, npc_id=npc_id)
+        with self._npc_mutation_lock(scoped):
+            yield self.load_npc_memory(profile_key=profile_key, npc_id=npc_id)
+
+    @contextmanager
+    def locked_world_memory(self) -> Iterator[WorldMemory]:
+        with self._world_mutation_lock:
+            yield self.load_world_memory()
 
     def save_npc_memory(self, memory: NpcMemory) -> None:
-        self.store.save_npc_memory(memory)
+        key = safe_id(memory.npc_id)
+        if memory.npc_id != key:
+            memory = memory.model_copy(update={"npc_id": key}, deep=True)
+        with self._memory_lock:
+            self._evicted_dirty.pop(key, None)
+            self._npc_memories[key] = memory
+            self._npc_memories.move_to_end(key)
+            if self.write_delay_s <= 0:
+                self._dirty_npcs.discard(key)
+                self._write_npc_memory(memory)
+                self._evict_npc_memories()
+                return
+            if key in self._dirty_npcs:
+                self._memory_stats["coalesced"] += 1
+            self._dirty_npcs.add(key)
+            self._evict_npc_memories()
+            self._schedule_flush()
 
     def load_world_memory(self) -> WorldMemory:
-        return self.store.load_world_memory()
+        with self._memory_lock:
+            if isinstance(self._world_memory, WorldMemory):
+                self._memory_stats["hits"] += 1
+                return self._world_memory
+            self._memory_stats["misses"] += 1
+            self._world_memory = self.store.load_world_memory()
+            return self._world_memory
 
     def save_world_memory(self, memory: WorldMemory) -> None:
+        with self._memory_lock:
+            self._world_memory = memory
+            if self.write_delay_s <= 0:
+                self._world_dirty = False
+                self._write_world_memory(memory)
+                return
+            if self._world_dirty:
+                self._memory_stats["coalesced"] += 1
+            self._world_dirty = True
+            self._schedule_flush()
+
+    def _write_npc_memory(self, memory: NpcMemory) -> None:
+        self.store.save_npc_memory(memory)
+        with self._memory_lock:
+            self._memory_stats["writes"] += 1
+
+    def _write_world_memory(self, memory: WorldMemory) -> None:
         self.store.save_world_memory(memory)
+        with self._memory_lock:
+            self._memory_stats["writes"] += 1
+
+    def _evict_npc_memories(self) -> None:
+        while len(self._npc_memories) > self.max_cached_memories:
+            key, memory = self._npc_memories.popitem(last=False)
+            if key in self._dirty_npcs:
+                # Parked until the next flush writes it; a reload before that adopts it back.
+                self._evicted_dirty[key] = memory
+            self._memory_stats["evictions"] += 1
+
+    def _schedule_flush(self) -> None:
+        if self._flush_timer is not None:
+            return
+        timer = threading.Timer(self.write_delay_s, self.flush)
+        timer.daemon = True
+        self._flush_timer = timer
+        timer.start()
+
+    def flush(self) -> int:
+        """Write every dirty memory now; returns the number of files written."""
+        with self._flush_lock:
+            with self._memory_lock:
+                timer = self._flush_timer
+                self._flush_timer = None
+                if timer is not None and timer is not threading.current_thread():
+                    timer.cancel()
+                pending: list[tuple[str, NpcMemory]] = []
+                for key in sorted(self._dirty_npcs):
+                    memory = self._npc_memories.get(key) or self._evicted_dirty.get(key)
+                    if isinstance(memory, NpcMemory):
+                        pending.append((key, memory))
+                self._dirty_npcs.clear()
+                world = self._world_memory if self._world_dirty else None
+                self._world_dirty = False
+
+            # Snapshot outside `_memory_lock`: an editor holds its mutation lock while saving.
+            npc_rows: list[tuple[str, NpcMemory]] = []
+            for key, memory in pending:
+                with self._npc_mutation_lock(key):
+                    npc_rows.append((key, memory.model_copy(deep=True)))
+            if isinstance(world, WorldMemory):
+                with self._world_mutation_lock:
+                    world = world.model_copy(deep=True)
+
+            written = 0
+            failed: dict[str, NpcMemory] = {}
+            for key, memory in npc_rows:
+                try:
+                    self._write_npc_memory(memory)
+                    written += 1
+                except Exception as exc:
+                    LOG.warning("memory write-behind: write failed for %s (%s)", key, exc)
+                    failed[key] = memory
+            world_failed = False
+            if isinstance(world, WorldMemory):
+                try:
+                    self._write_world_memory(world)
+                    written += 1
+                except Exception as exc:
+                    LOG.warning("memory write-behind: world write failed (%s)", exc)
+                    world_failed = True
+
+            with self._memory_lock:
+                # Parked memories stay readable until written, so a reload never sees stale files.
+                for key, _memory in pending:
+                    if key not in failed and key not in self._dirty_npcs:
+                        self._evicted_dirty.pop(key, None)
+                for key, memory in failed.items():
+                    if key not in self._npc_memories:
+                        self._evicted_dirty.setdefault(key, memory)
+                    self._dirty_npcs.add(key)
+                self._world_dirty = self._world_dirty or world_failed
+                if (failed or world_failed) and self.write_delay_s > 0:
+                    self._schedule_flush()
+            return written
+
+    def close(self) -> None:
+        self.flush()
+        self.embeddings.close()
+
+    def memory_cache_stats(self) -> dict[str, int]:
+        with self._memory_lock:
+            return {
+                **self._memory_stats,
+                "resident": len(self._npc_memories),
+                "dirty": len(self._dirty_npcs) + (1 if self._world_dirty else 0),
+                "max_resident": self.max_cached_memories,
+            }
 
     def _memory_turn(self, *, role: str, text: str, tags: list[str] | None, importance: float, turn_id: str | None = None) -> ShortTurn:
         clean_tags = [clean_tag(tag) for tag in (tags or []) if clean_tag(tag)]
@@ -167,25 +428,25 @@ class MemoryService:
         clean_text_value = clean_text(text, max_len=460)
         if not clean_text_value:
             return False
-        memory = self.load_npc_memory(profile_key=profile_key, npc_id=npc_id)
-        memory.short.append(
-            self._memory_turn(
-                role=role,
-                text=clean_text_value,
-                tags=tags,
-                importance=_to_importance_01(importance, default=0.45),
-                turn_id=turn_id,
+        with self.locked_npc_memory(profile_key=profile_key, npc_id=npc_id) as memory:
+            memory.short.append(
+                self._memory_turn(
+                    role=role,
+                    text=clean_text_value,
+                    tags=tags,
+                    importance=_to_importance_01(importance, default=0.45),
+                    turn_id=turn_id,
+                )
             )
-        )
-        compacted = compact_npc_memory(
-            memory,
-            ai_enabled=callable(self.compaction_planner),
-            planner=self.compaction_planner,
-        )
-        log_compaction_result(f"npc={memory.npc_id}", compacted)
-        self.save_npc_memory(memory)
+            compacted = compact_npc_memory(
+                memory,
+                ai_enabled=callable(self.compaction_planner),
+                planner=self.compaction_planner,
+            )
+            log_compaction_result(f"npc={memory.npc_id}", compacted)
+            self.save_npc_memory(memory)
         if compacted.changed:
-            self.rebuild_npc_index(profile_key=profile_key, npc_id=npc_id)
+            self.update_npc_index(profile_key=profile_key, npc_id=npc_id, memory=memory)
         return True
 
     def append_world_short(
@@ -200,27 +461,215 @@ class MemoryService:
         clean_text_value = clean_text(text, max_len=460)
         if not clean_text_value:
             return False
-        memory = self.load_world_memory()
-        memory.short.append(
-            self._memory_turn(
-                role=role,
-                text=clean_text_value,
-                tags=tags,
-                importance=_to_importance_01(importance, default=0.4),
-                turn_id=turn_id,
+        with self.locked_world_memory() as memory:
+            memory.short.append(
+                self._memory_turn(
+                    role=role,
+                    text=clean_text_value,
+                    tags=tags,
+                    importance=_to_importance_01(importance, default=0.4),
+                    turn_id=turn_id,
+                )
             )
-        )
-        compacted = compact_world_memory(
-            memory,
-            ai_enabled=callable(self.compaction_planner),
-            planner=self.compaction_planner,
-        )
-        log_compaction_result("world", compacted)
-        self.save_world_memory(memory)
+            compacted = compact_world_memory(
+                memory,
+                ai_enabled=callable(self.compaction_planner),
+                planner=self.compaction_planner,
+            )
+            log_compaction_result("world", compacted)
+            self.save_world_memory(memory)
         if compacted.changed:
-            self.rebuild_world_index()
+            self.update_world_index(memory=memory)
         return True
 
+    def _add_long_entry(self, memory: NpcMemory, *, text: str, kind: str, tags: list[str], importance: float) -> bool:
+        added = False
+        if kind == "promise" or "promise" in tags:
+            entry = MemoryPromise(
+                text=text,
+                status="open",
+                tags=tags,
+                importance=_to_importance_01(importance, 0.7),
+                text_hash=text_hash(text),
+            )
+            if not any(str(row.text_hash or "") == entry.text_hash for row in memory.long.promises):
+                memory.long.promises.append(entry)
+                added = True
+        elif kind == "debt" or "debt" in tags:
+            entry = MemoryDebt(
+                text=text,
+                status="open",
+                tags=tags,
+                importance=_to_importance_01(importance, 0.7),
+                text_hash=text_hash(text),
+            )
+            if not any(str(row.text_hash or "") == entry.text_hash for row in memory.long.debts):
+                memory.long.debts.append(entry)
+                added = True
+        elif kind == "event" or "quest" in tags or "combat" in tags:
+            impact = "med"
+            if any(word in text.casefold() for word in ("mort", "defaite", "rupture", "boss")):
+                impact = "high"
+            entry = MemoryEvent(
+                text=text,
+                impact=impact,
+                tags=tags,
+                importance=_to_importance_01(importance, 0.62),
+                text_hash=text_hash(text),
+            )
+            if not any(str(row.text_hash or "") == entry.text_hash for row in memory.long.events):
+                memory.long.events.append(entry)
+                added = True
+        else:
+            entry = MemoryFact(
+                text=text,
+                confidence=0.72,
+                tags=tags,
+                importance=_to_importance_01(importance, 0.55),
+                text_hash=text_hash(text),
+            )
+            if not any(str(row.text_hash or "") == entry.text_hash for row in memory.long.facts):
+                memory.long.facts.append(entry)
+                added = True
+        if added:
+            memory.long.summary.ts = utc_now_iso()
+            memory.long.summary.text = clean_text(text, max_len=900)
+            memory.long.facts = memory.long.facts[-500:]
+            memory.long.events = memory.long.events[-500:]
+            memory.long.promises = memory.long.promises[-100:]
+            memory.long.debts = memory.long.debts[-100:]
+        return added
+
+    def _add_world_event(self, world: WorldMemory, *, text: str, tags: list[str], importance: float) -> None:
+        world.long.events.append(
+            MemoryEvent(
+                text=text,
+                impact="med",
+                tags=tags or ["system"],
+                importance=_to_importance_01(importance, 0.55),
+                text_hash=text_hash(text),
+            )
+        )
+        world.long.events = world.long.events[-500:]
+        world.long.summary.ts = utc_now_iso()
+        world.long.summary.text = clean_text(text, max_len=900)
+
+    def append_many(
+        self,
+        *,
+        profile_key: str | None,
+        npc_id: str | None,
+        entries: list[MemoryEntry],
+    ) -> dict[str, int]:
+        """Apply a batch of entries with one load, one compaction and one save per memory.
+
+        The NPC index is updated at most once, and only if its records may have changed.
+        """
+        stats = {"short": 0, "long": 0, "world_short": 0, "world_events": 0}
+        npc_memory: NpcMemory | None = None
+        world_memory: WorldMemory | None = None
+        npc_changed = False
+        world_changed = False
+        npc_reindex = False
+        world_reindex = False
+        kinds = [str(entry.kind or "dialogue").strip().casefold() for entry in entries]
+        touches_npc = any(kind != "world" and not (kind == "system" and entry.world_only) for kind, entry in zip(kinds, entries))
+        touches_world = any(kind in {"system", "world"} for kind in kinds)
+
+        with ExitStack() as locks:
+            # Always NPC before world, so concurrent batches cannot deadlock.
+            if touches_npc:
+                locks.enter_context(self._npc_mutation_lock(self.scoped_npc_id(profile_key=profile_key, npc_id=npc_id)))
+            if touches_world:
+                locks.enter_context(self._world_mutation_lock)
+
+            for entry in entries:
+                kind = str(entry.kind or "dialogue").strip().casefold()
+                if kind == "system":
+                    clean = clean_text(entry.text, max_len=420)
+                    if not clean:
+                        continue
+                    event_kind = str(entry.event_kind or "system")
+                    tags = [clean_tag(event_kind)] + [clean_tag(tag) for tag in _extract_kind_tags(clean)]
+                    tags = [tag for tag in tags if tag]
+                    if not entry.world_only:
+                        if npc_memory is None:
+                            npc_memory = self.load_npc_memory(profile_key=profile_key, npc_id=npc_id)
+                        if self._add_long_entry(npc_memory, text=clean, kind=event_kind, tags=tags, importance=entry.importance):
+                            npc_changed = True
+                            stats["long"] += 1
+                    if world_memory is None:
+                        world_memory = self.load_world_memory()
+                    self._add_world_event(world_memory, text=clean, tags=tags, importance=entry.importance)
+                    world_changed = True
+                    stats["world_events"] += 1
+                    continue
+
+                clean = clean_text(entry.text, max_len=460)
+                if not clean:
+                    continue
+                if kind == "world":
+                    if world_memory is None:
+                        world_memory = self.load_world_memory()
+                    world_memory.short.append(
+                        self._memory_turn(
+                            role=entry.role,
+                            text=clean,
+                            tags=entry.tags,
+                            importance=_to_importance_01(entry.importance, default=0.4),
+                            turn_id=entry.turn_id,
+                        )
+                    )
+                    world_changed = True
+                    stats["world_short"] += 1
+                    continue
+
+                if npc_memory is None:
+                    npc_memory = self.load_npc_memory(profile_key=profile_key, npc_id=npc_id)
+                npc_memory.short.append(
+                    self._memory_turn(
+                        role=entry.role,
+                        text=clean,
+                        tags=entry.tags,
+                        importance=_to_importance_01(entry.importance, default=0.45),
+                        turn_id=entry.turn_id,
+                    )
+                )
+                npc_changed = True
+                stats["short"] += 1
+
+            if npc_memory is not None and npc_changed:
+                reindex = stats["long"] > 0
+                if stats["short"] > 0:
+                    compacted = compact_npc_memory(
+                        npc_memory,
+                        ai_enabled=callable(self.compaction_planner),
+                        planner=self.compaction_planner,
+                    )
+                    log_compaction_result(f"npc={npc_memory.npc_id}", compacted)
+                    reindex = reindex or compacted.changed
+                self.save_npc_memory(npc_memory)
+                npc_reindex = reindex
+
+            if world_memory is not None and world_changed:
+                reindex = False
+                if stats["world_short"] > 0:
+                    compacted = compact_world_memory(
+                        world_memory,
+                        ai_enabled=callable(self.compaction_planner),
+                        planner=self.compaction_planner,
+                    )
+                    log_compaction_result("world", compacted)
+                    reindex = compacted.changed
+                self.save_world_memory(world_memory)
+                world_reindex = reindex
+
+        if npc_reindex and npc_memory is not None:
+            self.update_npc_index(profile_key=profile_key, npc_id=npc_id, memory=npc_memory)
+        if world_reindex and world_memory is not None:
+            self.update_world_index(memory=world_memory)
+        return stats
+
     def remember_dialogue_turn(
         self,
         *,
@@ -230,28 +679,11 @@ class MemoryService:
         npc_reply: str,
         scene_title: str = "",
     ) -> None:
-        shared_turn_id = str(uuid4())
-        context_tags = [clean_tag(scene_title)] if scene_title else []
-        if player_text:
-            self.append_short(
-                profile_key=profile_key,
-                npc_id=npc_id,
-                role="player",
-                text=player_text,
-                tags=context_tags,
-                importance=0.5,
-                turn_id=shared_turn_id,
-            )
-        if npc_reply:
-            self.append_short(
-                profile_key=profile_key,
-                npc_id=npc_id,
-                role="npc",
-                text=npc_reply,
-                tags=context_tags,
-                importance=0.48,
-                turn_id=shared_turn_id,
-            )
+        self.append_many(
+            profile_key=profile_key,
+            npc_id=npc_id,
+            entries=dialogue_turn_entries(player_text=player_text, npc_reply=npc_reply, scene_title=scene_title),
+        )
 
     def remember_system_event(
         self,
@@ -263,84 +695,11 @@ class MemoryService:
         importance: float = 0.65,
         world_only: bool = False,
     ) -> None:
-        clean = clean_text(fact_text, max_len=420)
-        if not clean:
-            return
-        tags = [clean_tag(kind)] + [clean_tag(tag) for tag in _extract_kind_tags(clean)]
-        tags = [tag for tag in tags if tag]
-        if not world_only:
-            memory = self.load_npc_memory(profile_key=profile_key, npc_id=npc_id)
-            added = False
-            if kind == "promise" or "promise" in tags:
-                entry = MemoryPromise(
-                    text=clean,
-                    status="open",
-                    tags=tags,
-                    importance=_to_importance_01(importance, 0.7),
-                    text_hash=text_hash(clean),
-                )
-                if not any(str(row.text_hash or "") == entry.text_hash for row in memory.long.promises):
-                    memory.long.promises.append(entry)
-                    added = True
-            elif kind == "debt" or "debt" in tags:
-                entry = MemoryDebt(
-                    text=clean,
-                    status="open",
-                    tags=tags,
-                    importance=_to_importance_01(importance, 0.7),
-                    text_hash=text_hash(clean),
-                )
-                if not any(str(row.text_hash or "") == entry.text_hash for row in memory.long.debts):
-                    memory.long.debts.append(entry)
-                    added = True
-            elif kind == "event" or "quest" in tags or "combat" in tags:
-                impact = "med"
-                if any(word in clean.casefold() for word in ("mort", "defaite", "rupture", "boss")):
-                    impact = "high"
-                entry = MemoryEvent(
-                    text=clean,
-                    impact=impact,
-                    tags=tags,
-                    importance=_to_importance_01(importance, 0.62),
-                    text_hash=text_hash(clean),
-                )
-                if not any(str(row.text_hash or "") == entry.text_hash for row in memory.long.events):
-                    memory.long.events.append(entry)
-                    added = True
-            else:
-                entry = MemoryFact(
-                    text=clean,
-                    confidence=0.72,
-                    tags=tags,
-                    importance=_to_importance_01(importance, 0.55),
-                    text_hash=text_hash(clean),
-                )
-                if not any(str(row.text_hash or "") == entry.text_hash for row in memory.long.facts):
-                    memory.long.facts.append(entry)
-                    added = True
-            if added:
-                memory.long.summary.ts = utc_now_iso()
-                memory.long.summary.text = clean_text(clean, max_len=900)
-                memory.long.facts = memory.long.facts[-500:]
-                memory.long.events = memory.long.events[-500:]
-                memory.long.promises = memory.long.promises[-100:]
-                memory.long.debts = memory.long.debts[-100:]
-                self.save_npc_memory(memory)
-
-        world = self.load_world_memory()
-        world.long.events.append(
-            MemoryEvent(
-                text=clean,
-                impact="med",
-                tags=tags or ["system"],
-                importance=_to_importance_01(importance, 0.55),
-                text_hash=text_hash(clean),
-            )
+        self.append_many(
+            profile_key=profile_key,
+            npc_id=npc_id,
+            entries=[MemoryEntry(kind="system", text=fact_text, event_kind=kind, importance=importance, world_only=world_only)],
         )
-        world.long.events = world.long.events[-500:]
-        world.long.summary.ts = utc_now_iso()
-        world.long.summary.text = clean_text(clean, max_len=900)
-        self.save_world_memory(world)
 
     def _records_from_npc_memory(self, memory: NpcMemory) -> list[dict[str, Any]]:
         base_id = self._base_npc_id(memory.npc_id)
@@ -483,12 +842,16 @@ class MemoryService:
             )
         return rows
 
+    def _new_index(self) -> VectorIndex:
+        return VectorIndex(prefer_faiss=True, storage=self.index_storage)
+
     def _load_npc_index(self, scoped_npc_id: str) -> VectorIndex:
         key = safe_id(scoped_npc_id)
         index = self._npc_indexes.get(key)
         if isinstance(index, VectorIndex):
+            self._npc_indexes.move_to_end(key)
             return index
-        index = VectorIndex(prefer_faiss=True)
+        index = self._new_index()
         self._npc_indexes[key] = index
         return index
 
@@ -496,16 +859,69 @@ class MemoryService:
         key = safe_id(scoped_npc_id)
         index = self._load_npc_index(key)
         if key in self._npc_index_loaded:
+            self._index_stats["hits"] += 1
             return index
+        self._index_stats["misses"] += 1
         index_path = self.store.npc_index_path(key)
         map_path = self.store.npc_mapping_path(key)
         index.load(index_path=index_path, mapping_path=map_path)
         self._npc_index_loaded.add(key)
+        self._evict_npc_indexes(keep=key)
         return index
 
+    def _evict_npc_index(self, key: str) -> None:
+        index = self._npc_indexes.pop(key, None)
+        self._npc_index_loaded.discard(key)
+        if not isinstance(index, VectorIndex):
+            return
+        if index.pending_count > 0:
+            try:
+                index.persist_incremental(
+                    index_path=self.store.npc_index_path(key),
+                    mapping_path=self.store.npc_mapping_path(key),
+                )
+            except Exception as exc:
+                LOG.warning("memory index eviction: persist failed for %s (%s)", key, exc)
+        self._index_stats["evictions"] += 1
+
+    def _evict_npc_indexes(self, *, keep: str | None = None) -> int:
+        evicted = 0
+        sizes = {key: index.estimated_bytes() for key, index in self._npc_indexes.items()}
+        total = sum(sizes.values())
+        for key in list(self._npc_indexes.keys()):
+            if len(self._npc_indexes) <= self.max_loaded_indexes and total <= self.max_index_bytes:
+                break
+            if key == keep:
+                continue
+            with self._vacuum_lock:
+                busy = key in self._vacuum_pending
+            if busy:
+                continue
+            self._evict_npc_index(key)
+            total -= sizes.get(key, 0)
+            evicted += 1
+        return evicted
+
+    def embedding_cache_stats(self) -> dict[str, int | float]:
+        return self.embeddings.cache_stats()
+
+    def embedding_backend_stats(self) -> dict[str, Any]:
+        return self.embeddings.backend_stats()
+
+    def index_cache_stats(self) -> dict[str, int]:
+        lookups = self._index_stats["hits"] + self._index_stats["misses"]
+        return {
+            **self._index_stats,
+            "hit_ratio_pct": int(round(100.0 * self._index_stats["hits"] / lookups)) if lookups else 0,
+            "resident": len(self._npc_indexes),
+            "resident_bytes": sum(index.estimated_bytes() for index in self._npc_indexes.values()),
+            "max_resident": self.max_loaded_indexes,
+            "max_bytes": self.max_index_bytes,
+        }
+
     def _ensure_world_index_loaded(self) -> VectorIndex:
         if not isinstance(self._world_index, VectorIndex):
-            self._world_index = VectorIndex(prefer_faiss=True)
+            self._world_index = self._new_index()
         if self._world_index_loaded:
             return self._world_index
         self._world_index.load(index_path=self.store.world_index_path, mapping_path=self.store.world_mapping_path)
@@ -517,20 +933,91 @@ class MemoryService:
         memory = self.load_npc_memory(profile_key=profile_key, npc_id=npc_id)
         records = self._records_from_npc_memory(memory)
         index = self._load_npc_index(scoped)
-        added = index.rebuild_from_records(records=records, embed_texts=self.embeddings.embed_texts)
+        added = index.rebuild_from_records(records=records, embed_texts=self.embeddings.embed_arrays)
         index.persist(index_path=self.store.npc_index_path(scoped), mapping_path=self.store.npc_mapping_path(scoped))
         self._npc_index_loaded.add(safe_id(scoped))
+        self._evict_npc_indexes(keep=safe_id(scoped))
         return added
 
     def rebuild_world_index(self) -> int:
         memory = self.load_world_memory()
         records = self._records_from_world_memory(memory)
         index = self._ensure_world_index_loaded()
-        added = index.rebuild_from_records(records=records, embed_texts=self.embeddings.embed_texts)
+        added = index.rebuild_from_records(records=records, embed_texts=self.embeddings.embed_arrays)
         index.persist(index_path=self.store.world_index_path, mapping_path=self.store.world_mapping_path)
         self._world_index_loaded = True
         return added
 
+    def update_npc_index(
+        self,
+        *,
+        profile_key: str | None,
+        npc_id: str | None,
+        memory: NpcMemory | None = None,
+    ) -> dict[str, int]:
+        scoped = self.scoped_npc_id(profile_key=profile_key, npc_id=npc_id)
+        if memory is None:
+            memory = self.load_npc_memory(profile_key=profile_key, npc_id=npc_id)
+        key = safe_id(scoped)
+        index = self._ensure_npc_index_loaded(key)
+        stats = index.sync_records(records=self._records_from_npc_memory(memory), embed_texts=self.embeddings.embed_arrays)
+        index_path = self.store.npc_index_path(key)
+        mapping_path = self.store.npc_mapping_path(key)
+        index.persist_incremental(index_path=index_path, mapping_path=mapping_path)
+        self._maybe_schedule_vacuum(key, index, index_path=index_path, mapping_path=mapping_path)
+        return stats
+
+    def update_world_index(self, *, memory: WorldMemory | None = None) -> dict[str, int]:
+        if memory is None:
+            memory = self.load_world_memory()
+        index = self._ensure_world_index_loaded()
+        stats = index.sync_records(records=self._records_from_world_memory(memory), embed_texts=self.embeddings.embed_arrays)
+        index.persist_incremental(index_path=self.store.world_index_path, mapping_path=self.store.world_mapping_path)
+        self._maybe_schedule_vacuum(
+            "__world__",
+            index,
+            index_path=self.store.world_index_path,
+            mapping_path=self.store.world_mapping_path,
+        )
+        return stats
+
+    def _maybe_schedule_vacuum(self, key: str, index: VectorIndex, *, index_path: Path, mapping_path: Path) -> None:
+        if index.deleted_count < self.vacuum_min_deleted or index.tombstone_ratio < self.vacuum_ratio:
+            return
+        with self._vacuum_lock:
+            if key in self._vacuum_pending:
+                return
+            self._vacuum_pending.add(key)
+
+        def _run() -> None:
+            try:
+                removed = index.vacuum_to_disk(index_path=index_path, mapping_path=mapping_path)
+                LOG.info("memory index vacuum %s: %s rows dropped", key, removed)
+            except Exception as exc:
+                LOG.warning("memory index vacuum failed for %s (%s)", key, exc)
+            finally:
+                with self._vacuum_lock:
+                    self._vacuum_pending.discard(key)
+
+        if self.background_vacuum:
+            threading.Thread(target=_run, name=f"memory-vacuum-{key}", daemon=True).start()
+        else:
+            _run()
+
+    def vacuum_indexes(self) -> int:
+        removed = 0
+        for key, index in list(self._npc_indexes.items()):
+            removed += index.vacuum_to_disk(
+                index_path=self.store.npc_index_path(key),
+                mapping_path=self.store.npc_mapping_path(key),
+            )
+        if isinstance(self._world_index, VectorIndex):
+            removed += self._world_index.vacuum_to_disk(
+                index_path=self.store.world_index_path,
+                mapping_path=self.store.world_mapping_path,
+            )
+        return removed
+
     def _vector_hits(
         self,
         *,
@@ -551,9 +1038,13 @@ class MemoryService:
         if clean_mode in {"npc", "both"}:
             scoped = self.scoped_npc_id(profile_key=profile_key, npc_id=npc_id)
             index = self._ensure_npc_index_loaded(scoped)
+            if index.needs_rebuild:
+                self.update_npc_index(profile_key=profile_key, npc_id=npc_id)
             hits.extend(index.search(query_vec, top_k=max(1, top_k)))
         if clean_mode in {"world", "both"}:
             world_index = self._ensure_world_index_loaded()
+            if world_index.needs_rebuild:
+                self.update_world_index()
             hits.extend(world_index.search(query_vec, top_k=max(1, top_k)))
         return hits
 
@@ -577,12 +1068,12 @@ class MemoryService:
 
         if clean_mode in {"npc", "both"} and npc_memory and not npc_memory.chunks:
             try:
-                self.rebuild_npc_index(profile_key=profile_key, npc_id=npc_id)
+                self.update_npc_index(profile_key=profile_key, npc_id=npc_id, memory=npc_memory)
             except Exception:
                 pass
         if clean_mode in {"world", "both"} and world_memory and not world_memory.chunks:
             try:
-                self.rebuild_world_index()
+                self.update_world_index(memory=world_memory)
             except Exception:
                 pass
 
@@ -625,17 +1116,26 @@ class MemoryService:
         return [row for row in all_ids if str(row).startswith(prefix)]
 
     def purge_short(self, *, profile_key: str | None, npc_id: str | None) -> bool:
-        memory = self.load_npc_memory(profile_key=profile_key, npc_id=npc_id)
-        if not memory.short:
-            return False
-        memory.short = []
-        self.save_npc_memory(memory)
+        with self.locked_npc_memory(profile_key=profile_key, npc_id=npc_id) as memory:
+            if not memory.short:
+                return False
+            memory.short = []
+            self.save_npc_memory(memory)
         return True
 
 
 _MEMORY_SERVICE: MemoryService | None = None
 
 
+def close_memory_service() -> None:
+    """Flush and close the shared service, if one was ever created."""
+    if isinstance(_MEMORY_SERVICE, MemoryService):
+        _MEMORY_SERVICE.close()
+
+
+atexit.register(close_memory_service)
+
+
 def get_memory_service() -> MemoryService:
     global _MEMORY_SERVICE
     if isinstance(_MEMORY_SERVICE, MemoryService):
@@ -646,4 +1146,6 @@ def get_memory_service() -> MemoryService:
 
 def set_memory_service(service: MemoryService | None) -> None:
     global _MEMORY_SERVICE
+    if isinstance(_MEMORY_SERVICE, MemoryService) and _MEMORY_SERVICE is not service:
+        _MEMORY_SERVICE.close()
     _MEMORY_SERVICE = service
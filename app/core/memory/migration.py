@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any
 
+from app.core.save.encoding import decode_payload
+from app.core.save.journal import journal_path_for, replay_journal
+
 from .memory_compactor import compact_npc_memory, compact_world_memory
 from .memory_models import (
     MemoryDebt,
@@ -32,25 +34,29 @@ def _iter_save_state_payloads(saves_root: Path) -> list[tuple[str, Path, dict[st
                 continue
             profile_key = safe_id(profile_dir.name, fallback="default")
             for slot_path in sorted(profile_dir.glob("slot_*.json")):
-                try:
-                    payload = json.loads(slot_path.read_text(encoding="utf-8"))
-                except Exception:
-                    continue
-                state = payload.get("state") if isinstance(payload, dict) else None
+                state = _read_slot_state(slot_path)
                 if isinstance(state, dict):
                     out.append((profile_key, slot_path, state))
 
     for slot_path in sorted(saves_root.glob("slot_*.json")):
-        try:
-            payload = json.loads(slot_path.read_text(encoding="utf-8"))
-        except Exception:
-            continue
-        state = payload.get("state") if isinstance(payload, dict) else None
+        state = _read_slot_state(slot_path)
         if isinstance(state, dict):
             out.append(("default", slot_path, state))
     return out
 
 
+def _read_slot_state(slot_path: Path) -> dict[str, Any] | None:
+    try:
+        payload = decode_payload(slot_path.read_bytes())
+    except Exception:
+        return None
+    state = payload.get("state") if isinstance(payload, dict) else None
+    if not isinstance(state, dict):
+        return None
+    replay_journal(journal_path_for(slot_path), state, checkpoint_id=str(payload.get("checkpoint_id") or ""))
+    return state
+
+
 def _entry_ts(raw: dict[str, Any]) -> str:
     ts = str(raw.get("at") or raw.get("ts") or "").strip()
     return ts or utc_now_iso()
@@ -248,5 +254,6 @@ def bootstrap_from_existing_history(
         stats["indexes_rebuilt"] += 1
     except Exception:
         pass
+    service.flush()
     return stats
 
@@ -2,14 +2,28 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 from pathlib import Path
+import threading
 from typing import Any
 
 import numpy as np
 
+from .memory_models import text_hash
+
 
 LOG = logging.getLogger(__name__)
 
+STORAGE_MODES = {"memory", "mmap"}
+_NPY_MAGIC = b"\x93NUMPY"
+# fourcc des index FAISS plats (IndexFlatIP, IndexFlatL2, ancien IndexFlat).
+_FAISS_FLAT_FOURCCS = {b"IxFI", b"IxF2", b"IxFl"}
+
+
+def storage_mode_from_env(default: str = "memory") -> str:
+    raw = str(os.getenv("MEMORY_INDEX_STORAGE", default) or default).strip().casefold()
+    return raw if raw in STORAGE_MODES else default
+
 
 class VectorIndex:
     def __init__(
@@ -17,14 +31,29 @@ class VectorIndex:
         *,
         dim: int = 0,
         prefer_faiss: bool = True,
+        storage: str = "memory",
     ) -> None:
         self.dim = max(0, int(dim))
-        self.prefer_faiss = bool(prefer_faiss)
+        self.storage = str(storage or "memory").strip().casefold()
+        if self.storage not in STORAGE_MODES:
+            self.storage = "memory"
+        # FAISS flat indexes always live in RAM: the mmap mode relies on the numpy engine.
+        self.prefer_faiss = bool(prefer_faiss) and self.storage != "mmap"
         self._faiss = None
         self._index = None
+        # numpy engine: `_base` holds the rows read from disk (a read-only memmap in mmap mode),
+        # `_vectors` is the growable in-RAM tail holding `_rows` rows appended after it.
+        self._base = np.zeros((0, self.dim), dtype=np.float32) if self.dim > 0 else np.zeros((0, 0), dtype=np.float32)
         self._vectors = np.zeros((0, self.dim), dtype=np.float32) if self.dim > 0 else np.zeros((0, 0), dtype=np.float32)
+        self._rows = 0
         self._mapping: list[dict[str, Any]] = []
         self._engine = "numpy"
+        self._lock = threading.RLock()
+        self._deleted = 0
+        self._persisted_rows = 0
+        self._pending_lines: list[dict[str, Any]] = []
+        self._pending_vectors: list[np.ndarray] = []
+        self._needs_rebuild = False
         self._init_engine()
 
     @property
@@ -35,6 +64,48 @@ class VectorIndex:
     def mapping(self) -> list[dict[str, Any]]:
         return list(self._mapping)
 
+    @property
+    def live_count(self) -> int:
+        return len(self._mapping) - self._deleted
+
+    @property
+    def deleted_count(self) -> int:
+        return self._deleted
+
+    @property
+    def tombstone_ratio(self) -> float:
+        if not self._mapping:
+            return 0.0
+        return self._deleted / float(len(self._mapping))
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending_lines)
+
+    @property
+    def is_mmapped(self) -> bool:
+        return isinstance(self._base, np.memmap)
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """True when `load` dropped unreadable or misaligned files: re-sync from the records."""
+        return self._needs_rebuild
+
+    def estimated_bytes(self) -> int:
+        """Rough resident size: vector storage (mapped pages excluded) plus mapping rows."""
+        total = int(self._vectors.nbytes)
+        if not self.is_mmapped:
+            total += int(self._base.nbytes)
+        if self._engine == "faiss" and self._index is not None:
+            total += int(self._index.ntotal) * max(1, self.dim) * 4
+        for row in self._mapping:
+            total += 160 + len(str(row.get("text") or ""))
+        return total
+
+    @staticmethod
+    def append_path(index_path: Path) -> Path:
+        return index_path.with_name(index_path.name + ".append")
+
     def _init_engine(self) -> None:
         if not self.prefer_faiss:
             self._engine = "numpy"
@@ -56,6 +127,7 @@ class VectorIndex:
             return
         self.dim = max(1, int(dim))
         self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self._rows = 0
         if self._engine == "faiss" and self._faiss is not None:
             self._index = self._faiss.IndexFlatIP(self.dim)
 
@@ -68,11 +140,62 @@ class VectorIndex:
             arr = arr / norm
         return arr
 
+    def _normalize_rows(self, matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms <= 0] = 1.0
+        return (matrix / norms).astype(np.float32, copy=False)
+
+    def _matrix(self) -> np.ndarray:
+        return self._vectors[: self._rows]
+
+    def _stored_matrix(self) -> np.ndarray:
+        if int(self._base.shape[0]) <= 0:
+            return self._matrix()
+        if self._rows <= 0:
+            return np.asarray(self._base)
+        return np.concatenate([np.asarray(self._base), self._matrix()])
+
+    def _stored_rows(self) -> int:
+        return int(self._base.shape[0]) + self._rows
+
+    def _set_matrix(self, matrix: np.ndarray) -> None:
+        self._vectors = np.ascontiguousarray(matrix, dtype=np.float32)
+        self._rows = int(self._vectors.shape[0]) if self._vectors.ndim == 2 else 0
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._rows + max(0, int(extra))
+        capacity = int(self._vectors.shape[0]) if self._vectors.ndim == 2 else 0
+        if needed <= capacity and self._vectors.shape[1:] == (self.dim,):
+            return
+        new_capacity = max(16, capacity)
+        while new_capacity < needed:
+            new_capacity *= 2
+        buffer = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        if self._rows > 0:
+            buffer[: self._rows] = self._vectors[: self._rows]
+        self._vectors = buffer
+
+    def _append_matrix(self, block: np.ndarray) -> None:
+        if self._engine == "faiss" and self._index is not None:
+            self._index.add(block)
+            return
+        self._reserve(int(block.shape[0]))
+        self._vectors[self._rows : self._rows + int(block.shape[0])] = block
+        self._rows += int(block.shape[0])
+
     def clear(self) -> None:
         self._mapping = []
+        self._deleted = 0
+        self._persisted_rows = 0
+        self._pending_lines = []
+        self._pending_vectors = []
+        self._needs_rebuild = False
+        self._rows = 0
         if self.dim <= 0:
+            self._base = np.zeros((0, 0), dtype=np.float32)
             self._vectors = np.zeros((0, 0), dtype=np.float32)
         else:
+            self._base = np.zeros((0, self.dim), dtype=np.float32)
             self._vectors = np.zeros((0, self.dim), dtype=np.float32)
         if self._engine == "faiss" and self._faiss is not None and self.dim > 0:
             self._index = self._faiss.IndexFlatIP(self.dim)
@@ -85,27 +208,86 @@ class VectorIndex:
         arr = self._normalize(vector)
         if arr.size <= 0:
             return None
-        self._ensure_dim(int(arr.shape[0]))
-        if int(arr.shape[0]) != self.dim:
-            return None
+        ids = self.add_many([record_id], [text], [metadata], arr.reshape(1, -1))
+        return ids[0] if ids else None
 
-        vector_id = len(self._mapping)
-        row = {
-            "vector_id": vector_id,
-            "record_id": str(record_id or "").strip(),
-            "text": str(text or "").strip(),
-            "meta": metadata if isinstance(metadata, dict) else {},
-        }
-        self._mapping.append(row)
+    def add_many(
+        self,
+        record_ids: list[str],
+        texts: list[str],
+        metas: list[dict[str, Any] | None],
+        matrix: np.ndarray,
+    ) -> list[int]:
+        """Append a block of vectors (one row per record) with a single buffer write."""
+        block = np.asarray(matrix, dtype=np.float32)
+        if block.ndim == 1:
+            block = block.reshape(1, -1)
+        count = min(len(record_ids), len(texts), len(metas), int(block.shape[0]))
+        if count <= 0 or block.shape[1] <= 0:
+            return []
+        block = self._normalize_rows(block[:count])
 
+        with self._lock:
+            self._ensure_dim(int(block.shape[1]))
+            if int(block.shape[1]) != self.dim:
+                return []
+            first_id = len(self._mapping)
+            for offset in range(count):
+                clean_text_value = str(texts[offset] or "").strip()
+                meta = metas[offset]
+                row = {
+                    "vector_id": first_id + offset,
+                    "record_id": str(record_ids[offset] or "").strip(),
+                    "text": clean_text_value,
+                    "text_hash": text_hash(clean_text_value),
+                    "meta": meta if isinstance(meta, dict) else {},
+                }
+                self._mapping.append(row)
+                self._pending_lines.append(row)
+            self._pending_vectors.append(block)
+            self._append_matrix(block)
+            return list(range(first_id, first_id + count))
+
+    def remove(self, vector_id: int) -> bool:
+        with self._lock:
+            if vector_id < 0 or vector_id >= len(self._mapping):
+                return False
+            row = self._mapping[vector_id]
+            if row.get("deleted"):
+                return False
+            row["deleted"] = True
+            self._deleted += 1
+            self._pending_lines.append({"vector_id": int(vector_id), "deleted": True})
+            return True
+
+    def _all_vectors(self) -> np.ndarray:
         if self._engine == "faiss" and self._index is not None:
-            self._index.add(arr.reshape(1, -1))
-        else:
-            if self._vectors.size == 0:
-                self._vectors = arr.reshape(1, -1).astype(np.float32)
+            total = int(self._index.ntotal)
+            if total <= 0:
+                return np.zeros((0, self.dim), dtype=np.float32)
+            return np.asarray(self._index.reconstruct_n(0, total), dtype=np.float32)
+        return self._stored_matrix()
+
+    def vacuum(self) -> int:
+        """Drop tombstoned rows and renumber vector ids; returns the number of rows removed."""
+        with self._lock:
+            if self._deleted <= 0:
+                return 0
+            removed = self._deleted
+            vectors = self._all_vectors()
+            keep = [idx for idx, row in enumerate(self._mapping) if not row.get("deleted") and idx < len(vectors)]
+            rows = [self._mapping[idx] for idx in keep]
+            kept_vectors = vectors[keep] if keep else np.zeros((0, self.dim), dtype=np.float32)
+            self.clear()
+            for new_id, row in enumerate(rows):
+                row["vector_id"] = new_id
+            self._mapping = rows
+            if self._engine == "faiss" and self._index is not None:
+                if len(kept_vectors):
+                    self._index.add(kept_vectors)
             else:
-                self._vectors = np.vstack([self._vectors, arr.reshape(1, -1).astype(np.float32)])
-        return vector_id
+                self._set_matrix(kept_vectors)
+            return removed
 
     def search(
         self,
@@ -116,7 +298,17 @@ class VectorIndex:
     ) -> list[dict[str, Any]]:
         if not isinstance(query_vector, list) or not query_vector:
             return []
-        if self.dim <= 0 or not self._mapping:
+        with self._lock:
+            return self._search_locked(query_vector, top_k=top_k, filter_meta=filter_meta)
+
+    def _search_locked(
+        self,
+        query_vector: list[float],
+        *,
+        top_k: int,
+        filter_meta: dict[str, object] | None,
+    ) -> list[dict[str, Any]]:
+        if self.dim <= 0 or self.live_count <= 0:
             return []
 
         query = self._normalize(query_vector)
@@ -125,7 +317,7 @@ class VectorIndex:
 
         candidates: list[tuple[int, float]] = []
         limit = max(1, int(top_k))
-        oversample = min(max(limit * 4, 20), max(20, len(self._mapping)))
+        oversample = min(max(limit * 4, 20) + self._deleted, max(20, len(self._mapping)))
 
         if self._engine == "faiss" and self._index is not None:
             scores, indices = self._index.search(query.reshape(1, -1).astype(np.float32), oversample)
@@ -134,9 +326,15 @@ class VectorIndex:
                     continue
                 candidates.append((int(pos), float(score)))
         else:
-            if self._vectors.size <= 0:
+            if self._stored_rows() <= 0:
                 return []
-            sims = self._vectors @ query.astype(np.float32)
+            query32 = query.astype(np.float32)
+            parts: list[np.ndarray] = []
+            if int(self._base.shape[0]) > 0:
+                parts.append(self._base @ query32)
+            if self._rows > 0:
+                parts.append(self._matrix() @ query32)
+            sims = parts[0] if len(parts) == 1 else np.concatenate(parts)
             if sims.size <= 0:
                 return []
             order = np.argsort(sims)[::-1]
@@ -154,6 +352,8 @@ class VectorIndex:
             if idx < 0 or idx >= len(self._mapping):
                 continue
             row = self._mapping[idx]
+            if row.get("deleted"):
+                continue
             meta = row.get("meta") if isinstance(row.get("meta"), dict) else {}
             if isinstance(filter_meta, dict) and filter_meta and not _meta_match(meta, filter_meta):
                 continue
@@ -171,67 +371,260 @@ class VectorIndex:
         return hits
 
     def persist(self, *, index_path: Path, mapping_path: Path) -> None:
-        mapping_path.parent.mkdir(parents=True, exist_ok=True)
-        index_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            mapping_path.parent.mkdir(parents=True, exist_ok=True)
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+
+            mapping_rows: list[str] = []
+            for row in self._mapping:
+                mapping_rows.append(json.dumps(row, ensure_ascii=False))
+            mapping_text = "\n".join(mapping_rows) + ("\n" if mapping_rows else "")
+            mapping_path.write_text(mapping_text, encoding="utf-8")
+            self.append_path(index_path).unlink(missing_ok=True)
+            self._pending_lines = []
+            self._pending_vectors = []
+            self._persisted_rows = len(self._mapping)
+
+            if self.dim <= 0:
+                index_path.write_bytes(b"")
+                return
 
-        mapping_rows: list[str] = []
-        for row in self._mapping:
-            mapping_rows.append(json.dumps(row, ensure_ascii=False))
-        mapping_text = "\n".join(mapping_rows) + ("\n" if mapping_rows else "")
-        mapping_path.write_text(mapping_text, encoding="utf-8")
+            if self._engine == "faiss" and self._index is not None and self._faiss is not None:
+                self._faiss.write_index(self._index, str(index_path))
+                return
 
-        if self.dim <= 0:
-            index_path.write_bytes(b"")
-            return
+            arr = self._stored_matrix() if self._stored_rows() > 0 else np.zeros((0, self.dim), dtype=np.float32)
+            if self.is_mmapped:
+                arr = np.array(arr, dtype=np.float32)
+            # Release any mapping on the old file before replacing it (required on Windows);
+            # write to a temp file so a live memmap never sees a truncated file.
+            self._base = np.zeros((0, self.dim), dtype=np.float32)
+            self._set_matrix(arr)
+            tmp_path = index_path.with_name(index_path.name + ".tmp")
+            with tmp_path.open("wb") as fh:
+                np.save(fh, arr, allow_pickle=False)
+            os.replace(tmp_path, index_path)
+            if self.storage == "mmap":
+                self._map_base(index_path)
+
+    def _map_base(self, index_path: Path) -> bool:
+        try:
+            arr = np.load(str(index_path), mmap_mode="r", allow_pickle=False)
+        except Exception:
+            return False
+        if not isinstance(arr, np.memmap) or arr.dtype != np.float32 or arr.ndim != 2:
+            return False
+        if self.dim > 0 and int(arr.shape[1]) != self.dim:
+            return False
+        self.dim = int(arr.shape[1])
+        self._base = arr
+        self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self._rows = 0
+        return True
+
+    def vacuum_to_disk(self, *, index_path: Path, mapping_path: Path) -> int:
+        with self._lock:
+            removed = self.vacuum()
+            if removed > 0:
+                self.persist(index_path=index_path, mapping_path=mapping_path)
+            return removed
+
+    def persist_incremental(self, *, index_path: Path, mapping_path: Path) -> None:
+        """Append pending rows/tombstones to the mapping log and new vectors to the sidecar file.
+
+        Falls back to a full `persist` when nothing usable is on disk yet, or when the vector
+        files do not hold exactly `_persisted_rows` rows in this engine's format.
+        """
+        with self._lock:
+            if not self._pending_lines:
+                return
+            if (
+                self._persisted_rows <= 0
+                or self.dim <= 0
+                or not mapping_path.exists()
+                or self._disk_rows(index_path) != self._persisted_rows
+            ):
+                self.persist(index_path=index_path, mapping_path=mapping_path)
+                return
+            with mapping_path.open("a", encoding="utf-8") as fh:
+                for row in self._pending_lines:
+                    fh.write(json.dumps(row, ensure_ascii=False) + "\n")
+            if self._pending_vectors:
+                block = np.vstack(self._pending_vectors).astype(np.float32)
+                with self.append_path(index_path).open("ab") as fh:
+                    fh.write(block.tobytes())
+            self._persisted_rows = len(self._mapping)
+            self._pending_lines = []
+            self._pending_vectors = []
+
+    def _load_mapping_log(self, mapping_path: Path) -> list[dict[str, Any]]:
+        rows: dict[int, dict[str, Any]] = {}
+        if not mapping_path.exists():
+            return []
+        try:
+            for raw in mapping_path.read_text(encoding="utf-8").splitlines():
+                line = str(raw or "").strip()
+                if not line:
+                    continue
+                payload = json.loads(line)
+                if not isinstance(payload, dict):
+                    continue
+                try:
+                    vector_id = int(payload.get("vector_id"))
+                except (TypeError, ValueError):
+                    vector_id = len(rows)
+                if "record_id" not in payload:
+                    if payload.get("deleted") and vector_id in rows:
+                        rows[vector_id]["deleted"] = True
+                    continue
+                payload["vector_id"] = vector_id
+                rows[vector_id] = payload
+        except Exception:
+            return []
+        return [rows[key] for key in sorted(rows)]
 
-        if self._engine == "faiss" and self._index is not None and self._faiss is not None:
-            self._faiss.write_index(self._index, str(index_path))
-            return
+    def _read_append_block(self, index_path: Path) -> np.ndarray | None:
+        path = self.append_path(index_path)
+        if self.dim <= 0 or not path.exists():
+            return None
+        try:
+            block = np.fromfile(path, dtype=np.float32)
+        except Exception:
+            return None
+        rows = block.size // self.dim
+        if rows <= 0:
+            return None
+        return block[: rows * self.dim].reshape(rows, self.dim)
 
-        arr = self._vectors.astype(np.float32) if self._vectors.size > 0 else np.zeros((0, self.dim), dtype=np.float32)
-        with index_path.open("wb") as fh:
-            np.save(fh, arr, allow_pickle=False)
+    @staticmethod
+    def _index_file_info(index_path: Path) -> tuple[str, int, int]:
+        """(format, dim, rows) read from the index file header: "missing", "empty", "numpy",
+        "faiss" or "unknown" (rows = -1 when unknown)."""
+        try:
+            with index_path.open("rb") as fh:
+                head = fh.read(len(_NPY_MAGIC))
+                if not head:
+                    return "empty", 0, 0
+                if head == _NPY_MAGIC:
+                    fh.seek(0)
+                    version = np.lib.format.read_magic(fh)
+                    if version == (1, 0):
+                        shape, _, _ = np.lib.format.read_array_header_1_0(fh)
+                    else:
+                        shape, _, _ = np.lib.format.read_array_header_2_0(fh)
+                    if len(shape) == 2:
+                        return "numpy", int(shape[1]), int(shape[0])
+                    if len(shape) == 1:
+                        return "numpy", int(shape[0]), 1 if shape[0] else 0
+                    return "numpy", 0, -1
+                fh.seek(0)
+                header = fh.read(16)
+        except FileNotFoundError:
+            return "missing", 0, 0
+        except Exception:
+            return "unknown", 0, -1
+        if len(header) == 16 and header[:4] in _FAISS_FLAT_FOURCCS:
+            dim = int.from_bytes(header[4:8], "little", signed=True)
+            rows = int.from_bytes(header[8:16], "little", signed=True)
+            return "faiss", dim, rows
+        return "unknown", 0, -1
+
+    def _disk_format(self) -> str:
+        return "faiss" if self._engine == "faiss" and self._faiss is not None else "numpy"
+
+    def _disk_rows(self, index_path: Path) -> int:
+        """Rows stored on disk (index file + append sidecar) in this engine's format, or -1."""
+        fmt, dim, rows = self._index_file_info(index_path)
+        if fmt != self._disk_format() or rows < 0 or (rows > 0 and dim != self.dim):
+            return -1
+        try:
+            extra_bytes = self.append_path(index_path).stat().st_size
+        except FileNotFoundError:
+            extra_bytes = 0
+        row_bytes = max(1, self.dim) * 4
+        if extra_bytes % row_bytes:
+            return -1
+        return rows + extra_bytes // row_bytes
 
     def load(self, *, index_path: Path, mapping_path: Path) -> None:
-        self.clear()
-        rows: list[dict[str, Any]] = []
-        if mapping_path.exists():
-            try:
-                for raw in mapping_path.read_text(encoding="utf-8").splitlines():
-                    line = str(raw or "").strip()
-                    if not line:
-                        continue
-                    payload = json.loads(line)
-                    if isinstance(payload, dict):
-                        rows.append(payload)
-            except Exception:
-                rows = []
+        with self._lock:
+            self._load_locked(index_path=index_path, mapping_path=mapping_path)
+            self._deleted = sum(1 for row in self._mapping if row.get("deleted"))
+            self._persisted_rows = len(self._mapping)
 
-        self._mapping = rows
-        if not index_path.exists():
+    def _load_locked(self, *, index_path: Path, mapping_path: Path) -> None:
+        self.clear()
+        mapping = self._load_mapping_log(mapping_path)
+        fmt, _, _ = self._index_file_info(index_path)
+        loaded = 0 if fmt == "missing" else self._read_vectors_locked(index_path, fmt)
+        if loaded == len(mapping):
+            self._mapping = mapping
             return
+        # Vector ids are row offsets: a partial load would point every id at the wrong text.
+        if mapping or loaded != 0:
+            LOG.warning(
+                "vector index %s: %s rows readable (%s file, %s engine) for %s mapping rows; rebuilding from records",
+                index_path.name,
+                loaded,
+                fmt,
+                self._disk_format(),
+                len(mapping),
+            )
+        self.clear()
+        self._needs_rebuild = bool(mapping) or loaded != 0
 
-        if self._engine == "faiss" and self._faiss is not None:
+    def _read_vectors_locked(self, index_path: Path, fmt: str) -> int:
+        """Load the index file and its append sidecar; returns the row count, or -1 if unreadable."""
+        if fmt == "empty":
+            return 0
+        if fmt == "faiss":
+            if self._disk_format() != "faiss":
+                return -1
             try:
                 index = self._faiss.read_index(str(index_path))
                 self._index = index
                 self.dim = int(index.d)
                 self._vectors = np.zeros((0, self.dim), dtype=np.float32)
-                return
+                extra = self._read_append_block(index_path)
+                if extra is not None:
+                    self._index.add(extra)
+                return int(self._index.ntotal)
             except Exception:
                 self._index = None
+                return -1
+        if fmt != "numpy":
+            return -1
 
         try:
-            with index_path.open("rb") as fh:
-                arr = np.load(fh, allow_pickle=False)
-            if isinstance(arr, np.ndarray):
-                arr = arr.astype(np.float32)
+            if self.storage == "mmap":
+                if not self._map_base(index_path):
+                    return -1
+            else:
+                with index_path.open("rb") as fh:
+                    arr = np.load(fh, allow_pickle=False)
+                arr = np.asarray(arr, dtype=np.float32)
                 if arr.ndim == 1:
-                    arr = arr.reshape(1, -1)
-                self._vectors = arr
-                self.dim = int(arr.shape[1]) if arr.ndim == 2 and arr.size > 0 else int(self.dim or 0)
+                    arr = arr.reshape(1, -1) if arr.size > 0 else arr.reshape(0, max(0, self.dim))
+                if arr.ndim != 2:
+                    return -1
+                if int(arr.shape[0]) > 0:
+                    if self.dim > 0 and int(arr.shape[1]) != self.dim:
+                        return -1
+                    self.dim = int(arr.shape[1])
+                if self._disk_format() == "faiss":
+                    self._index = self._faiss.IndexFlatIP(self.dim) if self.dim > 0 else None
+                    if self._index is not None and int(arr.shape[0]) > 0:
+                        self._index.add(np.ascontiguousarray(arr))
+                else:
+                    self._set_matrix(arr)
+            extra = self._read_append_block(index_path)
+            if extra is not None:
+                self._append_matrix(extra)
         except Exception:
-            self._vectors = np.zeros((0, self.dim), dtype=np.float32) if self.dim > 0 else np.zeros((0, 0), dtype=np.float32)
+            return -1
+        if self._engine == "faiss" and self._index is not None:
+            return int(self._index.ntotal)
+        return self._stored_rows()
 
     def rebuild_from_records(
         self,
@@ -245,15 +638,106 @@ class VectorIndex:
 
         texts = [str(row.get("text") or "").strip() for row in records]
         vectors = embed_texts(texts)
-        total = 0
-        for idx, record in enumerate(records):
-            vec = vectors[idx] if idx < len(vectors) and isinstance(vectors[idx], list) else []
-            if not vec:
+        return len(self._add_embedded(records, vectors))
+
+    def _add_embedded(self, records: list[dict[str, Any]], vectors: list[list[float]] | list[np.ndarray]) -> list[int]:
+        keep: list[int] = []
+        dim = self.dim
+        for idx in range(min(len(records), len(vectors))):
+            vec = vectors[idx]
+            if not isinstance(vec, (list, np.ndarray)) or len(vec) == 0:
                 continue
-            record_id = str(record.get("record_id") or "")
-            text = str(record.get("text") or "")
-            meta = record.get("meta") if isinstance(record.get("meta"), dict) else {}
-            if self.add(record_id, text, meta, vec) is not None:
-                total += 1
-        return total
+            if dim <= 0:
+                dim = len(vec)
+            if len(vec) == dim:
+                keep.append(idx)
+        if not keep:
+            return []
+        matrix = np.asarray([vectors[idx] for idx in keep], dtype=np.float32)
+        return self.add_many(
+            [str(records[idx].get("record_id") or "") for idx in keep],
+            [str(records[idx].get("text") or "") for idx in keep],
+            [records[idx].get("meta") if isinstance(records[idx].get("meta"), dict) else {} for idx in keep],
+            matrix,
+        )
+
+    def sync_records(
+        self,
+        *,
+        records: list[dict[str, Any]],
+        embed_texts,
+    ) -> dict[str, int]:
+        """Diff `records` against the live mapping by record_id/text hash.
+
+        Only new or changed texts are embedded; vanished or changed rows are tombstoned.
+        Metadata-only changes are rewritten in place (and logged for `persist_incremental`).
+        `embed_texts` runs outside the lock so searches are not blocked by the embedding call.
+        """
+        stats = {"added": 0, "removed": 0, "updated": 0, "kept": 0}
+        with self._lock:
+            live = self._live_rows()
+            wanted: dict[str, dict[str, Any]] = {}
+            for record in records:
+                record_id = str(record.get("record_id") or "").strip()
+                if record_id:
+                    wanted[record_id] = record
+
+            for record_id, idx in live.items():
+                if record_id not in wanted:
+                    if self.remove(idx):
+                        stats["removed"] += 1
+
+            to_embed: list[dict[str, Any]] = []
+            for record_id, record in wanted.items():
+                text = str(record.get("text") or "").strip()
+                meta = record.get("meta") if isinstance(record.get("meta"), dict) else {}
+                idx = live.get(record_id)
+                if idx is not None:
+                    row = self._mapping[idx]
+                    if self._row_hash(row) == text_hash(text):
+                        if row.get("meta") != meta:
+                            row["meta"] = meta
+                            self._pending_lines.append(row)
+                            stats["updated"] += 1
+                        else:
+                            stats["kept"] += 1
+                        continue
+                    if self.remove(idx):
+                        stats["removed"] += 1
+                to_embed.append({"record_id": record_id, "text": text, "meta": meta})
+
+        if not to_embed:
+            self._needs_rebuild = False
+            return stats
+        vectors = embed_texts([row["text"] for row in to_embed])
+
+        with self._lock:
+            # Another sync may have run while embedding: skip texts it already added and
+            # tombstone rows it added for the same record with another text (last write wins).
+            live = self._live_rows()
+            fresh_rows: list[dict[str, Any]] = []
+            fresh_vectors: list[Any] = []
+            for row, vector in zip(to_embed, vectors):
+                idx = live.get(row["record_id"])
+                if idx is not None:
+                    if self._row_hash(self._mapping[idx]) == text_hash(row["text"]):
+                        continue
+                    if self.remove(idx):
+                        stats["removed"] += 1
+                fresh_rows.append(row)
+                fresh_vectors.append(vector)
+            stats["added"] = len(self._add_embedded(fresh_rows, fresh_vectors))
+            self._needs_rebuild = False
+        return stats
+
+    def _live_rows(self) -> dict[str, int]:
+        live: dict[str, int] = {}
+        for idx, row in enumerate(self._mapping):
+            if row.get("deleted"):
+                continue
+            live[str(row.get("record_id") or "")] = idx
+        return live
 
+    @staticmethod
+    def _row_hash(row: dict[str, Any]) -> str:
+        return str(row.get("text_hash") or "") or text_hash(row.get("text"))
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import gzip
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependance optionnelle
+    orjson = None
+
+
+ENCODING_JSON = "json"
+ENCODING_COMPACT = "compact"
+ENCODING_GZIP = "gzip"
+SAVE_ENCODINGS = (ENCODING_JSON, ENCODING_COMPACT, ENCODING_GZIP)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+# Niveau 6: a 2% pres la taille du niveau 9, encodage ~2.5x plus rapide (tools/bench_save_encoding.py).
+# Les checkpoints sont rares (journal) et ecrits hors du thread de jeu.
+_GZIP_LEVEL = 6
+
+
+def normalize_save_encoding(value: object) -> str:
+    clean = str(value or "").strip().lower()
+    return clean if clean in SAVE_ENCODINGS else ENCODING_JSON
+
+
+def _dumps_compact_bytes(payload: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_payload(payload: Any, encoding: str = ENCODING_JSON) -> bytes:
+    """Serialise un fichier de sauvegarde.
+
+    - `json`: JSON indente (format historique, lisible a la main);
+    - `compact`: JSON sans espaces;
+    - `gzip`: JSON compact compresse.
+    """
+    chosen = normalize_save_encoding(encoding)
+    if chosen == ENCODING_JSON:
+        return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    data = _dumps_compact_bytes(payload)
+    if chosen == ENCODING_GZIP:
+        # mtime=0: meme etat -> memes octets.
+        return gzip.compress(data, compresslevel=_GZIP_LEVEL, mtime=0)
+    return data
+
+
+def decode_payload(data: bytes) -> Any:
+    """Lit un fichier de sauvegarde quel que soit son encodage (detecte sur les premiers octets)."""
+    if data[:2] == _GZIP_MAGIC:
+        data = gzip.decompress(data)
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data.decode("utf-8"))
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+JOURNAL_FORMAT_VERSION = 1
+# Au-dela, on cesse de chercher un simple ajout en fin de chat et on reecrit la liste.
+_MAX_CHAT_APPEND_SCAN = 64
+
+
+def journal_path_for(slot_path: Path) -> Path:
+    return slot_path.with_name(slot_path.stem + JOURNAL_SUFFIX)
+
+
+def dumps_compact(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _digest(value: Any) -> bytes:
+    return hashlib.blake2b(dumps_compact(value).encode("utf-8"), digest_size=16).digest()
+
+
+@dataclass
+class StateDigest:
+    """Empreinte d'un etat sauvegarde: une par cle de premier niveau, une par message de chat."""
+
+    keys: dict[str, bytes] = field(default_factory=dict)
+    chat: list[bytes] = field(default_factory=list)
+
+
+def digest_state(state: dict) -> StateDigest:
+    chat = state.get("chat")
+    return StateDigest(
+        keys={key: _digest(value) for key, value in state.items() if key != "chat"},
+        chat=[_digest(msg) for msg in chat] if isinstance(chat, list) else [],
+    )
+
+
+def _appended_chat_count(previous: list[bytes], current: list[bytes], *, chat_max: int) -> int | None:
+    """Nombre de messages ajoutes en fin de `previous` pour obtenir `current` (apres troncature)."""
+    for added in range(0, min(len(current), _MAX_CHAT_APPEND_SCAN) + 1):
+        if len(current) != min(chat_max, len(previous) + added):
+            continue
+        kept = len(current) - added
+        if kept > len(previous):
+            continue
+        if current[:kept] == previous[len(previous) - kept:]:
+            return added
+    return None
+
+
+def build_delta(previous: StateDigest, current: StateDigest, state: dict, *, chat_max: int) -> dict:
+    """Delta entre deux etats; vide si rien n'a change."""
+    delta: dict[str, Any] = {}
+    changed = {key: state[key] for key, value in current.keys.items() if previous.keys.get(key) != value}
+    if current.chat != previous.chat:
+        chat = state.get("chat") if isinstance(state.get("chat"), list) else []
+        added = _appended_chat_count(previous.chat, current.chat, chat_max=chat_max)
+        if added is None:
+            changed["chat"] = chat
+        elif added > 0:
+            delta["chat_append"] = chat[len(chat) - added:]
+            delta["chat_max"] = int(chat_max)
+    if changed:
+        delta["set"] = changed
+    return delta
+
+
+def apply_delta(state: dict, delta: dict) -> None:
+    changed = delta.get("set")
+    if isinstance(changed, dict):
+        state.update(changed)
+    appended = delta.get("chat_append")
+    if isinstance(appended, list) and appended:
+        chat = state.get("chat") if isinstance(state.get("chat"), list) else []
+        merged = list(chat) + appended
+        try:
+            chat_max = int(delta.get("chat_max") or 0)
+        except (TypeError, ValueError):
+            chat_max = 0
+        state["chat"] = merged[-chat_max:] if chat_max > 0 else merged
+
+
+@dataclass
+class JournalReplay:
+    entries: int = 0
+    valid_bytes: int = 0
+    total_bytes: int = 0
+    saved_at: str = ""
+
+    @property
+    def complete(self) -> bool:
+        """Faux si une entree etrangere au checkpoint ou une fin de fichier tronquee a ete ignoree."""
+        return self.valid_bytes == self.total_bytes
+
+
+def replay_journal(path: Path, state: dict, *, checkpoint_id: str) -> JournalReplay:
+    """Rejoue sur `state` les entrees du journal rattachees a `checkpoint_id`."""
+    replay = JournalReplay()
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        return replay
+    replay.total_bytes = len(raw)
+    if not checkpoint_id:
+        return replay
+
+    offset = 0
+    for line in raw.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            break
+        if not isinstance(entry, dict) or str(entry.get("checkpoint_id") or "") != checkpoint_id:
+            break
+        apply_delta(state, entry)
+        offset += len(line)
+        replay.entries += 1
+        replay.saved_at = str(entry.get("saved_at") or replay.saved_at)
+    replay.valid_bytes = offset
+    return replay
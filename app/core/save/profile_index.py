@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+
+from .journal import dumps_compact
+
+
+PROFILE_INDEX_NAME = "index.jsonl"
+# Reecriture compacte quand le fichier contient plus de N lignes par profil connu.
+_COMPACT_LINES_PER_PROFILE = 4
+_COMPACT_MIN_LINES = 256
+
+
+class ProfileIndex:
+    """Index des profils et de leurs slots, tenu en un seul fichier JSONL append-only.
+
+    Chaque sauvegarde ajoute une ligne (profil, nom affiche, date, resume du slot); la
+    lecture replie les lignes dans l'ordre, la derniere valeur l'emporte. Le contenu replie
+    est garde en memoire tant que le fichier n'a pas ete modifie par un autre processus.
+    L'appelant serialise les ecritures entre processus (verrou de fichier global).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._profiles: dict[str, dict] | None = None
+        self._lines = 0
+        self._signature: tuple[int, int] | None = None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def profiles(self) -> dict[str, dict]:
+        """{profile_key: {"display_name", "updated_at", "slots": {slot: resume}}} (copie)."""
+        with self._lock:
+            self._refresh_locked()
+            return {
+                key: {**row, "slots": dict(row.get("slots") or {})}
+                for key, row in (self._profiles or {}).items()
+            }
+
+    def slot(self, profile_key: str, slot: int) -> dict | None:
+        with self._lock:
+            self._refresh_locked()
+            row = (self._profiles or {}).get(profile_key)
+            summary = (row or {}).get("slots", {}).get(str(int(slot)))
+            return dict(summary) if isinstance(summary, dict) else None
+
+    def record_slot(
+        self,
+        profile_key: str,
+        slot: int,
+        summary: dict | None,
+        *,
+        display_name: str | None = None,
+        updated_at: str = "",
+    ) -> None:
+        """Ajoute l'etat d'un slot (`summary=None`: slot supprime)."""
+        entry: dict = {"profile_key": profile_key, "slot": int(slot), "updated_at": updated_at}
+        if display_name:
+            entry["display_name"] = str(display_name)[:80]
+        if summary is None:
+            entry["deleted"] = True
+        else:
+            entry["summary"] = summary
+        self.append([entry])
+
+    def append(self, entries: list[dict]) -> None:
+        if not entries:
+            return
+        payload = "".join(dumps_compact(entry) + "\n" for entry in entries)
+        with self._lock:
+            self._refresh_locked()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as fp:
+                fp.write(payload)
+            profiles = self._profiles if self._profiles is not None else {}
+            for entry in entries:
+                _fold(profiles, entry)
+            self._profiles = profiles
+            self._lines += len(entries)
+            self._signature = _file_signature(self.path)
+            if self._lines > max(_COMPACT_MIN_LINES, _COMPACT_LINES_PER_PROFILE * len(profiles)):
+                self._rewrite_locked()
+
+    def rebuild(self, entries: list[dict]) -> None:
+        with self._lock:
+            profiles: dict[str, dict] = {}
+            for entry in entries:
+                _fold(profiles, entry)
+            self._profiles = profiles
+            self._rewrite_locked()
+
+    def _refresh_locked(self) -> None:
+        signature = _file_signature(self.path)
+        if self._profiles is not None and signature == self._signature:
+            return
+        profiles: dict[str, dict] = {}
+        lines = 0
+        try:
+            with self.path.open("r", encoding="utf-8") as fp:
+                for line in fp:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(entry, dict):
+                        _fold(profiles, entry)
+                        lines += 1
+        except OSError:
+            pass
+        self._profiles = profiles
+        self._lines = lines
+        self._signature = signature
+
+    def _rewrite_locked(self) -> None:
+        entries: list[dict] = []
+        for key, row in (self._profiles or {}).items():
+            slots = row.get("slots") or {}
+            if not slots:
+                entries.append(
+                    {
+                        "profile_key": key,
+                        "display_name": row.get("display_name", ""),
+                        "updated_at": row.get("updated_at", ""),
+                    }
+                )
+            for slot, summary in slots.items():
+                entries.append(
+                    {
+                        "profile_key": key,
+                        "display_name": row.get("display_name", ""),
+                        "updated_at": row.get("updated_at", ""),
+                        "slot": int(slot),
+                        "summary": summary,
+                    }
+                )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            encoding="utf-8",
+            dir=str(self.path.parent),
+            prefix=f".{self.path.name}.",
+            suffix=".tmp",
+            delete=False,
+        ) as tmp:
+            tmp.write("".join(dumps_compact(entry) + "\n" for entry in entries))
+            tmp.flush()
+            os.fsync(tmp.fileno())
+            tmp_path = Path(tmp.name)
+        os.replace(tmp_path, self.path)
+        self._lines = len(entries)
+        self._signature = _file_signature(self.path)
+
+
+def _fold(profiles: dict[str, dict], entry: dict) -> None:
+    key = str(entry.get("profile_key") or "").strip()
+    if not key:
+        return
+    row = profiles.setdefault(key, {"display_name": key, "updated_at": "", "slots": {}})
+    display_name = str(entry.get("display_name") or "").strip()
+    if display_name:
+        row["display_name"] = display_name[:80]
+    updated_at = str(entry.get("updated_at") or "")
+    if updated_at:
+        row["updated_at"] = updated_at
+    if "slot" not in entry:
+        return
+    try:
+        slot = str(int(entry.get("slot")))
+    except (TypeError, ValueError):
+        return
+    if entry.get("deleted"):
+        row["slots"].pop(slot, None)
+    elif isinstance(entry.get("summary"), dict):
+        row["slots"][slot] = entry["summary"]
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (int(stat.st_mtime_ns), int(stat.st_size))
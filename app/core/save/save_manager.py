@@ -1,15 +1,15 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-import json
 import os
-from dataclasses import asdict
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 import re
 import tempfile
 import unicodedata
-from typing import Iterator
+from typing import Callable, Iterator
+import uuid
 
 from app.gamemaster.conversation_memory import (
     sanitize_global_memory_payload,
@@ -29,20 +29,85 @@ from app.core.models import ChatMessage, Choice, Scene
 from app.ui.state.game_state import CHAT_HISTORY_MAX_ITEMS, GameState
 from app.ui.state.inventory import InventoryGrid, ItemStack
 
+from .encoding import ENCODING_JSON, decode_payload, encode_payload, normalize_save_encoding
+from .journal import (
+    JOURNAL_FORMAT_VERSION,
+    StateDigest,
+    build_delta,
+    digest_state,
+    dumps_compact,
+    journal_path_for,
+    replay_journal,
+)
+from .profile_index import PROFILE_INDEX_NAME, ProfileIndex
+from .save_writer import SaveKey, SaveWriter
+
 
 _SAVE_SCHEMA_VERSION = 2
 _BACKUP_SUFFIX = ".bak"
 _LOCKFILE_NAME = ".save.lock"
 
 
+def _env_int(name: str, default: int) -> int:
+    raw = str(os.getenv(name, str(default)) or str(default)).strip()
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return default
+
+
+# Entrees de journal entre deux checkpoints complets (0 = chaque sauvegarde reecrit le slot)
+SAVE_JOURNAL_MAX_ENTRIES = max(0, _env_int("SAVE_JOURNAL_MAX_ENTRIES", 50))
+# Fenetre de regroupement des sauvegardes en arriere-plan (queue_save)
+SAVE_WRITE_DELAY_MS = max(0, _env_int("SAVE_WRITE_DELAY_MS", 500))
+# Encodage des slots: json (indente), compact, gzip. Detecte a la lecture, quel que soit ce reglage.
+SAVE_ENCODING = normalize_save_encoding(os.getenv("SAVE_ENCODING", "json"))
+
+
+@dataclass
+class _JournalBaseline:
+    """Ce que contient le disque (checkpoint + journal) pour un slot, vu par ce processus."""
+
+    checkpoint_id: str
+    checkpoint_signature: tuple[int, int]
+    journal_bytes: int
+    entries: int
+    digest: StateDigest
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (int(stat.st_mtime_ns), int(stat.st_size))
+
+
 class SaveManager:
-    def __init__(self, *, saves_dir: str = "saves", slot_count: int = 3) -> None:
+    def __init__(
+        self,
+        *,
+        saves_dir: str = "saves",
+        slot_count: int = 3,
+        journal_max_entries: int | None = None,
+        write_delay_s: float | None = None,
+        encoding: str | None = None,
+    ) -> None:
         self.saves_dir = Path(saves_dir)
         self.slot_count = max(1, int(slot_count))
+        self.journal_max_entries = max(
+            0, int(SAVE_JOURNAL_MAX_ENTRIES if journal_max_entries is None else journal_max_entries)
+        )
+        self._journal_baselines: dict[str, _JournalBaseline] = {}
+        self.write_delay_s = max(0.0, float(SAVE_WRITE_DELAY_MS / 1000.0 if write_delay_s is None else write_delay_s))
+        self._writer: SaveWriter | None = None
+        self.encoding = normalize_save_encoding(SAVE_ENCODING if encoding is None else encoding)
         self.saves_dir.mkdir(parents=True, exist_ok=True)
         self.profiles_dir = self.saves_dir / "profiles"
         self.profiles_dir.mkdir(parents=True, exist_ok=True)
         self.meta_path = self.saves_dir / "meta.json"
+        # Resume des profils/slots pour les listes de l'UI et de /profiles (un seul fichier lu).
+        self._profile_index = ProfileIndex(self.profiles_dir / PROFILE_INDEX_NAME)
         self._known_anchors = set(MAP_ANCHORS)
         self.last_warning: str = ""
 
@@ -71,6 +136,9 @@ class SaveManager:
     def slot_path(self, slot: int, profile: str | None = None) -> Path:
         return self._profile_dir(profile) / f"slot_{slot}.json"
 
+    def journal_path(self, slot: int, profile: str | None = None) -> Path:
+        return journal_path_for(self.slot_path(slot, profile=profile))
+
     def _backup_path(self, path: Path) -> Path:
         return path.with_name(path.name + _BACKUP_SUFFIX)
 
@@ -118,10 +186,12 @@ class SaveManager:
                     pass
 
     def _atomic_write_text(self, path: Path, content: str) -> None:
+        self._atomic_write_bytes(path, content.encode("utf-8"))
+
+    def _atomic_write_bytes(self, path: Path, content: bytes) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
         with tempfile.NamedTemporaryFile(
-            mode="w",
-            encoding="utf-8",
+            mode="wb",
             dir=str(path.parent),
             prefix=f".{path.name}.",
             suffix=".tmp",
@@ -135,18 +205,18 @@ class SaveManager:
 
     def _read_json_file(self, path: Path) -> dict | list | None:
         try:
-            return json.loads(path.read_text(encoding="utf-8"))
+            return decode_payload(path.read_bytes())
         except Exception:
             return None
 
-    def _write_json_file(self, path: Path, payload: dict, *, backup: bool) -> None:
+    def _write_json_file(self, path: Path, payload: dict, *, backup: bool, encoding: str = ENCODING_JSON) -> None:
         if backup and path.exists():
             backup_path = self._backup_path(path)
             try:
-                self._atomic_write_text(backup_path, path.read_text(encoding="utf-8"))
+                self._atomic_write_bytes(backup_path, path.read_bytes())
             except Exception:
                 pass
-        self._atomic_write_text(path, json.dumps(payload, ensure_ascii=False, indent=2))
+        self._atomic_write_bytes(path, encode_payload(payload, encoding))
 
     def _load_payload_with_backup(self, path: Path) -> tuple[dict | None, bool]:
         payload = self._read_json_file(path)
@@ -160,7 +230,7 @@ class SaveManager:
 
         restored = False
         try:
-            self._atomic_write_text(path, backup_path.read_text(encoding="utf-8"))
+            self._atomic_write_bytes(path, backup_path.read_bytes())
             restored = True
         except Exception:
             restored = False
@@ -180,34 +250,95 @@ class SaveManager:
         profiles: list[dict] = []
         if not self.profiles_dir.exists():
             return profiles
-        for child in self.profiles_dir.iterdir():
-            if not child.is_dir():
-                continue
-            key = child.name
-            meta_path = child / "meta.json"
-            display_name = key
-            updated_at = ""
-            if meta_path.exists():
-                try:
-                    raw = self._read_json_file(meta_path)
-                    if isinstance(raw, dict):
-                        display_name = str(raw.get("display_name") or raw.get("profile_name") or key).strip() or key
-                        updated_at = str(raw.get("updated_at") or "")
-                except Exception:
-                    pass
-            has_slot = any((child / f"slot_{i}.json").exists() for i in range(1, self.slot_count + 1))
-            if not has_slot:
+        self._ensure_profile_index()
+        valid_slots = {str(i) for i in range(1, self.slot_count + 1)}
+        for key, row in self._profile_index.profiles().items():
+            if not valid_slots.intersection(row.get("slots") or {}):
                 continue
             profiles.append(
                 {
                     "profile_key": key,
-                    "display_name": display_name[:80],
-                    "updated_at": updated_at,
+                    "display_name": str(row.get("display_name") or key)[:80],
+                    "updated_at": str(row.get("updated_at") or ""),
                 }
             )
         profiles.sort(key=lambda p: str(p.get("updated_at") or ""), reverse=True)
         return profiles
 
+    def _ensure_profile_index(self) -> None:
+        if self._profile_index.exists():
+            return
+        with self._file_lock(None):
+            if not self._profile_index.exists():
+                self._profile_index.rebuild(self._scan_profile_index_entries())
+
+    def _scan_profile_index_entries(self) -> list[dict]:
+        """Reconstruit l'index depuis les dossiers de profils (premier lancement, index supprime)."""
+        entries: list[dict] = []
+        if not self.profiles_dir.exists():
+            return entries
+        for child in self.profiles_dir.iterdir():
+            if not child.is_dir():
+                continue
+            key = child.name
+            display_name = key
+            updated_at = ""
+            raw = self._read_json_file(child / "meta.json")
+            if isinstance(raw, dict):
+                display_name = str(raw.get("display_name") or raw.get("profile_name") or key).strip() or key
+                updated_at = str(raw.get("updated_at") or "")
+            entries.append({"profile_key": key, "display_name": display_name[:80], "updated_at": updated_at})
+            for i in range(1, self.slot_count + 1):
+                summary = self._summary_from_disk(child / f"slot_{i}.json")
+                if summary is not None:
+                    entries.append({"profile_key": key, "slot": i, "summary": summary})
+        return entries
+
+    def _summary_from_disk(self, path: Path) -> dict | None:
+        # Lecture seule, sans verrou de profil: appele sous le verrou global de l'index.
+        if not path.exists():
+            return None
+        payload = self._read_json_file(path)
+        if not isinstance(payload, dict):
+            payload = self._read_json_file(self._backup_path(path))
+        if not isinstance(payload, dict) or not isinstance(payload.get("state"), dict):
+            return None
+        raw_state = payload["state"]
+        replay = replay_journal(journal_path_for(path), raw_state, checkpoint_id=str(payload.get("checkpoint_id") or ""))
+        return self._slot_index_summary(raw_state, saved_at=replay.saved_at or str(payload.get("saved_at") or ""))
+
+    def _slot_index_summary(self, raw_state: dict, *, saved_at: str) -> dict:
+        chat = raw_state.get("chat", [])
+        return {
+            "saved_at": saved_at,
+            "location": str(raw_state.get("current_scene_id") or "inconnu"),
+            "messages": len(chat) if isinstance(chat, list) else 0,
+        }
+
+    def _record_slot_in_index(
+        self,
+        chosen: int,
+        summary: dict | None,
+        *,
+        profile: str | None,
+        display_name: str | None = None,
+    ) -> None:
+        if profile is None:
+            return
+        try:
+            self._ensure_profile_index()
+            with self._file_lock(None):
+                self._profile_index.record_slot(
+                    self.normalize_profile_id(profile),
+                    chosen,
+                    summary,
+                    display_name=display_name,
+                    updated_at=datetime.now(timezone.utc).isoformat(),
+                )
+        except Exception:
+            # L'index n'est qu'un cache: il sera reconstruit s'il disparait.
+            pass
+
     def has_legacy_saves(self) -> bool:
         for i in range(1, self.slot_count + 1):
             if (self.saves_dir / f"slot_{i}.json").exists():
@@ -224,8 +355,17 @@ class SaveManager:
             if not src.exists() or dst.exists():
                 continue
             try:
-                self._atomic_write_text(dst, src.read_text(encoding="utf-8"))
+                self._atomic_write_bytes(dst, src.read_bytes())
+                src_journal = journal_path_for(src)
+                if src_journal.exists():
+                    self._atomic_write_text(journal_path_for(dst), src_journal.read_text(encoding="utf-8"))
                 migrated += 1
+                self._record_slot_in_index(
+                    i,
+                    self._summary_from_disk(dst),
+                    profile=profile_key,
+                    display_name=display_name,
+                )
             except Exception:
                 continue
         if migrated > 0:
@@ -248,21 +388,38 @@ class SaveManager:
 
     def set_last_slot(self, slot: int, *, profile: str | None = None, display_name: str | None = None) -> None:
         with self._file_lock(profile):
-            self._set_last_slot_unlocked(slot, profile=profile, display_name=display_name)
+            updated_at = self._set_last_slot_unlocked(slot, profile=profile, display_name=display_name)
+        self._touch_profile_in_index(updated_at, profile=profile, display_name=display_name)
+
+    def _touch_profile_in_index(self, updated_at: str, *, profile: str | None, display_name: str | None = None) -> None:
+        # Meme date que meta.json: list_profiles trie sur le dernier chargement ou changement de slot.
+        if profile is None:
+            return
+        entry = {"profile_key": self.normalize_profile_id(profile), "updated_at": updated_at}
+        if display_name:
+            entry["display_name"] = str(display_name)[:80]
+        try:
+            self._ensure_profile_index()
+            with self._file_lock(None):
+                self._profile_index.append([entry])
+        except Exception:
+            pass
 
-    def _set_last_slot_unlocked(self, slot: int, *, profile: str | None = None, display_name: str | None = None) -> None:
+    def _set_last_slot_unlocked(self, slot: int, *, profile: str | None = None, display_name: str | None = None) -> str:
         chosen = self._clamp_slot(slot)
         meta_path = self._meta_path_for(profile)
         profile_name = str(display_name or profile or "").strip()
+        updated_at = datetime.now(timezone.utc).isoformat()
         payload = {
             "last_slot": chosen,
-            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "updated_at": updated_at,
         }
         if profile is not None:
             payload["profile_key"] = self.normalize_profile_id(profile)
             if profile_name:
                 payload["display_name"] = profile_name[:80]
         self._write_json_file(meta_path, payload, backup=True)
+        return updated_at
 
     def save_slot(
         self,
@@ -272,26 +429,227 @@ class SaveManager:
         profile: str | None = None,
         display_name: str | None = None,
     ) -> None:
+        """Sauvegarde le slot: un delta ajoute au journal si possible, sinon un checkpoint complet."""
         chosen = self._clamp_slot(slot)
-        payload = {
-            "version": _SAVE_SCHEMA_VERSION,
-            "saved_at": datetime.now(timezone.utc).isoformat(),
-            "state": self._state_to_dict(state),
-        }
+        raw_state = self._state_to_dict(state)
+        self._write_exclusive(
+            chosen,
+            profile,
+            lambda: self._write_raw_state(chosen, raw_state, profile=profile, display_name=display_name),
+        )
+
+    def queue_save(
+        self,
+        slot: int,
+        state: GameState,
+        *,
+        profile: str | None = None,
+        display_name: str | None = None,
+    ) -> None:
+        """Comme `save_slot`, mais l'ecriture se fait dans le thread de sauvegarde.
+
+        Seul l'instantane de l'etat est pris sur le thread appelant; les demandes rapprochees
+        pour un meme slot sont fusionnees. `flush_saves` force l'ecriture.
+        """
+        chosen = self._clamp_slot(slot)
+        self._save_writer().submit(
+            self._save_key(chosen, profile),
+            self._state_to_dict(state),
+            display_name=display_name,
+        )
+
+    def flush_saves(self) -> bool:
+        """Ecrit les sauvegardes en attente; faux si l'une d'elles a echoue."""
+        if self._writer is None:
+            return True
+        return self._writer.flush()
+
+    def _flush_slot(self, slot: int, profile: str | None) -> None:
+        # Seule la demande de ce slot est ecrite: les autres profils restent dans la file.
+        if self._writer is not None:
+            self._writer.flush(self._save_key(slot, profile))
+
+    def close(self) -> bool:
+        if self._writer is None:
+            return True
+        return self._writer.close()
+
+    def pending_save_error(self, slot: int, *, profile: str | None = None) -> str:
+        """Derniere erreur d'ecriture en arriere-plan pour ce slot (vide si aucune); la consomme."""
+        if self._writer is None:
+            return ""
+        return self._writer.pop_error(self._save_key(self._clamp_slot(slot), profile))
+
+    def save_writer_stats(self) -> dict[str, float | int]:
+        if self._writer is None:
+            return {}
+        return self._writer.stats()
+
+    def _write_exclusive(self, slot: int, profile: str | None, write: Callable[[], None]) -> None:
+        # Une ecriture directe remplace la sauvegarde en file et ne peut pas etre doublee par elle.
+        if self._writer is None:
+            write()
+            return
+        self._writer.write_now(self._save_key(slot, profile), write)
+
+    def _save_key(self, slot: int, profile: str | None) -> SaveKey:
+        return ("" if profile is None else self.normalize_profile_id(profile), int(slot))
+
+    def _save_writer(self) -> SaveWriter:
+        if self._writer is None:
+            self._writer = SaveWriter(self._write_queued_save, delay_s=self.write_delay_s)
+        return self._writer
+
+    def _write_queued_save(self, key: SaveKey, raw_state: dict, display_name: str | None) -> None:
+        profile_key, slot = key
+        self._write_raw_state(slot, raw_state, profile=profile_key or None, display_name=display_name)
+
+    def _write_raw_state(
+        self,
+        chosen: int,
+        raw_state: dict,
+        *,
+        profile: str | None,
+        display_name: str | None,
+    ) -> None:
+        digest = digest_state(raw_state)
+        saved_at = datetime.now(timezone.utc).isoformat()
         path = self.slot_path(chosen, profile=profile)
         with self._file_lock(profile):
-            self._write_json_file(path, payload, backup=True)
+            baseline = self._journal_baselines.get(str(path))
+            if self._journal_usable(path, baseline):
+                self._append_journal_entry(path, baseline, raw_state, digest, saved_at=saved_at)
+            else:
+                self._write_checkpoint(path, raw_state, digest, saved_at=saved_at)
             self._set_last_slot_unlocked(chosen, profile=profile, display_name=display_name)
+            self._record_slot_in_index(
+                chosen,
+                self._slot_index_summary(raw_state, saved_at=saved_at),
+                profile=profile,
+                display_name=str(display_name or profile or "").strip(),
+            )
+
+    def compact_slot(self, slot: int, state: GameState, *, profile: str | None = None) -> None:
+        """Force un checkpoint complet et vide le journal du slot."""
+        chosen = self._clamp_slot(slot)
+        raw_state = self._state_to_dict(state)
+        path = self.slot_path(chosen, profile=profile)
+
+        def _write() -> None:
+            with self._file_lock(profile):
+                self._write_checkpoint(
+                    path,
+                    raw_state,
+                    digest_state(raw_state),
+                    saved_at=datetime.now(timezone.utc).isoformat(),
+                )
+
+        self._write_exclusive(chosen, profile, _write)
+
+    def _journal_usable(self, path: Path, baseline: _JournalBaseline | None) -> bool:
+        if baseline is None or self.journal_max_entries <= 0:
+            return False
+        if baseline.entries >= self.journal_max_entries:
+            return False
+        # Rejouer un journal plus gros que le checkpoint couterait plus qu'une reecriture.
+        if baseline.journal_bytes >= baseline.checkpoint_signature[1]:
+            return False
+        # Un autre processus a reecrit le slot ou complete le journal: on repart d'un checkpoint.
+        if _file_signature(path) != baseline.checkpoint_signature:
+            return False
+        journal_signature = _file_signature(journal_path_for(path))
+        journal_bytes = journal_signature[1] if journal_signature is not None else 0
+        return journal_bytes == baseline.journal_bytes
+
+    def _write_checkpoint(self, path: Path, raw_state: dict, digest: StateDigest, *, saved_at: str) -> None:
+        checkpoint_id = uuid.uuid4().hex
+        payload = {
+            "version": _SAVE_SCHEMA_VERSION,
+            "saved_at": saved_at,
+            "checkpoint_id": checkpoint_id,
+            "state": raw_state,
+        }
+        self._write_json_file(path, payload, backup=True, encoding=self.encoding)
+        # Si on s'arrete avant cette suppression, les entrees restantes portent un
+        # ancien checkpoint_id et sont ignorees au chargement.
+        journal_path_for(path).unlink(missing_ok=True)
+        signature = _file_signature(path)
+        if signature is None:
+            self._journal_baselines.pop(str(path), None)
+            return
+        self._journal_baselines[str(path)] = _JournalBaseline(
+            checkpoint_id=checkpoint_id,
+            checkpoint_signature=signature,
+            journal_bytes=0,
+            entries=0,
+            digest=digest,
+        )
+
+    def _append_journal_entry(
+        self,
+        path: Path,
+        baseline: _JournalBaseline,
+        raw_state: dict,
+        digest: StateDigest,
+        *,
+        saved_at: str,
+    ) -> None:
+        delta = build_delta(baseline.digest, digest, raw_state, chat_max=CHAT_HISTORY_MAX_ITEMS)
+        if not delta:
+            return
+        entry = {
+            "v": JOURNAL_FORMAT_VERSION,
+            "checkpoint_id": baseline.checkpoint_id,
+            "seq": baseline.entries + 1,
+            "saved_at": saved_at,
+            **delta,
+        }
+        line = (dumps_compact(entry) + "\n").encode("utf-8")
+        with journal_path_for(path).open("ab") as fp:
+            fp.write(line)
+            fp.flush()
+            os.fsync(fp.fileno())
+        baseline.journal_bytes += len(line)
+        baseline.entries += 1
+        baseline.digest = digest
+
+    def _read_slot_payload(self, path: Path) -> tuple[dict | None, bool]:
+        """Checkpoint (ou sa sauvegarde .bak) avec le journal rejoue; met a jour la base du journal."""
+        payload, restored = self._load_payload_with_backup(path)
+        if not isinstance(payload, dict) or not isinstance(payload.get("state"), dict):
+            self._journal_baselines.pop(str(path), None)
+            return payload, restored
+
+        raw_state = payload["state"]
+        checkpoint_id = str(payload.get("checkpoint_id") or "")
+        replay = replay_journal(journal_path_for(path), raw_state, checkpoint_id=checkpoint_id)
+        if replay.saved_at:
+            payload["saved_at"] = replay.saved_at
+
+        signature = _file_signature(path)
+        if checkpoint_id and replay.complete and signature is not None:
+            self._journal_baselines[str(path)] = _JournalBaseline(
+                checkpoint_id=checkpoint_id,
+                checkpoint_signature=signature,
+                journal_bytes=replay.valid_bytes,
+                entries=replay.entries,
+                digest=digest_state(raw_state),
+            )
+        else:
+            # Ancien format, backup restaure ou journal abime: la prochaine sauvegarde sera complete.
+            self._journal_baselines.pop(str(path), None)
+        return payload, restored
 
     def load_slot(self, slot: int, state: GameState, *, profile: str | None = None) -> bool:
         chosen = self._clamp_slot(slot)
+        self._flush_slot(chosen, profile)
         path = self.slot_path(chosen, profile=profile)
         if not path.exists():
             return False
 
         self.last_warning = ""
         with self._file_lock(profile):
-            payload, restored = self._load_payload_with_backup(path)
+            payload, restored = self._read_slot_payload(path)
             if not isinstance(payload, dict):
                 return False
             raw_state = payload.get("state", {})
@@ -301,13 +659,15 @@ class SaveManager:
                 self._apply_state_dict(state, raw_state)
             except Exception:
                 return False
-            self._set_last_slot_unlocked(chosen, profile=profile)
+            updated_at = self._set_last_slot_unlocked(chosen, profile=profile)
             if restored:
                 self.last_warning = "Sauvegarde restaurée depuis backup après corruption du fichier principal."
-            return True
+        self._touch_profile_in_index(updated_at, profile=profile)
+        return True
 
     def slot_summary(self, slot: int, *, profile: str | None = None) -> dict:
         chosen = self._clamp_slot(slot)
+        self._flush_slot(chosen, profile)
         path = self.slot_path(chosen, profile=profile)
         if not path.exists():
             return {
@@ -318,20 +678,21 @@ class SaveManager:
                 "messages": 0,
             }
 
+        if profile is not None:
+            self._ensure_profile_index()
+            indexed = self._profile_index.slot(self.normalize_profile_id(profile), chosen)
+            if indexed is not None:
+                return {"slot": chosen, "exists": True, **indexed}
+
         try:
-            payload, _ = self._load_payload_with_backup(path)
+            with self._file_lock(profile):
+                payload, _ = self._read_slot_payload(path)
             if not isinstance(payload, dict):
                 raise ValueError("payload invalide")
             raw_state = payload.get("state", {}) if isinstance(payload, dict) else {}
-            scene_id = str(raw_state.get("current_scene_id") or "inconnu")
-            chat = raw_state.get("chat", []) if isinstance(raw_state, dict) else []
-            return {
-                "slot": chosen,
-                "exists": True,
-                "saved_at": str(payload.get("saved_at") or ""),
-                "location": scene_id,
-                "messages": len(chat) if isinstance(chat, list) else 0,
-            }
+            summary = self._slot_index_summary(raw_state, saved_at=str(payload.get("saved_at") or ""))
+            self._record_slot_in_index(chosen, summary, profile=profile)
+            return {"slot": chosen, "exists": True, **summary}
         except Exception:
             return {
                 "slot": chosen,
@@ -345,11 +706,18 @@ class SaveManager:
         chosen = self._clamp_slot(slot)
         path = self.slot_path(chosen, profile=profile)
         backup_path = self._backup_path(path)
-        with self._file_lock(profile):
-            if path.exists():
-                path.unlink()
-            if backup_path.exists():
-                backup_path.unlink()
+
+        def _delete() -> None:
+            with self._file_lock(profile):
+                if path.exists():
+                    path.unlink()
+                if backup_path.exists():
+                    backup_path.unlink()
+                journal_path_for(path).unlink(missing_ok=True)
+                self._journal_baselines.pop(str(path), None)
+                self._record_slot_in_index(chosen, None, profile=profile)
+
+        self._write_exclusive(chosen, profile, _delete)
 
     def _clamp_slot(self, slot: int) -> int:
         value = int(slot)
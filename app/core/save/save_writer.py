@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import atexit
+from dataclasses import dataclass
+import logging
+import pickle
+import threading
+import time
+from typing import Callable
+import weakref
+
+
+LOG = logging.getLogger(__name__)
+
+SaveKey = tuple[str, int]
+_IDLE_EXIT_S = 30.0
+
+
+@dataclass
+class _PendingSave:
+    seq: int
+    snapshot: bytes
+    display_name: str | None
+    first_queued_at: float
+    due_at: float
+    attempts: int = 0
+
+
+class SaveWriter:
+    """Ecrit les sauvegardes de slot depuis un thread, en fusionnant les demandes rapprochees.
+
+    `submit` ne fait que figer l'etat (pickle du dict de sauvegarde) sur le thread appelant ;
+    l'encodage JSON, le verrou de fichier et les fsync se font dans le thread d'ecriture.
+    Pour un meme (profil, slot), seule la derniere demande est ecrite : chaque nouvelle
+    demande repousse l'ecriture de `delay_s`, sans depasser `max_delay_s` depuis la premiere.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[SaveKey, dict, str | None], None],
+        *,
+        delay_s: float = 0.5,
+        max_delay_s: float | None = None,
+        retry_max_s: float = 30.0,
+    ) -> None:
+        self._write_fn = write
+        self.delay_s = max(0.0, float(delay_s))
+        self.max_delay_s = max(self.delay_s, float(max_delay_s) if max_delay_s is not None else self.delay_s * 5)
+        self.retry_max_s = max(0.1, float(retry_max_s))
+        self._cond = threading.Condition()
+        # Serialise les ecritures du thread et celles de flush(); `_written_seq` evite
+        # qu'une demande plus ancienne ecrase une plus recente deja ecrite.
+        self._io_lock = threading.Lock()
+        self._pending: dict[SaveKey, _PendingSave] = {}
+        self._written_seq: dict[SaveKey, int] = {}
+        self._errors: dict[SaveKey, str] = {}
+        self._seq = 0
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+        self._stats = {
+            "submitted": 0,
+            "coalesced": 0,
+            "written": 0,
+            "failed": 0,
+            "latency_ms_total": 0.0,
+            "latency_ms_max": 0.0,
+            "write_ms_total": 0.0,
+            "write_ms_max": 0.0,
+        }
+        _LIVE_WRITERS.add(self)
+
+    def submit(self, key: SaveKey, raw_state: dict, *, display_name: str | None = None) -> None:
+        snapshot = pickle.dumps(raw_state, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.monotonic()
+        with self._cond:
+            self._seq += 1
+            self._stats["submitted"] += 1
+            previous = self._pending.get(key)
+            first_queued_at = now
+            if previous is not None:
+                self._stats["coalesced"] += 1
+                first_queued_at = previous.first_queued_at
+            self._pending[key] = _PendingSave(
+                seq=self._seq,
+                snapshot=snapshot,
+                display_name=display_name if display_name is not None else getattr(previous, "display_name", None),
+                first_queued_at=first_queued_at,
+                due_at=min(now + self.delay_s, first_queued_at + self.max_delay_s),
+            )
+            self._ensure_thread_locked()
+            self._cond.notify_all()
+
+    def write_now(self, key: SaveKey, write: Callable[[], None]) -> None:
+        """Execute `write` a la place des demandes en attente pour `key`, dans l'ordre des ecritures."""
+        with self._io_lock:
+            self.discard(key)
+            write()
+            with self._cond:
+                self._errors.pop(key, None)
+
+    def discard(self, key: SaveKey) -> None:
+        with self._cond:
+            self._pending.pop(key, None)
+            self._errors.pop(key, None)
+            self._written_seq[key] = self._seq
+
+    def has_pending(self, key: SaveKey | None = None) -> bool:
+        with self._cond:
+            return bool(self._pending) if key is None else key in self._pending
+
+    def pop_error(self, key: SaveKey) -> str:
+        with self._cond:
+            return self._errors.pop(key, "")
+
+    def flush(self, key: SaveKey | None = None) -> bool:
+        """Ecrit immediatement les demandes en attente (toutes, ou celle de `key`); faux si une ecriture a echoue."""
+        ok = True
+        with self._io_lock:
+            with self._cond:
+                if key is None:
+                    batch = list(self._pending.items())
+                    self._pending.clear()
+                else:
+                    entry = self._pending.pop(key, None)
+                    batch = [(key, entry)] if entry is not None else []
+            for key, entry in batch:
+                ok = self._write_locked(key, entry) and ok
+        return ok
+
+    def close(self) -> bool:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        ok = self.flush()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+        return ok
+
+    def stats(self) -> dict[str, float | int]:
+        with self._cond:
+            written = int(self._stats["written"])
+            return {
+                "queue_depth": len(self._pending),
+                "submitted": int(self._stats["submitted"]),
+                "coalesced": int(self._stats["coalesced"]),
+                "written": written,
+                "failed": int(self._stats["failed"]),
+                "avg_latency_ms": round(self._stats["latency_ms_total"] / written, 2) if written else 0.0,
+                "max_latency_ms": round(self._stats["latency_ms_max"], 2),
+                "avg_write_ms": round(self._stats["write_ms_total"] / written, 2) if written else 0.0,
+                "max_write_ms": round(self._stats["write_ms_max"], 2),
+            }
+
+    def _ensure_thread_locked(self) -> None:
+        if self._stopped or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    now = time.monotonic()
+                    next_due = min((entry.due_at for entry in self._pending.values()), default=None)
+                    if next_due is not None and next_due <= now:
+                        break
+                    if next_due is None:
+                        # Thread arrete quand il n'y a plus rien a ecrire; submit() le relance.
+                        if not self._cond.wait(_IDLE_EXIT_S) and not self._pending:
+                            self._thread = None
+                            return
+                        continue
+                    self._cond.wait(next_due - now)
+            # Les demandes sont retirees et ecrites sous `_io_lock`: quand flush() rend la main,
+            # plus aucune ecriture n'est en cours.
+            with self._io_lock:
+                with self._cond:
+                    now = time.monotonic()
+                    due = [key for key, entry in self._pending.items() if entry.due_at <= now]
+                    batch = [(key, self._pending.pop(key)) for key in due]
+                for key, entry in batch:
+                    self._write_locked(key, entry)
+
+    def _write_locked(self, key: SaveKey, entry: _PendingSave) -> bool:
+        with self._cond:
+            if entry.seq <= self._written_seq.get(key, 0):
+                return True
+        started = time.monotonic()
+        try:
+            self._write_fn(key, pickle.loads(entry.snapshot), entry.display_name)
+        except Exception as exc:
+            LOG.warning("save writer: write failed for %s slot %s (%s)", key[0], key[1], exc)
+            with self._cond:
+                self._stats["failed"] += 1
+                self._errors[key] = str(exc)
+                if key not in self._pending and not self._stopped:
+                    entry.attempts += 1
+                    entry.due_at = time.monotonic() + min(
+                        self.retry_max_s,
+                        max(self.delay_s, 0.1) * (2 ** entry.attempts),
+                    )
+                    self._pending[key] = entry
+                    self._cond.notify_all()
+            return False
+        finished = time.monotonic()
+        with self._cond:
+            self._written_seq[key] = max(self._written_seq.get(key, 0), entry.seq)
+            self._errors.pop(key, None)
+            latency_ms = (finished - entry.first_queued_at) * 1000.0
+            write_ms = (finished - started) * 1000.0
+            self._stats["written"] += 1
+            self._stats["latency_ms_total"] += latency_ms
+            self._stats["latency_ms_max"] = max(self._stats["latency_ms_max"], latency_ms)
+            self._stats["write_ms_total"] += write_ms
+            self._stats["write_ms_max"] = max(self._stats["write_ms_max"], write_ms)
+        return True
+
+
+_LIVE_WRITERS: "weakref.WeakSet[SaveWriter]" = weakref.WeakSet()
+
+
+def _flush_save_writers_at_exit() -> None:
+    for writer in list(_LIVE_WRITERS):
+        try:
+            writer.close()
+        except Exception:
+            continue
+
+
+atexit.register(_flush_save_writers_at_exit)
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import random
+from typing import Any, Iterable
+
+from app.infra import text_library
+
+from .dungeon_combat import build_combat_state, resolve_combat_turn
+from .dungeon_manager import RUN_RELICS
+from .monster_manager import MonsterManager
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependance optionnelle
+    np = None
+
+
+DEFAULT_MAX_TURNS = 60
+# Combats par tache envoyee a un processus: amortit le transfert des resultats.
+_CHUNK_SIZE = 250
+_ACTION_FALLBACK_TEXT = {
+    "attack": "attaque decisive",
+    "spell": "sort offensif",
+    "heal": "sort de soin",
+}
+
+
+@dataclass(frozen=True)
+class CombatScenario:
+    """Un combat de donjon a simuler: ennemi, personnage, relique et tactique.
+
+    `stats` est un tuple (stat, valeur) pour rester hashable et transmissible aux processus.
+    Le joueur utilise `action` a chaque tour, ou se soigne quand ses PV passent sous
+    `heal_below` (fraction des PV max, 0 = jamais).
+    """
+
+    floor: int = 1
+    event_type: str = "monster"
+    monster_id: str = ""
+    build: str = "equilibre"
+    stats: tuple[tuple[str, int], ...] = ()
+    player_max_hp: int = 20
+    relic_id: str = ""
+    action: str = "attack"
+    heal_below: float = 0.0
+
+    @property
+    def label(self) -> str:
+        parts = [f"etage {self.floor}", self.event_type]
+        if self.monster_id:
+            parts.append(self.monster_id)
+        parts.append(self.build)
+        if self.relic_id:
+            parts.append(self.relic_id)
+        tactic = self.action if self.heal_below <= 0 else f"{self.action}+soin<{int(self.heal_below * 100)}%"
+        parts.append(tactic)
+        return " | ".join(parts)
+
+
+@dataclass(frozen=True)
+class FightResult:
+    seed: int
+    victory: bool
+    defeat: bool
+    turns: int
+    # PV apres chaque tour, precedes des PV de depart.
+    player_hp: tuple[int, ...]
+    enemy_hp: tuple[int, ...]
+
+
+@dataclass
+class CombatSummary:
+    scenario: CombatScenario
+    fights: int
+    win_rate: float
+    loss_rate: float
+    timeout_rate: float
+    turns_mean: float
+    turns_median: float
+    turns_p90: float
+    hp_left_mean: float
+    # Moyenne par tour (un combat termine garde ses derniers PV).
+    player_hp_curve: list[float] = field(default_factory=list)
+    enemy_hp_curve: list[float] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "scenario": self.scenario.label,
+            "fights": self.fights,
+            "win_rate": round(self.win_rate, 4),
+            "loss_rate": round(self.loss_rate, 4),
+            "timeout_rate": round(self.timeout_rate, 4),
+            "turns_mean": round(self.turns_mean, 2),
+            "turns_median": self.turns_median,
+            "turns_p90": self.turns_p90,
+            "hp_left_mean": round(self.hp_left_mean, 2),
+            "player_hp_curve": [round(v, 2) for v in self.player_hp_curve],
+            "enemy_hp_curve": [round(v, 2) for v in self.enemy_hp_curve],
+        }
+
+
+def relic_by_id(relic_id: str) -> dict | None:
+    clean = str(relic_id or "").strip().casefold()
+    for relic in RUN_RELICS:
+        if relic["id"] == clean:
+            return dict(relic)
+    return None
+
+
+def action_text(kind: str) -> str:
+    """Texte envoye par les boutons de combat (premiere variante, pour rester deterministe)."""
+    phrases = text_library.get_phrases(f"system.combat.action.{kind}")
+    return phrases[0] if phrases else _ACTION_FALLBACK_TEXT.get(kind, _ACTION_FALLBACK_TEXT["attack"])
+
+
+def simulate_fight(
+    scenario: CombatScenario,
+    seed: int,
+    *,
+    monster_manager: Any = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+) -> FightResult:
+    """Joue un combat complet avec `build_combat_state` et `resolve_combat_turn`.
+
+    Tous les jets passent par `random.Random(seed)`: un meme seed rejoue exactement
+    le meme combat. Les PV sont bornes aux PV max de base entre deux tours, comme le
+    fait le runtime Telegram.
+    """
+    rng = random.Random(seed)
+    relic = relic_by_id(scenario.relic_id)
+    event = {
+        "type": scenario.event_type,
+        "floor": scenario.floor,
+        "monster_id": scenario.monster_id,
+        "boss": scenario.event_type == "boss",
+    }
+    if relic is not None:
+        event["run_relic"] = relic
+    combat = build_combat_state(event, rng=rng, monster_manager=monster_manager)
+    sheet = {"stats": dict(scenario.stats)}
+    max_hp = max(1, int(scenario.player_max_hp))
+    hp = max_hp
+    attack_text = action_text(scenario.action)
+    heal_text = action_text("heal")
+
+    player_curve = [hp]
+    enemy_curve = [int(combat.get("enemy_hp") or 0)]
+    victory = defeat = False
+    turns = 0
+    while turns < max(1, int(max_turns)):
+        healing = scenario.heal_below > 0 and hp < max_hp * scenario.heal_below
+        result = resolve_combat_turn(
+            combat_state=combat,
+            action_text=heal_text if healing else attack_text,
+            player_hp=hp,
+            player_max_hp=max_hp,
+            player_sheet=sheet,
+            known_skills=[],
+            skill_manager=None,
+            rng=rng,
+            run_relic=relic,
+        )
+        turns += 1
+        combat = result["combat"]
+        hp = min(max(0, int(result["player_hp"])), max_hp)
+        player_curve.append(hp)
+        enemy_curve.append(int(result["enemy_hp"]))
+        victory = bool(result["victory"])
+        defeat = bool(result["defeat"])
+        if victory or defeat:
+            break
+    return FightResult(
+        seed=int(seed),
+        victory=victory,
+        defeat=defeat,
+        turns=turns,
+        player_hp=tuple(player_curve),
+        enemy_hp=tuple(enemy_curve),
+    )
+
+
+class _ProfileCache:
+    """Profils de combat memorises par evenement (ils ne consomment pas de jets)."""
+
+    def __init__(self, manager: MonsterManager) -> None:
+        self._manager = manager
+        self._profiles: dict[tuple, dict | None] = {}
+
+    def combat_profile_for_event(self, event: dict) -> dict | None:
+        key = tuple(sorted((k, repr(v)) for k, v in event.items()))
+        if key not in self._profiles:
+            self._profiles[key] = self._manager.combat_profile_for_event(event)
+        profile = self._profiles[key]
+        return dict(profile) if isinstance(profile, dict) else None
+
+
+def _simulate_chunk(task: tuple[CombatScenario, list[int], str, int]) -> list[FightResult]:
+    scenario, seeds, monsters_dir, max_turns = task
+    manager = _ProfileCache(MonsterManager(data_dir=monsters_dir)) if monsters_dir else None
+    return [simulate_fight(scenario, seed, monster_manager=manager, max_turns=max_turns) for seed in seeds]
+
+
+def simulate_batch(
+    scenarios: Iterable[CombatScenario],
+    seeds: Iterable[int],
+    *,
+    monsters_dir: str = "data/monsters",
+    max_turns: int = DEFAULT_MAX_TURNS,
+    workers: int = 1,
+) -> dict[CombatScenario, list[FightResult]]:
+    """Simule chaque scenario pour chaque seed (memes seeds pour tous: comparaisons a jets communs).
+
+    Avec `workers > 1`, les combats sont repartis par paquets sur un pool de processus;
+    les resultats sont identiques a l'execution sequentielle.
+    """
+    scenario_list = list(dict.fromkeys(scenarios))
+    seed_list = [int(seed) for seed in seeds]
+    tasks = [
+        (scenario, seed_list[start:start + _CHUNK_SIZE], monsters_dir, max_turns)
+        for scenario in scenario_list
+        for start in range(0, len(seed_list), _CHUNK_SIZE)
+    ]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, tasks))
+    else:
+        chunks = [_simulate_chunk(task) for task in tasks]
+
+    out: dict[CombatScenario, list[FightResult]] = {scenario: [] for scenario in scenario_list}
+    for task, results in zip(tasks, chunks):
+        out[task[0]].extend(results)
+    return out
+
+
+def _percentile(sorted_values: list[int], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Rang le plus proche (pas d'interpolation: les tours sont entiers).
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return float(sorted_values[idx])
+
+
+def _mean_curves(curves: list[tuple[int, ...]]) -> list[float]:
+    if not curves:
+        return []
+    width = max(len(curve) for curve in curves)
+    if np is not None:
+        grid = np.array([curve + (curve[-1],) * (width - len(curve)) for curve in curves], dtype=np.float64)
+        return grid.mean(axis=0).tolist()
+    totals = [0.0] * width
+    for curve in curves:
+        for turn in range(width):
+            totals[turn] += curve[turn] if turn < len(curve) else curve[-1]
+    return [total / len(curves) for total in totals]
+
+
+def summarize(scenario: CombatScenario, results: list[FightResult]) -> CombatSummary:
+    fights = len(results)
+    if fights == 0:
+        return CombatSummary(scenario, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    wins = [result for result in results if result.victory]
+    losses = sum(1 for result in results if result.defeat)
+    turns = sorted(result.turns for result in wins)
+    return CombatSummary(
+        scenario=scenario,
+        fights=fights,
+        win_rate=len(wins) / fights,
+        loss_rate=losses / fights,
+        timeout_rate=(fights - len(wins) - losses) / fights,
+        turns_mean=(sum(turns) / len(turns)) if turns else 0.0,
+        turns_median=_percentile(turns, 0.5),
+        turns_p90=_percentile(turns, 0.9),
+        hp_left_mean=(sum(result.player_hp[-1] for result in wins) / len(wins)) if wins else 0.0,
+        player_hp_curve=_mean_curves([result.player_hp for result in results]),
+        enemy_hp_curve=_mean_curves([result.enemy_hp for result in results]),
+    )
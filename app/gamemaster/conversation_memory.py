@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 import re
 from typing import Any
 
-from app.core.memory import get_memory_service
+from app.core.memory import MemoryEntry, dialogue_turn_entries, get_memory_service
 
 
 SHORT_TERM_MAX_ITEMS = 60
@@ -313,12 +313,14 @@ def remember_dialogue_turn(
     try:
         service = get_memory_service()
         profile_key = _memory_profile_key(state)
-        service.remember_dialogue_turn(
+        service.append_many(
             profile_key=profile_key,
             npc_id=key,
-            player_text=safe_player_text,
-            npc_reply=safe_npc_reply,
-            scene_title=scene_title,
+            entries=dialogue_turn_entries(
+                player_text=safe_player_text,
+                npc_reply=safe_npc_reply,
+                scene_title=scene_title,
+            ),
         )
     except Exception:
         pass
@@ -363,13 +365,18 @@ def remember_system_event(
     try:
         service = get_memory_service()
         profile_key = _memory_profile_key(state)
-        service.remember_system_event(
+        service.append_many(
             profile_key=profile_key,
             npc_id=None if key == _NO_NPC_KEY else key,
-            fact_text=summary,
-            kind=normalized_kind,
-            importance=max(0.0, min(1.0, float(max(1, min(5, _safe_int(importance, 3))) / 5.0))),
-            world_only=(key == _NO_NPC_KEY),
+            entries=[
+                MemoryEntry(
+                    kind="system",
+                    text=summary,
+                    event_kind=normalized_kind,
+                    importance=max(0.0, min(1.0, float(max(1, min(5, _safe_int(importance, 3))) / 5.0))),
+                    world_only=(key == _NO_NPC_KEY),
+                )
+            ],
         )
     except Exception:
         pass
@@ -397,6 +404,17 @@ def _latest_query_text(state: Any) -> str:
     return ""
 
 
+async def warm_memory_query(state: Any) -> None:
+    """Embed the retrieval query asynchronously so the sync `build_*_context` calls hit the cache."""
+    query = _latest_query_text(state)
+    if not query:
+        return
+    try:
+        await get_memory_service().embeddings.aembed_arrays([query])
+    except Exception:
+        pass
+
+
 def build_short_term_context(state: Any, npc_key: str | None, *, max_lines: int = 10) -> str:
     ensure_conversation_memory_state(state)
     key = _clean_key(npc_key)
@@ -4,8 +4,9 @@ import json
 from dataclasses import dataclass
 from pathlib import Path
 
+from app.core.data.catalog_cache import CatalogSnapshot, get_catalog_registry
 from app.core.data.item_manager import ItemDef
-from app.ui.state.inventory import ItemStack
+from app.ui.state.inventory import add_item, count_item, remove_item
 
 
 @dataclass(frozen=True)
@@ -29,12 +30,12 @@ class CraftRecipe:
 class CraftManager:
     def __init__(self, *, data_path: str = "data/crafting_recipes.json") -> None:
         self.data_path = Path(data_path)
-        self._cache: dict[str, CraftRecipe] | None = None
 
     def load_recipes(self) -> dict[str, CraftRecipe]:
-        if isinstance(self._cache, dict):
-            return self._cache
+        """Recettes partagees (lecture seule), relues seulement si le fichier change."""
+        return get_catalog_registry().load("recipes", self.data_path, self._read_recipes)
 
+    def _read_recipes(self) -> CatalogSnapshot:
         rows: list[dict] = []
         if self.data_path.exists():
             try:
@@ -52,8 +53,7 @@ class CraftManager:
             if recipe is None:
                 continue
             out[recipe.recipe_id] = recipe
-        self._cache = out
-        return out
+        return CatalogSnapshot(out)
 
     def list_recipes_text(self, *, item_defs: dict[str, ItemDef] | None = None) -> str:
         recipes = self.load_recipes()
@@ -217,83 +217,15 @@ class CraftManager:
         return True
 
     def _count_item(self, state, item_id: str) -> int:
-        target = str(item_id or "").strip().casefold()
-        total = 0
-        for grid in (state.carried, state.storage):
-            for stack in grid.slots:
-                if stack is None:
-                    continue
-                if str(stack.item_id or "").strip().casefold() != target:
-                    continue
-                total += max(0, self._safe_int(getattr(stack, "qty", 0), 0))
-        return total
+        return count_item((state.carried, state.storage), item_id)
 
     def _remove_item(self, state, item_id: str, qty: int) -> int:
-        target = str(item_id or "").strip().casefold()
-        remaining = max(0, int(qty))
-        removed = 0
-        for grid in (state.carried, state.storage):
-            for idx, stack in enumerate(grid.slots):
-                if remaining <= 0:
-                    break
-                if stack is None:
-                    continue
-                if str(stack.item_id or "").strip().casefold() != target:
-                    continue
-                stack_qty = max(0, self._safe_int(getattr(stack, "qty", 0), 0))
-                if stack_qty <= 0:
-                    continue
-                take = min(stack_qty, remaining)
-                new_qty = stack_qty - take
-                if new_qty > 0:
-                    grid.slots[idx] = ItemStack(item_id=target, qty=new_qty)
-                else:
-                    grid.slots[idx] = None
-                remaining -= take
-                removed += take
-            if remaining <= 0:
-                break
-        return removed
+        return remove_item((state.carried, state.storage), item_id, qty)
 
     def _add_item(self, state, item_id: str, qty: int, *, item_defs: dict[str, ItemDef]) -> int:
-        target = str(item_id or "").strip().casefold()
-        remaining = max(0, int(qty))
-        added = 0
-        item = item_defs.get(target)
+        item = item_defs.get(str(item_id or "").strip().casefold())
         stack_max = max(1, self._safe_int(getattr(item, "stack_max", 1), 1))
-
-        for grid in (state.carried, state.storage):
-            for stack in grid.slots:
-                if remaining <= 0:
-                    break
-                if stack is None:
-                    continue
-                if str(stack.item_id or "").strip().casefold() != target:
-                    continue
-                stack_qty = max(0, self._safe_int(getattr(stack, "qty", 0), 0))
-                capacity = max(0, stack_max - stack_qty)
-                if capacity <= 0:
-                    continue
-                take = min(capacity, remaining)
-                stack.qty = stack_qty + take
-                remaining -= take
-                added += take
-            if remaining <= 0:
-                break
-
-        for grid in (state.carried, state.storage):
-            while remaining > 0:
-                try:
-                    idx = grid.slots.index(None)
-                except ValueError:
-                    break
-                take = min(stack_max, remaining)
-                grid.slots[idx] = ItemStack(item_id=target, qty=take)
-                remaining -= take
-                added += take
-            if remaining <= 0:
-                break
-        return added
+        return add_item((state.carried, state.storage), item_id, qty, stack_max=stack_max)
 
     def _item_label(self, item_defs: dict[str, ItemDef], item_id: str) -> str:
         item = item_defs.get(str(item_id or "").strip().casefold()) if isinstance(item_defs, dict) else None
@@ -9,9 +9,42 @@ from typing import Any
 
 from pydantic import BaseModel, Field, ValidationError
 
+from .llm_scheduler import LANE_BACKGROUND, llm_lane
 from .models import model_for
 
 
+RUN_RELICS: tuple[dict, ...] = (
+    {
+        "id": "relique_cendre",
+        "name": "Relique de cendre",
+        "effect": "attack",
+        "bonus": 2,
+        "description": "Augmente vos jets offensifs en donjon.",
+    },
+    {
+        "id": "relique_garde",
+        "name": "Relique de garde",
+        "effect": "defense",
+        "bonus": 2,
+        "description": "Renforce votre defense contre les monstres.",
+    },
+    {
+        "id": "relique_sang",
+        "name": "Relique de sang",
+        "effect": "max_hp",
+        "bonus": 6,
+        "description": "Accorde une reserve de vitalite temporaire.",
+    },
+    {
+        "id": "relique_flux",
+        "name": "Relique du flux",
+        "effect": "heal",
+        "bonus": 2,
+        "description": "Ameliore les soins pendant l'expedition.",
+    },
+)
+
+
 class DungeonProfileDraft(BaseModel):
     name: str
     theme: str
@@ -82,14 +115,15 @@ class DungeonManager:
     async def _generate_profile(self, anchor: str) -> dict:
         prompt = self._profile_prompt(anchor)
         try:
-            raw = await self.llm.generate(
-                model=model_for("rules"),
-                prompt=prompt,
-                temperature=0.35,
-                num_ctx=3072,
-                num_predict=420,
-                stop=None,
-            )
+            with llm_lane(LANE_BACKGROUND):
+                raw = await self.llm.generate(
+                    model=model_for("rules"),
+                    prompt=prompt,
+                    temperature=0.35,
+                    num_ctx=3072,
+                    num_predict=420,
+                    stop=None,
+                )
             draft = self._parse_profile(raw, anchor)
             monsters = [m.strip() for m in draft.monster_pool if isinstance(m, str) and m.strip()][:8]
             treasures = [t.strip() for t in draft.treasure_pool if isinstance(t, str) and t.strip()][:8]
@@ -278,34 +312,4 @@ class DungeonManager:
         return "{}"
 
     def _roll_run_relic(self) -> dict:
-        pool = [
-            {
-                "id": "relique_cendre",
-                "name": "Relique de cendre",
-                "effect": "attack",
-                "bonus": 2,
-                "description": "Augmente vos jets offensifs en donjon.",
-            },
-            {
-                "id": "relique_garde",
-                "name": "Relique de garde",
-                "effect": "defense",
-                "bonus": 2,
-                "description": "Renforce votre defense contre les monstres.",
-            },
-            {
-                "id": "relique_sang",
-                "name": "Relique de sang",
-                "effect": "max_hp",
-                "bonus": 6,
-                "description": "Accorde une reserve de vitalite temporaire.",
-            },
-            {
-                "id": "relique_flux",
-                "name": "Relique du flux",
-                "effect": "heal",
-                "bonus": 2,
-                "description": "Ameliore les soins pendant l'expedition.",
-            },
-        ]
-        return dict(random.choice(pool))
+        return dict(random.choice(RUN_RELICS))
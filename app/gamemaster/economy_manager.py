@@ -1,16 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-import difflib
 import json
 from pathlib import Path
 import re
 import unicodedata
 
+from app.core.data.catalog_cache import CatalogSnapshot, get_catalog_registry
 from app.core.data.item_manager import ItemDef, ItemsManager
+from app.core.data.item_search import get_item_search_index, normalize_search_text
 from app.gamemaster.reputation_manager import merchant_price_multiplier_from_reputation
 from app.gamemaster.world_time import day_index
-from app.ui.state.inventory import ItemStack
+from app.ui.state.inventory import add_item, count_item, item_totals, remove_item
 
 
 _MERCHANT_HINTS = (
@@ -71,6 +72,9 @@ _TYPE_HINTS = {
     "accessory": {"anneau", "amulette", "talisman", "accessoire"},
     "material": {"minerai", "bois", "cuir", "materiau", "matériau"},
 }
+_TYPE_HINT_TOKENS = {
+    item_type: {normalize_search_text(hint) for hint in hints} for item_type, hints in _TYPE_HINTS.items()
+}
 
 _NUMBER_WORDS = {
     "un": 1,
@@ -238,20 +242,11 @@ class EconomyManager:
         self.data_dir = Path(data_dir)
         self.items = ItemsManager(data_dir=data_dir)
         self.merchants_dir = self.data_dir / "merchants"
+        # Catalogue impose (tests); sinon le catalogue partage du registre est utilise.
         self._merchant_catalog_cache: dict[str, dict] | None = None
 
     def inventory_totals(self, state) -> dict[str, int]:
-        out: dict[str, int] = {}
-        for grid in (state.carried, state.storage):
-            for stack in grid.slots:
-                if stack is None:
-                    continue
-                item_id = str(stack.item_id or "").strip().casefold()
-                qty = int(getattr(stack, "qty", 0) or 0)
-                if not item_id or qty <= 0:
-                    continue
-                out[item_id] = out.get(item_id, 0) + qty
-        return out
+        return item_totals((state.carried, state.storage))
 
     def inventory_summary(self, state, item_defs: dict[str, ItemDef], *, limit: int = 12) -> str:
         totals = self.inventory_totals(state)
@@ -1490,11 +1485,12 @@ class EconomyManager:
     def _load_merchants_catalog(self) -> dict[str, dict]:
         if isinstance(self._merchant_catalog_cache, dict):
             return self._merchant_catalog_cache
+        return get_catalog_registry().load("merchants", self.merchants_dir, self._read_merchants_catalog)
 
+    def _read_merchants_catalog(self) -> CatalogSnapshot:
         catalog: dict[str, dict] = {}
         if not self.merchants_dir.exists():
-            self._merchant_catalog_cache = catalog
-            return catalog
+            return CatalogSnapshot(catalog)
 
         for path in sorted(self.merchants_dir.glob("*.json")):
             try:
@@ -1537,8 +1533,7 @@ class EconomyManager:
                 "inventory": inventory,
             }
 
-        self._merchant_catalog_cache = catalog
-        return catalog
+        return CatalogSnapshot(catalog)
 
     def _resolve_merchant_entry(self, *, state, selected_npc_name: str, selected_npc_profile: dict | None) -> dict | None:
         catalog = self._load_merchants_catalog()
@@ -1665,44 +1660,30 @@ class EconomyManager:
         if q in item_defs:
             return q, 100.0
 
-        by_name: dict[str, str] = {}
-        for item_id, item in item_defs.items():
-            by_name[self._norm(item_id)] = item_id
-            by_name[self._norm(item.name)] = item_id
-        if q in by_name:
-            return by_name[q], 98.0
+        index = get_item_search_index(item_defs)
+        exact = index.exact(q)
+        if exact is not None:
+            return exact, 98.0
 
         tokens = [t for t in q.split() if t and t not in _STOPWORDS]
-        best_id: str | None = None
-        best_score = 0.0
-        for item_id, item in item_defs.items():
-            hay = " ".join(
-                (
-                    self._norm(item_id),
-                    self._norm(item.name),
-                    self._norm(item.type),
-                    self._norm(item.slot),
-                    self._norm(item.description),
-                )
-            )
-            score = 0.0
-            for token in tokens:
-                if token and token in hay:
-                    score += 2.0
-            for item_type, hints in _TYPE_HINTS.items():
-                if item_type == self._norm(item.type) and any(self._norm(h) in tokens for h in hints):
-                    score += 1.5
-            if score > best_score:
-                best_score = score
-                best_id = item_id
-
-        if best_id and best_score >= 1.5:
-            return best_id, best_score
-
-        all_keys = list(by_name.keys())
-        close = difflib.get_close_matches(q, all_keys, n=1, cutoff=0.7)
+        scores: dict[str, float] = {}
+        for token in tokens:
+            for item_id in index.ids_containing(token):
+                scores[item_id] = scores.get(item_id, 0.0) + 2.0
+        for item_type, hints in _TYPE_HINT_TOKENS.items():
+            if any(h in tokens for h in hints):
+                for item_id in index.ids_of_type(item_type):
+                    scores[item_id] = scores.get(item_id, 0.0) + 1.5
+
+        if scores:
+            # Meilleur score; a egalite, le premier objet du catalogue.
+            best_id = max(scores, key=lambda item_id: (scores[item_id], -index.position[item_id]))
+            if scores[best_id] >= 1.5:
+                return best_id, scores[best_id]
+
+        close = index.close_keys(q, n=1, cutoff=0.7)
         if close:
-            return by_name[close[0]], 1.0
+            return index.by_key[close[0]], 1.0
         return None, 0.0
 
     def _ensure_trade_item_exists(self, query: str, item_defs: dict[str, ItemDef]) -> tuple[str, dict[str, ItemDef]] | None:
@@ -1711,8 +1692,8 @@ class EconomyManager:
         if not words:
             return None
         item_type = "misc"
-        for candidate_type, hints in _TYPE_HINTS.items():
-            if any(self._norm(h) in words for h in hints):
+        for candidate_type, hints in _TYPE_HINT_TOKENS.items():
+            if any(h in words for h in hints):
                 item_type = candidate_type
                 break
 
@@ -1842,94 +1823,15 @@ class EconomyManager:
         return any(self._norm(h) in hay for h in _BEGGAR_HINTS)
 
     def _count_item(self, state, item_id: str) -> int:
-        total = 0
-        target = str(item_id or "").strip().casefold()
-        if not target:
-            return 0
-        for grid in (state.carried, state.storage):
-            for stack in grid.slots:
-                if stack is None:
-                    continue
-                sid = str(stack.item_id or "").strip().casefold()
-                if sid != target:
-                    continue
-                total += max(0, self._safe_int(getattr(stack, "qty", 0), 0))
-        return total
+        return count_item((state.carried, state.storage), item_id)
 
     def _remove_item_from_inventory(self, state, item_id: str, qty: int) -> int:
-        target = str(item_id or "").strip().casefold()
-        remaining = max(0, int(qty))
-        removed = 0
-        if not target or remaining <= 0:
-            return 0
-        for grid in (state.carried, state.storage):
-            for idx, stack in enumerate(grid.slots):
-                if remaining <= 0:
-                    break
-                if stack is None:
-                    continue
-                sid = str(stack.item_id or "").strip().casefold()
-                if sid != target:
-                    continue
-                sqty = max(0, self._safe_int(getattr(stack, "qty", 0), 0))
-                if sqty <= 0:
-                    continue
-                take = min(sqty, remaining)
-                new_qty = sqty - take
-                if new_qty > 0:
-                    grid.slots[idx] = ItemStack(item_id=target, qty=new_qty)
-                else:
-                    grid.slots[idx] = None
-                remaining -= take
-                removed += take
-            if remaining <= 0:
-                break
-        return removed
+        return remove_item((state.carried, state.storage), item_id, qty)
 
     def _add_item_to_inventory(self, state, item_id: str, qty: int, *, item_defs: dict[str, ItemDef]) -> int:
-        target = str(item_id or "").strip().casefold()
-        remaining = max(0, int(qty))
-        added = 0
-        if not target or remaining <= 0:
-            return 0
-        item = item_defs.get(target)
-        stack_max = 1
-        if item is not None:
-            stack_max = max(1, self._safe_int(getattr(item, "stack_max", 1), 1))
-
-        for grid in (state.carried, state.storage):
-            for stack in grid.slots:
-                if remaining <= 0:
-                    break
-                if stack is None:
-                    continue
-                sid = str(stack.item_id or "").strip().casefold()
-                if sid != target:
-                    continue
-                sqty = max(0, self._safe_int(getattr(stack, "qty", 0), 0))
-                cap = max(0, stack_max - sqty)
-                if cap <= 0:
-                    continue
-                put = min(cap, remaining)
-                stack.qty = sqty + put
-                remaining -= put
-                added += put
-            if remaining <= 0:
-                break
-
-        for grid in (state.carried, state.storage):
-            while remaining > 0:
-                try:
-                    idx = grid.slots.index(None)
-                except ValueError:
-                    break
-                put = min(stack_max, remaining)
-                grid.slots[idx] = ItemStack(item_id=target, qty=put)
-                remaining -= put
-                added += put
-            if remaining <= 0:
-                break
-        return added
+        item = item_defs.get(str(item_id or "").strip().casefold())
+        stack_max = max(1, self._safe_int(getattr(item, "stack_max", 1), 1)) if item is not None else 1
+        return add_item((state.carried, state.storage), item_id, qty, stack_max=stack_max)
 
     def _norm(self, text: str) -> str:
         raw = unicodedata.normalize("NFKD", str(text or "").strip()).encode("ascii", "ignore").decode("ascii")
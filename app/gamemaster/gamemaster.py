@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import aclosing
 import difflib
 import hashlib
 import json
+import logging
 import os
 import random
 import re
+import threading
+import time
 import unicodedata
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable
 from pydantic import ValidationError
 
 from app.core.events import (
@@ -18,6 +23,7 @@ from app.core.events import (
     OnTradeCompleted,
     get_global_event_bus,
 )
+from .economy_manager import EconomyManager
 from .ollama_client import OllamaClient
 from .models import MODEL_NAME, model_for
 from .debug_commands import parse_debug_command
@@ -66,6 +72,88 @@ from .telegram_ataryxia_core import (
 NARRATION_MAX_SENTENCES_DEFAULT = 2
 NARRATION_MAX_SENTENCES_TRAINING = 1
 NARRATION_MAX_CHARS = 220
+# Streamed dialogue length (ending on a full sentence) from which the pipelined narration starts;
+# 0 (default): the narration waits for the full dialogue.
+NARRATION_PREFIX_CHARS_DEFAULT = 0
+# Longest prefix ending on a full sentence (terminal punctuation followed by a space or the end).
+_COMPLETE_SENTENCES_RE = re.compile(r".*[.!?…](?=\s|$)", flags=re.DOTALL)
+
+# Fast path: turns that clearly need neither rolls, state patch nor choices skip the rules LLM.
+FAST_PATH_MAX_WORDS = 30
+FAST_PATH_MAX_CHARS = 220
+_FAST_PATH_BLOCKERS_RE = re.compile(
+    r"\b("
+    r"aller|allons|allez|vais|voyag\w*|partir|pars|rendre|route|direction|emmene\w*|conduis\w*|"
+    r"attaqu\w*|frapp\w*|tue[rz]?|combat\w*|degaine\w*|arme|epee|dague|fuir|fuis|"
+    r"vole[rz]?|crochet\w*|escalad\w*|cache[rz]?|infiltr\w*|fouill\w*|force[rz]?|pousse[rz]?|"
+    r"lance[rz]?|sort|magie|soign\w*|utilise[rz]?|equipe[rz]?|ouvr\w*|ouvre|prends|donne|"
+    r"quete|mission|contrat|jure[rz]?|promets|seduis\w*|embrass\w*|menac\w*"
+    r")\b"
+)
+_FAST_PATH_NARRATION_HOOKS = [
+    "L'echange se poursuit sans heurt.",
+    "Le PNJ prend le temps de repondre.",
+    "La conversation suit son cours, calme.",
+]
+
+LOG = logging.getLogger(__name__)
+
+# Receives the dialogue text generated so far (cumulative, not a delta) while a turn streams.
+DialogueStreamCallback = Callable[[str], Awaitable[None]]
+_STREAM_TAG_RE = re.compile(r"\[(?:MEDIA|GEN_IMG):[^\]]*\]", flags=re.IGNORECASE)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000.0, 1)
+
+
+# Process-wide counters (every GameMaster, closed ones included) for the admin diagnostics view.
+_process_stats_lock = threading.Lock()
+_process_plan_stats = {"turns": 0, "fast_path": 0, "llm": 0, "llm_ms_total": 0.0}
+_process_turn_timings: dict[str, Any] = {"turns": 0, "totals_ms": {}, "last_ms": {}}
+
+
+def _summarize_plan_stats(raw: dict) -> dict[str, float]:
+    turns = int(raw["turns"])
+    fast = int(raw["fast_path"])
+    llm = int(raw["llm"])
+    avg_llm_ms = raw["llm_ms_total"] / llm if llm else 0.0
+    return {
+        "turns": turns,
+        "fast_path": fast,
+        "llm": llm,
+        "hit_rate": round(fast / turns, 4) if turns else 0.0,
+        "avg_llm_plan_ms": round(avg_llm_ms, 1),
+        # Estimated from the average rules-model round-trip of the turns that did call it.
+        "saved_ms_estimate": round(fast * avg_llm_ms, 1),
+    }
+
+
+def _record_turn_timings(timings: dict[str, float]) -> None:
+    stages = {key: float(value) for key, value in timings.items() if key.endswith("_ms")}
+    with _process_stats_lock:
+        _process_turn_timings["turns"] += 1
+        totals = _process_turn_timings["totals_ms"]
+        for key, value in stages.items():
+            total, count = totals.get(key, (0.0, 0))
+            totals[key] = (total + value, count + 1)
+        _process_turn_timings["last_ms"] = dict(timings)
+
+
+def gamemaster_stats() -> dict[str, Any]:
+    """Plan fast path and turn timings over all GameMaster instances of the process."""
+    with _process_stats_lock:
+        plan = _summarize_plan_stats(_process_plan_stats)
+        turns = int(_process_turn_timings["turns"])
+        totals = dict(_process_turn_timings["totals_ms"])
+        last = dict(_process_turn_timings["last_ms"])
+    return {
+        "plan": plan,
+        "timed_turns": turns,
+        # Per stage, over the turns that went through it (not every turn narrates or streams).
+        "avg_timings_ms": {key: round(total / count, 1) for key, (total, count) in totals.items()},
+        "last_timings_ms": last,
+    }
 
 
 class GameMaster:
@@ -76,6 +164,10 @@ class GameMaster:
         seed: int | None = None,
         decision_mode_v2: bool | None = None,
         event_bus: EventBus | None = None,
+        pipelined_turn: bool | None = None,
+        narration_prefix_chars: int | None = None,
+        plan_fast_path: bool | None = None,
+        economy_manager: EconomyManager | None = None,
     ):
         self.llm = llm
         self.debug_enabled = False
@@ -86,6 +178,26 @@ class GameMaster:
             self.decision_mode_v2_default = env_value not in {"0", "false", "off", "no"}
         else:
             self.decision_mode_v2_default = bool(decision_mode_v2)
+        if pipelined_turn is None:
+            env_value = str(os.getenv("GM_PIPELINED_TURN", "1")).strip().casefold()
+            self.pipelined_turn = env_value not in {"0", "false", "off", "no"}
+        else:
+            self.pipelined_turn = bool(pipelined_turn)
+        if narration_prefix_chars is None:
+            narration_prefix_chars = self._safe_int(
+                os.getenv("GM_NARRATION_PREFIX_CHARS", str(NARRATION_PREFIX_CHARS_DEFAULT)),
+                NARRATION_PREFIX_CHARS_DEFAULT,
+            )
+        # >0: narration starts from the first streamed dialogue sentence(s) of at least this length
+        # (restarted on the final reply if it does not begin with that preview); 0: after the dialogue.
+        self.narration_prefix_chars = max(0, int(narration_prefix_chars))
+        if plan_fast_path is None:
+            env_value = str(os.getenv("GM_PLAN_FAST_PATH", "1")).strip().casefold()
+            self.plan_fast_path = env_value not in {"0", "false", "off", "no"}
+        else:
+            self.plan_fast_path = bool(plan_fast_path)
+        self._economy_manager = economy_manager
+        self._plan_stats = {"turns": 0, "fast_path": 0, "llm": 0, "llm_ms_total": 0.0}
         self.event_bus = event_bus if isinstance(event_bus, EventBus) else get_global_event_bus()
         self._pending_events: list[Any] = []
         self._event_unsubscribers: list[Callable[[], None]] = []
@@ -101,7 +213,18 @@ class GameMaster:
                 continue
         self._event_unsubscribers.clear()
 
-    async def play_turn(self, state: dict, user_text: str) -> TurnResult:
+    async def play_turn(
+        self,
+        state: dict,
+        user_text: str,
+        *,
+        on_dialogue: DialogueStreamCallback | None = None,
+    ) -> TurnResult:
+        """Run one turn; with `on_dialogue`, the NPC reply is streamed to it as it is generated.
+
+        Streamed text is a raw preview: the returned `TurnResult.dialogue` is the sanitized
+        final reply and should replace it.
+        """
         # ---- DEBUG layer (temporary) ----
         choice, handled = parse_debug_command(user_text, self.debug_enabled)
         self.debug_enabled = choice.enabled
@@ -127,23 +250,103 @@ class GameMaster:
             return TurnResult(mode="debug", model_used=self.debug_forced, narration=out)
 
         # ---- AUTO pipeline ----
-        return await self._play_turn_auto(state, text)
+        return await self._play_turn_auto(state, text, on_dialogue=on_dialogue)
+
+    async def _generate_dialogue(
+        self,
+        *,
+        speaker: str,
+        on_dialogue: DialogueStreamCallback | None,
+        **kwargs: Any,
+    ) -> str:
+        stream = getattr(self.llm, "generate_stream", None)
+        if on_dialogue is None or not callable(stream):
+            return await self.llm.generate(**kwargs)
 
-    async def _play_turn_auto(self, state: dict, user_text: str) -> TurnResult:
+        parts: list[str] = []
+        last_preview = ""
+        try:
+            # aclosing: the scheduler slot held by the stream is released even if this turn is cancelled.
+            async with aclosing(stream(**kwargs)) as fragments:
+                async for fragment in fragments:
+                    parts.append(fragment)
+                    preview = self._dialogue_stream_preview("".join(parts), speaker=speaker)
+                    if preview and preview != last_preview:
+                        last_preview = preview
+                        try:
+                            await on_dialogue(preview)
+                        except Exception:
+                            pass
+        except Exception:
+            if not parts:
+                raise
+            # Stream cut mid-reply: the preview already shown is replaced by a complete reply.
+            return await self.llm.generate(**kwargs)
+        return "".join(parts).strip()
+
+    def _dialogue_extends_preview(self, dialogue_text: str | None, preview: str, *, speaker: str) -> bool:
+        final = self._dialogue_stream_preview(str(dialogue_text or ""), speaker=speaker)
+        return final.casefold().startswith(self._dialogue_stream_preview(preview, speaker=speaker).casefold())
+
+    def _dialogue_stream_preview(self, text: str, *, speaker: str) -> str:
+        preview = _STREAM_TAG_RE.sub("", str(text or ""))
+        open_tag = preview.rfind("[")
+        if open_tag >= 0 and "]" not in preview[open_tag:]:
+            preview = preview[:open_tag]
+        preview = re.sub(r"\s+", " ", preview).strip()
+        for name in {str(speaker or "").strip(), "Ataryxia"}:
+            if name and preview.casefold().startswith(f"{name.casefold()}:"):
+                preview = preview[len(name) + 1 :].strip()
+        return preview
+
+    async def _play_turn_auto(
+        self,
+        state: dict,
+        user_text: str,
+        *,
+        on_dialogue: DialogueStreamCallback | None = None,
+    ) -> TurnResult:
+        pending: list[asyncio.Task] = []
+        try:
+            return await self._run_turn_auto(state, user_text, on_dialogue=on_dialogue, pending=pending)
+        finally:
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+
+    async def _run_turn_auto(
+        self,
+        state: dict,
+        user_text: str,
+        *,
+        on_dialogue: DialogueStreamCallback | None,
+        pending: list[asyncio.Task],
+    ) -> TurnResult:
         selected_npc = str(state.get("selected_npc") or "").strip()
         prompt_user_text = self._sanitize_user_text_for_dialogue(user_text, selected_npc)
         if is_telegram_ataryxia_mode(state):
             return await self._play_turn_telegram_ataryxia(
                 state=state,
                 user_text=prompt_user_text,
+                on_dialogue=on_dialogue,
             )
         canon = build_canon_summary(state, prompt_user_text)
         decision_mode_v2 = self._decision_mode_v2_enabled(state)
         verbose_mode = self._verbose_mode_enabled(state)
         system_lines: list[str] = []
 
-        # 1) RULES: plan JSON (mistral)
-        plan = self._normalize_plan_for_engine(await self._get_plan(canon))
+        timings: dict[str, float] = {}
+        turn_started = time.perf_counter()
+
+        # 1) RULES: plan JSON (mistral), unless the local fast path is confident
+        fast_plan = self._fast_path_plan(state, prompt_user_text, selected_npc=selected_npc)
+        if fast_plan is not None:
+            plan = fast_plan
+            timings["plan_fast_path"] = 1.0
+        else:
+            plan = self._normalize_plan_for_engine(await self._get_plan(canon))
+        timings["plan_ms"] = _elapsed_ms(turn_started)
+        self._record_plan_stats(fast_path=fast_plan is not None, elapsed_ms=timings["plan_ms"])
         if not decision_mode_v2:
             plan.output_type = "dialogue"
             plan.options = []
@@ -176,6 +379,29 @@ class GameMaster:
         # 3) Apply patch (canon state)
         apply_patch(state, plan.state_patch)
 
+        narration_task: asyncio.Task | None = None
+        narration_dialogue: str | None = None
+
+        def _start_narration(exchange_dialogue: str | None) -> None:
+            # Pipelined mode: narration runs as soon as its prompt inputs are known.
+            nonlocal narration_task, narration_dialogue
+            if narration_task is not None or not self.pipelined_turn:
+                return
+            narration_dialogue = exchange_dialogue
+            narration_task = asyncio.create_task(
+                self._generate_narration(
+                    canon=canon,
+                    prompt_user_text=prompt_user_text,
+                    hooks=list(plan.narration_hooks),
+                    roll_summary=roll_summary,
+                    speaker=speaker,
+                    dialogue_text=exchange_dialogue,
+                    timings=timings,
+                    turn_started=turn_started,
+                )
+            )
+            pending.append(narration_task)
+
         # 4) Dialogue if target or type talk
         target = self._resolve_dialogue_target(
             selected_npc=selected_npc,
@@ -190,6 +416,10 @@ class GameMaster:
         event_text: str | None = None
         npc_profile = None
 
+        if not target:
+            # No NPC reply: the narration prompt is already complete.
+            _start_narration(None)
+
         if target:
             speaker = target
             player_name = re.sub(r"\s+", " ", str(state.get("player_name") or "").strip())
@@ -286,7 +516,21 @@ class GameMaster:
                     verbose_mode=verbose_mode,
                 )
                 dialogue_model = model_for("dialogue")
-                dialogue_text = await self.llm.generate(
+                dialogue_callback = on_dialogue
+                if self.pipelined_turn and self.narration_prefix_chars > 0:
+
+                    async def dialogue_callback(preview: str) -> None:
+                        if on_dialogue is not None:
+                            await on_dialogue(preview)
+                        complete = _COMPLETE_SENTENCES_RE.match(preview)
+                        if complete and len(complete.group(0)) >= self.narration_prefix_chars:
+                            timings.setdefault("narration_prefix_chars", float(len(complete.group(0))))
+                            _start_narration(complete.group(0))
+
+                dialogue_started = time.perf_counter()
+                dialogue_text = await self._generate_dialogue(
+                    speaker=target,
+                    on_dialogue=dialogue_callback,
                     model=dialogue_model,
                     prompt=dialogue_prompt,
                     temperature=0.8,
@@ -294,6 +538,7 @@ class GameMaster:
                     num_predict=250,
                     fallback_models=self._fallback_models(dialogue_model),
                 )
+                timings["dialogue_ms"] = _elapsed_ms(dialogue_started)
                 dialogue_text = self._sanitize_dialogue_self_addressing(
                     dialogue_text,
                     player_name=player_name,
@@ -324,6 +569,18 @@ class GameMaster:
                     npc_name=target,
                     dialogue_text=dialogue_text,
                 )
+            if output_type != "choice_required":
+                if (
+                    narration_task is not None
+                    and narration_dialogue
+                    and not self._dialogue_extends_preview(dialogue_text, narration_dialogue, speaker=target)
+                ):
+                    # The final reply diverged from the streamed prefix (fallback, sanitizing):
+                    # the narration would describe words the NPC never said.
+                    narration_task.cancel()
+                    narration_task = None
+                    timings["narration_restarted"] = 1.0
+                _start_narration(dialogue_text)
 
         # 5) Narration: interprète l'échange joueur <-> PNJ du tour
         micro_event = self._maybe_generate_micro_event(
@@ -357,39 +614,23 @@ class GameMaster:
                 hooks=plan.narration_hooks,
                 max_chars=NARRATION_MAX_CHARS,
             )
+        elif narration_task is not None:
+            narration_text = await narration_task
         else:
-            turn_exchange_lines = [f"Joueur: {prompt_user_text}"]
-            if speaker and dialogue_text:
-                turn_exchange_lines.append(f"{speaker}: {dialogue_text}")
-            turn_exchange = "\n".join(turn_exchange_lines)
-
-            narration_prompt = prompt_narration(
-                canon,
-                prompt_user_text,
-                plan.narration_hooks,
-                roll_summary,
-                turn_exchange=turn_exchange,
-            )
-            narration_model = model_for("narration")
-            narration_text = await self.llm.generate(
-                model=narration_model,
-                prompt=narration_prompt,
-                temperature=0.7,
-                num_ctx=4096,
-                num_predict=180,
-                fallback_models=self._fallback_models(narration_model),
-            )
-            narration_text = self._sanitize_narration_text(narration_text, plan.narration_hooks)
-            max_sentences = NARRATION_MAX_SENTENCES_DEFAULT
-            if self._is_training_message(prompt_user_text):
-                max_sentences = NARRATION_MAX_SENTENCES_TRAINING
-            narration_text = self._limit_narration_sentences(
-                narration_text,
-                max_sentences=max_sentences,
+            narration_text = await self._generate_narration(
+                canon=canon,
+                prompt_user_text=prompt_user_text,
                 hooks=plan.narration_hooks,
-                max_chars=NARRATION_MAX_CHARS,
+                roll_summary=roll_summary,
+                speaker=speaker,
+                dialogue_text=dialogue_text,
+                timings=timings,
+                turn_started=turn_started,
             )
 
+        timings["total_ms"] = _elapsed_ms(turn_started)
+        LOG.debug("gm turn timings: %s", timings)
+        _record_turn_timings(timings)
         return TurnResult(
             mode="auto",
             narration=narration_text,
@@ -401,9 +642,63 @@ class GameMaster:
             options=options,
             event_text=event_text,
             system="\n".join(system_lines).strip() or None,
+            timings_ms=timings,
+        )
+
+    async def _generate_narration(
+        self,
+        *,
+        canon: str,
+        prompt_user_text: str,
+        hooks: list[str],
+        roll_summary: str,
+        speaker: str | None,
+        dialogue_text: str | None,
+        timings: dict[str, float],
+        turn_started: float,
+    ) -> str:
+        turn_exchange_lines = [f"Joueur: {prompt_user_text}"]
+        if speaker and dialogue_text:
+            turn_exchange_lines.append(f"{speaker}: {dialogue_text}")
+        turn_exchange = "\n".join(turn_exchange_lines)
+
+        narration_prompt = prompt_narration(
+            canon,
+            prompt_user_text,
+            hooks,
+            roll_summary,
+            turn_exchange=turn_exchange,
+        )
+        narration_model = model_for("narration")
+        stage_started = time.perf_counter()
+        timings["narration_start_ms"] = round((stage_started - turn_started) * 1000.0, 1)
+        narration_text = await self.llm.generate(
+            model=narration_model,
+            prompt=narration_prompt,
+            temperature=0.7,
+            num_ctx=4096,
+            num_predict=180,
+            fallback_models=self._fallback_models(narration_model),
+        )
+        timings["narration_ms"] = _elapsed_ms(stage_started)
+        narration_text = self._sanitize_narration_text(narration_text, hooks)
+        max_sentences = NARRATION_MAX_SENTENCES_DEFAULT
+        if self._is_training_message(prompt_user_text):
+            max_sentences = NARRATION_MAX_SENTENCES_TRAINING
+        return self._limit_narration_sentences(
+            narration_text,
+            max_sentences=max_sentences,
+            hooks=hooks,
+            max_chars=NARRATION_MAX_CHARS,
         )
 
-    async def _play_turn_telegram_ataryxia(self, *, state: dict, user_text: str) -> TurnResult:
+    async def _play_turn_telegram_ataryxia(
+        self,
+        *,
+        state: dict,
+        user_text: str,
+        on_dialogue: DialogueStreamCallback | None = None,
+    ) -> TurnResult:
         npc_name = "Ataryxia"
         player_name = re.sub(r"\s+", " ", str(state.get("player_name") or "").strip())
         selected_profile = state.get("selected_npc_profile") if isinstance(state.get("selected_npc_profile"), dict) else None
@@ -434,7 +729,9 @@ class GameMaster:
             work_topic_mode=work_topic_mode,
             last_reply=recent_replies[-1] if recent_replies else "",
         )
-        dialogue_text = await self.llm.generate(
+        dialogue_text = await self._generate_dialogue(
+            speaker=npc_name,
+            on_dialogue=on_dialogue,
             model=dialogue_model,
             prompt=prompt,
             temperature=self._telegram_temperature(default=0.45),
@@ -1621,6 +1918,52 @@ class GameMaster:
 
         return "d20"
 
+    def _fast_path_plan(self, state: dict, user_text: str, *, selected_npc: str) -> Plan | None:
+        """Plain dialogue plan for trivial small talk with the selected NPC, or None when unsure."""
+        if not self.plan_fast_path or not selected_npc:
+            return None
+        if bool(state.get("in_dungeon")) or str(state.get("location_id") or "").startswith("dungeon:"):
+            return None
+        text = re.sub(r"\s+", " ", str(user_text or "")).strip()
+        if not text or "*" in text or len(text) > FAST_PATH_MAX_CHARS or len(text.split(" ")) > FAST_PATH_MAX_WORDS:
+            return None
+        plain = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").casefold()
+        if _FAST_PATH_BLOCKERS_RE.search(plain) or self._is_training_message(text):
+            return None
+        tension_delta, _ = self._heuristic_tension_delta(text, Plan(), [])
+        if tension_delta > 0:
+            return None
+        try:
+            economy = self._economy_manager
+            if economy is None:
+                economy = self._economy_manager = EconomyManager()
+            if economy._extract_trade_intent(text) is not None:
+                return None
+        except Exception:
+            return None
+        return Plan(
+            type="talk",
+            target=selected_npc,
+            intent="discussion",
+            narration_hooks=[self.rng.choice(_FAST_PATH_NARRATION_HOOKS)],
+            decision_type="dialogue",
+            output_type="dialogue",
+        )
+
+    def _record_plan_stats(self, *, fast_path: bool, elapsed_ms: float) -> None:
+        with _process_stats_lock:
+            for stats in (self._plan_stats, _process_plan_stats):
+                stats["turns"] += 1
+                if fast_path:
+                    stats["fast_path"] += 1
+                else:
+                    stats["llm"] += 1
+                    stats["llm_ms_total"] += float(elapsed_ms)
+
+    def plan_stats(self) -> dict[str, float]:
+        with _process_stats_lock:
+            return _summarize_plan_stats(self._plan_stats)
+
     async def _get_plan(self, canon: str) -> Plan:
         prompt = prompt_rules_json(canon)
         rules_model = model_for("rules")
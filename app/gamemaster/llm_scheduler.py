@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import os
+import threading
+import time
+from typing import AsyncIterator, Iterator
+
+
+LANE_INTERACTIVE = "interactive"
+LANE_BACKGROUND = "background"
+LANES = (LANE_INTERACTIVE, LANE_BACKGROUND)
+
+_current_lane: ContextVar[str] = ContextVar("llm_lane", default=LANE_INTERACTIVE)
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = str(os.getenv(name, str(default)) or str(default)).strip()
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return default
+
+
+def current_llm_lane() -> str:
+    return _current_lane.get()
+
+
+@contextmanager
+def llm_lane(lane: str) -> Iterator[None]:
+    """Route les appels LLM faits dans ce bloc (et les taches qu'il cree) vers `lane`."""
+    token = _current_lane.set(lane if lane in LANES else LANE_INTERACTIVE)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+@dataclass
+class _Waiter:
+    model: str
+    lane: str
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future
+    queued_at: float
+    granted: bool = False
+
+
+@dataclass
+class _LaneStats:
+    requests: int = 0
+    granted: int = 0
+    max_queue_depth: int = 0
+    wait_ms_total: float = 0.0
+    wait_ms_max: float = 0.0
+
+
+@dataclass
+class _SchedulerState:
+    queues: dict[str, list[_Waiter]] = field(default_factory=lambda: {lane: [] for lane in LANES})
+    in_flight: dict[str, int] = field(default_factory=dict)
+    in_flight_total: int = 0
+    last_model: str = ""
+    streak: int = 0
+    model_switches: int = 0
+
+
+class LLMScheduler:
+    """File d'attente commune a tous les appels Ollama du processus.
+
+    Les requetes interactives passent toujours avant les requetes de fond ; une file
+    de priorite inferieure n'est servie que lorsque les files superieures sont vides.
+    Dans une file, un modele deja charge est servi en priorite (au plus
+    `max_same_model_streak` fois de suite) pour eviter de faire alterner les modeles
+    en memoire d'Ollama. Thread-safe : les creneaux peuvent etre demandes depuis
+    plusieurs boucles asyncio.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 2,
+        per_model_concurrency: int = 2,
+        model_limits: dict[str, int] | None = None,
+        max_same_model_streak: int = 4,
+    ) -> None:
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.per_model_concurrency = max(1, int(per_model_concurrency))
+        self.model_limits = {str(k): max(1, int(v)) for k, v in (model_limits or {}).items()}
+        self.max_same_model_streak = max(1, int(max_same_model_streak))
+        self._lock = threading.Lock()
+        self._state = _SchedulerState()
+        self._lane_stats = {lane: _LaneStats() for lane in LANES}
+
+    def model_limit(self, model: str) -> int:
+        return self.model_limits.get(model, self.per_model_concurrency)
+
+    @asynccontextmanager
+    async def slot(self, model: str, *, lane: str | None = None) -> AsyncIterator[None]:
+        await self.acquire(model, lane=lane)
+        try:
+            yield
+        finally:
+            self.release(model)
+
+    async def acquire(self, model: str, *, lane: str | None = None) -> None:
+        chosen_lane = lane if lane in LANES else current_llm_lane()
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            model=str(model or ""),
+            lane=chosen_lane,
+            loop=loop,
+            future=loop.create_future(),
+            queued_at=time.monotonic(),
+        )
+        with self._lock:
+            queue = self._state.queues[chosen_lane]
+            queue.append(waiter)
+            stats = self._lane_stats[chosen_lane]
+            stats.requests += 1
+            stats.max_queue_depth = max(stats.max_queue_depth, len(queue))
+            self._dispatch_locked()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._release_locked(waiter.model)
+                else:
+                    try:
+                        self._state.queues[waiter.lane].remove(waiter)
+                    except ValueError:
+                        pass
+                self._dispatch_locked()
+            raise
+
+    def release(self, model: str) -> None:
+        with self._lock:
+            self._release_locked(str(model or ""))
+            self._dispatch_locked()
+
+    def _release_locked(self, model: str) -> None:
+        state = self._state
+        state.in_flight_total = max(0, state.in_flight_total - 1)
+        remaining = state.in_flight.get(model, 0) - 1
+        if remaining > 0:
+            state.in_flight[model] = remaining
+        else:
+            state.in_flight.pop(model, None)
+
+    def _pick_locked(self) -> _Waiter | None:
+        state = self._state
+        for lane in LANES:
+            queue = state.queues[lane]
+            if not queue:
+                continue
+            eligible = [w for w in queue if state.in_flight.get(w.model, 0) < self.model_limit(w.model)]
+            if not eligible:
+                # File prioritaire bloquee par un plafond de modele: les files inferieures attendent.
+                return None
+            if state.last_model and state.streak < self.max_same_model_streak:
+                for waiter in eligible:
+                    if waiter.model == state.last_model:
+                        return waiter
+            return eligible[0]
+        return None
+
+    def _dispatch_locked(self) -> None:
+        state = self._state
+        while state.in_flight_total < self.max_concurrency:
+            waiter = self._pick_locked()
+            if waiter is None:
+                return
+            state.queues[waiter.lane].remove(waiter)
+            waiter.granted = True
+            state.in_flight_total += 1
+            state.in_flight[waiter.model] = state.in_flight.get(waiter.model, 0) + 1
+            if waiter.model == state.last_model:
+                state.streak += 1
+            else:
+                if state.last_model:
+                    state.model_switches += 1
+                state.last_model = waiter.model
+                state.streak = 1
+
+            waited_ms = (time.monotonic() - waiter.queued_at) * 1000.0
+            stats = self._lane_stats[waiter.lane]
+            stats.granted += 1
+            stats.wait_ms_total += waited_ms
+            stats.wait_ms_max = max(stats.wait_ms_max, waited_ms)
+            try:
+                waiter.loop.call_soon_threadsafe(_resolve_waiter, waiter.future)
+            except RuntimeError:
+                # Boucle fermee: personne n'attend plus ce creneau.
+                self._release_locked(waiter.model)
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            state = self._state
+            lanes = {}
+            for lane in LANES:
+                stats = self._lane_stats[lane]
+                lanes[lane] = {
+                    "queue_depth": len(state.queues[lane]),
+                    "max_queue_depth": stats.max_queue_depth,
+                    "requests": stats.requests,
+                    "granted": stats.granted,
+                    "avg_wait_ms": round(stats.wait_ms_total / stats.granted, 2) if stats.granted else 0.0,
+                    "max_wait_ms": round(stats.wait_ms_max, 2),
+                }
+            return {
+                "lanes": lanes,
+                "in_flight": dict(state.in_flight),
+                "in_flight_total": state.in_flight_total,
+                "max_concurrency": self.max_concurrency,
+                "model_switches": state.model_switches,
+            }
+
+
+def _resolve_waiter(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_scheduler_lock = threading.Lock()
+_scheduler: LLMScheduler | None = None
+
+
+def build_llm_scheduler() -> LLMScheduler:
+    return LLMScheduler(
+        max_concurrency=_env_int("LLM_MAX_CONCURRENCY", 2),
+        per_model_concurrency=_env_int("LLM_MODEL_CONCURRENCY", 2),
+        max_same_model_streak=_env_int("LLM_SAME_MODEL_STREAK", 4),
+    )
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    global _scheduler
+    if isinstance(_scheduler, LLMScheduler):
+        return _scheduler
+
+    with _scheduler_lock:
+        if not isinstance(_scheduler, LLMScheduler):
+            _scheduler = build_llm_scheduler()
+    return _scheduler
@@ -8,7 +8,9 @@ from dataclasses import asdict
 from typing import Any
 
 from app.core.data.item_manager import ItemsManager, ItemDef
+from app.core.data.item_search import get_item_search_index
 
+from .llm_scheduler import LANE_BACKGROUND, llm_lane
 from .models import model_for
 
 
@@ -42,8 +44,8 @@ class LootManager:
         self.llm = llm
         self.items = ItemsManager(data_dir=data_dir)
         self.rng = random.Random(20260209)
-        self._last_fallback_item_id = ""
-        self._recent_fallback_item_ids: list[str] = []
+        # Historique par defaut; un appelant partage (un chat Telegram) passe le sien a generate_loot.
+        self._recent_loot_ids: list[str] = []
 
     def load_item_defs(self) -> dict[str, ItemDef]:
         return self.items.load_all()
@@ -56,7 +58,10 @@ class LootManager:
         anchor: str,
         known_items: dict[str, ItemDef],
         hint_text: str = "",
+        recent_item_ids: list[str] | None = None,
     ) -> dict:
+        """`recent_item_ids`: derniers butins de la session (plus recent en dernier), mis a jour sur place."""
+        recent = self._recent_loot_ids if recent_item_ids is None else recent_item_ids
         source_key = str(source_type or "").strip().casefold()
         floor_hint = max(1, int(floor or 1))
         fallback = self._fallback_loot(
@@ -64,6 +69,7 @@ class LootManager:
             floor=floor_hint,
             known_items=known_items,
             hint_text=hint_text,
+            recent=recent,
         )
         if self.llm is None:
             result = self._apply_diversity_guard(
@@ -72,8 +78,9 @@ class LootManager:
                 floor=floor_hint,
                 known_items=known_items,
                 hint_text=hint_text,
+                recent=recent,
             )
-            self._remember_recent_loot(str(result.get("item_id") or ""))
+            self._remember_recent_loot(recent, str(result.get("item_id") or ""))
             return result
 
         prompt = self._build_prompt(
@@ -84,14 +91,15 @@ class LootManager:
             hint_text=hint_text,
         )
         try:
-            raw = await self.llm.generate(
-                model=model_for("rules"),
-                prompt=prompt,
-                temperature=0.25,
-                num_ctx=4096,
-                num_predict=750,
-                stop=None,
-            )
+            with llm_lane(LANE_BACKGROUND):
+                raw = await self.llm.generate(
+                    model=model_for("rules"),
+                    prompt=prompt,
+                    temperature=0.25,
+                    num_ctx=4096,
+                    num_predict=750,
+                    stop=None,
+                )
             payload = json.loads(self._extract_json(raw))
             normalized = self._normalize_loot_payload(
                 payload,
@@ -106,8 +114,9 @@ class LootManager:
                 floor=floor_hint,
                 known_items=known_items,
                 hint_text=hint_text,
+                recent=recent,
             )
-            self._remember_recent_loot(str(result.get("item_id") or ""))
+            self._remember_recent_loot(recent, str(result.get("item_id") or ""))
             return result
         except Exception:
             result = self._apply_diversity_guard(
@@ -116,8 +125,9 @@ class LootManager:
                 floor=floor_hint,
                 known_items=known_items,
                 hint_text=hint_text,
+                recent=recent,
             )
-            self._remember_recent_loot(str(result.get("item_id") or ""))
+            self._remember_recent_loot(recent, str(result.get("item_id") or ""))
             return result
 
     def ensure_item_exists(self, loot: dict, known_items: dict[str, ItemDef]) -> tuple[str, dict[str, ItemDef], bool]:
@@ -251,6 +261,7 @@ class LootManager:
         floor: int,
         known_items: dict[str, ItemDef],
         hint_text: str = "",
+        recent: list[str] | None = None,
     ) -> dict:
         hinted = self._fallback_loot_from_hint(
             source_type=source_type,
@@ -273,7 +284,7 @@ class LootManager:
 
         existing_ids = list(known_items.keys())
         if existing_ids and self.rng.random() <= self._existing_drop_chance(source_type=source_type, floor=floor):
-            chosen = self._pick_existing_item_for_source(known_items, source_type=source_type, floor=floor)
+            chosen = self._pick_existing_item_for_source(known_items, source_type=source_type, floor=floor, recent=recent)
             if chosen and chosen in known_items:
                 item = known_items[chosen]
                 qty = self._fallback_existing_qty(item, source_type=source_type, floor=floor)
@@ -543,7 +554,10 @@ class LootManager:
         source_type: str,
         floor: int,
         exclude_ids: set[str] | None = None,
+        recent: list[str] | None = None,
     ) -> str:
+        recent_ids = list(recent or [])
+        last_id = recent_ids[-1] if recent_ids else ""
         rows: list[tuple[str, str, float]] = []
         excluded = {str(item_id or "").strip().casefold() for item_id in (exclude_ids or set()) if str(item_id or "").strip()}
         floor_target_rank = max(0, min(4, (max(1, int(floor)) - 1) // 8))
@@ -563,9 +577,9 @@ class LootManager:
             else:
                 weight *= 1.0 + min(0.18, 0.06 * (rarity_rank - floor_target_rank))
 
-            if item_key == self._last_fallback_item_id:
+            if item_key == last_id:
                 weight *= 0.06
-            elif item_key in self._recent_fallback_item_ids:
+            elif item_key in recent_ids:
                 weight *= 0.30
 
             rows.append((item_key, item_type, max(0.01, weight)))
@@ -611,6 +625,7 @@ class LootManager:
         floor: int,
         known_items: dict[str, ItemDef],
         hint_text: str,
+        recent: list[str] | None = None,
     ) -> dict:
         if not isinstance(loot, dict):
             return loot
@@ -623,13 +638,14 @@ class LootManager:
 
         # Empêche les drops en boucle d'un seul item (ex: épée unique), même si l'IA
         # propose toujours le même ID.
-        if current_item_id and current_item_id == self._last_fallback_item_id:
+        if current_item_id and recent and current_item_id == recent[-1]:
             replacement = self._replacement_loot_for_repetition(
                 repeated_item_id=current_item_id,
                 source_type=source_key,
                 floor=max(1, floor),
                 known_items=known_items,
                 hint_text=hint_text,
+                recent=recent,
             )
             replacement_id = str(replacement.get("item_id") or "").strip().casefold() if isinstance(replacement, dict) else ""
             if replacement_id and replacement_id != current_item_id:
@@ -661,6 +677,7 @@ class LootManager:
         floor: int,
         known_items: dict[str, ItemDef],
         hint_text: str,
+        recent: list[str] | None = None,
     ) -> dict:
         repeated_key = str(repeated_item_id or "").strip().casefold()
         source_key = str(source_type or "").strip().casefold()
@@ -680,6 +697,7 @@ class LootManager:
             source_type=source_key,
             floor=max(1, floor),
             exclude_ids={repeated_key},
+            recent=recent,
         )
         if alt_existing and alt_existing in known_items:
             item = known_items[alt_existing]
@@ -706,14 +724,11 @@ class LootManager:
             "floor_hint": max(1, floor),
         }
 
-    def _remember_recent_loot(self, item_id: str) -> None:
+    def _remember_recent_loot(self, recent: list[str], item_id: str) -> None:
         key = str(item_id or "").strip().casefold()
         if not key:
             return
-        self._last_fallback_item_id = key
-        recent = [row for row in self._recent_fallback_item_ids if row != key]
-        recent.append(key)
-        self._recent_fallback_item_ids = recent[-8:]
+        recent[:] = [row for row in recent if row != key][-7:] + [key]
 
     def _build_prompt(
         self,
@@ -946,11 +961,7 @@ class LootManager:
         }
 
     def _find_existing_potion(self, known_items: dict[str, ItemDef], *, rarity: str, floor: int) -> str:
-        consumables = [
-            item_id
-            for item_id, item in known_items.items()
-            if str(item.type or "").strip().casefold() == "consumable"
-        ]
+        consumables = get_item_search_index(known_items).ids_of_type("consumable")
         if not consumables:
             return ""
 
@@ -6,6 +6,8 @@ import unicodedata
 from dataclasses import dataclass
 from pathlib import Path
 
+from app.core.data.catalog_cache import CatalogSnapshot, get_catalog_registry
+
 
 @dataclass(frozen=True)
 class MonsterDef:
@@ -36,13 +38,15 @@ class MonsterManager:
     def __init__(self, *, data_dir: str = "data/monsters") -> None:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self._cache: dict[str, MonsterDef] | None = None
-        self._name_index: dict[str, str] | None = None
 
     def load_catalog(self) -> dict[str, MonsterDef]:
-        if isinstance(self._cache, dict):
-            return self._cache
+        """Catalogue partage (lecture seule), relu seulement si un fichier de monstre change."""
+        return self._catalog_entry()[0]
+
+    def _catalog_entry(self) -> tuple[CatalogSnapshot, dict[str, str]]:
+        return get_catalog_registry().load("monsters", self.data_dir, self._read_catalog)
 
+    def _read_catalog(self) -> tuple[CatalogSnapshot, dict[str, str]]:
         out: dict[str, MonsterDef] = {}
         for path in sorted(self.data_dir.glob("*.json")):
             try:
@@ -57,9 +61,7 @@ class MonsterManager:
         if not out:
             out = self._fallback_catalog()
 
-        self._cache = out
-        self._name_index = self._build_name_index(out)
-        return out
+        return CatalogSnapshot(out), self._build_name_index(out)
 
     def combat_profile_for_event(self, event: dict) -> dict | None:
         if not isinstance(event, dict):
@@ -94,14 +96,13 @@ class MonsterManager:
         }
 
     def _resolve_monster(self, *, monster_id: str, name: str, event_type: str) -> MonsterDef | None:
-        catalog = self.load_catalog()
+        catalog, name_index = self._catalog_entry()
         if monster_id and monster_id in catalog:
             return catalog[monster_id]
 
         if event_type == "mimic" and "mimic" in catalog:
             return catalog["mimic"]
 
-        name_index = self._name_index if isinstance(self._name_index, dict) else {}
         normalized_name = self._norm(name)
         if normalized_name and normalized_name in name_index:
             resolved_id = name_index[normalized_name]
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import aclosing
+import json
 import time
+from typing import AsyncIterator
 
 import httpx
 
+from .llm_scheduler import LLMScheduler, get_llm_scheduler
+
 
 _RETRYABLE_HTTP_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
 
@@ -19,6 +24,7 @@ class OllamaClient:
         retry_backoff_seconds: float = 0.35,
         circuit_breaker_failures: int = 4,
         circuit_breaker_cooldown_seconds: float = 8.0,
+        scheduler: LLMScheduler | None = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.timeout_seconds = max(1.0, float(timeout_seconds))
@@ -26,6 +32,8 @@ class OllamaClient:
         self.retry_backoff_seconds = max(0.05, float(retry_backoff_seconds))
         self.circuit_breaker_failures = max(1, int(circuit_breaker_failures))
         self.circuit_breaker_cooldown_seconds = max(1.0, float(circuit_breaker_cooldown_seconds))
+        # Creneaux partages par tous les clients du processus (priorite, plafond par modele).
+        self.scheduler = scheduler if isinstance(scheduler, LLMScheduler) else get_llm_scheduler()
         self._client: httpx.AsyncClient | None = None
         self._client_lock = asyncio.Lock()
         self._state_lock = asyncio.Lock()
@@ -100,6 +108,18 @@ class OllamaClient:
 
         return bool(ok)
 
+    def _model_candidates(self, model: str, fallback_models: list[str] | None) -> list[str]:
+        model_candidates: list[str] = []
+        for candidate in [model, *(fallback_models or [])]:
+            name = str(candidate or "").strip()
+            if not name or name in model_candidates:
+                continue
+            model_candidates.append(name)
+
+        if not model_candidates:
+            raise RuntimeError("Aucun modèle Ollama valide fourni.")
+        return model_candidates
+
     async def generate(
         self,
         model: str,
@@ -111,19 +131,30 @@ class OllamaClient:
         stop: list[str] | None = None,
         fallback_models: list[str] | None = None,
     ) -> str:
-        model_candidates: list[str] = []
-        for candidate in [model, *(fallback_models or [])]:
-            name = str(candidate or "").strip()
-            if not name or name in model_candidates:
-                continue
-            model_candidates.append(name)
-
-        if not model_candidates:
-            raise RuntimeError("Aucun modèle Ollama valide fourni.")
+        model_candidates = self._model_candidates(model, fallback_models)
 
         if time.monotonic() < self._circuit_open_until:
             raise RuntimeError("Circuit Ollama ouvert: service temporairement indisponible.")
 
+        return await self._generate_candidates(
+            model_candidates,
+            prompt,
+            temperature=temperature,
+            num_ctx=num_ctx,
+            num_predict=num_predict,
+            stop=stop,
+        )
+
+    async def _generate_candidates(
+        self,
+        model_candidates: list[str],
+        prompt: str,
+        *,
+        temperature: float,
+        num_ctx: int,
+        num_predict: int,
+        stop: list[str] | None,
+    ) -> str:
         last_error: Exception | None = None
         for model_name in model_candidates:
             payload = {
@@ -142,7 +173,9 @@ class OllamaClient:
             for attempt in range(self.max_retries + 1):
                 try:
                     client = await self._get_client()
-                    response = await client.post(f"{self.base_url}/api/generate", json=payload)
+                    # One scheduler slot per attempt, for the model actually queried; backoff waits run outside it.
+                    async with self.scheduler.slot(model_name):
+                        response = await client.post(f"{self.base_url}/api/generate", json=payload)
                     response.raise_for_status()
 
                     decoded = response.json()
@@ -169,3 +202,112 @@ class OllamaClient:
         if isinstance(last_error, Exception):
             raise RuntimeError(f"Echec Ollama après retries/fallback: {last_error}") from last_error
         raise RuntimeError("Echec Ollama: aucune réponse exploitable.")
+
+    async def generate_stream(
+        self,
+        model: str,
+        prompt: str,
+        *,
+        temperature: float = 0.7,
+        num_ctx: int = 2048,
+        num_predict: int = 300,
+        stop: list[str] | None = None,
+        fallback_models: list[str] | None = None,
+    ) -> AsyncIterator[str]:
+        """Like `generate`, but yields text fragments as Ollama produces them.
+
+        Retries and fallback models only apply until the first fragment is yielded;
+        an error after that point is raised to the caller. The scheduler slot is held while
+        the stream is open: close the generator (`aclose()`) when stopping early.
+        """
+        model_candidates = self._model_candidates(model, fallback_models)
+
+        if time.monotonic() < self._circuit_open_until:
+            raise RuntimeError("Circuit Ollama ouvert: service temporairement indisponible.")
+
+        async with aclosing(
+            self._stream_candidates(
+                model_candidates,
+                prompt,
+                temperature=temperature,
+                num_ctx=num_ctx,
+                num_predict=num_predict,
+                stop=stop,
+            )
+        ) as fragments:
+            async for fragment in fragments:
+                yield fragment
+
+    async def _stream_candidates(
+        self,
+        model_candidates: list[str],
+        prompt: str,
+        *,
+        temperature: float,
+        num_ctx: int,
+        num_predict: int,
+        stop: list[str] | None,
+    ) -> AsyncIterator[str]:
+        last_error: Exception | None = None
+        for model_name in model_candidates:
+            payload = {
+                "model": model_name,
+                "prompt": prompt,
+                "stream": True,
+                "options": {
+                    "temperature": temperature,
+                    "num_ctx": num_ctx,
+                    "num_predict": num_predict,
+                },
+            }
+            if stop:
+                payload["options"]["stop"] = stop
+
+            for attempt in range(self.max_retries + 1):
+                emitted = False
+                try:
+                    client = await self._get_client()
+                    async with self.scheduler.slot(model_name), client.stream(
+                        "POST", f"{self.base_url}/api/generate", json=payload
+                    ) as response:
+                        response.raise_for_status()
+                        async for line in response.aiter_lines():
+                            if not line.strip():
+                                continue
+                            decoded = json.loads(line)
+                            if not isinstance(decoded, dict):
+                                raise RuntimeError("Réponse Ollama invalide (JSON objet attendu).")
+                            if decoded.get("error"):
+                                raise RuntimeError(str(decoded.get("error")))
+                            fragment = str(decoded.get("response") or "")
+                            if fragment:
+                                if not emitted:
+                                    emitted = True
+                                    await self._record_success()
+                                yield fragment
+                            if decoded.get("done"):
+                                break
+                    if not emitted:
+                        await self._record_success()
+                    return
+                except httpx.HTTPStatusError as exc:
+                    last_error = exc
+                    status = int(exc.response.status_code) if exc.response is not None else 0
+                    if status in _RETRYABLE_HTTP_STATUS and attempt < self.max_retries:
+                        await asyncio.sleep(self.retry_backoff_seconds * (2 ** attempt))
+                        continue
+                    break
+                except (httpx.TransportError, httpx.TimeoutException, RuntimeError, ValueError) as exc:
+                    if emitted:
+                        await self._record_failure()
+                        raise RuntimeError(f"Flux Ollama interrompu: {exc}") from exc
+                    last_error = exc
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(self.retry_backoff_seconds * (2 ** attempt))
+                        continue
+                    break
+
+        await self._record_failure()
+        if isinstance(last_error, Exception):
+            raise RuntimeError(f"Echec Ollama après retries/fallback: {last_error}") from last_error
+        raise RuntimeError("Echec Ollama: aucune réponse exploitable.")
@@ -10,6 +10,7 @@ from typing import Any, Literal
 from pydantic import BaseModel, Field, ValidationError
 
 from .location_manager import canonical_anchor, official_neighbors
+from .llm_scheduler import LANE_BACKGROUND, llm_lane
 from .models import model_for
 
 
@@ -100,14 +101,15 @@ class QuestManager:
         )
 
         try:
-            raw = await self.llm.generate(
-                model=model_for("rules"),
-                prompt=prompt,
-                temperature=0.35,
-                num_ctx=4096,
-                num_predict=900,
-                stop=None,
-            )
+            with llm_lane(LANE_BACKGROUND):
+                raw = await self.llm.generate(
+                    model=model_for("rules"),
+                    prompt=prompt,
+                    temperature=0.35,
+                    num_ctx=4096,
+                    num_predict=900,
+                    stop=None,
+                )
             draft = self._parse_draft(raw)
         except Exception:
             draft = self._fallback_draft(npc_name=npc_name, map_anchor=map_anchor)
@@ -47,11 +47,12 @@ def build_runtime_services(
 ) -> GameRuntimeServices:
     bus = event_bus if isinstance(event_bus, EventBus) else get_global_event_bus()
     llm_client = llm if isinstance(llm, OllamaClient) else OllamaClient()
+    economy_manager = EconomyManager(data_dir=data_dir)
 
     return GameRuntimeServices(
         event_bus=bus,
         llm=llm_client,
-        gm=GameMaster(llm_client, seed=123, event_bus=bus),
+        gm=GameMaster(llm_client, seed=123, event_bus=bus, economy_manager=economy_manager),
         npc_manager=NPCProfileManager(llm_client),
         location_manager=LocationManager(llm_client),
         dungeon_manager=DungeonManager(llm_client),
@@ -60,7 +61,7 @@ def build_runtime_services(
         loot_manager=LootManager(llm_client, data_dir=data_dir),
         skill_manager=SkillManager(llm_client, data_path=skills_catalog_path),
         monster_manager=MonsterManager(data_dir=monsters_dir),
-        economy_manager=EconomyManager(data_dir=data_dir),
+        economy_manager=economy_manager,
         craft_manager=CraftManager(data_path=crafting_data_path),
     )
 
@@ -58,3 +58,5 @@ class TurnResult(BaseModel):
     system: Optional[str] = None
     media_keyword: Optional[str] = None
     generated_image_prompt: Optional[str] = None
+    # Per-stage latency of the turn (plan_ms, dialogue_ms, narration_start_ms, narration_ms, total_ms).
+    timings_ms: dict[str, float] = Field(default_factory=dict)
@@ -9,7 +9,10 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from app.core.data.catalog_cache import CatalogSnapshot, get_catalog_registry
+
 from .models import model_for
+from .skill_matcher import FuzzyTokenIndex, SkillEntry, SkillMatcher, get_skill_matcher
 
 
 _STAT_KEYS = (
@@ -173,12 +176,19 @@ class SkillDef:
 
 
 class SkillManager:
+    # Indices de _INTENT_HINT_MAP normalises (partages par toutes les instances).
+    _intent_hints_compiled: tuple[dict[str, tuple[str, ...]], FuzzyTokenIndex] | None = None
+
     def __init__(self, llm: Any, *, data_path: str = "data/skills_catalog.json") -> None:
         self.llm = llm
         self.data_path = Path(data_path)
         self.rng = random.Random(20260209)
 
     def load_catalog(self) -> dict[str, SkillDef]:
+        # Copie du catalogue partage: l'enregistrement d'une competence modifie le dict recu.
+        return dict(get_catalog_registry().load("skills", self.data_path, self._read_catalog))
+
+    def _read_catalog(self) -> CatalogSnapshot:
         payload = self._read_catalog_payload()
         raw_skills = payload.get("skills")
         if not isinstance(raw_skills, list) or not raw_skills:
@@ -194,7 +204,7 @@ class SkillManager:
             if skill is None:
                 continue
             catalog[skill.skill_id] = skill
-        return catalog
+        return CatalogSnapshot(catalog)
 
     def normalize_known_skills(self, raw_skills: object, catalog: dict[str, SkillDef]) -> list[dict]:
         if not isinstance(raw_skills, list):
@@ -385,32 +395,15 @@ class SkillManager:
     def detect_used_skill_ids(self, text: str, known_skills: list[dict]) -> list[str]:
         if not text or not isinstance(known_skills, list):
             return []
+        matcher = self._skill_matcher(known_skills)
         lower = self._norm(text)
         words = self._split_tokens(lower)
         found: list[str] = []
-        for row in known_skills:
-            if not isinstance(row, dict):
-                continue
-            skill_id = str(row.get("skill_id") or "").strip().casefold()
-            if not skill_id:
-                continue
-            name = self._norm(str(row.get("name") or ""))
-            id_phrase = self._norm(skill_id.replace("_", " "))
-            if (len(name) >= 4 and name in lower) or (len(id_phrase) >= 4 and id_phrase in lower):
-                if skill_id not in found:
-                    found.append(skill_id)
-                continue
-
-            # Fuzzy tolerant for typos on skill names.
-            name_tokens = [tok for tok in self._split_tokens(name) if len(tok) >= 4]
-            if name_tokens and words:
-                matched = 0
-                for token in name_tokens:
-                    if any(self._fuzzy_ratio(token, w) >= 0.82 for w in words if len(w) >= 3):
-                        matched += 1
-                if matched >= max(1, len(name_tokens) - 1):
-                    if skill_id not in found:
-                        found.append(skill_id)
+        # Nom cite tel quel, ou tolerance aux fautes de frappe sur les mots du nom.
+        for idx in matcher.name_hits(lower, words):
+            skill_id = matcher.entries[idx].skill_id
+            if skill_id not in found:
+                found.append(skill_id)
 
         # Detection intentionnelle "j'utilise/lance/applique ..." + categorie.
         action_hit = any(verb in lower for verb in _ACTION_VERBS)
@@ -421,21 +414,43 @@ class SkillManager:
         if not hinted_intents:
             return found[:3]
 
-        for row in known_skills:
-            if not isinstance(row, dict):
-                continue
-            skill_id = str(row.get("skill_id") or "").strip().casefold()
-            if not skill_id:
+        intent_tokens = [self._split_tokens(self.canonicalize_intent_label(intent)) for intent in hinted_intents]
+        intent_hits = matcher.intent_hits(intent_tokens)
+        category_hits = matcher.category_hits(self._norm(intent) for intent in hinted_intents)
+        for idx in sorted(intent_hits | category_hits):
+            skill_id = matcher.entries[idx].skill_id
+            if idx in intent_hits and skill_id not in found:
+                found.append(skill_id)
                 continue
-            if any(self.skill_matches_intent(row, intent) for intent in hinted_intents):
-                if skill_id not in found:
-                    found.append(skill_id)
-                    continue
-            category = self._norm(str(row.get("category") or ""))
-            if category and any(self._fuzzy_ratio(category, intent) >= 0.82 for intent in hinted_intents):
+            if idx in category_hits:
                 found.append(skill_id)
         return found[:3]
 
+    def _skill_matcher(self, known_skills: list[dict]) -> SkillMatcher:
+        signature = tuple(
+            (skill_id, str(row.get("name") or ""), str(row.get("category") or ""), self._skill_blob(row))
+            for row in known_skills
+            if isinstance(row, dict) and (skill_id := str(row.get("skill_id") or "").strip().casefold())
+        )
+
+        def build() -> SkillMatcher:
+            entries: list[SkillEntry] = []
+            for skill_id, raw_name, raw_category, blob in signature:
+                name = self._norm(raw_name)
+                id_phrase = self._norm(skill_id.replace("_", " "))
+                entries.append(
+                    SkillEntry(
+                        skill_id=skill_id,
+                        phrases=tuple(phrase for phrase in (name, id_phrase) if len(phrase) >= 4),
+                        name_tokens=tuple(tok for tok in self._split_tokens(name) if len(tok) >= 4),
+                        blob_tokens=frozenset(self._split_tokens(blob)),
+                        category=self._norm(raw_category),
+                    )
+                )
+            return SkillMatcher(entries)
+
+        return get_skill_matcher(signature, build)
+
     def estimate_usage_xp_gain(self, skill_entry: dict, text: str) -> int:
         if not isinstance(skill_entry, dict):
             return 0
@@ -589,8 +604,24 @@ class SkillManager:
         intent_key = self.canonicalize_intent_label(intent)
         if not intent_key:
             return False
+        blob = self._skill_blob(skill_like)
+        if blob is None:
+            return False
+        skill_tokens = self._split_tokens(blob)
+        intent_tokens = self._split_tokens(intent_key)
+        if not intent_tokens:
+            return False
+
+        for token in intent_tokens:
+            if token in skill_tokens:
+                return True
+            if any(self._fuzzy_ratio(token, st) >= 0.82 for st in skill_tokens if len(st) >= 3):
+                return True
+        return False
+
+    def _skill_blob(self, skill_like: object) -> str | None:
         if isinstance(skill_like, SkillDef):
-            blob = " ".join(
+            return " ".join(
                 [
                     skill_like.name,
                     skill_like.category,
@@ -599,8 +630,8 @@ class SkillManager:
                     " ".join(skill_like.trainer_roles),
                 ]
             )
-        elif isinstance(skill_like, dict):
-            blob = " ".join(
+        if isinstance(skill_like, dict):
+            return " ".join(
                 [
                     str(skill_like.get("name") or ""),
                     str(skill_like.get("category") or ""),
@@ -609,19 +640,7 @@ class SkillManager:
                     " ".join(str(x) for x in (skill_like.get("trainer_roles") or []) if isinstance(x, str)),
                 ]
             )
-        else:
-            return False
-        skill_tokens = self._split_tokens(blob)
-        intent_tokens = self._split_tokens(intent_key)
-        if not intent_tokens:
-            return False
-
-        for token in intent_tokens:
-            if token in skill_tokens:
-                return True
-            if any(self._fuzzy_ratio(token, st) >= 0.82 for st in skill_tokens if len(st) >= 3):
-                return True
-        return False
+        return None
 
     def apply_skill_xp(self, skill_entry: dict, *, xp_gain: int, used_at_iso: str = "") -> dict:
         if not isinstance(skill_entry, dict):
@@ -870,25 +889,30 @@ class SkillManager:
         # on préfère créer une compétence dédiée.
         return len(covered) < len(hints)
 
+    def _intent_hint_index(self) -> tuple[dict[str, tuple[str, ...]], FuzzyTokenIndex]:
+        cached = SkillManager._intent_hints_compiled
+        if cached is None:
+            tokens = {
+                label: tuple(tok for tok in (self._norm(token) for token in raw) if tok)
+                for label, raw in _INTENT_HINT_MAP.items()
+            }
+            cached = (tokens, FuzzyTokenIndex(tok for row in tokens.values() for tok in row))
+            SkillManager._intent_hints_compiled = cached
+        return cached
+
     def _extract_intent_hints(self, text: str) -> list[str]:
         lower = self._norm(text)
         words = self._split_tokens(lower)
         found: list[str] = []
 
         # 1) Base hints (fuzzy-friendly).
-        for label, tokens in _INTENT_HINT_MAP.items():
-            hit = False
-            for token in tokens:
-                tok = self._norm(token)
-                if not tok:
-                    continue
-                if tok in lower:
-                    hit = True
-                    break
-                if any(self._fuzzy_ratio(tok, w) >= 0.82 for w in words if len(w) >= 4):
-                    hit = True
-                    break
-            if hit:
+        hint_tokens, hint_index = self._intent_hint_index()
+        close: set[str] = set()
+        for word in set(words):
+            if len(word) >= 4:
+                close |= hint_index.similar(word)
+        for label, tokens in hint_tokens.items():
+            if any(tok in lower or tok in close for tok in tokens):
                 found.append(label)
 
         # 2) Freeform fallback when action verbs are present.
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+import threading
+from typing import Callable, Hashable, Iterable, Mapping
+
+
+FUZZY_MIN_RATIO = 0.82
+_MATCHER_CACHE_SIZE = 32
+_SIMILAR_MEMO_SIZE = 4096
+
+
+class PhraseAutomaton:
+    """Automate d'Aho-Corasick: toutes les phrases presentes (sous-chaines) en un passage du texte."""
+
+    def __init__(self, phrases: Mapping[str, Iterable[int]]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[frozenset[int]] = [frozenset()]
+        for phrase, values in phrases.items():
+            node = 0
+            for ch in phrase:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(frozenset())
+                node = nxt
+            self._out[node] = self._out[node] | frozenset(values)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] | self._out[self._fail[child]]
+
+    def find(self, text: str) -> set[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        hits: set[int] = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                hits |= out[node]
+        return hits
+
+
+def _char_grams(token: str) -> set[str]:
+    """Caracteres numerotes par occurrence ("a1", "a2"...): l'intersection de deux ensembles
+    donne exactement l'intersection des multi-ensembles de caracteres."""
+    seen: dict[str, int] = {}
+    grams: set[str] = set()
+    for ch in token:
+        rank = seen.get(ch, 0) + 1
+        seen[ch] = rank
+        grams.add(f"{ch}{rank}")
+    return grams
+
+
+class FuzzyTokenIndex:
+    """Tokens proches d'une requete au sens de SequenceMatcher.ratio() >= FUZZY_MIN_RATIO.
+
+    SequenceMatcher n'apparie jamais plus de caracteres que l'intersection des multi-ensembles:
+    l'index inverse sur `_char_grams` ecarte sans calcul les tokens qui ne peuvent pas atteindre
+    le seuil; les resultats par requete sont memorises.
+    """
+
+    def __init__(self, tokens: Iterable[str]) -> None:
+        self._postings: dict[str, list[str]] = {}
+        for token in set(tokens):
+            if not token:
+                continue
+            for gram in _char_grams(token):
+                self._postings.setdefault(gram, []).append(token)
+        self._memo: dict[tuple[str, bool], frozenset[str]] = {}
+
+    def similar(self, query: str, *, query_first: bool = False) -> frozenset[str]:
+        """`query_first` fixe l'ordre des arguments du ratio (query, token) ou (token, query)."""
+        key = (query, query_first)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+        shared: dict[str, int] = {}
+        if query:
+            for gram in _char_grams(query):
+                for token in self._postings.get(gram, ()):
+                    shared[token] = shared.get(token, 0) + 1
+        hits: set[str] = set()
+        for token, common in shared.items():
+            if 2.0 * common / (len(token) + len(query)) < FUZZY_MIN_RATIO:
+                continue
+            a, b = (query, token) if query_first else (token, query)
+            if a == b or SequenceMatcher(None, a, b).ratio() >= FUZZY_MIN_RATIO:
+                hits.add(token)
+        result = frozenset(hits)
+        if len(self._memo) >= _SIMILAR_MEMO_SIZE:
+            self._memo.clear()
+        self._memo[key] = result
+        return result
+
+
+@dataclass(frozen=True)
+class SkillEntry:
+    skill_id: str
+    phrases: tuple[str, ...]
+    name_tokens: tuple[str, ...]
+    blob_tokens: frozenset[str]
+    category: str
+
+
+class SkillMatcher:
+    """Detection des competences citees dans un message, compilee une fois par liste de competences.
+
+    Les entrees sont deja normalisees par SkillManager; les indices renvoyes suivent l'ordre
+    des entrees.
+    """
+
+    def __init__(self, entries: Iterable[SkillEntry]) -> None:
+        self.entries = tuple(entries)
+        phrases: dict[str, set[int]] = {}
+        self._name_postings: dict[str, set[int]] = {}
+        self._blob_postings: dict[str, set[int]] = {}
+        self._category_postings: dict[str, set[int]] = {}
+        for idx, entry in enumerate(self.entries):
+            for phrase in entry.phrases:
+                phrases.setdefault(phrase, set()).add(idx)
+            for token in entry.name_tokens:
+                self._name_postings.setdefault(token, set()).add(idx)
+            for token in entry.blob_tokens:
+                self._blob_postings.setdefault(token, set()).add(idx)
+            if entry.category:
+                self._category_postings.setdefault(entry.category, set()).add(idx)
+        self._phrases = PhraseAutomaton(phrases)
+        self._name_index = FuzzyTokenIndex(self._name_postings)
+        self._blob_index = FuzzyTokenIndex(token for token in self._blob_postings if len(token) >= 3)
+        self._category_index = FuzzyTokenIndex(self._category_postings)
+
+    def name_hits(self, lower: str, words: Iterable[str]) -> list[int]:
+        """Nom ou id cite tel quel, ou tokens du nom retrouves (a une faute pres) dans le message."""
+        exact = self._phrases.find(lower)
+        matched: set[str] = set()
+        for word in set(words):
+            if len(word) >= 3:
+                matched |= self._name_index.similar(word)
+        candidates = set(exact)
+        for token in matched:
+            candidates |= self._name_postings[token]
+        out: list[int] = []
+        for idx in sorted(candidates):
+            if idx in exact:
+                out.append(idx)
+                continue
+            tokens = self.entries[idx].name_tokens
+            if sum(1 for token in tokens if token in matched) >= max(1, len(tokens) - 1):
+                out.append(idx)
+        return out
+
+    def intent_hits(self, intent_tokens: Iterable[Iterable[str]]) -> set[int]:
+        """Competences dont un token (nom, categorie, description, effets, roles) correspond a une intention."""
+        hits: set[int] = set()
+        for tokens in intent_tokens:
+            for token in tokens:
+                hits |= self._blob_postings.get(token, set())
+                for skill_token in self._blob_index.similar(token, query_first=True):
+                    hits |= self._blob_postings[skill_token]
+        return hits
+
+    def category_hits(self, intents: Iterable[str]) -> set[int]:
+        hits: set[int] = set()
+        for intent in intents:
+            for category in self._category_index.similar(intent):
+                hits |= self._category_postings[category]
+        return hits
+
+
+_matcher_lock = threading.Lock()
+_matcher_cache: "OrderedDict[Hashable, SkillMatcher]" = OrderedDict()
+
+
+def get_skill_matcher(signature: Hashable, build: Callable[[], SkillMatcher]) -> SkillMatcher:
+    """Matcher partage pour une liste de competences (`signature`: son contenu utile)."""
+    with _matcher_lock:
+        cached = _matcher_cache.get(signature)
+        if cached is not None:
+            _matcher_cache.move_to_end(signature)
+            return cached
+    matcher = build()
+    with _matcher_lock:
+        _matcher_cache[signature] = matcher
+        _matcher_cache.move_to_end(signature)
+        while len(_matcher_cache) > _MATCHER_CACHE_SIZE:
+            _matcher_cache.popitem(last=False)
+    return matcher
@@ -1,4 +1,5 @@
 from nicegui import app, ui
+from app.core.memory import close_memory_service
 from app.ui.pages.game_page import game_page as game_page  # noqa: F401
 from app.ui.pages.memory_admin_page import memory_admin_page as memory_admin_page  # noqa: F401
 from app.ui.pages.prototype_2d_page import prototype_2d_page as prototype_2d_page  # noqa: F401
@@ -6,6 +7,7 @@ from app.ui.pages.studio_page import studio_page as studio_page  # noqa: F401
 
 
 app.add_static_files('/assets', 'assets')  # dossier local ./assets
+app.on_shutdown(close_memory_service)  # vide le write-behind memoire
 ui.add_head_html(
     """
     <style>
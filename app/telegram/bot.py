@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+import heapq
 import os
 import random
 import re
 import time
+from typing import AsyncIterator
 
 from dotenv import load_dotenv
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton, ReplyKeyboardMarkup, Update
@@ -50,6 +53,8 @@ _IDLE_LAST_USER_ACTIVITY_KEY = "telegram_idle_last_user_activity"
 _IDLE_LAST_NUDGE_KEY = "telegram_idle_last_nudge"
 _IDLE_WAITING_REPLY_KEY = "telegram_idle_waiting_reply"
 _IDLE_DAILY_PLAN_KEY = "telegram_idle_daily_plan"
+_IDLE_NUDGE_HEAP_KEY = "telegram_idle_nudge_heap"
+_IDLE_NUDGE_DUE_KEY = "telegram_idle_nudge_due"
 
 
 def _env_int(name: str, default: int) -> int:
@@ -66,6 +71,9 @@ IDLE_NUDGE_MAX_PER_DAY = max(1, min(3, _env_int("TELEGRAM_IDLE_NUDGE_MAX_PER_DAY
 IDLE_NUDGE_WINDOW_START_HOUR = max(0, min(23, _env_int("TELEGRAM_IDLE_NUDGE_WINDOW_START_HOUR", 8)))
 IDLE_NUDGE_WINDOW_END_HOUR = max(IDLE_NUDGE_WINDOW_START_HOUR + 1, min(24, _env_int("TELEGRAM_IDLE_NUDGE_WINDOW_END_HOUR", 20)))
 IDLE_NUDGE_MIN_GAP_CHOICES_SECONDS = (3600, 7200)
+# Intervalle min entre deux editions du message en cours de streaming (0 = pas de streaming)
+STREAM_EDIT_INTERVAL_MS = max(0, _env_int("TELEGRAM_STREAM_EDIT_MS", 900))
+_STREAM_CURSOR = " …"
 
 # Client global pour l'API image (stateless)
 banana_client = BananaClient()
@@ -285,8 +293,10 @@ def _is_waiting_for_reply(application: Application, chat_id: int) -> bool:
 
 
 def _mark_user_activity(application: Application, chat_id: int) -> None:
-    _ts_map(application, _IDLE_LAST_USER_ACTIVITY_KEY)[int(chat_id)] = time.time()
+    now = time.time()
+    _ts_map(application, _IDLE_LAST_USER_ACTIVITY_KEY)[int(chat_id)] = now
     _set_waiting_for_reply(application, int(chat_id), False)
+    _schedule_nudge_check(application, int(chat_id), _next_nudge_check_ts(application, int(chat_id), now_ts=now))
 
 
 def _mark_nudge_sent(application: Application, chat_id: int) -> None:
@@ -295,6 +305,56 @@ def _mark_nudge_sent(application: Application, chat_id: int) -> None:
     _advance_daily_nudge(application, int(chat_id), now_ts=time.time())
 
 
+def _next_nudge_window_start(now_ts: float) -> float:
+    local_now = datetime.fromtimestamp(float(now_ts))
+    start_dt = local_now.replace(hour=IDLE_NUDGE_WINDOW_START_HOUR, minute=0, second=0, microsecond=0)
+    if start_dt.timestamp() <= float(now_ts):
+        start_dt += timedelta(days=1)
+    return start_dt.timestamp()
+
+
+def _next_nudge_check_ts(application: Application, chat_id: int, *, now_ts: float) -> float:
+    """Plus tot instant ou une relance peut devenir necessaire pour ce chat."""
+    if not _is_within_nudge_window(now_ts):
+        return _next_nudge_window_start(now_ts)
+    next_nudge_ts = _next_daily_nudge_ts(application, chat_id, now_ts=now_ts)
+    if next_nudge_ts is None:
+        return _next_nudge_window_start(now_ts)
+    due = float(next_nudge_ts)
+    if not _is_waiting_for_reply(application, chat_id):
+        last_user = float(_ts_map(application, _IDLE_LAST_USER_ACTIVITY_KEY).get(int(chat_id), 0.0) or 0.0)
+        due = max(due, last_user + float(IDLE_NUDGE_AFTER_SECONDS))
+    return max(due, float(now_ts) + 1.0)
+
+
+def _schedule_nudge_check(application: Application, chat_id: int, due_ts: float) -> None:
+    # Tas (due_ts, chat_id) avec suppression paresseuse: seule l'entree egale a _IDLE_NUDGE_DUE_KEY compte.
+    heap = application.bot_data.setdefault(_IDLE_NUDGE_HEAP_KEY, [])
+    _ts_map(application, _IDLE_NUDGE_DUE_KEY)[int(chat_id)] = float(due_ts)
+    heapq.heappush(heap, (float(due_ts), int(chat_id)))
+
+
+def _peek_nudge_due(application: Application) -> float | None:
+    heap = application.bot_data.setdefault(_IDLE_NUDGE_HEAP_KEY, [])
+    due_map = _ts_map(application, _IDLE_NUDGE_DUE_KEY)
+    while heap and due_map.get(heap[0][1]) != heap[0][0]:
+        heapq.heappop(heap)
+    return heap[0][0] if heap else None
+
+
+def _pop_due_nudge_chats(application: Application, *, now_ts: float) -> list[int]:
+    heap = application.bot_data.setdefault(_IDLE_NUDGE_HEAP_KEY, [])
+    due_map = _ts_map(application, _IDLE_NUDGE_DUE_KEY)
+    due_chats: list[int] = []
+    while heap and heap[0][0] <= float(now_ts):
+        due_ts, chat_id = heapq.heappop(heap)
+        if due_map.get(chat_id) != due_ts:
+            continue
+        due_map.pop(chat_id, None)
+        due_chats.append(chat_id)
+    return due_chats
+
+
 def _ensure_idle_nudge_loop(application: Application) -> None:
     task = application.bot_data.get(_IDLE_NUDGE_TASK_KEY)
     if isinstance(task, asyncio.Task) and not task.done():
@@ -316,15 +376,17 @@ def _display_name_from_update(update: Update) -> str:
     return display_name
 
 
-async def _session_from_update(update: Update, context: ContextTypes.DEFAULT_TYPE) -> TelegramGameSession:
+@asynccontextmanager
+async def _leased_session(update: Update, context: ContextTypes.DEFAULT_TYPE) -> AsyncIterator[TelegramGameSession]:
+    """Session du chat, epinglee en memoire (pas d'hibernation) jusqu'a la fin du handler."""
     chat = update.effective_chat
     if chat is None:
         raise RuntimeError(_text("error.bot.chat_not_found"))
     display_name = _display_name_from_update(update)
-    session = await _manager(context).get_session(chat_id=int(chat.id), display_name=display_name)
-    _ensure_idle_nudge_loop(context.application)
-    _mark_user_activity(context.application, int(chat.id))
-    return session
+    async with _manager(context).session_lease(chat_id=int(chat.id), display_name=display_name) as session:
+        _ensure_idle_nudge_loop(context.application)
+        _mark_user_activity(context.application, int(chat.id))
+        yield session
 
 
 def _register_user_activity_from_update(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -381,6 +443,45 @@ def _split_ataryxia_bubbles(text: str, *, max_bubbles: int = 2, max_chars: int =
     return [row for row in bubbles[:limit] if row]
 
 
+class _StreamedReply:
+    """Message Telegram edite au fil du streaming du dialogue (editions espacees: rate-limit Telegram)."""
+
+    def __init__(self, text_target, *, min_interval_s: float) -> None:
+        self.text_target = text_target
+        self.min_interval_s = max(0.0, float(min_interval_s))
+        self.message = None
+        self.shown = ""
+        self._last_edit = 0.0
+
+    async def update(self, preview: str) -> None:
+        text = str(preview or "").strip()
+        if not text or text == self.shown:
+            return
+        now = time.monotonic()
+        try:
+            if self.message is None:
+                self.message = await self.text_target.reply_text(text + _STREAM_CURSOR, reply_markup=_main_keyboard())
+            elif now - self._last_edit < self.min_interval_s:
+                return
+            else:
+                await self.message.edit_text(text + _STREAM_CURSOR)
+        except Exception:
+            return
+        self.shown = text
+        self._last_edit = now
+
+    async def finish(self, text: str) -> bool:
+        """Remplace l'apercu par le texte final; False si rien n'a ete streame."""
+        if self.message is None:
+            return False
+        clean = str(text or "").strip() or _text("system.message.placeholder")
+        try:
+            await self.message.edit_text(clean)
+        except Exception:
+            pass
+        return True
+
+
 async def _send_typing_hint(text_target, text: str) -> None:
     clean = str(text or "").strip()
     if not clean:
@@ -408,86 +509,111 @@ async def _send_typing_hint_chat_id(application: Application, chat_id: int, text
 async def _idle_nudge_loop(application: Application) -> None:
     try:
         while True:
-            await asyncio.sleep(IDLE_NUDGE_CHECK_SECONDS)
+            next_due = _peek_nudge_due(application)
+            delay = float(IDLE_NUDGE_CHECK_SECONDS)
+            if next_due is not None:
+                delay = max(1.0, min(delay, next_due - time.time()))
+            await asyncio.sleep(delay)
             manager = application.bot_data.get("telegram_session_manager")
             if not isinstance(manager, TelegramSessionManager):
                 continue
 
-            now = time.time()
-            user_activity = _ts_map(application, _IDLE_LAST_USER_ACTIVITY_KEY)
-            last_nudges = _ts_map(application, _IDLE_LAST_NUDGE_KEY)
-
-            for session in manager.active_sessions():
-                chat_id = int(getattr(session, "chat_id", 0) or 0)
-                if chat_id <= 0:
-                    continue
-                if not _is_within_nudge_window(now):
-                    continue
-
-                last_user = float(user_activity.get(chat_id, 0.0) or 0.0)
-                if last_user <= 0.0:
-                    # Evite une relance immediate au redemarrage: initialise d'abord.
-                    user_activity[chat_id] = now
-                    continue
-
-                next_nudge_ts = _next_daily_nudge_ts(application, chat_id, now_ts=now)
-                if next_nudge_ts is None:
-                    continue
-                if now < float(next_nudge_ts):
-                    continue
-
-                last_nudge = float(last_nudges.get(chat_id, 0.0) or 0.0)
-                waiting_reply = _is_waiting_for_reply(application, chat_id)
-                if waiting_reply and last_nudge <= 0.0:
-                    _set_waiting_for_reply(application, chat_id, False)
-                    waiting_reply = False
-
-                if waiting_reply:
-                    # Relances 2/3: uniquement si aucune reponse utilisateur depuis la relance precedente.
-                    if last_user > last_nudge:
-                        _set_waiting_for_reply(application, chat_id, False)
-                        continue
-                else:
-                    # Premiere relance de la serie: seulement apres inactivite.
-                    if (now - last_user) < float(IDLE_NUDGE_AFTER_SECONDS):
-                        continue
+            try:
+                await manager.evict_idle()
+            except Exception:
+                pass
 
+            for chat_id in _pop_due_nudge_chats(application, now_ts=time.time()):
                 try:
-                    async with session.lock:
-                        if session.telegram_mode() != TELEGRAM_MODE_ATARYXIA:
-                            continue
-                        if not (session.state and session.state.player_sheet_ready):
-                            continue
-                        if session.in_dungeon() or session.dungeon_has_active_combat():
-                            continue
-                        nudge_text = session.build_idle_nudge_text()
-                        if not nudge_text:
-                            continue
-                        session.save()
-
-                    bubbles = _split_ataryxia_bubbles(nudge_text, max_bubbles=2, max_chars=170)
-                    if not bubbles:
-                        bubbles = [str(nudge_text).strip() or _text("system.message.placeholder")]
-                    for idx, bubble in enumerate(bubbles):
-                        await _send_typing_hint_chat_id(application, chat_id, bubble)
-                        markup = _main_keyboard() if idx == len(bubbles) - 1 else None
-                        await application.bot.send_message(chat_id=chat_id, text=bubble, reply_markup=markup)
-                    _mark_nudge_sent(application, chat_id)
+                    await _maybe_send_idle_nudge(application, manager, chat_id)
                 except asyncio.CancelledError:
                     raise
                 except Exception:
-                    continue
+                    pass
+                if manager.is_known_chat(chat_id):
+                    _schedule_nudge_check(application, chat_id, _next_nudge_check_ts(application, chat_id, now_ts=time.time()))
     except asyncio.CancelledError:
         return
 
 
-async def _send_turn_output(*, text_target, output: TurnOutput, session: TelegramGameSession) -> None:
+async def _maybe_send_idle_nudge(application: Application, manager: TelegramSessionManager, chat_id: int) -> None:
+    now = time.time()
+    if chat_id <= 0 or not manager.is_known_chat(chat_id):
+        return
+    if not _is_within_nudge_window(now):
+        return
+
+    user_activity = _ts_map(application, _IDLE_LAST_USER_ACTIVITY_KEY)
+    last_nudges = _ts_map(application, _IDLE_LAST_NUDGE_KEY)
+    last_user = float(user_activity.get(chat_id, 0.0) or 0.0)
+    if last_user <= 0.0:
+        # Evite une relance immediate au redemarrage: initialise d'abord.
+        user_activity[chat_id] = now
+        return
+
+    next_nudge_ts = _next_daily_nudge_ts(application, chat_id, now_ts=now)
+    if next_nudge_ts is None:
+        return
+    if now < float(next_nudge_ts):
+        return
+
+    last_nudge = float(last_nudges.get(chat_id, 0.0) or 0.0)
+    waiting_reply = _is_waiting_for_reply(application, chat_id)
+    if waiting_reply and last_nudge <= 0.0:
+        _set_waiting_for_reply(application, chat_id, False)
+        waiting_reply = False
+
+    if waiting_reply:
+        # Relances 2/3: uniquement si aucune reponse utilisateur depuis la relance precedente.
+        if last_user > last_nudge:
+            _set_waiting_for_reply(application, chat_id, False)
+            return
+    else:
+        # Premiere relance de la serie: seulement apres inactivite.
+        if (now - last_user) < float(IDLE_NUDGE_AFTER_SECONDS):
+            return
+
+    # Une session hibernee est rechargee depuis sa sauvegarde uniquement quand la relance est due.
+    async with manager.session_lease(chat_id=chat_id) as session, session.lock:
+        if session.telegram_mode() != TELEGRAM_MODE_ATARYXIA:
+            return
+        if not (session.state and session.state.player_sheet_ready):
+            return
+        if session.in_dungeon() or session.dungeon_has_active_combat():
+            return
+        nudge_text = session.build_idle_nudge_text()
+        if not nudge_text:
+            return
+        session.save()
+
+    bubbles = _split_ataryxia_bubbles(nudge_text, max_bubbles=2, max_chars=170)
+    if not bubbles:
+        bubbles = [str(nudge_text).strip() or _text("system.message.placeholder")]
+    for idx, bubble in enumerate(bubbles):
+        await _send_typing_hint_chat_id(application, chat_id, bubble)
+        markup = _main_keyboard() if idx == len(bubbles) - 1 else None
+        await application.bot.send_message(chat_id=chat_id, text=bubble, reply_markup=markup)
+    _mark_nudge_sent(application, chat_id)
+
+
+async def _send_turn_output(
+    *,
+    text_target,
+    output: TurnOutput,
+    session: TelegramGameSession,
+    streamed: _StreamedReply | None = None,
+) -> None:
     mode = session.telegram_mode()
     if mode == TELEGRAM_MODE_ATARYXIA:
         bubbles = _split_ataryxia_bubbles(output.text, max_bubbles=3, max_chars=220)
         if not bubbles:
             bubbles = [str(output.text or "").strip() or _text("system.message.placeholder")]
+        first = 0
+        if streamed is not None and await streamed.finish(bubbles[0]):
+            first = 1
         for idx, bubble in enumerate(bubbles):
+            if idx < first:
+                continue
             await _send_typing_hint(text_target, bubble)
             markup = _main_keyboard() if idx == len(bubbles) - 1 else None
             await text_target.reply_text(bubble, reply_markup=markup)
@@ -526,58 +652,58 @@ async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     if message is None:
         return
 
-    session = await _session_from_update(update, context)
-    async with session.lock:
-        status = session.status_text()
-        mode = session.telegram_mode()
-        creation = session.creation_status_text() if not (session.state and session.state.player_sheet_ready) else ""
-    mode_name = _text("system.bot.mode_name_dungeon") if mode == TELEGRAM_MODE_DUNGEON else _text("system.bot.mode_name_ataryxia")
-    lines = [
-        _text("system.start.title"),
-        _text("system.start.current_mode", mode=mode_name),
-        _text("system.start.quick_choice"),
-    ]
-    await message.reply_text("\n".join(lines), reply_markup=_main_keyboard())
-    await message.reply_text(status, reply_markup=_main_keyboard())
-    if creation:
-        await message.reply_text(creation, reply_markup=_main_keyboard())
-    if mode == TELEGRAM_MODE_DUNGEON:
-        await message.reply_text(_text("ui.dungeon.actions_title"), reply_markup=_dungeon_keyboard(session))
+    async with _leased_session(update, context) as session:
+        async with session.lock:
+            status = session.status_text()
+            mode = session.telegram_mode()
+            creation = session.creation_status_text() if not (session.state and session.state.player_sheet_ready) else ""
+        mode_name = _text("system.bot.mode_name_dungeon") if mode == TELEGRAM_MODE_DUNGEON else _text("system.bot.mode_name_ataryxia")
+        lines = [
+            _text("system.start.title"),
+            _text("system.start.current_mode", mode=mode_name),
+            _text("system.start.quick_choice"),
+        ]
+        await message.reply_text("\n".join(lines), reply_markup=_main_keyboard())
+        await message.reply_text(status, reply_markup=_main_keyboard())
+        if creation:
+            await message.reply_text(creation, reply_markup=_main_keyboard())
+        if mode == TELEGRAM_MODE_DUNGEON:
+            await message.reply_text(_text("ui.dungeon.actions_title"), reply_markup=_dungeon_keyboard(session))
 
 
 async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     message = update.effective_message
     if message is None:
         return
-    session = await _session_from_update(update, context)
-    async with session.lock:
-        mode = session.telegram_mode()
-        status = session.status_text()
+    async with _leased_session(update, context) as session:
+        async with session.lock:
+            mode = session.telegram_mode()
+            status = session.status_text()
+            if mode == TELEGRAM_MODE_DUNGEON:
+                status = f"{status}\n\n{session.dungeon_status_text()}"
+        await message.reply_text(status, reply_markup=_main_keyboard())
         if mode == TELEGRAM_MODE_DUNGEON:
-            status = f"{status}\n\n{session.dungeon_status_text()}"
-    await message.reply_text(status, reply_markup=_main_keyboard())
-    if mode == TELEGRAM_MODE_DUNGEON:
-        await message.reply_text(_text("ui.dungeon.actions_title"), reply_markup=_dungeon_keyboard(session))
+            await message.reply_text(_text("ui.dungeon.actions_title"), reply_markup=_dungeon_keyboard(session))
 
 
 async def cmd_save(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     message = update.effective_message
     if message is None:
         return
-    session = await _session_from_update(update, context)
-    async with session.lock:
-        session.save()
-    await message.reply_text(_text("system.save.done"), reply_markup=_main_keyboard())
+    async with _leased_session(update, context) as session:
+        async with session.lock:
+            await session.save_and_flush()
+        await message.reply_text(_text("system.save.done"), reply_markup=_main_keyboard())
 
 
 async def cmd_creation(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     message = update.effective_message
     if message is None:
         return
-    session = await _session_from_update(update, context)
-    async with session.lock:
-        text = session.creation_status_text()
-    await message.reply_text(text, reply_markup=_main_keyboard())
+    async with _leased_session(update, context) as session:
+        async with session.lock:
+            text = session.creation_status_text()
+        await message.reply_text(text, reply_markup=_main_keyboard())
 
 
 async def cmd_profiles(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -614,15 +740,16 @@ async def cmd_useprofile(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     _register_user_activity_from_update(update, context)
     manager = _manager(context)
     display_name = _display_name_from_update(update)
-    session = await manager.switch_profile(
+    await manager.switch_profile(
         chat_id=int(chat.id),
         display_name=display_name,
         profile_key=str(args[0]),
     )
-    async with session.lock:
+    async with manager.session_lease(chat_id=int(chat.id), display_name=display_name) as session, session.lock:
         status = session.status_text()
         creation = session.creation_status_text() if not (session.state and session.state.player_sheet_ready) else ""
-    txt = _text("system.bot.profile_switched", profile_key=session.profile_key) + "\n" + status
+        profile_key = session.profile_key
+    txt = _text("system.bot.profile_switched", profile_key=profile_key) + "\n" + status
     if creation:
         txt += f"\n\n{creation}"
     await message.reply_text(txt, reply_markup=_main_keyboard())
@@ -648,11 +775,12 @@ async def cmd_slot(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     _register_user_activity_from_update(update, context)
     manager = _manager(context)
     display_name = _display_name_from_update(update)
-    session = await manager.switch_slot(chat_id=int(chat.id), display_name=display_name, slot=slot)
-    async with session.lock:
+    await manager.switch_slot(chat_id=int(chat.id), display_name=display_name, slot=slot)
+    async with manager.session_lease(chat_id=int(chat.id), display_name=display_name) as session, session.lock:
         status = session.status_text()
         creation = session.creation_status_text() if not (session.state and session.state.player_sheet_ready) else ""
-    txt = _text("system.bot.slot_switched", slot=session.slot) + "\n" + status
+        current_slot = session.slot
+    txt = _text("system.bot.slot_switched", slot=current_slot) + "\n" + status
     if creation:
         txt += f"\n\n{creation}"
     await message.reply_text(txt, reply_markup=_main_keyboard())
@@ -662,20 +790,20 @@ async def cmd_dungeon(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     message = update.effective_message
     if message is None:
         return
-    session = await _session_from_update(update, context)
-    async with session.lock:
-        output = await _switch_mode(session, TELEGRAM_MODE_DUNGEON)
-    await _send_turn_output(text_target=message, output=output, session=session)
+    async with _leased_session(update, context) as session:
+        async with session.lock:
+            output = await _switch_mode(session, TELEGRAM_MODE_DUNGEON)
+        await _send_turn_output(text_target=message, output=output, session=session)
 
 
 async def cmd_ataryxia(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     message = update.effective_message
     if message is None:
         return
-    session = await _session_from_update(update, context)
-    async with session.lock:
-        output = await _switch_mode(session, TELEGRAM_MODE_ATARYXIA)
-    await _send_turn_output(text_target=message, output=output, session=session)
+    async with _leased_session(update, context) as session:
+        async with session.lock:
+            output = await _switch_mode(session, TELEGRAM_MODE_ATARYXIA)
+        await _send_turn_output(text_target=message, output=output, session=session)
 
 
 async def cmd_npcs(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -707,35 +835,38 @@ async def on_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     if not text:
         return
 
-    session = await _session_from_update(update, context)
-
-    if text == BUTTON_MODE_DUNGEON:
+    async with _leased_session(update, context) as session:
+        if text == BUTTON_MODE_DUNGEON:
+            async with session.lock:
+                output = await _switch_mode(session, TELEGRAM_MODE_DUNGEON)
+            await _send_turn_output(text_target=message, output=output, session=session)
+            return
+        if text == BUTTON_MODE_ATARYXIA:
+            async with session.lock:
+                output = await _switch_mode(session, TELEGRAM_MODE_ATARYXIA)
+            await _send_turn_output(text_target=message, output=output, session=session)
+            return
+        if text == BUTTON_STATUS:
+            await cmd_status(update, context)
+            return
+        if text == BUTTON_SAVE:
+            await cmd_save(update, context)
+            return
+
+        streamed: _StreamedReply | None = None
         async with session.lock:
-            output = await _switch_mode(session, TELEGRAM_MODE_DUNGEON)
-        await _send_turn_output(text_target=message, output=output, session=session)
-        return
-    if text == BUTTON_MODE_ATARYXIA:
-        async with session.lock:
-            output = await _switch_mode(session, TELEGRAM_MODE_ATARYXIA)
-        await _send_turn_output(text_target=message, output=output, session=session)
-        return
-    if text == BUTTON_STATUS:
-        await cmd_status(update, context)
-        return
-    if text == BUTTON_SAVE:
-        await cmd_save(update, context)
-        return
-
-    async with session.lock:
-        mode = session.telegram_mode()
-        if mode == TELEGRAM_MODE_DUNGEON:
-            output = TurnOutput(
-                text=_text("ui.hint.dungeon_use_buttons"),
-                has_pending_trade=False,
-            )
-        else:
-            output = await session.process_ataryxia_message(text)
-    await _send_turn_output(text_target=message, output=output, session=session)
+            mode = session.telegram_mode()
+            if mode == TELEGRAM_MODE_DUNGEON:
+                output = TurnOutput(
+                    text=_text("ui.hint.dungeon_use_buttons"),
+                    has_pending_trade=False,
+                )
+            elif STREAM_EDIT_INTERVAL_MS > 0:
+                streamed = _StreamedReply(message, min_interval_s=STREAM_EDIT_INTERVAL_MS / 1000.0)
+                output = await session.process_ataryxia_message(text, on_dialogue=streamed.update)
+            else:
+                output = await session.process_ataryxia_message(text)
+        await _send_turn_output(text_target=message, output=output, session=session, streamed=streamed)
 
 
 async def on_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -748,50 +879,55 @@ async def on_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         return
 
     data = str(query.data or "")
-    session = await _session_from_update(update, context)
-
-    if data == CALLBACK_NOOP:
-        return
+    async with _leased_session(update, context) as session:
+        if data == CALLBACK_NOOP:
+            return
 
-    if data == CALLBACK_DUNGEON_SKILL_MENU:
-        await query.message.reply_text(_text("ui.dungeon.skill_menu_title"), reply_markup=_dungeon_skill_keyboard())
-        return
+        if data == CALLBACK_DUNGEON_SKILL_MENU:
+            await query.message.reply_text(_text("ui.dungeon.skill_menu_title"), reply_markup=_dungeon_skill_keyboard())
+            return
 
-    if data == CALLBACK_DUNGEON_INVENTORY:
-        async with session.lock:
-            rows = session.dungeon_consumables()
-        await query.message.reply_text(_text("ui.dungeon.inventory_title"), reply_markup=_dungeon_inventory_keyboard(rows))
-        return
+        if data == CALLBACK_DUNGEON_INVENTORY:
+            async with session.lock:
+                rows = session.dungeon_consumables()
+            await query.message.reply_text(_text("ui.dungeon.inventory_title"), reply_markup=_dungeon_inventory_keyboard(rows))
+            return
 
-    if data == CALLBACK_DUNGEON_BACK:
-        await query.message.reply_text(_text("ui.dungeon.actions_title"), reply_markup=_dungeon_keyboard(session))
-        return
+        if data == CALLBACK_DUNGEON_BACK:
+            await query.message.reply_text(_text("ui.dungeon.actions_title"), reply_markup=_dungeon_keyboard(session))
+            return
 
-    output: TurnOutput | None = None
-    async with session.lock:
-        session.set_telegram_mode(TELEGRAM_MODE_DUNGEON)
-        if data == CALLBACK_DUNGEON_ENTER:
-            output = await session.dungeon_enter_or_resume()
-        elif data == CALLBACK_DUNGEON_ADVANCE:
-            output = await session.dungeon_advance_floor()
-        elif data == CALLBACK_DUNGEON_ATTACK:
-            output = await session.dungeon_combat_action("attack")
-        elif data == CALLBACK_DUNGEON_SKILL_HEAL:
-            output = await session.dungeon_combat_action("heal")
-        elif data == CALLBACK_DUNGEON_SKILL_SPELL:
-            output = await session.dungeon_combat_action("spell")
-        elif data == CALLBACK_DUNGEON_SKILL_CORE:
-            output = await session.dungeon_combat_action("skill")
-        elif data == CALLBACK_DUNGEON_FLEE:
-            output = await session.dungeon_combat_action("flee")
-        elif data.startswith(CALLBACK_DUNGEON_ITEM_PREFIX):
-            item_id = data[len(CALLBACK_DUNGEON_ITEM_PREFIX) :].strip().casefold()
-            output = await session.dungeon_use_consumable(item_id)
-
-    if output is None:
-        await query.message.reply_text(_text("system.bot.action_unknown"), reply_markup=_main_keyboard())
-        return
-    await _send_turn_output(text_target=query.message, output=output, session=session)
+        output: TurnOutput | None = None
+        async with session.lock:
+            session.set_telegram_mode(TELEGRAM_MODE_DUNGEON)
+            if data == CALLBACK_DUNGEON_ENTER:
+                output = await session.dungeon_enter_or_resume()
+            elif data == CALLBACK_DUNGEON_ADVANCE:
+                output = await session.dungeon_advance_floor()
+            elif data == CALLBACK_DUNGEON_ATTACK:
+                output = await session.dungeon_combat_action("attack")
+            elif data == CALLBACK_DUNGEON_SKILL_HEAL:
+                output = await session.dungeon_combat_action("heal")
+            elif data == CALLBACK_DUNGEON_SKILL_SPELL:
+                output = await session.dungeon_combat_action("spell")
+            elif data == CALLBACK_DUNGEON_SKILL_CORE:
+                output = await session.dungeon_combat_action("skill")
+            elif data == CALLBACK_DUNGEON_FLEE:
+                output = await session.dungeon_combat_action("flee")
+            elif data.startswith(CALLBACK_DUNGEON_ITEM_PREFIX):
+                item_id = data[len(CALLBACK_DUNGEON_ITEM_PREFIX) :].strip().casefold()
+                output = await session.dungeon_use_consumable(item_id)
+
+        if output is None:
+            await query.message.reply_text(_text("system.bot.action_unknown"), reply_markup=_main_keyboard())
+            return
+        await _send_turn_output(text_target=query.message, output=output, session=session)
+
+
+async def _on_shutdown(application: Application) -> None:
+    manager = application.bot_data.get("telegram_session_manager")
+    if isinstance(manager, TelegramSessionManager):
+        await manager.aclose()
 
 
 def build_application(token: str) -> Application:
@@ -806,7 +942,7 @@ def build_application(token: str) -> Application:
         shared_profile_name=shared_profile_name or None,
     )
 
-    app = Application.builder().token(token).build()
+    app = Application.builder().token(token).post_shutdown(_on_shutdown).build()
     app.bot_data["telegram_session_manager"] = manager
 
     app.add_handler(CommandHandler("start", cmd_start))
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import asynccontextmanager
+import logging
 import os
 import re
+import threading
+import time
 from dataclasses import dataclass, field
+from typing import AsyncIterator
 
-from app.core.events import OnLocationEntered, get_global_event_bus
+from app.core.events import EventBus, OnLocationEntered, get_global_event_bus
 from app.core.data.data_manager import DataError, DataManager
 from app.core.data.item_manager import ItemsManager
 from app.core.save import SaveManager
@@ -17,11 +22,12 @@ from app.gamemaster.conversation_memory import (
     ensure_conversation_memory_state,
     remember_dialogue_turn,
     remember_system_event,
+    warm_memory_query,
 )
 from app.gamemaster.dungeon_combat import build_combat_state, is_combat_event, resolve_combat_turn
 from app.gamemaster.dungeon_manager import DungeonManager
 from app.gamemaster.economy_manager import EconomyManager
-from app.gamemaster.gamemaster import GameMaster
+from app.gamemaster.gamemaster import DialogueStreamCallback, GameMaster
 from app.gamemaster.gm_state_builder import apply_base_gm_state
 from app.gamemaster.location_manager import LocationManager, is_building_scene_title, scene_open_status
 from app.gamemaster.loot_manager import LootManager
@@ -41,6 +47,10 @@ from app.gamemaster.world_time import format_fantasy_datetime
 from app.infra import text_library as _text_library
 from app.ui.components.consumables import add_consumable_stat_buff, get_consumable_stat_bonus_totals, tick_consumable_buffs
 from app.ui.state.game_state import GameState
+from app.ui.state.inventory import add_item, count_item, remove_item
+
+
+LOG = logging.getLogger(__name__)
 
 
 @dataclass
@@ -89,6 +99,82 @@ def _env_bool(name: str, default: bool) -> bool:
 _ATARYXIA_FREEFORM_DEFAULT = _env_bool("TELEGRAM_ATARYXIA_FREEFORM_DEFAULT", False)
 
 
+def _env_int(name: str, default: int) -> int:
+    raw = str(os.getenv(name, str(default)) or str(default)).strip()
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return default
+
+
+# Sessions inactives sauvegardees puis dechargees de la memoire (0 = jamais)
+SESSION_IDLE_TIMEOUT_SECONDS = max(0, _env_int("TELEGRAM_SESSION_IDLE_TIMEOUT_SECONDS", 1800))
+# Nombre max de sessions gardees en memoire, les moins recentes sont hibernees (0 = illimite)
+SESSION_MAX_RESIDENT = max(0, _env_int("TELEGRAM_SESSION_MAX_RESIDENT", 64))
+
+
+@dataclass(frozen=True)
+class TelegramSharedServices:
+    """Client LLM et managers partages par toutes les sessions Telegram du processus."""
+
+    event_bus: EventBus
+    llm: OllamaClient
+    economy_manager: EconomyManager
+    location_seed: LocationManager
+    items_manager: ItemsManager
+    dungeon_manager: DungeonManager
+    monster_manager: MonsterManager
+    loot_manager: LootManager
+    npc_store: NPCProfileManager
+    player_sheet_manager: PlayerSheetManager
+
+
+def build_telegram_shared_services(
+    *,
+    data_dir: str = "data",
+    monsters_dir: str = "data/monsters",
+    event_bus: EventBus | None = None,
+    llm: OllamaClient | None = None,
+) -> TelegramSharedServices:
+    bus = event_bus if isinstance(event_bus, EventBus) else get_global_event_bus()
+    llm_client = llm if isinstance(llm, OllamaClient) else OllamaClient()
+    return TelegramSharedServices(
+        event_bus=bus,
+        llm=llm_client,
+        economy_manager=EconomyManager(data_dir=data_dir),
+        location_seed=LocationManager(None),
+        items_manager=ItemsManager(data_dir=data_dir),
+        dungeon_manager=DungeonManager(llm_client),
+        monster_manager=MonsterManager(data_dir=monsters_dir),
+        loot_manager=LootManager(llm_client, data_dir=data_dir),
+        npc_store=NPCProfileManager(llm_client),
+        player_sheet_manager=PlayerSheetManager(llm_client),
+    )
+
+
+_shared_services_lock = threading.Lock()
+_shared_services: dict[str, TelegramSharedServices] = {}
+
+
+def get_telegram_shared_services(data_dir: str = "data") -> TelegramSharedServices:
+    key = str(data_dir or "data")
+    services = _shared_services.get(key)
+    if isinstance(services, TelegramSharedServices):
+        return services
+
+    with _shared_services_lock:
+        services = _shared_services.get(key)
+        if not isinstance(services, TelegramSharedServices):
+            services = build_telegram_shared_services(data_dir=key)
+            _shared_services[key] = services
+    return services
+
+
+def reset_telegram_shared_services() -> None:
+    with _shared_services_lock:
+        _shared_services.clear()
+
+
 @dataclass
 class TelegramGameSession:
     chat_id: int
@@ -99,23 +185,34 @@ class TelegramGameSession:
     data_dir: str = "data"
     state: GameState | None = None
     lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    services: TelegramSharedServices | None = field(default=None, repr=False)
 
     def __post_init__(self) -> None:
-        self._llm = OllamaClient()
-        self._gm = GameMaster(self._llm, seed=123)
-        self._location_seed = LocationManager(None)
-        self._items_manager = ItemsManager(data_dir=self.data_dir)
-        self._economy_manager = EconomyManager(data_dir=self.data_dir)
-        self._dungeon_manager = DungeonManager(self._llm)
-        self._monster_manager = MonsterManager(data_dir="data/monsters")
-        self._loot_manager = LootManager(self._llm, data_dir=self.data_dir)
-        self._npc_store = NPCProfileManager(self._llm)
-        self._player_sheet_manager = PlayerSheetManager(self._llm)
-        self._event_bus = get_global_event_bus()
+        # Client HTTP et catalogues sont partages entre chats ; seul le GameMaster
+        # (debug, rng, evenements en attente) et l'etat de jeu restent propres a la session.
+        if not isinstance(self.services, TelegramSharedServices):
+            self.services = get_telegram_shared_services(self.data_dir)
+        shared = self.services
+        self._llm = shared.llm
+        self._economy_manager = shared.economy_manager
+        self._event_bus = shared.event_bus
+        self._gm = GameMaster(self._llm, seed=123, event_bus=self._event_bus, economy_manager=self._economy_manager)
+        self._location_seed = shared.location_seed
+        self._items_manager = shared.items_manager
+        self._dungeon_manager = shared.dungeon_manager
+        self._monster_manager = shared.monster_manager
+        self._loot_manager = shared.loot_manager
+        # Anti-repetition du butin: propre au chat, le LootManager etant partage.
+        self._recent_loot_ids: list[str] = []
+        self._npc_store = shared.npc_store
+        self._player_sheet_manager = shared.player_sheet_manager
+
+    def close(self) -> None:
+        self._gm.close()
 
     async def load_or_create(self) -> None:
         state = self._build_initial_state()
-        loaded = self.save_manager.load_slot(self.slot, state, profile=self.profile_key)
+        loaded = await asyncio.to_thread(self.save_manager.load_slot, self.slot, state, profile=self.profile_key)
         self.state = state
 
         if loaded:
@@ -144,11 +241,15 @@ class TelegramGameSession:
             location=self.state.current_scene().title,
         )
 
-    def save(self) -> None:
+    def save(self) -> bool:
+        """Met la sauvegarde en file; l'ecriture disque se fait hors de la boucle asyncio."""
         if self.state is None:
-            return
+            return False
+        failed = self.save_manager.pending_save_error(self.slot, profile=self.profile_key)
+        if failed:
+            self.state.push("Systeme", _text("error.save.failed", error=failed), count_for_media=False)
         try:
-            self.save_manager.save_slot(
+            self.save_manager.queue_save(
                 self.slot,
                 self.state,
                 profile=self.profile_key,
@@ -156,6 +257,13 @@ class TelegramGameSession:
             )
         except Exception as e:
             self.state.push("Systeme", _text("error.save.failed", error=e), count_for_media=False)
+            return False
+        return True
+
+    async def save_and_flush(self) -> bool:
+        if not self.save():
+            return False
+        return await asyncio.to_thread(self.save_manager.flush_saves)
 
     def _apply_world_progression(self) -> None:
         if self.state is None:
@@ -756,7 +864,12 @@ class TelegramGameSession:
         self.save()
         return TurnOutput(text="\n".join(lines), has_pending_trade=False)
 
-    async def process_ataryxia_message(self, text: str) -> TurnOutput:
+    async def process_ataryxia_message(
+        self,
+        text: str,
+        *,
+        on_dialogue: DialogueStreamCallback | None = None,
+    ) -> TurnOutput:
         if self.state is None:
             return TurnOutput(text=_text("system.session.not_initialized"), has_pending_trade=False)
 
@@ -795,6 +908,7 @@ class TelegramGameSession:
                     ataryxia_profile[key] = value
         ataryxia_profile = self._apply_telegram_ataryxia_persona(ataryxia_profile)
         self.state.npc_profiles[ataryxia_key] = ataryxia_profile
+        await warm_memory_query(self.state)
         self._sync_gm_state(
             selected_npc="Ataryxia",
             selected_npc_key=ataryxia_key,
@@ -808,7 +922,7 @@ class TelegramGameSession:
         flags["telegram_ataryxia_sms_mode"] = True
 
         try:
-            res = await self._gm.play_turn(self.state.gm_state, user_text)
+            res = await self._gm.play_turn(self.state.gm_state, user_text, on_dialogue=on_dialogue)
         except Exception as e:
             return TurnOutput(text=_text("error.ai.failure", error=e), has_pending_trade=False)
 
@@ -921,7 +1035,12 @@ class TelegramGameSession:
         self.save()
         return TurnOutput(text="\n".join(lines) if lines else self.creation_status_text(), has_pending_trade=False)
 
-    async def process_user_message(self, text: str) -> TurnOutput:
+    async def process_user_message(
+        self,
+        text: str,
+        *,
+        on_dialogue: DialogueStreamCallback | None = None,
+    ) -> TurnOutput:
         if self.state is None:
             return TurnOutput(text=_text("system.session.not_initialized"), has_pending_trade=False)
 
@@ -959,10 +1078,11 @@ class TelegramGameSession:
         trade_lines = self._trade_lines(trade_outcome)
 
         self.state.gm_state["conversation_last_player_line"] = user_text
+        await warm_memory_query(self.state)
         self._sync_gm_state(selected_npc=npc, selected_npc_key=npc_key, selected_profile=npc_profile)
 
         try:
-            res = await self._gm.play_turn(self.state.gm_state, user_text)
+            res = await self._gm.play_turn(self.state.gm_state, user_text, on_dialogue=on_dialogue)
         except Exception as e:
             self.state.push("Systeme", _text("error.ai.failure", error=e), count_for_media=False)
             self.save()
@@ -1609,6 +1729,7 @@ class TelegramGameSession:
             anchor=anchor,
             known_items=self.state.item_defs,
             hint_text=hint_text,
+            recent_item_ids=self._recent_loot_ids,
         )
         got_line = self._grant_generated_loot(loot, prefix=_text("system.dungeon.loot_prefix.obtained"))
         if got_line:
@@ -1621,6 +1742,7 @@ class TelegramGameSession:
                 anchor=anchor,
                 known_items=self.state.item_defs,
                 hint_text=str(event.get("loot") or "").strip(),
+                recent_item_ids=self._recent_loot_ids,
             )
             bonus_line = self._grant_generated_loot(bonus, prefix=_text("system.dungeon.loot_prefix.boss"))
             if bonus_line:
@@ -1633,6 +1755,7 @@ class TelegramGameSession:
                 anchor=anchor,
                 known_items=self.state.item_defs,
                 hint_text=self._potion_hint_for_drop(floor),
+                recent_item_ids=self._recent_loot_ids,
             )
             potion_line = self._grant_generated_loot(potion, prefix=_text("system.dungeon.loot_prefix.potion"))
             if potion_line:
@@ -1699,90 +1822,20 @@ class TelegramGameSession:
     def _inventory_qty(self, item_id: str) -> int:
         if self.state is None:
             return 0
-        target = str(item_id or "").strip().casefold()
-        if not target:
-            return 0
-        totals = self._economy_manager.inventory_totals(self.state)
-        return max(0, self._safe_int(totals.get(target), 0))
+        return count_item((self.state.carried, self.state.storage), item_id)
 
     def _remove_item_from_inventory(self, item_id: str, qty: int) -> int:
         if self.state is None:
             return 0
-        target_id = str(item_id or "").strip().casefold()
-        wanted = max(0, self._safe_int(qty, 0))
-        if not target_id or wanted <= 0:
-            return 0
-        removed = 0
-        for grid in (self.state.carried, self.state.storage):
-            for idx, stack in enumerate(grid.slots):
-                if removed >= wanted:
-                    break
-                if stack is None:
-                    continue
-                sid = str(getattr(stack, "item_id", "") or "").strip().casefold()
-                if sid != target_id:
-                    continue
-                sqty = max(0, self._safe_int(getattr(stack, "qty", 0), 0))
-                if sqty <= 0:
-                    grid.set(idx, None)
-                    continue
-                take = min(sqty, wanted - removed)
-                left = sqty - take
-                removed += take
-                if left > 0:
-                    stack.qty = left
-                else:
-                    grid.set(idx, None)
-            if removed >= wanted:
-                break
-        return removed
+        return remove_item((self.state.carried, self.state.storage), item_id, max(0, self._safe_int(qty, 0)))
 
     def _add_item_to_inventory(self, *, item_id: str, qty: int) -> int:
         if self.state is None:
             return 0
         target_id = str(item_id or "").strip().casefold()
-        wanted = max(0, self._safe_int(qty, 0))
-        if not target_id or wanted <= 0:
-            return 0
         item_def = self.state.item_defs.get(target_id) if isinstance(self.state.item_defs, dict) else None
         stack_max = max(1, self._safe_int(getattr(item_def, "stack_max", 1), 1))
-        added = 0
-
-        for grid in (self.state.carried, self.state.storage):
-            for stack in grid.slots:
-                if added >= wanted:
-                    break
-                if stack is None:
-                    continue
-                sid = str(getattr(stack, "item_id", "") or "").strip().casefold()
-                if sid != target_id:
-                    continue
-                current_qty = max(0, self._safe_int(getattr(stack, "qty", 0), 0))
-                room = max(0, stack_max - current_qty)
-                if room <= 0:
-                    continue
-                take = min(room, wanted - added)
-                stack.qty = current_qty + take
-                added += take
-            if added >= wanted:
-                return added
-
-        from app.ui.state.inventory import ItemStack
-
-        for grid in (self.state.carried, self.state.storage):
-            for idx, stack in enumerate(grid.slots):
-                if added >= wanted:
-                    break
-                if stack is not None:
-                    continue
-                take = min(stack_max, wanted - added)
-                if take <= 0:
-                    continue
-                grid.set(idx, ItemStack(item_id=target_id, qty=take))
-                added += take
-            if added >= wanted:
-                break
-        return added
+        return add_item((self.state.carried, self.state.storage), target_id, max(0, self._safe_int(qty, 0)), stack_max=stack_max)
 
     def _sheet_stats_refs(self) -> tuple[dict | None, dict | None]:
         if self.state is None or not isinstance(self.state.player_sheet, dict):
@@ -2114,42 +2167,93 @@ class TelegramSessionManager:
         default_slot: int = 1,
         shared_profile_key: str | None = None,
         shared_profile_name: str | None = None,
+        idle_timeout_s: float | None = None,
+        max_resident: int | None = None,
     ) -> None:
         self.data_dir = data_dir
         self.default_slot = max(1, int(default_slot))
         self.save_manager = SaveManager(slot_count=max(1, int(slot_count)))
+        self.services = get_telegram_shared_services(data_dir)
         self.shared_profile_key = (
             self.save_manager.normalize_profile_id(shared_profile_key)
             if str(shared_profile_key or "").strip()
             else None
         )
         self.shared_profile_name = str(shared_profile_name or "").strip()[:80]
+        self.idle_timeout_s = max(0.0, float(SESSION_IDLE_TIMEOUT_SECONDS if idle_timeout_s is None else idle_timeout_s))
+        self.max_resident = max(0, int(SESSION_MAX_RESIDENT if max_resident is None else max_resident))
+        # Ordre d'insertion = ordre d'usage (le plus ancien en tete).
         self._sessions: dict[int, TelegramGameSession] = {}
-
-    async def get_session(self, *, chat_id: int, display_name: str = "") -> TelegramGameSession:
+        self._last_used: dict[int, float] = {}
+        # Sessions dechargees: seul le profil/slot est garde, l'etat est relu depuis la sauvegarde.
+        self._hibernated: dict[int, tuple[str, str, int]] = {}
+        # Baux pris par les handlers en cours (get_session(lease=True)): session non hibernable.
+        self._leases: dict[int, int] = {}
+        self._evicted_count = 0
+
+    async def get_session(self, *, chat_id: int, display_name: str = "", lease: bool = False) -> TelegramGameSession:
+        """Session du chat (rechargee si hibernee). `lease=True` l'epingle en memoire jusqu'a
+        `release_session`: elle ne sera pas hibernee tant qu'un handler s'en sert."""
         existing = self._sessions.get(int(chat_id))
         if existing is not None:
+            self._touch(int(chat_id))
+            if lease:
+                self._pin(int(chat_id))
             return existing
 
-        profile_key, profile_name = self._resolve_profile(chat_id=chat_id, display_name=display_name)
+        parked = self._hibernated.get(int(chat_id))
+        if parked is not None:
+            profile_key, profile_name, slot = parked
+        else:
+            profile_key, profile_name = self._resolve_profile(chat_id=chat_id, display_name=display_name)
+            slot = self.default_slot
 
         session = TelegramGameSession(
             chat_id=int(chat_id),
             profile_key=profile_key,
             profile_name=profile_name,
-            slot=self.default_slot,
+            slot=slot,
             save_manager=self.save_manager,
             data_dir=self.data_dir,
+            services=self.services,
         )
         await session.load_or_create()
-        self._sessions[int(chat_id)] = session
+        self._hibernated.pop(int(chat_id), None)
+        self._admit(int(chat_id), session)
+        if lease:
+            self._pin(int(chat_id))
+        await self._enforce_max_resident(keep=int(chat_id))
         return session
 
+    def release_session(self, chat_id: int) -> None:
+        remaining = self._leases.get(int(chat_id), 0) - 1
+        if remaining > 0:
+            self._leases[int(chat_id)] = remaining
+        else:
+            self._leases.pop(int(chat_id), None)
+
+    @asynccontextmanager
+    async def session_lease(self, *, chat_id: int, display_name: str = "") -> AsyncIterator[TelegramGameSession]:
+        """`get_session(lease=True)` relachee en sortie de bloc, meme en cas d'erreur."""
+        session = await self.get_session(chat_id=chat_id, display_name=display_name, lease=True)
+        try:
+            yield session
+        finally:
+            self.release_session(chat_id)
+
+    def is_pinned(self, chat_id: int) -> bool:
+        return self._leases.get(int(chat_id), 0) > 0
+
     async def switch_profile(self, *, chat_id: int, display_name: str, profile_key: str) -> TelegramGameSession:
         chosen_key = self.save_manager.normalize_profile_id(profile_key)
         chosen_name = self._display_name_for_profile(chosen_key) or display_name or chosen_key
         previous = self._sessions.get(int(chat_id))
-        chosen_slot = previous.slot if isinstance(previous, TelegramGameSession) else self.default_slot
+        if isinstance(previous, TelegramGameSession):
+            chosen_slot = previous.slot
+        elif int(chat_id) in self._hibernated:
+            chosen_slot = self._hibernated[int(chat_id)][2]
+        else:
+            chosen_slot = self.default_slot
 
         session = TelegramGameSession(
             chat_id=int(chat_id),
@@ -2158,16 +2262,21 @@ class TelegramSessionManager:
             slot=self._clamp_slot(chosen_slot),
             save_manager=self.save_manager,
             data_dir=self.data_dir,
+            services=self.services,
         )
         await session.load_or_create()
-        self._sessions[int(chat_id)] = session
+        self._hibernated.pop(int(chat_id), None)
+        self._admit(int(chat_id), session)
+        if isinstance(previous, TelegramGameSession) and previous is not session:
+            previous.close()
+        await self._enforce_max_resident(keep=int(chat_id))
         return session
 
     async def switch_slot(self, *, chat_id: int, display_name: str, slot: int) -> TelegramGameSession:
         session = await self.get_session(chat_id=chat_id, display_name=display_name)
         session.slot = self._clamp_slot(slot)
         await session.load_or_create()
-        self._sessions[int(chat_id)] = session
+        self._admit(int(chat_id), session)
         return session
 
     def list_profiles(self) -> list[dict]:
@@ -2176,6 +2285,95 @@ class TelegramSessionManager:
     def active_sessions(self) -> list[TelegramGameSession]:
         return list(self._sessions.values())
 
+    async def aclose(self) -> None:
+        """Sauvegarde les sessions en memoire et attend la fin des ecritures en file."""
+        for session in list(self._sessions.values()):
+            session.save()
+            session.close()
+        self._sessions.clear()
+        self._last_used.clear()
+        await asyncio.to_thread(self.save_manager.close)
+
+    def resident_session(self, chat_id: int) -> TelegramGameSession | None:
+        return self._sessions.get(int(chat_id))
+
+    def is_known_chat(self, chat_id: int) -> bool:
+        return int(chat_id) in self._sessions or int(chat_id) in self._hibernated
+
+    def session_stats(self) -> dict[str, int]:
+        return {
+            "resident": len(self._sessions),
+            "hibernated": len(self._hibernated),
+            "evicted": self._evicted_count,
+        }
+
+    async def evict_idle(self, *, now: float | None = None) -> int:
+        """Hiberne les sessions inactives depuis `idle_timeout_s`, puis applique `max_resident`."""
+        current = time.monotonic() if now is None else float(now)
+        evicted = 0
+        if self.idle_timeout_s > 0:
+            idle = [
+                chat_id
+                for chat_id, last_used in self._last_used.items()
+                if (current - last_used) >= self.idle_timeout_s
+            ]
+            for chat_id in idle:
+                if await self._hibernate(chat_id):
+                    evicted += 1
+        evicted += await self._enforce_max_resident()
+        return evicted
+
+    def _touch(self, chat_id: int) -> None:
+        session = self._sessions.pop(chat_id, None)
+        if session is not None:
+            self._sessions[chat_id] = session
+        self._last_used[chat_id] = time.monotonic()
+
+    def _pin(self, chat_id: int) -> None:
+        self._leases[chat_id] = self._leases.get(chat_id, 0) + 1
+
+    def _admit(self, chat_id: int, session: TelegramGameSession) -> None:
+        self._sessions.pop(chat_id, None)
+        self._sessions[chat_id] = session
+        self._last_used[chat_id] = time.monotonic()
+
+    async def _enforce_max_resident(self, *, keep: int | None = None) -> int:
+        evicted = 0
+        if self.max_resident <= 0:
+            return 0
+        candidates = [
+            chat_id
+            for chat_id, session in self._sessions.items()
+            if chat_id != keep and not self.is_pinned(chat_id) and not session.lock.locked()
+        ]
+        for chat_id in candidates:
+            if len(self._sessions) <= self.max_resident:
+                break
+            if await self._hibernate(chat_id):
+                evicted += 1
+        return evicted
+
+    async def _hibernate(self, chat_id: int) -> bool:
+        session = self._sessions.get(chat_id)
+        if session is None or self.is_pinned(chat_id) or session.lock.locked():
+            return False
+        async with session.lock:
+            if self._sessions.get(chat_id) is not session:
+                return False
+            if session.state is not None and not await session.save_and_flush():
+                # Sauvegarde impossible: on garde la session en memoire plutot que perdre l'etat.
+                LOG.warning("telegram session %s: save failed, kept resident", chat_id)
+                return False
+            # Un handler a pu prendre un bail pendant la sauvegarde: la session reste chargee.
+            if self.is_pinned(chat_id) or self._sessions.get(chat_id) is not session:
+                return False
+            self._sessions.pop(chat_id, None)
+            self._last_used.pop(chat_id, None)
+            self._hibernated[chat_id] = (session.profile_key, session.profile_name, session.slot)
+        session.close()
+        self._evicted_count += 1
+        return True
+
     def _resolve_profile(self, *, chat_id: int, display_name: str) -> tuple[str, str]:
         fallback_name = str(display_name or f"Telegram-{chat_id}").strip()[:80] or f"Telegram-{chat_id}"
 
@@ -1,5 +1,6 @@
 import asyncio
 import re
+import time
 from types import SimpleNamespace
 import unicodedata
 
@@ -32,14 +33,17 @@ from app.ui.components.center_panel_quests import (
 )
 from app.ui.components.center_panel_support import (
     TransientInput as _TransientInput,
+    clear_chat_stream_preview as _clear_chat_stream_preview,
     experience_tier as _experience_tier,
     refresh_chat_messages_view as _refresh_chat_messages_view,
     render_chat_messages as _render_chat_messages,
+    render_chat_stream_slot as _render_chat_stream_slot,
     run_chat_command_handler as _run_chat_command_handler,
     safe_int as _safe_int,
     sanitize_progression_for_trade as _sanitize_progression_for_trade,
     schedule_chat_autoscroll as _schedule_chat_autoscroll,
     schedule_chat_input_focus as _schedule_chat_input_focus,
+    update_chat_stream_preview as _update_chat_stream_preview,
     utc_now_iso as _utc_now_iso,
 )
 from app.ui.components.center_panel_skills import train_skill_with_selected_npc as _train_skill_with_selected_npc_action
@@ -122,6 +126,7 @@ from app.gamemaster.conversation_memory import (
     ensure_conversation_memory_state,
     remember_dialogue_turn,
     remember_system_event,
+    warm_memory_query,
 )
 from app.gamemaster.world_time import format_fantasy_datetime
 from app.gamemaster.story_manager import progress_main_story as _story_progress_main_story
@@ -182,6 +187,7 @@ _LOCAL_ENTRY_TARGET_FLAG = "local_entry_target_scene_id"
 _COMBAT_QUICK_SKILL_FLAG = "combat_quick_skill_id"
 _GUIDED_TRAINING_SESSION_FLAG = "guided_training_session"
 _MAX_AUTO_HEAL_CASTS = 8
+_CHAT_STREAM_REFRESH_S = 0.12
 
 
 def _chat_turn_busy(state: GameState) -> bool:
@@ -192,6 +198,20 @@ def _set_chat_turn_busy(state: GameState, busy: bool) -> None:
     state.chat_turn_in_progress = bool(busy)
 
 
+def _chat_stream_callback(state: GameState, *, speaker: str):
+    last_refresh = {"at": 0.0}
+
+    async def _on_dialogue(preview: str) -> None:
+        now = time.monotonic()
+        if now - last_refresh["at"] < _CHAT_STREAM_REFRESH_S:
+            return
+        last_refresh["at"] = now
+        _update_chat_stream_preview(state, speaker=speaker, text=preview)
+        _schedule_chat_autoscroll(force=False)
+
+    return _on_dialogue
+
+
 def _ensure_skill_state(state: GameState) -> None:
     _skills_ensure_skill_state(
         state,
@@ -2184,6 +2204,7 @@ def center_dialogue(state: GameState, on_change, chat_command_handler=None) -> N
         "overflow-y: auto;"
     ):
         _render_chat_messages(state)
+        _render_chat_stream_slot(state)
     _schedule_chat_autoscroll()
 
     ui.separator()
@@ -3168,6 +3189,7 @@ async def _send_to_npc(state: GameState, inp: ui.input, client, on_change, chat_
         npc_key = npc_context.npc_key
         npc_profile = npc_context.npc_profile
 
+        await warm_memory_query(state)
         _memory_prepare_gm_state_for_turn(
             state,
             scene=scene,
@@ -3349,7 +3371,11 @@ async def _send_to_npc(state: GameState, inp: ui.input, client, on_change, chat_
         if ai_mode_enabled and llm_available:
             _gm_flags(state)["ai_unavailable_notified"] = False
             try:
-                res = await _gm.play_turn(state.gm_state, user_msg)
+                res = await _gm.play_turn(
+                    state.gm_state,
+                    user_msg,
+                    on_dialogue=_chat_stream_callback(state, speaker=str(npc or "")),
+                )
             except Exception as e:
                 state.push("Système", f"⚠️ IA indisponible ({e}). Basculage en mode deterministe.", count_for_media=False)
                 _gm_flags(state)["ai_unavailable_notified"] = True
@@ -3583,8 +3609,10 @@ async def _send_to_npc(state: GameState, inp: ui.input, client, on_change, chat_
         state.advance_world_time(6)
         _apply_world_and_story_progress(state)
         on_change()
+        _clear_chat_stream_preview(state)
         _refresh_chat_messages_view()
     finally:
+        _clear_chat_stream_preview(state)
         _set_chat_turn_busy(state, False)
         on_change()
 
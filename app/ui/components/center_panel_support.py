@@ -59,6 +59,42 @@ def render_chat_messages(state: GameState) -> None:
                 ui.markdown(f"**{speaker}** : {text}")
 
 
+def render_chat_stream_slot(state: GameState) -> None:
+    """Emplacement de l'apercu streame, sous la liste (hors de `render_chat_messages`, jamais re-rendu)."""
+    state.chat_stream_preview = {"slot": ui.column().classes("w-full gap-0")}
+
+
+def update_chat_stream_preview(state: GameState, *, speaker: str, text: str) -> None:
+    """Un seul element par tour, cree au premier apercu puis mis a jour avec set_content."""
+    preview = state.chat_stream_preview if isinstance(state.chat_stream_preview, dict) else {}
+    content = f"**{str(speaker or '').strip()}** : {str(text or '').strip()} ▌"
+    element = preview.get("element")
+    try:
+        if element is not None:
+            element.set_content(content)
+            return
+        slot = preview.get("slot")
+        if slot is None:
+            return
+        with slot:
+            preview["element"] = ui.markdown(content).classes("opacity-70")
+    except Exception:
+        # Page re-rendue ou client deconnecte: l'apercu est ignore, le message final reste.
+        preview.pop("element", None)
+
+
+def clear_chat_stream_preview(state: GameState) -> None:
+    preview = state.chat_stream_preview if isinstance(state.chat_stream_preview, dict) else {}
+    preview.pop("element", None)
+    slot = preview.get("slot")
+    if slot is None:
+        return
+    try:
+        slot.clear()
+    except Exception:
+        pass
+
+
 def schedule_chat_autoscroll(*, force: bool = True) -> None:
     def _run_scroll() -> None:
         try:
@@ -5,6 +5,7 @@ import re
 import unicodedata
 
 from app.core.engine import TradeEngine, normalize_trade_session, trade_session_to_dict
+from app.core.data.item_search import get_item_search_index, normalize_search_text
 from app.gamemaster.models import model_for
 from app.ui.state.game_state import GameState
 from app.ui.state.inventory import ItemStack
@@ -77,9 +78,15 @@ def _match_item_for_buy(query: str, item_defs: dict[str, object]) -> tuple[str,
     best_item_id = ""
     best_item = None
     q = _norm(query)
+    index = get_item_search_index(item_defs)
     for item_id, item in item_defs.items():
-        name = _norm(getattr(item, "name", item_id))
-        iid = _norm(item_id)
+        if index.is_current(item_id, item):
+            name = index.norm_name[item_id]
+            iid = index.norm_id[item_id]
+        else:
+            # Catalogue modifie en place a taille constante: l'index ne couvre pas cet objet.
+            name = normalize_search_text(getattr(item, "name", item_id))
+            iid = normalize_search_text(item_id)
         score = 0.0
         if q in name or q in iid:
             score = 1.0
@@ -608,12 +615,10 @@ def apply_trade_from_player_message(
 
 
 def find_empty_slot(state: GameState) -> tuple[str, int] | None:
-    for idx, stack in enumerate(state.carried.slots):
-        if stack is None:
-            return ("carried", idx)
-    for idx, stack in enumerate(state.storage.slots):
-        if stack is None:
-            return ("storage", idx)
+    for which, grid in (("carried", state.carried), ("storage", state.storage)):
+        idx = grid.first_free()
+        if idx is not None:
+            return (which, idx)
     return None
 
 
@@ -642,11 +647,10 @@ def grant_item_reward(
     stack_max = item_stack_max_fn(state, item_id)
 
     for grid in (state.carried, state.storage):
-        for stack in grid.slots:
+        for idx in grid.stack_indices(item_id):
             if remaining <= 0:
                 break
-            if stack is None or stack.item_id != item_id:
-                continue
+            stack = grid.get(idx)
             capacity = max(0, stack_max - int(stack.qty))
             if capacity <= 0:
                 continue
@@ -1,6 +1,6 @@
 ﻿from nicegui import ui
 from app.ui.state.game_state import GameState
-from app.ui.state.inventory import InventoryGrid, ItemStack
+from app.ui.state.inventory import InventoryGrid, add_item
 from app.ui.components.consumables import add_consumable_stat_buff
 
 
@@ -158,9 +158,8 @@ def _move(state: GameState, src: str, dst: str, on_change) -> None:
         return
 
     # trouver un slot vide destination
-    try:
-        empty_idx = dst_grid.slots.index(None)
-    except ValueError:
+    empty_idx = dst_grid.first_free()
+    if empty_idx is None:
         state.push("Système", "Aucun slot vide.", count_for_media=False)
         on_change()
         return
@@ -508,40 +507,7 @@ def _target_equip_slot(state: GameState, item_id: str) -> str | None:
 def _add_item_to_inventory(state: GameState, item_id: str, qty: int) -> int:
     if qty <= 0:
         return 0
-    remaining = qty
-    added = 0
-    stack_max = _item_stack_max(state, item_id)
-
-    for grid in (state.carried, state.storage):
-        for stack in grid.slots:
-            if remaining <= 0:
-                break
-            if stack is None or stack.item_id != item_id:
-                continue
-            capacity = max(0, stack_max - int(stack.qty))
-            if capacity <= 0:
-                continue
-            take = min(capacity, remaining)
-            stack.qty += take
-            remaining -= take
-            added += take
-        if remaining <= 0:
-            break
-
-    for grid in (state.carried, state.storage):
-        while remaining > 0:
-            try:
-                idx = grid.slots.index(None)
-            except ValueError:
-                break
-            take = min(stack_max, remaining)
-            grid.slots[idx] = ItemStack(item_id=item_id, qty=take)
-            remaining -= take
-            added += take
-        if remaining <= 0:
-            break
-
-    return added
+    return add_item((state.carried, state.storage), item_id, qty, stack_max=_item_stack_max(state, item_id))
 
 
 def _use_selected(state: GameState, on_change) -> None:
@@ -321,12 +321,21 @@ def game_page() -> None:
         sync_gm_state(state, economy_manager=_economy_manager)
         npc_profile_tracker.save_dirty_profiles(state.npc_profiles)
         try:
-            save_manager.save_slot(
-                active_slot["value"],
-                state,
-                profile=active_profile["key"],
-                display_name=active_profile["name"],
-            )
+            if show_notify or force:
+                save_manager.save_slot(
+                    active_slot["value"],
+                    state,
+                    profile=active_profile["key"],
+                    display_name=active_profile["name"],
+                )
+            else:
+                # Autosave: instantane pris ici, ecriture dans le thread de sauvegarde.
+                save_manager.queue_save(
+                    active_slot["value"],
+                    state,
+                    profile=active_profile["key"],
+                    display_name=active_profile["name"],
+                )
         except Exception as e:
             if show_notify:
                 ui.notify(f"Echec sauvegarde slot {active_slot['value']}: {e}", color="negative")
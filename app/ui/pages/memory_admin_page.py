@@ -4,7 +4,10 @@ import json
 
 from nicegui import ui
 
+from app.core.data.catalog_cache import get_catalog_registry
 from app.core.memory import MemoryAdmin
+from app.gamemaster.gamemaster import gamemaster_stats
+from app.gamemaster.llm_scheduler import get_llm_scheduler
 
 
 _admin = MemoryAdmin.from_default()
@@ -72,10 +75,23 @@ def memory_admin_page() -> None:
         count = _admin.rebuild_world_index()
         output.value = json.dumps({"world_indexed_records": int(count)}, ensure_ascii=False, indent=2)
 
+    def _show_cache_stats() -> None:
+        output.value = json.dumps(_admin.cache_stats(), ensure_ascii=False, indent=2)
+
+    def _show_diagnostics() -> None:
+        payload = {
+            "gamemaster": gamemaster_stats(),
+            "catalogs": get_catalog_registry().stats(),
+            "llm_scheduler": get_llm_scheduler().stats(),
+        }
+        output.value = json.dumps(payload, ensure_ascii=False, indent=2)
+
     with ui.row().classes("gap-2"):
         ui.button("Refresh NPC list", on_click=_refresh_npcs).props("outline")
         ui.button("Show NPC memory", on_click=_show_npc).props("outline")
         ui.button("Show world memory", on_click=_show_world).props("outline")
+        ui.button("Stats cache", on_click=_show_cache_stats).props("outline")
+        ui.button("Diagnostics", on_click=_show_diagnostics).props("outline")
     with ui.row().classes("gap-2"):
         ui.button("Compacter maintenant", on_click=_compact_now)
         ui.button("Rebuild index PNJ", on_click=_rebuild_npc_index)
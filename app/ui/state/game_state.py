@@ -35,6 +35,7 @@ class GameState:
     chat: List[ChatMessage] = field(default_factory=list)
     chat_draft: str = ""
     chat_turn_in_progress: bool = False
+    chat_stream_preview: dict = field(default_factory=dict)
     selected_npc: Optional[str] = None
     pending_choice_options: List[dict] = field(default_factory=list)
     pending_choice_prompt: str = ""
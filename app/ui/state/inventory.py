@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional
+import heapq
+from typing import Iterable, Optional
 
 
 @dataclass
@@ -9,12 +10,120 @@ class ItemStack:
     qty: int
 
 
+def item_key(item_id: object) -> str:
+    return str(item_id or "").strip().casefold()
+
+
+def _stack_qty(stack: ItemStack) -> int:
+    try:
+        return max(0, int(getattr(stack, "qty", 0)))
+    except (TypeError, ValueError):
+        return 0
+
+
+class _SlotList(list):
+    """Liste des cases d'une grille: toute affectation met a jour l'index de la grille."""
+
+    __slots__ = ("_grid",)
+
+    def __init__(self, iterable: Iterable = (), grid: "InventoryGrid | None" = None) -> None:
+        super().__init__(iterable)
+        self._grid = grid
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+    def __setitem__(self, idx, value) -> None:
+        grid = self._grid
+        if grid is None or not isinstance(idx, int):
+            super().__setitem__(idx, value)
+            if grid is not None:
+                grid._reindex()
+            return
+        if idx < 0:
+            idx += len(self)
+        old = self[idx]
+        super().__setitem__(idx, value)
+        grid._on_slot_changed(idx, old, value)
+
+    def _mutated(self) -> None:
+        if self._grid is not None:
+            self._grid._reindex()
+
+    def __delitem__(self, idx) -> None:
+        super().__delitem__(idx)
+        self._mutated()
+
+    def __iadd__(self, other):
+        result = super().__iadd__(other)
+        self._mutated()
+        return result
+
+    def __imul__(self, n):
+        result = super().__imul__(n)
+        self._mutated()
+        return result
+
+    def append(self, value) -> None:
+        super().append(value)
+        self._mutated()
+
+    def extend(self, values) -> None:
+        super().extend(values)
+        self._mutated()
+
+    def insert(self, idx, value) -> None:
+        super().insert(idx, value)
+        self._mutated()
+
+    def pop(self, idx=-1):
+        value = super().pop(idx)
+        self._mutated()
+        return value
+
+    def remove(self, value) -> None:
+        super().remove(value)
+        self._mutated()
+
+    def clear(self) -> None:
+        super().clear()
+        self._mutated()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._mutated()
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._mutated()
+
+
 @dataclass
 class InventoryGrid:
+    """Grille d'inventaire indexee.
+
+    `slots` reste une liste de `ItemStack | None` (lecture, `get`/`set`, `slots[i] = ...`),
+    mais chaque affectation entretient un index item_id -> cases et un tas des cases
+    libres: compter, trouver une case libre ou la pile d'un objet ne parcourt plus la grille.
+    Les quantites sont lues sur les piles indexees (elles peuvent etre modifiees en place);
+    l'item_id d'une pile deja posee ne doit pas etre modifie en place.
+    """
+
     cols: int
     rows: int
     slots: list[Optional[ItemStack]]
 
+    def __setattr__(self, name: str, value) -> None:
+        if name == "slots":
+            value = _SlotList(value, self)
+            object.__setattr__(self, name, value)
+            self._reindex()
+            return
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        return (type(self), (self.cols, self.rows, list(self.slots)))
+
     @classmethod
     def empty(cls, cols: int, rows: int) -> "InventoryGrid":
         return cls(cols=cols, rows=rows, slots=[None] * (cols * rows))
@@ -27,3 +136,154 @@ class InventoryGrid:
 
     def set(self, idx: int, stack: Optional[ItemStack]) -> None:
         self.slots[idx] = stack
+
+    def first_free(self) -> int | None:
+        """Plus petit indice de case vide (None si la grille est pleine)."""
+        heap = self._free_heap
+        slots = self.slots
+        while heap and slots[heap[0]] is not None:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def free_count(self) -> int:
+        return self._free_count
+
+    def stack_indices(self, item_id: str) -> list[int]:
+        """Cases contenant `item_id`, dans l'ordre de la grille."""
+        return sorted(self._by_item.get(item_key(item_id), ()))
+
+    def count(self, item_id: str) -> int:
+        slots = self.slots
+        return sum(_stack_qty(slots[idx]) for idx in self._by_item.get(item_key(item_id), ()))
+
+    def totals(self) -> dict[str, int]:
+        """{item_id: quantite}, dans l'ordre de la premiere case de chaque objet."""
+        slots = self.slots
+        out: dict[str, int] = {}
+        for key, indices in sorted(self._by_item.items(), key=lambda row: min(row[1])):
+            qty = sum(_stack_qty(slots[idx]) for idx in indices)
+            if qty > 0:
+                out[key] = qty
+        return out
+
+    def _reindex(self) -> None:
+        by_item: dict[str, set[int]] = {}
+        free: list[int] = []
+        for idx, stack in enumerate(self.slots):
+            if stack is None:
+                free.append(idx)
+                continue
+            key = item_key(getattr(stack, "item_id", ""))
+            if key:
+                by_item.setdefault(key, set()).add(idx)
+        object.__setattr__(self, "_by_item", by_item)
+        object.__setattr__(self, "_free_heap", free)  # deja trie: tas valide
+        object.__setattr__(self, "_free_count", len(free))
+
+    def _on_slot_changed(self, idx: int, old: Optional[ItemStack], new: Optional[ItemStack]) -> None:
+        if old is not None:
+            key = item_key(getattr(old, "item_id", ""))
+            indices = self._by_item.get(key)
+            if indices is not None:
+                indices.discard(idx)
+                if not indices:
+                    del self._by_item[key]
+        if new is not None:
+            key = item_key(getattr(new, "item_id", ""))
+            if key:
+                self._by_item.setdefault(key, set()).add(idx)
+        if old is None and new is not None:
+            self._free_count -= 1
+        elif old is not None and new is None:
+            self._free_count += 1
+            heapq.heappush(self._free_heap, idx)
+            if len(self._free_heap) > 2 * len(self.slots):
+                self._free_heap = sorted(i for i, s in enumerate(self.slots) if s is None)
+
+
+# Operations sur l'inventaire complet du joueur (sac puis coffre), a partir des index de grille.
+
+def count_item(grids: Iterable[InventoryGrid], item_id: str) -> int:
+    return sum(grid.count(item_id) for grid in grids)
+
+
+def item_totals(grids: Iterable[InventoryGrid]) -> dict[str, int]:
+    out: dict[str, int] = {}
+    for grid in grids:
+        for key, qty in grid.totals().items():
+            out[key] = out.get(key, 0) + qty
+    return out
+
+
+def item_capacity(grids: Iterable[InventoryGrid], item_id: str, *, stack_max: int) -> int:
+    """Quantite de `item_id` encore placable: place libre des piles existantes + cases vides."""
+    stack_max = max(1, int(stack_max))
+    free = 0
+    for grid in grids:
+        free += grid.free_count() * stack_max
+        for idx in grid.stack_indices(item_id):
+            free += max(0, stack_max - _stack_qty(grid.slots[idx]))
+    return free
+
+
+def add_item(grids: Iterable[InventoryGrid], item_id: str, qty: int, *, stack_max: int) -> int:
+    """Complete les piles existantes puis remplit les cases vides; retourne la quantite ajoutee."""
+    grids = tuple(grids)
+    target = item_key(item_id)
+    remaining = max(0, int(qty))
+    stack_max = max(1, int(stack_max))
+    if not target or remaining <= 0:
+        return 0
+    added = 0
+    for grid in grids:
+        for idx in grid.stack_indices(target):
+            if remaining <= 0:
+                break
+            stack = grid.slots[idx]
+            room = max(0, stack_max - _stack_qty(stack))
+            if room <= 0:
+                continue
+            take = min(room, remaining)
+            stack.qty = _stack_qty(stack) + take
+            remaining -= take
+            added += take
+        if remaining <= 0:
+            return added
+
+    for grid in grids:
+        while remaining > 0:
+            idx = grid.first_free()
+            if idx is None:
+                break
+            take = min(stack_max, remaining)
+            grid.set(idx, ItemStack(item_id=target, qty=take))
+            remaining -= take
+            added += take
+        if remaining <= 0:
+            break
+    return added
+
+
+def remove_item(grids: Iterable[InventoryGrid], item_id: str, qty: int) -> int:
+    """Retire jusqu'a `qty` exemplaires, dans l'ordre des cases; retourne la quantite retiree."""
+    target = item_key(item_id)
+    remaining = max(0, int(qty))
+    if not target or remaining <= 0:
+        return 0
+    removed = 0
+    for grid in grids:
+        for idx in grid.stack_indices(target):
+            if remaining <= 0:
+                break
+            stack = grid.slots[idx]
+            stack_qty = _stack_qty(stack)
+            take = min(stack_qty, remaining)
+            if stack_qty - take > 0:
+                stack.qty = stack_qty - take
+            else:
+                grid.set(idx, None)
+            remaining -= take
+            removed += take
+        if remaining <= 0:
+            break
+    return removed
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from app.core.data.catalog_cache import CatalogRegistry, CatalogSnapshot, get_catalog_registry
+from app.core.data.item_manager import ItemsManager
+from app.gamemaster.craft_manager import CraftManager
+from app.gamemaster.monster_manager import MonsterManager
+
+
+def _write_item(items_dir: Path, item_id: str, name: str) -> None:
+    payload = {"id": item_id, "name": name, "stack_max": 5}
+    (items_dir / f"{item_id}.json").write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+
+def test_items_catalog_is_shared_and_reloaded_on_change(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    items_dir = data_dir / "items"
+    items_dir.mkdir(parents=True)
+    _write_item(items_dir, "pain", "Pain")
+
+    before = get_catalog_registry().stats().get("items", {"hits": 0, "misses": 0, "reloads": 0})
+    first = ItemsManager(data_dir=str(data_dir)).load_all()
+    second = ItemsManager(data_dir=str(data_dir)).load_all()
+    assert first is second
+    assert list(first) == ["pain"]
+
+    _write_item(items_dir, "pain", "Pain de seigle")
+    _write_item(items_dir, "sel", "Sel")
+    third = ItemsManager(data_dir=str(data_dir)).load_all()
+    assert third is not first
+    assert third["pain"].name == "Pain de seigle"
+    assert sorted(third) == ["pain", "sel"]
+
+    after = get_catalog_registry().stats()["items"]
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+    assert after["reloads"] - before["reloads"] == 1
+
+
+def test_snapshot_is_read_only_but_copies_are_mutable() -> None:
+    snapshot = CatalogSnapshot({"a": 1})
+    with pytest.raises(TypeError):
+        snapshot["b"] = 2
+    with pytest.raises(TypeError):
+        snapshot.update(b=2)
+    with pytest.raises(TypeError):
+        snapshot.pop("a")
+
+    for clone in (dict(snapshot), copy.copy(snapshot), copy.deepcopy(snapshot)):
+        clone["b"] = 2
+        assert type(clone) is dict
+    assert snapshot == {"a": 1}
+
+
+def test_registry_invalidate_forces_reload(tmp_path: Path) -> None:
+    registry = CatalogRegistry()
+    calls: list[int] = []
+
+    def loader() -> CatalogSnapshot:
+        calls.append(1)
+        return CatalogSnapshot({"n": len(calls)})
+
+    assert registry.load("demo", tmp_path, loader)["n"] == 1
+    assert registry.load("demo", tmp_path, loader)["n"] == 1
+    registry.invalidate("demo")
+    assert registry.load("demo", tmp_path, loader)["n"] == 2
+    assert registry.stats() == {"demo": {"hits": 1, "misses": 2, "reloads": 0}}
+
+
+def test_monster_and_recipe_catalogs_follow_file_changes(tmp_path: Path) -> None:
+    monsters_dir = tmp_path / "monsters"
+    monsters = MonsterManager(data_dir=str(monsters_dir))
+    fallback = monsters.load_catalog()
+    assert fallback and monsters.load_catalog() is fallback
+
+    recipes_path = tmp_path / "crafting_recipes.json"
+    crafting = CraftManager(data_path=str(recipes_path))
+    default_recipes = crafting.load_recipes()
+    assert CraftManager(data_path=str(recipes_path)).load_recipes() is default_recipes
+
+    recipes_path.write_text(
+        json.dumps(
+            {
+                "recipes": [
+                    {
+                        "id": "pain_simple",
+                        "name": "Pain simple",
+                        "inputs": [{"item_id": "farine", "qty": 2}],
+                        "outputs": [{"item_id": "pain", "qty": 1}],
+                    }
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    assert list(crafting.load_recipes()) == ["pain_simple"]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import random
+
+from app.gamemaster.combat_simulator import (
+    CombatScenario,
+    action_text,
+    relic_by_id,
+    simulate_batch,
+    simulate_fight,
+    summarize,
+)
+from app.gamemaster.dungeon_combat import build_combat_state, resolve_combat_turn
+from app.gamemaster.monster_manager import MonsterManager
+
+
+def _manual_fight(scenario: CombatScenario, seed: int, manager: MonsterManager) -> tuple[bool, bool, list[int]]:
+    rng = random.Random(seed)
+    relic = relic_by_id(scenario.relic_id)
+    event = {"type": scenario.event_type, "floor": scenario.floor, "monster_id": scenario.monster_id, "boss": False}
+    if relic is not None:
+        event["run_relic"] = relic
+    combat = build_combat_state(event, rng=rng, monster_manager=manager)
+    hp = scenario.player_max_hp
+    curve = [hp]
+    while True:
+        action = "heal" if hp < scenario.player_max_hp * scenario.heal_below else scenario.action
+        result = resolve_combat_turn(
+            combat_state=combat,
+            action_text=action_text(action),
+            player_hp=hp,
+            player_max_hp=scenario.player_max_hp,
+            player_sheet={"stats": dict(scenario.stats)},
+            known_skills=[],
+            rng=rng,
+            run_relic=relic,
+        )
+        combat = result["combat"]
+        hp = min(result["player_hp"], scenario.player_max_hp)
+        curve.append(hp)
+        if result["victory"] or result["defeat"]:
+            return result["victory"], result["defeat"], curve
+
+
+def test_simulated_fight_replays_resolve_combat_turn_for_a_seed() -> None:
+    manager = MonsterManager(data_dir="data/monsters")
+    scenario = CombatScenario(
+        floor=4,
+        monster_id="goule_cendreuse",
+        stats=(("defense", 7), ("force", 8)),
+        relic_id="relique_sang",
+        heal_below=0.4,
+    )
+    for seed in range(25):
+        fight = simulate_fight(scenario, seed, monster_manager=manager)
+        victory, defeat, curve = _manual_fight(scenario, seed, manager)
+        assert (fight.victory, fight.defeat, list(fight.player_hp)) == (victory, defeat, curve)
+        assert fight.turns == len(curve) - 1
+
+
+def test_batch_results_match_across_workers_and_summary_adds_up() -> None:
+    scenarios = [
+        CombatScenario(floor=1, monster_id="goule_cendreuse"),
+        CombatScenario(floor=6, monster_id="squelette_blinde", build="mage", action="spell", heal_below=0.3),
+    ]
+    serial = simulate_batch(scenarios, range(300))
+    pooled = simulate_batch(scenarios, range(300), workers=2)
+    assert serial == pooled
+
+    summary = summarize(scenarios[0], serial[scenarios[0]])
+    assert summary.fights == 300
+    assert abs(summary.win_rate + summary.loss_rate + summary.timeout_rate - 1.0) < 1e-9
+    assert summary.player_hp_curve[0] == 20.0
+    assert len(summary.player_hp_curve) == max(result.turns for result in serial[scenarios[0]]) + 1
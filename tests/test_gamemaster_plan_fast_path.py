@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from app.gamemaster.gamemaster import GameMaster, gamemaster_stats
+
+
+class _CountingLLM:
+    def __init__(self) -> None:
+        self.rules_calls = 0
+
+    async def generate(self, **kwargs) -> str:
+        prompt = str(kwargs.get("prompt") or "")
+        if "moteur de règles" in prompt:
+            self.rules_calls += 1
+            return json.dumps({"type": "talk", "target": "Mirelle", "intent": "commerce", "narration_hooks": ["Marchandage."]})
+        if "Tu joues le rôle" in prompt:
+            return "Bien sur, voyageur."
+        return "La lampe vacille."
+
+
+def _state() -> dict:
+    return {
+        "location": "City",
+        "location_id": "city",
+        "flags": {"decision_mode_v2": True},
+        "player_name": "Sephy",
+        "world_time_minutes": 60,
+        "selected_npc": "Mirelle",
+        "selected_npc_key": "city__mirelle",
+        "scene_npcs": ["Mirelle"],
+        "npc_profiles": {},
+    }
+
+
+def test_fast_path_accepts_small_talk_only() -> None:
+    gm = GameMaster(None, seed=1, plan_fast_path=True)
+    state = _state()
+
+    plan = gm._fast_path_plan(state, "Bonjour Mirelle, comment vas-tu aujourd'hui ?", selected_npc="Mirelle")
+    assert plan is not None
+    assert plan.type == "talk" and plan.target == "Mirelle"
+    assert plan.rolls == [] and plan.state_patch == {} and plan.narration_hooks
+
+    for text in (
+        "Je veux acheter deux potions de soin.",
+        "Allons a la taverne du port.",
+        "Reponds, sinon je te menace.",
+        "Je m'entraine a l'epee avec toi.",
+        "*je fouille le coffre*",
+    ):
+        assert gm._fast_path_plan(state, text, selected_npc="Mirelle") is None, text
+    assert gm._fast_path_plan(state, "Bonjour !", selected_npc="") is None
+    assert gm._fast_path_plan({**state, "in_dungeon": True}, "Bonjour !", selected_npc="Mirelle") is None
+    assert GameMaster(None, plan_fast_path=False)._fast_path_plan(state, "Bonjour !", selected_npc="Mirelle") is None
+    gm.close()
+
+
+def test_fast_path_skips_rules_call_and_counts_hits() -> None:
+    llm = _CountingLLM()
+    gm = GameMaster(llm, seed=1, plan_fast_path=True, pipelined_turn=False)  # type: ignore[arg-type]
+    before = gamemaster_stats()
+
+    small_talk = asyncio.run(gm.play_turn(_state(), "Salut, belle journee aujourd'hui ?"))
+    trade = asyncio.run(gm.play_turn(_state(), "Je voudrais acheter une dague."))
+
+    assert llm.rules_calls == 1
+    assert small_talk.timings_ms.get("plan_fast_path") == 1.0
+    assert small_talk.dialogue == "Bien sur, voyageur."
+    assert "plan_fast_path" not in trade.timings_ms
+    stats = gm.plan_stats()
+    assert stats["turns"] == 2 and stats["fast_path"] == 1 and stats["llm"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["saved_ms_estimate"] == stats["avg_llm_plan_ms"]
+    gm.close()
+
+    # Process-wide view (admin diagnostics): counters survive close().
+    after = gamemaster_stats()
+    assert after["plan"]["fast_path"] - before["plan"]["fast_path"] == 1
+    assert after["plan"]["llm"] - before["plan"]["llm"] == 1
+    assert after["timed_turns"] - before["timed_turns"] == 2
+    assert after["last_timings_ms"] == trade.timings_ms
+    assert "total_ms" in after["avg_timings_ms"]
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from app.gamemaster.gamemaster import GameMaster
+from app.gamemaster.ollama_client import OllamaClient
+
+
+def _ndjson(*rows: dict) -> bytes:
+    return "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+
+
+def test_generate_stream_yields_fragments_and_falls_back_before_first_token() -> None:
+    seen_models: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        seen_models.append(payload["model"])
+        assert payload["stream"] is True
+        if payload["model"] == "broken":
+            return httpx.Response(404, json={"error": "model not found"})
+        return httpx.Response(
+            200,
+            content=_ndjson(
+                {"response": "Bon", "done": False},
+                {"response": "jour.", "done": False},
+                {"response": "", "done": True},
+            ),
+        )
+
+    llm = OllamaClient(max_retries=0)
+
+    async def _run() -> list[str]:
+        llm._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return [fragment async for fragment in llm.generate_stream("broken", "salut", fallback_models=["ok"])]
+        finally:
+            await llm.aclose()
+
+    assert asyncio.run(_run()) == ["Bon", "jour."]
+    assert seen_models == ["broken", "ok"]
+
+
+class _StreamingLLM:
+    def __init__(self) -> None:
+        self.generate_calls = 0
+
+    async def generate(self, **kwargs) -> str:
+        self.generate_calls += 1
+        return "Tu ecris vite."
+
+    async def generate_stream(self, **kwargs):
+        for fragment in ["Ataryxia: Tu ", "ecris ", "vite. [MED", "IA: chat]"]:
+            yield fragment
+
+
+def _telegram_state() -> dict:
+    return {
+        "location": "Lumeria",
+        "location_id": "city",
+        "player_name": "Sephy",
+        "selected_npc": "Ataryxia",
+        "flags": {"telegram_ataryxia_mode": True, "telegram_ataryxia_sms_mode": True},
+        "npc_profiles": {},
+    }
+
+
+def test_play_turn_streams_sanitized_dialogue_previews() -> None:
+    llm = _StreamingLLM()
+    gm = GameMaster(llm, seed=1)  # type: ignore[arg-type]
+    previews: list[str] = []
+
+    async def _on_dialogue(preview: str) -> None:
+        previews.append(preview)
+
+    result = asyncio.run(gm.play_turn(_telegram_state(), "tu fais quoi ?", on_dialogue=_on_dialogue))
+
+    assert previews[0] == "Tu"
+    assert previews[-1] == "Tu ecris vite."
+    assert all("[" not in row and "Ataryxia" not in row for row in previews)
+    assert result.media_keyword == "chat"
+    gm.close()
+
+
+class _PipelinedLLM:
+    def __init__(self) -> None:
+        self.narration_started = asyncio.Event()
+        self.narration_prompts: list[str] = []
+        self.events: list[str] = []
+
+    async def generate(self, **kwargs) -> str:
+        prompt = str(kwargs.get("prompt") or "")
+        if "moteur de règles" in prompt:
+            return json.dumps(
+                {
+                    "type": "talk",
+                    "target": "Mirelle",
+                    "intent": "discussion",
+                    "rolls": [],
+                    "narration_hooks": ["La cellule reste silencieuse."],
+                    "state_patch": {},
+                    "output_type": "dialogue",
+                    "options": [],
+                },
+                ensure_ascii=False,
+            )
+        if "Tu joues le rôle" in prompt:
+            self.events.append("dialogue_fallback")
+            return "Je t'ecoute. Parle vite, la garde approche."
+        self.events.append("narration_start")
+        self.narration_prompts.append(prompt)
+        self.narration_started.set()
+        return "Mirelle garde les yeux sur la porte."
+
+    async def generate_stream(self, **kwargs):
+        self.events.append("dialogue_start")
+        yield "Je t'ecoute. "
+        # The tail of the reply only arrives once narration is already being generated.
+        await asyncio.wait_for(self.narration_started.wait(), timeout=2.0)
+        yield "Parle vite, la garde approche."
+        self.events.append("dialogue_end")
+
+
+def _mirelle_state() -> dict:
+    return {
+        "location": "City",
+        "location_id": "city",
+        "flags": {"decision_mode_v2": True},
+        "player_name": "Sephy",
+        "world_time_minutes": 120,
+        "selected_npc": "Mirelle",
+        "selected_npc_key": "city__mirelle",
+        "scene_npcs": ["Mirelle"],
+        "npc_profiles": {},
+    }
+
+
+def test_pipelined_turn_starts_narration_from_streamed_dialogue_prefix() -> None:
+    llm = _PipelinedLLM()
+    gm = GameMaster(llm, seed=3, pipelined_turn=True, narration_prefix_chars=8)  # type: ignore[arg-type]
+
+    result = asyncio.run(gm.play_turn(_mirelle_state(), "Je veux parler de la garde."))
+
+    assert result.dialogue and "la garde approche" in result.dialogue
+    assert result.narration == "Mirelle garde les yeux sur la porte."
+    assert len(llm.narration_prompts) == 1
+    assert "Mirelle: Je t'ecoute." in llm.narration_prompts[0]
+    assert "la garde approche" not in llm.narration_prompts[0]
+    assert llm.events == ["dialogue_start", "narration_start", "dialogue_end"]
+    assert result.timings_ms["narration_prefix_chars"] >= 8
+    assert "narration_restarted" not in result.timings_ms
+    assert {"plan_ms", "dialogue_ms", "narration_ms", "total_ms"} <= set(result.timings_ms)
+    gm.close()
+
+
+class _DivergingLLM(_PipelinedLLM):
+    async def generate(self, **kwargs) -> str:
+        if "Tu joues le rôle" in str(kwargs.get("prompt") or ""):
+            self.events.append("dialogue_fallback")
+            return "Va-t'en. La garde arrive."
+        return await super().generate(**kwargs)
+
+    async def generate_stream(self, **kwargs):
+        self.events.append("dialogue_start")
+        yield "Je t'ecoute. "
+        await asyncio.wait_for(self.narration_started.wait(), timeout=2.0)
+        raise httpx.ReadError("stream coupe")
+        yield ""  # pragma: no cover
+
+
+def test_pipelined_narration_restarts_when_final_dialogue_diverges_from_prefix() -> None:
+    llm = _DivergingLLM()
+    gm = GameMaster(llm, seed=3, pipelined_turn=True, narration_prefix_chars=8)  # type: ignore[arg-type]
+
+    result = asyncio.run(gm.play_turn(_mirelle_state(), "Je veux parler de la garde."))
+
+    assert result.dialogue and "Va-t'en" in result.dialogue
+    assert llm.events == ["dialogue_start", "narration_start", "dialogue_fallback", "narration_start"]
+    assert "Mirelle: Je t'ecoute." in llm.narration_prompts[0]
+    assert "Mirelle: Va-t'en. La garde arrive." in llm.narration_prompts[-1]
+    assert result.timings_ms["narration_restarted"] == 1.0
+    gm.close()
+
+
+def test_prefix_narration_is_opt_in(monkeypatch) -> None:
+    monkeypatch.delenv("GM_NARRATION_PREFIX_CHARS", raising=False)
+    llm = _PipelinedLLM()
+    gm = GameMaster(llm, seed=3)  # type: ignore[arg-type]
+    assert gm.narration_prefix_chars == 0
+
+    asyncio.run(gm.play_turn(_mirelle_state(), "Je veux parler de la garde."))
+
+    assert "la garde approche" in llm.narration_prompts[0]
+    gm.close()
+
+
+def test_sequential_turn_narrates_full_dialogue() -> None:
+    llm = _PipelinedLLM()
+    gm = GameMaster(llm, seed=3, pipelined_turn=False, narration_prefix_chars=8)  # type: ignore[arg-type]
+
+    result = asyncio.run(gm.play_turn(_mirelle_state(), "Je veux parler de la garde."))
+
+    assert "la garde approche" in llm.narration_prompts[0]
+    assert result.timings_ms["total_ms"] >= result.timings_ms["narration_ms"]
+    gm.close()
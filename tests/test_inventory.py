@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import copy
+import pickle
+import random
+
+from app.ui.state.inventory import (
+    InventoryGrid,
+    ItemStack,
+    add_item,
+    count_item,
+    item_capacity,
+    item_totals,
+    remove_item,
+)
+
+
+def _scan_count(grid: InventoryGrid, item_id: str) -> int:
+    return sum(stack.qty for stack in grid.slots if stack is not None and stack.item_id == item_id)
+
+
+def test_index_follows_slot_assignments() -> None:
+    rng = random.Random(3)
+    grid = InventoryGrid.empty(4, 3)
+    for _ in range(400):
+        idx = rng.randrange(len(grid.slots))
+        if rng.random() < 0.4:
+            grid.slots[idx] = None
+        else:
+            grid.set(idx, ItemStack(item_id=rng.choice(("pain_01", "potion", "epee")), qty=rng.randint(1, 5)))
+        free = [i for i, stack in enumerate(grid.slots) if stack is None]
+        assert grid.free_count() == len(free)
+        assert grid.first_free() == (free[0] if free else None)
+        for item_id in ("pain_01", "potion", "epee"):
+            assert grid.count(item_id) == _scan_count(grid, item_id)
+
+    grid.slots = [ItemStack(item_id="Pain_01", qty=2)] + [None] * 11
+    assert grid.count("pain_01") == 2 and grid.first_free() == 1
+    grid.slots[0].qty = 7  # modification en place: lue a la volee
+    assert grid.totals() == {"pain_01": 7}
+
+
+def test_add_and_remove_fill_stacks_then_free_slots_across_grids() -> None:
+    carried = InventoryGrid.empty(2, 1)
+    storage = InventoryGrid.empty(2, 1)
+    carried.set(1, ItemStack(item_id="pain_01", qty=3))
+    grids = (carried, storage)
+
+    assert item_capacity(grids, "pain_01", stack_max=5) == 2 + 3 * 5
+    assert add_item(grids, "pain_01", 10, stack_max=5) == 10
+    assert [s.qty if s else None for s in carried.slots + storage.slots] == [5, 5, 3, None]
+    assert add_item(grids, "epee", 3, stack_max=1) == 1
+    assert count_item(grids, "pain_01") == 13
+    assert item_totals(grids) == {"pain_01": 13, "epee": 1}
+
+    assert remove_item(grids, "PAIN_01", 11) == 11
+    assert [s.qty if s else None for s in carried.slots] == [None, None]
+    assert storage.get(0).qty == 2 and carried.first_free() == 0
+
+
+def test_copies_keep_an_independent_index() -> None:
+    grid = InventoryGrid.empty(3, 1)
+    grid.set(0, ItemStack(item_id="potion", qty=2))
+    for clone in (copy.deepcopy(grid), pickle.loads(pickle.dumps(grid))):
+        assert clone == grid
+        clone.set(1, ItemStack(item_id="potion", qty=1))
+        assert clone.count("potion") == 3 and grid.count("potion") == 2
+        assert clone.first_free() == 2 and grid.first_free() == 1
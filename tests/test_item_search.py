@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import difflib
+import time
+
+from app.core.data.item_manager import ItemDef, ItemsManager
+from app.core.data.item_search import ItemSearchIndex, get_item_search_index, normalize_search_text
+from app.gamemaster.economy_manager import EconomyManager
+from app.ui.components.center_panel_trade import _match_item_for_buy
+
+
+def _catalog(count: int) -> dict[str, ItemDef]:
+    kinds = ("epee", "dague", "potion", "anneau", "minerai", "cuir", "pain", "bouclier")
+    adjectives = ("rouille", "runique", "ancien", "leger", "brillant", "sombre", "royal", "humble")
+    items: dict[str, ItemDef] = {}
+    for i in range(count):
+        kind = kinds[i % len(kinds)]
+        adj = adjectives[(i // len(kinds)) % len(adjectives)]
+        item_id = f"{kind}_{adj}_{i}"
+        items[item_id] = ItemDef(id=item_id, name=f"{kind.capitalize()} {adj} {i}", stack_max=1, description=f"Un {kind} {adj}.")
+    return items
+
+
+def _legacy_resolve(economy: EconomyManager, query: str, item_defs: dict[str, ItemDef]) -> tuple[str | None, float]:
+    """Ancienne resolution par balayage complet du catalogue (reference)."""
+    from app.gamemaster.economy_manager import _STOPWORDS, _TYPE_HINTS
+
+    norm = economy._norm
+    q = norm(query)
+    if not q:
+        return None, 0.0
+    if q in item_defs:
+        return q, 100.0
+    by_name: dict[str, str] = {}
+    for item_id, item in item_defs.items():
+        by_name[norm(item_id)] = item_id
+        by_name[norm(item.name)] = item_id
+    if q in by_name:
+        return by_name[q], 98.0
+    tokens = [t for t in q.split() if t and t not in _STOPWORDS]
+    best_id, best_score = None, 0.0
+    for item_id, item in item_defs.items():
+        hay = " ".join(norm(v) for v in (item_id, item.name, item.type, item.slot, item.description))
+        score = sum(2.0 for token in tokens if token in hay)
+        for item_type, hints in _TYPE_HINTS.items():
+            if item_type == norm(item.type) and any(norm(h) in tokens for h in hints):
+                score += 1.5
+        if score > best_score:
+            best_id, best_score = item_id, score
+    if best_id and best_score >= 1.5:
+        return best_id, best_score
+    close = difflib.get_close_matches(q, list(by_name), n=1, cutoff=0.7)
+    return (by_name[close[0]], 1.0) if close else (None, 0.0)
+
+
+def test_resolution_matches_the_full_scan() -> None:
+    economy = EconomyManager(data_dir="data")
+    real = ItemsManager(data_dir="data").load_all()
+    assert real
+    queries = ["", "une potion", "epee", "Épée d'apprenti", "pian", "armure", "anneau", "cuir", "truc inconnu"]
+    queries += [item.name for item in real.values()] + [item_id.replace("_", " ") for item_id in real]
+    for catalog in (real, _catalog(300)):
+        for query in queries + ["dague runique 17", "bouclir royal", "minerai 250"]:
+            assert economy._resolve_item_id(query, catalog) == _legacy_resolve(economy, query, catalog), query
+    assert get_item_search_index(real) is get_item_search_index(real)
+    assert get_item_search_index(dict(real)) is not get_item_search_index(real)
+
+
+def test_index_candidates_match_a_full_scan() -> None:
+    items = _catalog(400)
+    index = ItemSearchIndex(items)
+    hay = {
+        item_id: " ".join(
+            normalize_search_text(v) for v in (item_id, item.name, item.type, item.slot, item.description)
+        )
+        for item_id, item in items.items()
+    }
+    for token in ("ep", "runique", "potion", "uir", "zzz", "12"):
+        assert index.ids_containing(token) == {item_id for item_id, text in hay.items() if token in text}
+    for query in ("epee runiqe 9", "bouclir royal 15", "pain humble"):
+        assert index.close_keys(query) == difflib.get_close_matches(query, list(index.by_key), n=1, cutoff=0.7)
+
+    ranked = index.search("potion sombre")
+    assert ranked and all(items[item_id].name.startswith("Potion sombre") for item_id, _ in ranked)
+
+
+def test_resolution_stays_fast_on_large_catalogs() -> None:
+    economy = EconomyManager(data_dir="data")
+    items = _catalog(5000)
+    economy._resolve_item_id("epee", items)  # construction de l'index
+
+    started = time.perf_counter()
+    for _ in range(50):
+        item_id, _score = economy._resolve_item_id("cuir royal 4021", items)
+    elapsed_ms = (time.perf_counter() - started) * 1000.0 / 50
+    assert item_id == "cuir_royal_4021"
+    assert elapsed_ms < 20.0
+
+
+def test_buy_matching_survives_a_catalog_edited_in_place() -> None:
+    items = {"pain": ItemDef(id="pain", name="Pain", stack_max=5)}
+    assert _match_item_for_buy("pain", items)[0] == "pain"
+
+    # Meme dictionnaire, meme taille: l'index partage est perime pour ces objets.
+    del items["pain"]
+    items["hydromel"] = ItemDef(id="hydromel", name="Hydromel doux", stack_max=5)
+    assert _match_item_for_buy("hydromel doux", items)[0] == "hydromel"
+    items["hydromel"] = ItemDef(id="hydromel", name="Biere ambree", stack_max=5)
+    assert _match_item_for_buy("biere ambree", items)[0] == "hydromel"
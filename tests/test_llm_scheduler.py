@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from app.gamemaster.llm_scheduler import LANE_BACKGROUND, LANE_INTERACTIVE, LLMScheduler, llm_lane
+from app.gamemaster.ollama_client import OllamaClient
+
+
+def test_interactive_lane_is_served_before_background() -> None:
+    scheduler = LLMScheduler(max_concurrency=1, per_model_concurrency=1)
+    order: list[str] = []
+
+    async def _call(name: str, lane: str) -> None:
+        with llm_lane(lane):
+            async with scheduler.slot("dolphin"):
+                order.append(name)
+                await asyncio.sleep(0)
+
+    async def _run() -> None:
+        await scheduler.acquire("dolphin")
+        tasks = [
+            asyncio.create_task(_call("bg-1", LANE_BACKGROUND)),
+            asyncio.create_task(_call("bg-2", LANE_BACKGROUND)),
+            asyncio.create_task(_call("chat", LANE_INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["lanes"][LANE_BACKGROUND]["queue_depth"] == 2
+        scheduler.release("dolphin")
+        await asyncio.gather(*tasks)
+
+    asyncio.run(_run())
+    assert order == ["chat", "bg-1", "bg-2"]
+    stats = scheduler.stats()
+    assert stats["in_flight_total"] == 0
+    assert stats["lanes"][LANE_BACKGROUND]["max_queue_depth"] == 2
+    assert stats["lanes"][LANE_INTERACTIVE]["granted"] == 2
+
+
+def test_same_model_requests_are_grouped_and_capped() -> None:
+    scheduler = LLMScheduler(max_concurrency=1, per_model_concurrency=1, max_same_model_streak=2)
+    order: list[str] = []
+
+    async def _call(model: str) -> None:
+        async with scheduler.slot(model):
+            order.append(model)
+            await asyncio.sleep(0)
+
+    async def _run() -> None:
+        await scheduler.acquire("mistral")
+        tasks = [asyncio.create_task(_call(model)) for model in ("dolphin", "mistral", "dolphin", "mistral", "mistral")]
+        await asyncio.sleep(0)
+        scheduler.release("mistral")
+        await asyncio.gather(*tasks)
+
+    asyncio.run(_run())
+    # "mistral" est deja charge: il reste servi jusqu'a la limite de la serie.
+    assert order == ["mistral", "dolphin", "dolphin", "mistral", "mistral"]
+    assert scheduler.stats()["model_switches"] == 2
+
+
+def test_cancelled_waiter_leaves_the_queue() -> None:
+    scheduler = LLMScheduler(max_concurrency=1)
+
+    async def _run() -> None:
+        await scheduler.acquire("qwen")
+        waiter = asyncio.create_task(scheduler.acquire("qwen"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert scheduler.stats()["lanes"][LANE_INTERACTIVE]["queue_depth"] == 0
+        scheduler.release("qwen")
+        await asyncio.wait_for(scheduler.acquire("qwen"), timeout=1.0)
+        scheduler.release("qwen")
+
+    asyncio.run(_run())
+    assert scheduler.stats()["in_flight_total"] == 0
+
+
+def _ollama_client(scheduler: LLMScheduler, seen: list[dict]) -> OllamaClient:
+    def _handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        seen.append(dict(scheduler.stats()["in_flight"]))
+        if payload["model"] == "absent":
+            return httpx.Response(404, json={"error": "model not found"})
+        if payload["stream"]:
+            lines = [json.dumps({"response": word}) for word in ("Bon", "jour", " !")]
+            return httpx.Response(200, content="\n".join(lines + [json.dumps({"done": True})]).encode())
+        return httpx.Response(200, json={"response": "Bonjour !"})
+
+    client = OllamaClient(max_retries=0, scheduler=scheduler)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    return client
+
+
+def test_ollama_client_takes_a_slot_for_each_model_it_queries() -> None:
+    scheduler = LLMScheduler(max_concurrency=1)
+    seen: list[dict] = []
+    client = _ollama_client(scheduler, seen)
+
+    async def _run() -> str:
+        try:
+            return await client.generate("absent", "Salut", fallback_models=["dolphin"])
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(_run()) == "Bonjour !"
+    assert seen == [{"absent": 1}, {"dolphin": 1}]
+    assert scheduler.stats()["in_flight_total"] == 0
+
+
+def test_closing_a_stream_early_releases_its_slot() -> None:
+    scheduler = LLMScheduler(max_concurrency=1)
+    seen: list[dict] = []
+    client = _ollama_client(scheduler, seen)
+
+    async def _run() -> list[str]:
+        stream = client.generate_stream("dolphin", "Salut", fallback_models=["mistral"])
+        fragments = [await stream.__anext__()]
+        assert scheduler.stats()["in_flight"] == {"dolphin": 1}
+        await stream.aclose()
+        assert scheduler.stats()["in_flight_total"] == 0
+        await asyncio.wait_for(scheduler.acquire("mistral"), timeout=1.0)
+        scheduler.release("mistral")
+        await client.aclose()
+        return fragments
+
+    assert asyncio.run(_run()) == ["Bon"]
+    assert seen == [{"dolphin": 1}]
@@ -217,3 +217,41 @@ def test_diversity_guard_breaks_repeated_same_item_drop_from_llm() -> None:
 
     assert first.get("item_id") == "epee_apprenti"
     assert second.get("item_id") != "epee_apprenti"
+
+
+def test_diversity_guard_history_is_per_caller() -> None:
+    class _FakeLlm:
+        async def generate(self, **kwargs) -> str:
+            return '{"item_id":"epee_apprenti","qty":1,"rarity":"common","new_item":null}'
+
+    manager = LootManager(_FakeLlm(), data_dir="data")
+    known = {
+        "epee_apprenti": ItemDef(
+            id="epee_apprenti",
+            name="Epee d'apprenti",
+            stack_max=1,
+            type="weapon",
+            slot="weapon",
+            rarity="common",
+        ),
+    }
+    chat_a: list[str] = []
+    chat_b: list[str] = []
+
+    def _drop(recent: list[str]) -> dict:
+        return asyncio.run(
+            manager.generate_loot(
+                source_type="monster",
+                floor=7,
+                anchor="Lumeria",
+                known_items=known,
+                hint_text="goule cendreuse",
+                recent_item_ids=recent,
+            )
+        )
+
+    assert _drop(chat_a).get("item_id") == "epee_apprenti"
+    assert _drop(chat_b).get("item_id") == "epee_apprenti"
+    assert _drop(chat_a).get("item_id") != "epee_apprenti"
+    assert chat_b == ["epee_apprenti"]
+    assert manager._recent_loot_ids == []  # noqa: SLF001 - tested intentionally
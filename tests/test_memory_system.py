@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from pathlib import Path
+import threading
+import time
 
+import httpx
+import numpy as np
+import pytest
+
+from app.core.memory.embedding_cache import EmbeddingCache
+from app.core.memory.embedding_health import BackendHealthMonitor
+from app.core.memory import embeddings as embeddings_module
 from app.core.memory.embeddings import EmbeddingProvider
 from app.core.memory.memory_compactor import CompactionPatch, PatchItem, _apply_patch_to_long, compact_npc_memory
 from app.core.memory.memory_models import LongMemory, NpcMemory, ShortTurn, WorldMemory
 from app.core.memory.memory_models import MemoryFact
 from app.core.memory.memory_retrieval import retrieve_context
-from app.core.memory.memory_service import MemoryService
-from app.core.memory.memory_store import MemoryStore
+from app.core.memory.memory_service import MemoryEntry, MemoryService, dialogue_turn_entries
+from app.core.memory.memory_store import MemoryStore, safe_id
 from app.core.memory.migration import bootstrap_from_existing_history
 from app.core.memory.vector_index import VectorIndex
 
@@ -154,3 +164,581 @@ def test_bootstrap_from_existing_history(tmp_path: Path) -> None:
     assert int(report["indexes_rebuilt"]) >= 1
     npc_files = list((tmp_path / "data" / "memory" / "npcs").glob("*.json"))
     assert npc_files
+
+
+def test_vector_index_sync_records_is_incremental(tmp_path: Path) -> None:
+    calls: list[list[str]] = []
+
+    def _embed(texts: list[str]) -> list[list[float]]:
+        calls.append(list(texts))
+        return [[1.0, float(len(text)), 0.0] for text in texts]
+
+    records = [
+        {"record_id": "fact:1", "text": "le pont est garde", "meta": {"kind": "fact"}},
+        {"record_id": "fact:2", "text": "la marchande ment", "meta": {"kind": "fact"}},
+    ]
+    index_path = tmp_path / "npc.faiss"
+    mapping_path = tmp_path / "npc.jsonl"
+    idx = VectorIndex(prefer_faiss=False)
+    idx.sync_records(records=records, embed_texts=_embed)
+    idx.persist_incremental(index_path=index_path, mapping_path=mapping_path)
+
+    records = [
+        records[0],
+        {"record_id": "fact:3", "text": "un dragon dort sous la colline", "meta": {"kind": "fact"}},
+    ]
+    stats = idx.sync_records(records=records, embed_texts=_embed)
+    idx.persist_incremental(index_path=index_path, mapping_path=mapping_path)
+
+    assert stats == {"added": 1, "removed": 1, "updated": 0, "kept": 1}
+    assert calls[-1] == ["un dragon dort sous la colline"]
+    assert VectorIndex.append_path(index_path).exists()
+
+    loaded = VectorIndex(prefer_faiss=False)
+    loaded.load(index_path=index_path, mapping_path=mapping_path)
+    assert loaded.live_count == 2
+    assert loaded.deleted_count == 1
+    hit_ids = {row["record_id"] for row in loaded.search([1.0, 30.0, 0.0], top_k=5)}
+    assert hit_ids == {"fact:1", "fact:3"}
+
+    assert loaded.vacuum_to_disk(index_path=index_path, mapping_path=mapping_path) == 1
+    assert not VectorIndex.append_path(index_path).exists()
+    reloaded = VectorIndex(prefer_faiss=False)
+    reloaded.load(index_path=index_path, mapping_path=mapping_path)
+    assert reloaded.deleted_count == 0
+    assert [row["record_id"] for row in reloaded.mapping] == ["fact:1", "fact:3"]
+
+
+def test_vector_index_add_many_grows_buffer_in_place() -> None:
+    idx = VectorIndex(prefer_faiss=False)
+    matrix = np.eye(40, 8, dtype=np.float32) + 0.01
+    ids = idx.add_many([f"r:{i}" for i in range(40)], [f"texte {i}" for i in range(40)], [{}] * 40, matrix)
+    assert ids == list(range(40))
+    capacity = idx._vectors.shape[0]
+    assert capacity >= 40
+    idx.add("r:40", "texte 40", {}, [0.0] * 7 + [1.0])
+    assert idx._vectors.shape[0] == capacity
+    hits = idx.search([0.0] * 7 + [1.0], top_k=1)
+    assert hits[0]["record_id"] in {"r:7", "r:40"}
+
+    rebuilt = VectorIndex(prefer_faiss=False)
+    records = [{"record_id": f"r:{i}", "text": f"t{i}", "meta": {"i": i}} for i in range(5)]
+    added = rebuilt.rebuild_from_records(records=records, embed_texts=lambda texts: [[1.0, float(i)] for i, _ in enumerate(texts)])
+    assert added == 5
+    assert rebuilt.live_count == 5
+
+
+def test_vector_index_mmap_storage_reads_lazily(tmp_path: Path) -> None:
+    index_path = tmp_path / "npc.faiss"
+    mapping_path = tmp_path / "npc.jsonl"
+    idx = VectorIndex(prefer_faiss=False)
+    idx.add("chunk:1", "combat au pont", {}, [1.0, 0.0, 0.0])
+    idx.add("chunk:2", "commerce au marche", {}, [0.0, 1.0, 0.0])
+    idx.persist(index_path=index_path, mapping_path=mapping_path)
+
+    mapped = VectorIndex(prefer_faiss=True, storage="mmap")
+    assert mapped.engine == "numpy"
+    mapped.load(index_path=index_path, mapping_path=mapping_path)
+    assert mapped.is_mmapped
+    assert mapped.search([0.0, 1.0, 0.0], top_k=1)[0]["record_id"] == "chunk:2"
+
+    mapped.add("chunk:3", "temple en ruine", {}, [0.0, 0.0, 1.0])
+    assert mapped.search([0.0, 0.0, 1.0], top_k=1)[0]["record_id"] == "chunk:3"
+    mapped.persist(index_path=index_path, mapping_path=mapping_path)
+    assert mapped.is_mmapped
+    assert mapped.live_count == 3
+    assert mapped.search([1.0, 0.0, 0.0], top_k=1)[0]["record_id"] == "chunk:1"
+
+
+def _fake_embed(texts: list[str]) -> list[list[float]]:
+    vocab = {"pont": 0, "marche": 1, "temple": 2}
+    out: list[list[float]] = []
+    for text in texts:
+        vec = [0.0, 0.0, 0.0]
+        for word, pos in vocab.items():
+            if word in text:
+                vec[pos] = 1.0
+        out.append(vec)
+    return out
+
+
+def test_vector_index_rebuilds_when_files_do_not_match_engine(tmp_path: Path) -> None:
+    index_path = tmp_path / "npc.faiss"
+    mapping_path = tmp_path / "npc.jsonl"
+    records = [
+        {"record_id": "chunk:1", "text": "combat au pont", "meta": {}},
+        {"record_id": "chunk:2", "text": "commerce au marche", "meta": {}},
+    ]
+    mapping_path.write_text(
+        "".join(
+            json.dumps({"vector_id": pos, "record_id": row["record_id"], "text": row["text"], "meta": {}}) + "\n"
+            for pos, row in enumerate(records)
+        ),
+        encoding="utf-8",
+    )
+    # En-tete d'un IndexFlatIP ecrit par FAISS: illisible par le moteur numpy/mmap.
+    index_path.write_bytes(b"IxFI" + (3).to_bytes(4, "little") + (2).to_bytes(8, "little") + b"\0" * 64)
+
+    idx = VectorIndex(prefer_faiss=False, storage="mmap")
+    idx.load(index_path=index_path, mapping_path=mapping_path)
+    assert idx.needs_rebuild
+    assert idx.live_count == 0
+    assert idx.search([1.0, 0.0, 0.0]) == []
+
+    stats = idx.sync_records(records=records, embed_texts=_fake_embed)
+    assert stats["added"] == 2
+    assert not idx.needs_rebuild
+    idx.persist_incremental(index_path=index_path, mapping_path=mapping_path)
+
+    reloaded = VectorIndex(prefer_faiss=False, storage="mmap")
+    reloaded.load(index_path=index_path, mapping_path=mapping_path)
+    assert not reloaded.needs_rebuild
+    assert reloaded.is_mmapped
+    assert reloaded.search([0.0, 1.0, 0.0], top_k=1)[0]["record_id"] == "chunk:2"
+
+
+def test_vector_index_persist_incremental_rewrites_when_disk_rows_differ(tmp_path: Path) -> None:
+    index_path = tmp_path / "npc.faiss"
+    mapping_path = tmp_path / "npc.jsonl"
+    idx = VectorIndex(prefer_faiss=False)
+    idx.add("chunk:1", "combat au pont", {}, [1.0, 0.0, 0.0])
+    idx.add("chunk:2", "commerce au marche", {}, [0.0, 1.0, 0.0])
+    idx.persist(index_path=index_path, mapping_path=mapping_path)
+
+    # Fichier de vecteurs remplace hors de l'index (une seule ligne au lieu de deux).
+    with index_path.open("wb") as fh:
+        np.save(fh, np.asarray([[1.0, 0.0, 0.0]], dtype=np.float32), allow_pickle=False)
+    idx.add("chunk:3", "temple en ruine", {}, [0.0, 0.0, 1.0])
+    idx.persist_incremental(index_path=index_path, mapping_path=mapping_path)
+    assert not VectorIndex.append_path(index_path).exists()
+
+    reloaded = VectorIndex(prefer_faiss=False)
+    reloaded.load(index_path=index_path, mapping_path=mapping_path)
+    assert not reloaded.needs_rebuild
+    assert reloaded.live_count == 3
+    assert reloaded.search([0.0, 0.0, 1.0], top_k=1)[0]["record_id"] == "chunk:3"
+    assert reloaded.search([0.0, 1.0, 0.0], top_k=1)[0]["record_id"] == "chunk:2"
+
+
+def test_vector_index_sync_records_embeds_outside_lock() -> None:
+    idx = VectorIndex(prefer_faiss=False)
+    idx.add("chunk:1", "combat au pont", {}, [1.0, 0.0, 0.0])
+    searched: list[list[dict]] = []
+
+    def _embed(texts: list[str]) -> list[list[float]]:
+        reader = threading.Thread(target=lambda: searched.append(idx.search([1.0, 0.0, 0.0], top_k=1)))
+        reader.start()
+        reader.join(timeout=2.0)
+        assert not reader.is_alive()
+        return _fake_embed(texts)
+
+    stats = idx.sync_records(
+        records=[
+            {"record_id": "chunk:1", "text": "combat au pont", "meta": {}},
+            {"record_id": "chunk:2", "text": "temple en ruine", "meta": {}},
+        ],
+        embed_texts=_embed,
+    )
+    assert stats == {"added": 1, "removed": 0, "updated": 0, "kept": 1}
+    assert searched and searched[0][0]["record_id"] == "chunk:1"
+
+
+def _fake_provider(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> EmbeddingProvider:
+    provider = EmbeddingProvider(cache_path=str(tmp_path / "emb_cache.jsonl"))
+    monkeypatch.setattr(provider, "enabled", lambda: True)
+    monkeypatch.setattr(provider, "embed_text", lambda text: _fake_embed([text])[0])
+    monkeypatch.setattr(provider, "embed_arrays", _fake_embed)
+    return provider
+
+
+def test_memory_service_rebuilds_index_written_by_another_engine(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    store = MemoryStore(memory_root=str(tmp_path / "memory"), index_root=str(tmp_path / "memory_index"))
+    embeddings = _fake_provider(tmp_path, monkeypatch)
+    writer = MemoryService(store=store, embeddings=embeddings, index_storage="memory", write_delay_s=0)
+    memory = writer.load_npc_memory(profile_key="p", npc_id="alice")
+    memory.long.facts.append(MemoryFact(text="Le temple en ruine cache une relique"))
+    memory.long.facts.append(MemoryFact(text="Le marche ouvre a l'aube"))
+    writer.save_npc_memory(memory)
+    writer.update_npc_index(profile_key="p", npc_id="alice", memory=memory)
+    key = writer.scoped_npc_id(profile_key="p", npc_id="alice")
+    # Fichier reecrit au format FAISS (autre moteur): le mode mmap ne peut pas le lire.
+    store.npc_index_path(key).write_bytes(b"IxFI" + (3).to_bytes(4, "little") + (2).to_bytes(8, "little"))
+
+    reader = MemoryService(store=store, embeddings=embeddings, index_storage="mmap", write_delay_s=0)
+    hits = reader._vector_hits(profile_key="p", npc_id="alice", query="temple", mode="npc", top_k=1)
+    assert [hit["text"] for hit in hits] == ["Le temple en ruine cache une relique"]
+    assert not reader._ensure_npc_index_loaded(key).needs_rebuild
+    assert store.npc_index_path(key).read_bytes()[:6] == b"\x93NUMPY"
+
+
+def test_memory_service_evicts_least_recently_used_npc_index(tmp_path: Path) -> None:
+    store = MemoryStore(memory_root=str(tmp_path / "memory"), index_root=str(tmp_path / "memory_index"))
+    service = MemoryService(
+        store=store,
+        embeddings=EmbeddingProvider(cache_path=str(tmp_path / "emb_cache.jsonl")),
+        max_loaded_indexes=2,
+    )
+    for npc in ("alice", "bob", "alice", "carol"):
+        service._ensure_npc_index_loaded(service.scoped_npc_id(profile_key="p", npc_id=npc))
+
+    stats = service.index_cache_stats()
+    assert list(service._npc_indexes.keys()) == ["p__alice", "p__carol"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+    assert stats["evictions"] == 1
+    assert stats["resident"] == 2
+
+
+def test_memory_service_write_behind_coalesces_appends(tmp_path: Path) -> None:
+    store = MemoryStore(memory_root=str(tmp_path / "memory"), index_root=str(tmp_path / "memory_index"))
+    service = MemoryService(
+        store=store,
+        embeddings=EmbeddingProvider(cache_path=str(tmp_path / "emb_cache.jsonl")),
+        write_delay_s=60.0,
+    )
+    writes_before = service.memory_cache_stats()["writes"]
+    for i in range(5):
+        service.append_short(profile_key="p", npc_id="mira", role="player", text=f"Bonjour {i}")
+
+    first = service.load_npc_memory(profile_key="p", npc_id="mira")
+    assert first is service.load_npc_memory(profile_key="p", npc_id="mira")
+    assert len(first.short) == 5
+    on_disk = json.loads(store.npc_memory_path("p__mira").read_text(encoding="utf-8"))
+    assert on_disk["short"] == []
+
+    stats = service.memory_cache_stats()
+    assert stats["dirty"] == 1
+    assert stats["coalesced"] == 4
+    assert service.flush() == 1
+    assert service.memory_cache_stats()["writes"] == writes_before + 1
+    on_disk = json.loads(store.npc_memory_path("p__mira").read_text(encoding="utf-8"))
+    assert len(on_disk["short"]) == 5
+
+
+def test_memory_service_flush_snapshots_under_the_mutation_lock(tmp_path: Path) -> None:
+    store = MemoryStore(memory_root=str(tmp_path / "memory"), index_root=str(tmp_path / "memory_index"))
+    service = MemoryService(
+        store=store,
+        embeddings=EmbeddingProvider(cache_path=str(tmp_path / "emb_cache.jsonl")),
+        write_delay_s=60.0,
+    )
+    service.append_short(profile_key="p", npc_id="mira", role="player", text="Bonjour")
+    flushed = threading.Event()
+
+    with service.locked_npc_memory(profile_key="p", npc_id="mira") as memory:
+        memory.short.append(memory.short[0].model_copy(update={"text": "Encore"}))
+        flusher = threading.Thread(target=lambda: (service.flush(), flushed.set()))
+        flusher.start()
+        assert not flushed.wait(0.2)
+        memory.short.append(memory.short[0].model_copy(update={"text": "Fin"}))
+    assert flushed.wait(2.0)
+    flusher.join()
+
+    on_disk = json.loads(store.npc_memory_path("p__mira").read_text(encoding="utf-8"))
+    assert [turn["text"] for turn in on_disk["short"]] == ["Bonjour", "Encore", "Fin"]
+
+
+def test_save_npc_memory_does_not_rename_the_callers_object(tmp_path: Path) -> None:
+    store = MemoryStore(memory_root=str(tmp_path / "memory"), index_root=str(tmp_path / "memory_index"))
+    service = MemoryService(
+        store=store,
+        embeddings=EmbeddingProvider(cache_path=str(tmp_path / "emb_cache.jsonl")),
+        write_delay_s=0,
+    )
+    memory = NpcMemory(npc_id="p__Mira la Rousse")
+    service.save_npc_memory(memory)
+
+    assert memory.npc_id == "p__Mira la Rousse"
+    saved = service.load_npc_memory(profile_key="p", npc_id="Mira la Rousse")
+    assert saved is not memory
+    assert saved.npc_id == safe_id("p__Mira la Rousse")
+
+
+def test_append_many_saves_once_and_routes_system_events(tmp_path: Path) -> None:
+    store = MemoryStore(memory_root=str(tmp_path / "memory"), index_root=str(tmp_path / "memory_index"))
+    service = MemoryService(
+        store=store,
+        embeddings=EmbeddingProvider(cache_path=str(tmp_path / "emb_cache.jsonl")),
+        write_delay_s=0,
+    )
+    writes_before = service.memory_cache_stats()["writes"]
+    stats = service.append_many(
+        profile_key="p",
+        npc_id="mira",
+        entries=[
+            *dialogue_turn_entries(player_text="Je te promets de revenir.", npc_reply="Je t'attendrai.", scene_title="Port"),
+            MemoryEntry(kind="system", text="Mira doit 20 pieces au joueur.", event_kind="debt", importance=0.7),
+        ],
+    )
+
+    assert stats == {"short": 2, "long": 1, "world_short": 0, "world_events": 1}
+    assert service.memory_cache_stats()["writes"] == writes_before + 2
+    memory = service.load_npc_memory(profile_key="p", npc_id="mira")
+    assert [turn.role for turn in memory.short] == ["player", "npc"]
+    assert memory.short[0].turn_id == memory.short[1].turn_id
+    assert [row.text for row in memory.long.debts] == ["Mira doit 20 pieces au joueur."]
+    assert service.load_world_memory().long.events[-1].text == "Mira doit 20 pieces au joueur."
+
+
+def test_embedding_cache_appends_and_imports_legacy_jsonl(tmp_path: Path) -> None:
+    legacy = tmp_path / "emb_cache.jsonl"
+    old_hash = "00" * 19 + "ab"
+    legacy.write_text(json.dumps({"text_hash": old_hash, "vector": [0.6, 0.8]}) + "\n", encoding="utf-8")
+
+    cache = EmbeddingCache(legacy)
+    cache.load()
+    assert cache.get(old_hash).tolist() == pytest.approx([0.6, 0.8])
+    size_after_import = cache.data_path.stat().st_size
+
+    new_hash = "ff" * 19 + "00"
+    cache.put(new_hash, [1.0, 0.0, 0.0])
+    assert cache.flush() == 1
+    assert cache.data_path.stat().st_size == size_after_import + 12
+
+    reloaded = EmbeddingCache(legacy)
+    reloaded.load()
+    assert len(reloaded) == 2
+    assert reloaded.get(new_hash).tolist() == [1.0, 0.0, 0.0]
+
+    reloaded.put(new_hash, [0.0, 1.0, 0.0])
+    reloaded.flush()
+    assert reloaded.dead_records == 1
+    assert reloaded.compact() == 2
+    assert reloaded.dead_records == 0
+    assert reloaded.get(new_hash).tolist() == [0.0, 1.0, 0.0]
+
+
+def test_embedding_cache_budget_evicts_least_recently_used(tmp_path: Path) -> None:
+    per_entry = 4 * 4 + 200
+    cache = EmbeddingCache(tmp_path / "emb_cache.jsonl", max_bytes=per_entry * 2)
+    cache.load()
+    keys = [f"{i:02x}" * 20 for i in range(3)]
+    cache.put(keys[0], [1.0, 0.0, 0.0, 0.0])
+    cache.put(keys[1], [0.0, 1.0, 0.0, 0.0])
+    cache.flush()
+    view = cache.get(keys[0])
+    assert view is not None and not view.flags.writeable
+    cache.put(keys[2], [0.0, 0.0, 1.0, 0.0])
+    cache.flush()
+
+    # Only the in-RAM hot copy of keys[1] is dropped: the vector is still served from the map.
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hot_entries"] == 2
+    assert stats["resident_bytes"] <= per_entry * 2
+    assert all(key in cache for key in keys)
+    assert cache.get(keys[1]).tolist() == [0.0, 1.0, 0.0, 0.0]
+    assert cache.dead_records == 0
+    assert cache.compact() == 3
+
+    reloaded = EmbeddingCache(tmp_path / "emb_cache.jsonl", max_bytes=per_entry)
+    reloaded.load()
+    assert len(reloaded) == 3
+    assert reloaded.stats()["resident_bytes"] == 0
+    for pos, key in enumerate(keys):
+        assert reloaded.get(key).tolist()[pos] == 1.0
+    assert reloaded.stats()["hot_entries"] == 1
+    assert reloaded.stats()["hit_ratio"] == 1.0
+
+
+def _legacy_ollama_handler(calls: list[str]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path == "/api/embed":
+            return httpx.Response(404, json={"error": "not found"})
+        prompt = json.loads(request.content)["prompt"]
+        return httpx.Response(200, json={"embedding": [float(len(prompt)), 1.0, 0.0]})
+
+    return handler
+
+
+def test_embedding_provider_pools_client_and_fans_out_legacy_endpoint(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("MEMORY_EMBED_MODE", "ollama")
+    calls: list[str] = []
+    provider = EmbeddingProvider(cache_path=str(tmp_path / "emb_cache.jsonl"), max_concurrency=3)
+    provider._http = httpx.Client(transport=httpx.MockTransport(_legacy_ollama_handler(calls)))
+    pooled = provider._http
+
+    texts = ["a", "bb", "ccc", "dddd"]
+    vectors = provider.embed_texts(texts)
+    assert provider._http is pooled
+    assert calls.count("/api/embed") == 1
+    assert calls.count("/api/embeddings") == len(texts)
+    for text, vec in zip(texts, vectors):
+        expected = np.asarray([len(text), 1.0, 0.0], dtype=np.float32)
+        assert np.allclose(vec, expected / np.linalg.norm(expected))
+
+    provider.close()
+    assert provider._http is None
+
+
+def test_embedding_provider_async_path_fills_shared_cache(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("MEMORY_EMBED_MODE", "ollama")
+    calls: list[str] = []
+    provider = EmbeddingProvider(cache_path=str(tmp_path / "emb_cache.jsonl"), max_concurrency=2)
+    transport = httpx.MockTransport(_legacy_ollama_handler(calls))
+
+    async def _client() -> httpx.AsyncClient:
+        if provider._async_http is None:
+            provider._async_http = httpx.AsyncClient(transport=transport)
+            provider._async_http_loop = asyncio.get_running_loop()
+        return provider._async_http
+
+    monkeypatch.setattr(provider, "_async_http_client", _client)
+
+    async def _run() -> list[list[float]]:
+        try:
+            return await provider.aembed_texts(["hello", "world", "hello"])
+        finally:
+            await provider.aclose()
+
+    vectors = asyncio.run(_run())
+    assert len(vectors) == 3 and vectors[0] == vectors[2]
+    assert calls.count("/api/embeddings") == 2
+
+    provider._http = httpx.Client(transport=transport)
+    assert provider.embed_texts(["world"]) == [vectors[1]]
+    assert calls.count("/api/embeddings") == 2
+
+
+def test_embedding_provider_closes_async_client_of_previous_loop(tmp_path: Path) -> None:
+    provider = EmbeddingProvider(cache_path=str(tmp_path / "emb_cache.jsonl"))
+
+    async def _client() -> httpx.AsyncClient:
+        return await provider._async_http_client()
+
+    try:
+        first = asyncio.run(_client())
+        second = asyncio.run(_client())
+        assert second is not first
+        assert first.is_closed and not second.is_closed
+    finally:
+        provider.close()
+
+
+def test_backend_health_monitor_probes_in_background_with_backoff() -> None:
+    probed: list[tuple[str, str]] = []
+    ollama_up = {"value": False}
+
+    def _probe_ollama() -> bool:
+        probed.append(("ollama", threading.current_thread().name))
+        return ollama_up["value"]
+
+    def _probe_sentence() -> bool:
+        probed.append(("sentence", threading.current_thread().name))
+        return True
+
+    monitor = BackendHealthMonitor(
+        {"ollama": _probe_ollama, "sentence": _probe_sentence},
+        order=["ollama", "sentence"],
+        backoff_s=0.05,
+        backoff_max_s=0.2,
+    )
+    try:
+        assert monitor.wait_ready(2.0)
+        assert monitor.active() == "sentence"
+        assert {thread for _, thread in probed} == {"memory-embed-health"}
+
+        ollama_up["value"] = True
+        deadline = time.monotonic() + 2.0
+        while monitor.active() != "ollama" and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert monitor.active() == "ollama"
+        assert monitor.stats()["ollama"]["failures"] == 0
+
+        monitor.report_failure("ollama")
+        assert monitor.active() == "sentence"
+        assert monitor.stats()["ollama"]["failures"] == 1
+    finally:
+        monitor.stop()
+
+
+def test_embedding_provider_failure_never_probes_inline(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("MEMORY_EMBED_MODE", "ollama")
+    inline_probes: list[str] = []
+    caller = threading.current_thread().name
+
+    def _probe(*_args) -> bool:
+        if threading.current_thread().name == caller:
+            inline_probes.append("probe")
+        return False
+
+    monkeypatch.setattr(embeddings_module, "_probe_ollama", _probe)
+    monkeypatch.setattr(embeddings_module, "_probe_sentence", _probe)
+    provider = EmbeddingProvider(
+        cache_path=str(tmp_path / "emb_cache.jsonl"),
+        ollama_base_url="http://embed-failure.invalid:1",
+    )
+    monkeypatch.setattr(provider, "_embed_with_ollama", lambda texts: [])
+    try:
+        assert provider.mode == "ollama"
+        assert provider.embed_texts(["bonjour"]) == [[]]
+        assert provider.mode == "disabled"
+        assert provider.embed_texts(["bonjour"]) == [[]]
+        assert inline_probes == []
+        assert provider.backend_stats()["backends"]["ollama"]["failures"] >= 1
+    finally:
+        provider.close()
+
+
+def test_embedding_providers_share_one_prober_per_endpoint(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("MEMORY_EMBED_MODE", raising=False)
+    release = threading.Event()
+    probes: list[str] = []
+
+    def _slow_probe(base_url: str) -> bool:
+        probes.append(base_url)
+        release.wait(2.0)
+        return True
+
+    monkeypatch.setattr(embeddings_module, "_probe_ollama", _slow_probe)
+    monkeypatch.setattr(embeddings_module, "_probe_sentence", lambda: False)
+    url = "http://embed-shared.invalid:1"
+    first = EmbeddingProvider(cache_path=str(tmp_path / "a.jsonl"), ollama_base_url=url)
+    second = EmbeddingProvider(cache_path=str(tmp_path / "b.jsonl"), ollama_base_url=url)
+    monitor = first._health
+    try:
+        assert second._health is monitor
+        started = time.monotonic()
+        assert first.mode == "disabled"
+        assert time.monotonic() - started < 0.5
+        assert first.backend_stats()["mode"] == "probing"
+
+        release.set()
+        assert monitor.wait_ready(2.0)
+        assert first.mode == "ollama" and second.mode == "ollama"
+        assert probes == [url]
+
+        first.close()
+        assert not monitor._stopped
+    finally:
+        release.set()
+        first.close()
+        second.close()
+    assert monitor._stopped
+    third = EmbeddingProvider(cache_path=str(tmp_path / "c.jsonl"), ollama_base_url=url)
+    try:
+        assert third._health is not monitor
+    finally:
+        third.close()
+
+
+def test_embedding_provider_forced_sentence_never_falls_back_to_ollama(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("MEMORY_EMBED_MODE", "sentence")
+    monkeypatch.setattr(embeddings_module, "_probe_ollama", lambda base_url: True)
+    monkeypatch.setattr(embeddings_module, "_probe_sentence", lambda: False)
+    provider = EmbeddingProvider(
+        cache_path=str(tmp_path / "emb_cache.jsonl"),
+        ollama_base_url="http://embed-sentence.invalid:1",
+    )
+    ollama_calls: list[list[str]] = []
+    monkeypatch.setattr(provider, "_embed_with_ollama", lambda texts: ollama_calls.append(texts) or [])
+    monkeypatch.setattr(provider, "_embed_with_sentence", lambda texts: [])
+    try:
+        assert provider.mode == "sentence"
+        assert provider.embed_texts(["bonjour"]) == [[]]
+        assert provider.mode == "disabled"
+        assert ollama_calls == []
+        assert list(provider.backend_stats()["backends"]) == ["sentence"]
+    finally:
+        provider.close()
@@ -253,3 +253,145 @@ def test_save_and_load_travel_state_roundtrip(tmp_path) -> None:
     assert loaded.travel_state.to_location_id == "temple_01"
     assert loaded.travel_state.progress == 22
     assert int(loaded.travel_state.supplies_used.get("food") or 0) == 2
+
+
+def test_incremental_saves_append_deltas_and_reload(tmp_path) -> None:
+    save_manager = SaveManager(saves_dir=str(tmp_path), slot_count=3, journal_max_entries=10)
+    state = _build_state()
+    state.push("System", "line-0", count_for_media=False)
+    save_manager.save_slot(1, state, profile="Tester")
+
+    slot_path = save_manager.slot_path(1, profile="Tester")
+    checkpoint = slot_path.read_text(encoding="utf-8")
+
+    state.push("System", "line-1", count_for_media=False)
+    state.faction_reputation = {"Marchands": 3}
+    save_manager.save_slot(1, state, profile="Tester")
+    save_manager.save_slot(1, state, profile="Tester")  # rien n'a change: pas d'entree
+
+    assert slot_path.read_text(encoding="utf-8") == checkpoint
+    entries = [
+        json.loads(line)
+        for line in save_manager.journal_path(1, profile="Tester").read_text(encoding="utf-8").splitlines()
+    ]
+    assert len(entries) == 1
+    assert [msg["text"] for msg in entries[0]["chat_append"]] == ["line-1"]
+    assert set(entries[0]["set"]) == {"faction_reputation"}
+
+    loaded = GameState()
+    assert SaveManager(saves_dir=str(tmp_path), slot_count=3).load_slot(1, loaded, profile="Tester")
+    assert [msg.text for msg in loaded.chat][-2:] == ["line-0", "line-1"]
+    assert loaded.faction_reputation == {"Marchands": 3}
+    assert save_manager.slot_summary(1, profile="Tester")["messages"] == len(loaded.chat)
+
+
+def test_journal_is_compacted_into_a_checkpoint(tmp_path) -> None:
+    save_manager = SaveManager(saves_dir=str(tmp_path), slot_count=3, journal_max_entries=2)
+    state = _build_state()
+    journal_path = save_manager.journal_path(1, profile="Tester")
+
+    for i in range(3):
+        state.push("System", f"line-{i}", count_for_media=False)
+        save_manager.save_slot(1, state, profile="Tester")
+    assert len(journal_path.read_text(encoding="utf-8").splitlines()) == 2
+
+    state.push("System", "line-3", count_for_media=False)
+    save_manager.save_slot(1, state, profile="Tester")
+    assert not journal_path.exists()
+    payload = json.loads(save_manager.slot_path(1, profile="Tester").read_text(encoding="utf-8"))
+    assert payload["state"]["chat"][-1]["text"] == "line-3"
+
+
+def test_stale_or_truncated_journal_entries_are_ignored(tmp_path) -> None:
+    save_manager = SaveManager(saves_dir=str(tmp_path), slot_count=3, journal_max_entries=10)
+    state = _build_state()
+    save_manager.save_slot(1, state, profile="Tester")
+    state.push("System", "kept", count_for_media=False)
+    save_manager.save_slot(1, state, profile="Tester")
+
+    journal_path = save_manager.journal_path(1, profile="Tester")
+    with journal_path.open("a", encoding="utf-8") as fp:
+        fp.write('{"checkpoint_id": "old", "set": {"current_scene_id": "nowhere"}}\n{"trunc')
+
+    loaded = GameState()
+    assert save_manager.load_slot(1, loaded, profile="Tester")
+    assert loaded.chat[-1].text == "kept"
+    assert loaded.current_scene_id == "city"
+
+    # Journal abime: la sauvegarde suivante repart d'un checkpoint complet.
+    loaded.push("System", "after", count_for_media=False)
+    save_manager.save_slot(1, loaded, profile="Tester")
+    assert not journal_path.exists()
+
+
+def test_profile_index_serves_lists_and_summaries(tmp_path, monkeypatch) -> None:
+    save_manager = SaveManager(saves_dir=str(tmp_path), slot_count=3)
+    state = _build_state()
+    state.push("System", "hello", count_for_media=False)
+    save_manager.save_slot(1, state, profile="Alice", display_name="Alice la Brave")
+    save_manager.save_slot(2, state, profile="Bob")
+
+    def _no_parse(*args, **kwargs):
+        raise AssertionError("le slot ne doit pas etre relu")
+
+    monkeypatch.setattr(save_manager, "_read_slot_payload", _no_parse)
+    profiles = {row["profile_key"]: row for row in save_manager.list_profiles()}
+    assert set(profiles) == {"alice", "bob"}
+    assert profiles["alice"]["display_name"] == "Alice la Brave"
+    summary = save_manager.slot_summary(1, profile="Alice")
+    assert summary["exists"] and summary["location"] == "city"
+    assert summary["messages"] == len(state.chat)
+
+    monkeypatch.undo()
+    save_manager.delete_slot(2, profile="Bob")
+    assert [row["profile_key"] for row in save_manager.list_profiles()] == ["alice"]
+
+    # Index supprime: il est reconstruit depuis les dossiers de profils.
+    (save_manager.profiles_dir / "index.jsonl").unlink()
+    fresh = SaveManager(saves_dir=str(tmp_path), slot_count=3)
+    assert [row["display_name"] for row in fresh.list_profiles()] == ["Alice la Brave"]
+    assert fresh.slot_summary(1, profile="Alice")["messages"] == len(state.chat)
+
+
+def test_profile_list_follows_loads_and_slot_switches(tmp_path) -> None:
+    save_manager = SaveManager(saves_dir=str(tmp_path), slot_count=3)
+    state = _build_state()
+    save_manager.save_slot(1, state, profile="Alice")
+    save_manager.save_slot(1, state, profile="Bob")
+    assert [row["profile_key"] for row in save_manager.list_profiles()] == ["bob", "alice"]
+
+    assert save_manager.load_slot(1, GameState(), profile="Alice")
+    assert [row["profile_key"] for row in save_manager.list_profiles()] == ["alice", "bob"]
+
+    save_manager.set_last_slot(2, profile="Bob")
+    profiles = save_manager.list_profiles()
+    assert [row["profile_key"] for row in profiles] == ["bob", "alice"]
+    meta = save_manager._read_json_file(save_manager._meta_path_for("Bob"))
+    assert profiles[0]["updated_at"] == meta["updated_at"]
+
+
+def test_compact_encodings_roundtrip_and_read_legacy_json(tmp_path) -> None:
+    state = _build_state()
+    state.push("System", "héllo", count_for_media=False)
+    legacy = SaveManager(saves_dir=str(tmp_path), slot_count=3)
+    legacy.save_slot(1, state, profile="Tester")
+    legacy_path = legacy.slot_path(1, profile="Tester")
+    assert legacy_path.read_bytes().startswith(b"{\n")
+
+    gz = SaveManager(saves_dir=str(tmp_path), slot_count=3, encoding="gzip", journal_max_entries=0)
+    loaded = GameState()
+    assert gz.load_slot(1, loaded, profile="Tester")
+    assert loaded.chat[-1].text == "héllo"
+
+    loaded.push("System", "compressed", count_for_media=False)
+    gz.save_slot(1, loaded, profile="Tester")
+    assert legacy_path.read_bytes()[:2] == b"\x1f\x8b"
+    assert gz._backup_path(legacy_path).read_bytes().startswith(b"{\n")
+
+    compact = SaveManager(saves_dir=str(tmp_path), slot_count=3, encoding="compact", journal_max_entries=0)
+    reloaded = GameState()
+    assert compact.load_slot(1, reloaded, profile="Tester")
+    assert reloaded.chat[-1].text == "compressed"
+    compact.save_slot(1, reloaded, profile="Tester")
+    assert json.loads(legacy_path.read_text(encoding="utf-8"))["state"]["chat"][-1]["text"] == "compressed"
+    assert SaveManager(saves_dir=str(tmp_path), slot_count=3).slot_summary(1, profile="Tester")["exists"]
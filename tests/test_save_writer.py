@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import threading
+
+from app.core.save.save_manager import SaveManager
+from app.core.save.save_writer import SaveWriter
+from app.ui.state.game_state import GameState, Scene
+
+
+def _build_state() -> GameState:
+    state = GameState()
+    state.scenes = {
+        "city": Scene(id="city", title="City", narrator_text="A calm square.", map_anchor="Lumeria", choices=[])
+    }
+    state.current_scene_id = "city"
+    return state
+
+
+def test_queued_saves_are_coalesced_and_flushed(tmp_path) -> None:
+    save_manager = SaveManager(saves_dir=str(tmp_path), slot_count=3, write_delay_s=60.0)
+    state = _build_state()
+
+    for i in range(5):
+        state.push("System", f"line-{i}", count_for_media=False)
+        save_manager.queue_save(1, state, profile="Tester", display_name="Tester")
+    state.push("System", "after-snapshot", count_for_media=False)
+
+    assert not save_manager.slot_path(1, profile="Tester").exists()
+    assert save_manager.flush_saves()
+
+    payload = json.loads(save_manager.slot_path(1, profile="Tester").read_text(encoding="utf-8"))
+    assert payload["state"]["chat"][-1]["text"] == "line-4"
+    stats = save_manager.save_writer_stats()
+    assert stats["submitted"] == 5 and stats["coalesced"] == 4 and stats["written"] == 1
+    assert stats["queue_depth"] == 0
+    save_manager.close()
+
+
+def test_load_and_direct_save_see_queued_writes_in_order(tmp_path) -> None:
+    save_manager = SaveManager(saves_dir=str(tmp_path), slot_count=3, write_delay_s=60.0)
+    state = _build_state()
+    state.push("System", "queued", count_for_media=False)
+    save_manager.queue_save(1, state, profile="Tester")
+
+    loaded = GameState()
+    assert save_manager.load_slot(1, loaded, profile="Tester")
+    assert loaded.chat[-1].text == "queued"
+
+    state.push("System", "stale", count_for_media=False)
+    save_manager.queue_save(1, state, profile="Tester")
+    state.push("System", "direct", count_for_media=False)
+    save_manager.save_slot(1, state, profile="Tester")
+    assert save_manager.flush_saves()
+
+    reloaded = GameState()
+    assert save_manager.load_slot(1, reloaded, profile="Tester")
+    assert reloaded.chat[-1].text == "direct"
+    save_manager.close()
+
+
+def test_load_only_flushes_its_own_slot(tmp_path) -> None:
+    save_manager = SaveManager(saves_dir=str(tmp_path), slot_count=3, write_delay_s=60.0)
+    state = _build_state()
+    state.push("System", "alice", count_for_media=False)
+    save_manager.queue_save(1, state, profile="Alice")
+    save_manager.queue_save(1, state, profile="Bob")
+
+    assert save_manager.load_slot(1, GameState(), profile="Alice")
+    assert save_manager.slot_summary(1, profile="Alice")["exists"]
+    assert not save_manager.slot_path(1, profile="Bob").exists()
+    assert save_manager.save_writer_stats()["queue_depth"] == 1
+    save_manager.close()
+    assert save_manager.slot_path(1, profile="Bob").exists()
+
+
+def test_writer_thread_writes_after_delay_and_retries_failures() -> None:
+    written: list[dict] = []
+    done = threading.Event()
+    calls = {"n": 0}
+
+    def _write(key, raw_state, display_name) -> None:
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise OSError("disk full")
+        written.append(raw_state)
+        done.set()
+
+    writer = SaveWriter(_write, delay_s=0.01, retry_max_s=0.05)
+    writer.submit(("tester", 1), {"chat": ["a"]})
+
+    assert done.wait(2.0)
+    assert written == [{"chat": ["a"]}]
+    stats = writer.stats()
+    assert stats["failed"] == 1 and stats["written"] == 1
+    assert writer.pop_error(("tester", 1)) == ""
+    writer.close()
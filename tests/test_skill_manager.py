@@ -47,3 +47,167 @@ def test_generated_skill_replaces_generic_name(tmp_path) -> None:
         npc_name="Ronan Ardent",
     )
     assert manager._norm(skill.name) != "nouveau sort"  # noqa: SLF001 - targeted unit test
+
+
+_LEGACY_COMMON_VERBS = {
+    "utilise",
+    "lance",
+    "applique",
+    "emploie",
+    "pratique",
+    "pratiquer",
+    "travaille",
+    "fais",
+    "fait",
+    "entraine",
+    "entrainer",
+    "entrainement",
+    "exerce",
+    "exercer",
+    "repete",
+    "repetition",
+}
+
+
+def _legacy_extract_intent_hints(manager: SkillManager, text: str) -> list[str]:
+    """Copie figee de l'ancien SkillManager._extract_intent_hints (reference)."""
+    from app.gamemaster.skill_manager import _ACTION_VERBS, _INTENT_HINT_MAP, _INTENT_STOPWORDS
+
+    lower = manager._norm(text)
+    words = manager._split_tokens(lower)
+    found: list[str] = []
+    for label, tokens in _INTENT_HINT_MAP.items():
+        hit = False
+        for token in tokens:
+            tok = manager._norm(token)
+            if not tok:
+                continue
+            if tok in lower:
+                hit = True
+                break
+            if any(manager._fuzzy_ratio(tok, w) >= 0.82 for w in words if len(w) >= 4):
+                hit = True
+                break
+        if hit:
+            found.append(label)
+
+    if any(verb in lower for verb in _ACTION_VERBS):
+        for idx, word in enumerate(words):
+            if word in _INTENT_STOPWORDS or len(word) < 4 or word in _LEGACY_COMMON_VERBS:
+                continue
+            if idx > 0 and words[idx - 1] in {"de", "du", "des", "d", "a", "au", "aux", "avec", "sur"}:
+                if word not in found:
+                    found.append(word)
+            if idx > 0 and words[idx - 1] in _ACTION_VERBS and word not in found:
+                found.append(word)
+        if not found:
+            for word in words:
+                if word in _INTENT_STOPWORDS or len(word) < 4:
+                    continue
+                found.append(word)
+                if len(found) >= 2:
+                    break
+
+    dedup: list[str] = []
+    for label in found:
+        normalized = manager.canonicalize_intent_label(label)
+        if normalized and normalized not in dedup:
+            dedup.append(normalized)
+    return dedup[:4]
+
+
+def _legacy_skill_matches_intent(manager: SkillManager, row: dict, intent: str) -> bool:
+    """Copie figee de l'ancien SkillManager.skill_matches_intent pour un dict (reference)."""
+    intent_key = manager.canonicalize_intent_label(intent)
+    if not intent_key:
+        return False
+    blob = " ".join(
+        [
+            str(row.get("name") or ""),
+            str(row.get("category") or ""),
+            str(row.get("description") or ""),
+            " ".join(str(x) for x in (row.get("effects") or []) if isinstance(x, str)),
+            " ".join(str(x) for x in (row.get("trainer_roles") or []) if isinstance(x, str)),
+        ]
+    )
+    skill_tokens = manager._split_tokens(blob)
+    for token in manager._split_tokens(intent_key):
+        if token in skill_tokens:
+            return True
+        if any(manager._fuzzy_ratio(token, st) >= 0.82 for st in skill_tokens if len(st) >= 3):
+            return True
+    return False
+
+
+def _legacy_detect_used_skill_ids(manager: SkillManager, text: str, known_skills: list[dict]) -> list[str]:
+    """Ancienne detection par balayage competences x mots (reference)."""
+    from app.gamemaster.skill_manager import _ACTION_VERBS
+
+    lower = manager._norm(text)
+    words = manager._split_tokens(lower)
+    found: list[str] = []
+    for row in known_skills:
+        skill_id = str(row.get("skill_id") or "").strip().casefold()
+        if not skill_id:
+            continue
+        name = manager._norm(str(row.get("name") or ""))
+        id_phrase = manager._norm(skill_id.replace("_", " "))
+        if (len(name) >= 4 and name in lower) or (len(id_phrase) >= 4 and id_phrase in lower):
+            if skill_id not in found:
+                found.append(skill_id)
+            continue
+        name_tokens = [tok for tok in manager._split_tokens(name) if len(tok) >= 4]
+        if name_tokens and words:
+            matched = sum(
+                1 for token in name_tokens if any(manager._fuzzy_ratio(token, w) >= 0.82 for w in words if len(w) >= 3)
+            )
+            if matched >= max(1, len(name_tokens) - 1) and skill_id not in found:
+                found.append(skill_id)
+    if not any(verb in lower for verb in _ACTION_VERBS):
+        return found[:3]
+    hinted_intents = _legacy_extract_intent_hints(manager, text)
+    for row in known_skills:
+        skill_id = str(row.get("skill_id") or "").strip().casefold()
+        if not skill_id:
+            continue
+        if any(_legacy_skill_matches_intent(manager, row, intent) for intent in hinted_intents):
+            if skill_id not in found:
+                found.append(skill_id)
+                continue
+        category = manager._norm(str(row.get("category") or ""))
+        if category and any(manager._fuzzy_ratio(category, intent) >= 0.82 for intent in hinted_intents):
+            found.append(skill_id)
+    return found[:3]
+
+
+def test_detect_used_skill_ids_matches_legacy_scan(tmp_path) -> None:
+    manager = SkillManager(None, data_path=str(tmp_path / "skills_catalog.json"))
+    catalog = manager.load_catalog()
+    known = manager.normalize_known_skills([{"skill_id": skill_id} for skill_id in catalog], catalog)
+    known.append({"skill_id": "lame_runique", "name": "Lame runique", "category": "escrime", "effects": ["duel"]})
+    known.append({"skill_id": "", "name": "Sans id"})
+    messages = [
+        "J'utilise ma frappe precise sur le gobelin.",
+        "je lance une etincele vers la porte",
+        "Je pratique l'escrime avec ma lame runnique.",
+        "J'applique un soin legr sur mon bras.",
+        "Je me cache, pas silencieux, dans l'ombre.",
+        "Je travaille a la forge du village.",
+        "J'attaque avec une charge brutal puis un tir instinctif.",
+        "Bonjour, tu vends des potions ?",
+        "Je fais de la magie sacree au temple.",
+        "",
+    ]
+    for message in messages:
+        assert manager.detect_used_skill_ids(message, known) == _legacy_detect_used_skill_ids(manager, message, known), message
+
+
+def test_skill_matcher_is_reused_until_skills_change(tmp_path) -> None:
+    manager = SkillManager(None, data_path=str(tmp_path / "skills_catalog.json"))
+    known = [{"skill_id": "frappe_precise", "name": "Frappe precise", "category": "combat"}]
+    first = manager._skill_matcher(known)  # noqa: SLF001 - targeted unit test
+    assert manager._skill_matcher(list(known)) is first  # noqa: SLF001 - targeted unit test
+
+    known.append({"skill_id": "etincelle", "name": "Etincelle", "category": "magie"})
+    assert manager._skill_matcher(known) is not first  # noqa: SLF001 - targeted unit test
+    assert manager.detect_used_skill_ids("je lance etincelle", known) == ["etincelle"]
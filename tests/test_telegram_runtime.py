@@ -4,7 +4,7 @@ from app.gamemaster.schemas import TurnResult
 from app.gamemaster.world_time import day_index
 from app.core.data.item_manager import ItemDef
 from app.core.save import SaveManager
-from app.telegram.runtime import TelegramGameSession
+from app.telegram.runtime import TelegramGameSession, TelegramSessionManager, build_telegram_shared_services
 from app.ui.state.game_state import Choice, GameState, Scene
 from app.ui.state.inventory import ItemStack
 
@@ -16,6 +16,8 @@ def _build_session(state: GameState) -> TelegramGameSession:
         profile_name="PyTest",
         slot=1,
         save_manager=SaveManager(slot_count=1),
+        # Services propres au test : certains tests remplacent des methodes des managers.
+        services=build_telegram_shared_services(),
     )
     session.state = state
     session.save = lambda: None  # type: ignore[method-assign]
@@ -252,7 +254,7 @@ def test_ataryxia_mode_strips_duplicate_speaker_prefix() -> None:
     state.player_sheet_ready = True
     session = _build_session(state)
 
-    async def _fake_play_turn(_state, _text):
+    async def _fake_play_turn(_state, _text, **_kwargs):
         return TurnResult(
             mode="auto",
             speaker="Ataryxia",
@@ -292,7 +294,7 @@ def test_ataryxia_nearby_world_event_intervention_is_handled_before_ai() -> None
     session = _build_session(state)
     called = {"value": False}
 
-    async def _should_not_run(_state, _text):
+    async def _should_not_run(_state, _text, **_kwargs):
         called["value"] = True
         return TurnResult(mode="auto", speaker="Ataryxia", dialogue="Ne devrait pas arriver")
 
@@ -305,3 +307,31 @@ def test_ataryxia_nearby_world_event_intervention_is_handled_before_ai() -> None
     incident = flags.get("world_event_incident") if isinstance(flags, dict) else {}
     assert isinstance(incident, dict)
     assert bool(incident.get("resolved", False)) is True
+
+
+def test_sessions_share_llm_and_managers_but_not_gamemaster() -> None:
+    manager = TelegramSessionManager(slot_count=1)
+    first = TelegramGameSession(
+        chat_id=1,
+        profile_key="pytest_telegram_a",
+        profile_name="A",
+        slot=1,
+        save_manager=manager.save_manager,
+        services=manager.services,
+    )
+    second = TelegramGameSession(
+        chat_id=2,
+        profile_key="pytest_telegram_b",
+        profile_name="B",
+        slot=1,
+        save_manager=manager.save_manager,
+    )
+
+    assert first._llm is second._llm
+    assert first._items_manager is second._items_manager
+    assert first._npc_store is second._npc_store
+    assert first._gm is not second._gm
+    first._gm.debug_enabled = True
+    assert second._gm.debug_enabled is False
+    first.close()
+    second.close()
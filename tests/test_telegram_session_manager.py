@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import shutil
+import time
+from types import SimpleNamespace
+from typing import Iterator
+
+import pytest
+
+from app.core.memory import memory_service as memory_service_module
+from app.core.memory.embeddings import EmbeddingProvider
+from app.core.memory.memory_service import MemoryService
+from app.core.memory.memory_store import MemoryStore
+from app.core.save import SaveManager
+from app.telegram import bot
+from app.telegram.runtime import TelegramSessionManager
+
+
+_REPO_DATA = Path(__file__).resolve().parents[1] / "data"
+
+
+@pytest.fixture(autouse=True)
+def _isolated_data(tmp_path, monkeypatch) -> Iterator[Path]:
+    """Catalogues copies et memoire PNJ/monde dans tmp_path: rien n'est ecrit sous data/."""
+    data_dir = tmp_path / "data"
+    shutil.copytree(_REPO_DATA, data_dir, ignore=shutil.ignore_patterns("memory", "memory_index"))
+    service = MemoryService(
+        store=MemoryStore(memory_root=str(data_dir / "memory"), index_root=str(data_dir / "memory_index")),
+        embeddings=EmbeddingProvider(cache_path=str(data_dir / "memory_index" / "emb_cache.jsonl")),
+        write_delay_s=0,
+    )
+    monkeypatch.setattr(memory_service_module, "_MEMORY_SERVICE", service)
+    yield data_dir
+    service.close()
+
+
+def _manager(tmp_path, **kwargs) -> TelegramSessionManager:
+    manager = TelegramSessionManager(data_dir=str(tmp_path / "data"), slot_count=1, **kwargs)
+    manager.save_manager = SaveManager(saves_dir=str(tmp_path / "saves"), slot_count=1)
+    manager._resolve_profile = lambda *, chat_id, display_name: (  # type: ignore[method-assign]
+        f"pytest_telegram_{chat_id}",
+        display_name or f"Telegram-{chat_id}",
+    )
+    return manager
+
+
+def test_max_resident_hibernates_least_recent_session_and_rehydrates(tmp_path) -> None:
+    manager = _manager(tmp_path, idle_timeout_s=0, max_resident=1)
+
+    async def _run() -> None:
+        first = await manager.get_session(chat_id=11, display_name="Alpha")
+        assert first.state is not None
+        first.state.player.gold = 321
+        second = await manager.get_session(chat_id=22, display_name="Beta")
+
+        assert manager.active_sessions() == [second]
+        assert manager.session_stats() == {"resident": 1, "hibernated": 1, "evicted": 1}
+        assert manager.is_known_chat(11) and manager.resident_session(11) is None
+
+        again = await manager.get_session(chat_id=11)
+        assert again is not first
+        assert again.profile_name == "Alpha"
+        assert again.state is not None and again.state.player.gold == 321
+        assert manager.resident_session(22) is None
+        for session in manager.active_sessions():
+            session.close()
+
+    asyncio.run(_run())
+
+
+def test_evict_idle_skips_busy_sessions(tmp_path) -> None:
+    manager = _manager(tmp_path, idle_timeout_s=60, max_resident=0)
+
+    async def _run() -> None:
+        idle = await manager.get_session(chat_id=1, display_name="Idle")
+        busy = await manager.get_session(chat_id=2, display_name="Busy")
+        assert await manager.evict_idle() == 0
+
+        async with busy.lock:
+            evicted = await manager.evict_idle(now=time.monotonic() + 120)
+        assert evicted == 1
+        assert manager.active_sessions() == [busy]
+        assert manager.resident_session(idle.chat_id) is None
+        busy.close()
+
+    asyncio.run(_run())
+
+
+def test_leased_session_is_never_hibernated(tmp_path) -> None:
+    manager = _manager(tmp_path, idle_timeout_s=60, max_resident=1)
+
+    async def _run() -> None:
+        async with manager.session_lease(chat_id=1, display_name="Leased") as leased:
+            assert manager.is_pinned(1)
+            other = await manager.get_session(chat_id=2, display_name="Other")
+            assert manager.resident_session(1) is leased
+            assert manager.active_sessions() == [leased, other]
+            assert await manager.evict_idle(now=time.monotonic() + 120) == 1
+            assert manager.active_sessions() == [leased]
+        assert not manager.is_pinned(1)
+        assert await manager.evict_idle(now=time.monotonic() + 120) == 1
+        assert manager.active_sessions() == []
+
+    asyncio.run(_run())
+
+
+def test_hibernate_rechecks_lease_taken_during_save(tmp_path) -> None:
+    manager = _manager(tmp_path, idle_timeout_s=60, max_resident=0)
+
+    async def _run() -> None:
+        session = await manager.get_session(chat_id=1, display_name="Alpha")
+        original_save = session.save_and_flush
+
+        async def _save_then_lease() -> bool:
+            ok = await original_save()
+            # Un handler recupere la session pendant l'ecriture.
+            await manager.get_session(chat_id=1, lease=True)
+            return ok
+
+        session.save_and_flush = _save_then_lease  # type: ignore[method-assign]
+        assert await manager.evict_idle(now=time.monotonic() + 120) == 0
+        assert manager.resident_session(1) is session
+        manager.release_session(1)
+        session.close()
+
+    asyncio.run(_run())
+
+
+def test_failed_save_skips_to_next_candidate(tmp_path) -> None:
+    manager = _manager(tmp_path, idle_timeout_s=0, max_resident=2)
+
+    async def _run() -> None:
+        stuck = await manager.get_session(chat_id=1, display_name="Stuck")
+        second = await manager.get_session(chat_id=2, display_name="Second")
+
+        async def _fail() -> bool:
+            return False
+
+        stuck.save_and_flush = _fail  # type: ignore[method-assign]
+        third = await manager.get_session(chat_id=3, display_name="Third")
+        assert manager.active_sessions() == [stuck, third]
+        assert manager.resident_session(second.chat_id) is None
+        for session in manager.active_sessions():
+            session.close()
+
+    asyncio.run(_run())
+
+
+def test_nudge_heap_pops_only_latest_due_entry() -> None:
+    application = SimpleNamespace(bot_data={})
+
+    bot._schedule_nudge_check(application, 5, 100.0)
+    bot._schedule_nudge_check(application, 7, 50.0)
+    bot._schedule_nudge_check(application, 5, 300.0)  # remplace l'entree a 100.0
+
+    assert bot._peek_nudge_due(application) == 50.0
+    assert bot._pop_due_nudge_chats(application, now_ts=200.0) == [7]
+    assert bot._peek_nudge_due(application) == 300.0
+    assert bot._pop_due_nudge_chats(application, now_ts=400.0) == [5]
+    assert bot._peek_nudge_due(application) is None
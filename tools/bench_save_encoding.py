@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.save.encoding import SAVE_ENCODINGS, decode_payload, encode_payload  # noqa: E402
+from app.core.save.save_manager import SaveManager  # noqa: E402
+from app.ui.state.game_state import CHAT_HISTORY_MAX_ITEMS, GameState  # noqa: E402
+
+
+_WORDS = (
+    "lanterne ruelle marchand epee brume taverne serment garde ombre riviere potion "
+    "ancien pacte rumeur donjon relique cendre clairiere forge chant lune porte"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _synthetic_payload(*, npcs: int, seed: int) -> dict:
+    """Etat de fin de partie: chat plein, nombreux PNJ et memoires de conversation."""
+    rng = random.Random(seed)
+    state = GameState()
+    for i in range(CHAT_HISTORY_MAX_ITEMS):
+        state.push("Ataryxia" if i % 2 else "Joueur", _sentence(rng, rng.randint(8, 60)), count_for_media=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = SaveManager(saves_dir=tmp, slot_count=1)._state_to_dict(state)
+
+    npc_keys = [f"lumeria__pnj_{i}" for i in range(npcs)]
+    raw["npc_profiles"] = {
+        key: {
+            "label": key.split("__")[-1],
+            "role": rng.choice(("marchand", "garde", "aubergiste", "forgeron")),
+            "traits": [rng.choice(_WORDS) for _ in range(5)],
+            "backstory": _sentence(rng, 80),
+            "relation": rng.randint(-50, 50),
+        }
+        for key in npc_keys
+    }
+    raw["conversation_short_term"] = {
+        key: [{"role": "user", "text": _sentence(rng, 20), "at": "2026-01-01T00:00:00+00:00"} for _ in range(12)]
+        for key in npc_keys
+    }
+    raw["conversation_long_term"] = {
+        key: [{"kind": "fact", "text": _sentence(rng, 25), "importance": rng.randint(1, 5)} for _ in range(20)]
+        for key in npc_keys
+    }
+    raw["player_progress_log"] = [
+        {"at": f"2026-01-01T00:{i % 60:02d}:00+00:00", "kind": "xp", "text": _sentence(rng, 12)} for i in range(400)
+    ]
+    return {"version": 2, "saved_at": "2026-01-01T00:00:00+00:00", "checkpoint_id": "bench", "state": raw}
+
+
+def _load_payloads(saves_dir: Path) -> list[tuple[str, dict]]:
+    out: list[tuple[str, dict]] = []
+    for path in sorted(saves_dir.rglob("slot_*.json")):
+        try:
+            payload = decode_payload(path.read_bytes())
+        except Exception:
+            continue
+        if isinstance(payload, dict):
+            out.append((str(path.relative_to(saves_dir)), payload))
+    return out
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0
+
+
+def _report(name: str, payload: dict, repeat: int) -> None:
+    print(f"\n{name}")
+    print(f"  {'encodage':<10}{'taille':>12}{'ratio':>9}{'encode ms':>12}{'decode ms':>12}")
+    baseline = 0
+    for encoding in SAVE_ENCODINGS:
+        data = encode_payload(payload, encoding)
+        assert decode_payload(data) == decode_payload(encode_payload(payload, "json"))
+        baseline = baseline or len(data)
+        encode_ms = _best_ms(lambda: encode_payload(payload, encoding), repeat)
+        decode_ms = _best_ms(lambda: decode_payload(data), repeat)
+        print(
+            f"  {encoding:<10}{len(data):>12,}{len(data) / baseline:>9.2f}"
+            f"{encode_ms:>12.2f}{decode_ms:>12.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare taille et temps des encodages de sauvegarde")
+    parser.add_argument("--saves", default="", help="Dossier de sauvegardes a mesurer (defaut: etat synthetique)")
+    parser.add_argument("--npcs", type=int, default=120, help="PNJ de l'etat synthetique (defaut: 120)")
+    parser.add_argument("--repeat", type=int, default=5, help="Mesures par encodage, meilleure retenue (defaut: 5)")
+    args = parser.parse_args()
+
+    repeat = max(1, args.repeat)
+    if args.saves:
+        payloads = _load_payloads(Path(args.saves))
+        if not payloads:
+            print(f"Aucun slot dans {args.saves}")
+            return
+    else:
+        payloads = [(f"synthetique ({args.npcs} PNJ, {CHAT_HISTORY_MAX_ITEMS} messages)", _synthetic_payload(npcs=args.npcs, seed=7))]
+    for name, payload in payloads:
+        _report(name, payload, repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.gamemaster.combat_simulator import (  # noqa: E402
+    DEFAULT_MAX_TURNS,
+    CombatScenario,
+    simulate_batch,
+    summarize,
+)
+from app.gamemaster.dungeon_manager import RUN_RELICS  # noqa: E402
+from app.gamemaster.monster_manager import MonsterManager  # noqa: E402
+
+
+# Profils de personnage: stats (5 par defaut) et action de combat habituelle.
+_BUILDS: dict[str, tuple[dict[str, int], str]] = {
+    "equilibre": ({}, "attack"),
+    "guerrier": ({"force": 9, "dexterite": 7, "agilite": 6, "defense": 8}, "attack"),
+    "rodeur": ({"agilite": 9, "dexterite": 9, "force": 6, "defense": 6}, "attack"),
+    "mage": ({"magie": 9, "intelligence": 8, "sagesse": 7, "defense": 4}, "spell"),
+}
+
+
+def _csv(raw: str) -> list[str]:
+    return [part.strip().casefold() for part in str(raw or "").split(",") if part.strip()]
+
+
+def _event_type_for(monster_id: str, archetype: str) -> str:
+    if monster_id == "mimic":
+        return "mimic"
+    if archetype == "boss":
+        return "boss"
+    return "monster"
+
+
+def _scenarios(args: argparse.Namespace) -> list[CombatScenario]:
+    catalog = MonsterManager(data_dir=args.monsters_dir).load_catalog()
+    wanted_ids = set(_csv(args.monsters))
+    wanted_archetypes = set(_csv(args.archetypes))
+    monsters = [
+        monster
+        for monster_id, monster in sorted(catalog.items())
+        if (not wanted_ids or monster_id in wanted_ids)
+        and (not wanted_archetypes or monster.archetype.casefold() in wanted_archetypes)
+    ]
+    relic_ids = [relic for relic in _csv(args.relics) if relic != "none"]
+    relics = [""] + relic_ids if "none" in _csv(args.relics) else relic_ids or [""]
+    floors = [max(1, int(value)) for value in _csv(args.floors)]
+
+    out: list[CombatScenario] = []
+    for build in _csv(args.builds):
+        stats, action = _BUILDS[build]
+        for floor in floors:
+            for monster in monsters:
+                for relic_id in relics:
+                    out.append(
+                        CombatScenario(
+                            floor=floor,
+                            event_type=_event_type_for(monster.id, monster.archetype.casefold()),
+                            monster_id=monster.id,
+                            build=build,
+                            stats=tuple(sorted(stats.items())),
+                            player_max_hp=args.max_hp,
+                            relic_id=relic_id,
+                            action=args.action or action,
+                            heal_below=max(0.0, min(1.0, args.heal_below)),
+                        )
+                    )
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simule des combats de donjon (sans LLM) pour equilibrer les etages")
+    parser.add_argument("--floors", default="1,5,10", help="Etages, separes par des virgules (defaut: 1,5,10)")
+    parser.add_argument("--monsters", default="", help="Ids de monstres (defaut: tout le catalogue)")
+    parser.add_argument("--archetypes", default="", help="Filtre par archetype (brute, tank, boss...)")
+    parser.add_argument("--builds", default="equilibre,guerrier,mage", help=f"Profils parmi {', '.join(_BUILDS)}")
+    parser.add_argument(
+        "--relics",
+        default="none",
+        help=f"'none' et/ou reliques parmi {', '.join(relic['id'] for relic in RUN_RELICS)}",
+    )
+    parser.add_argument("--action", choices=("attack", "spell"), default="", help="Force l'action (defaut: celle du profil)")
+    parser.add_argument("--heal-below", type=float, default=0.35, help="Soin sous cette fraction des PV (0: jamais)")
+    parser.add_argument("--max-hp", type=int, default=20, help="PV max du personnage (defaut: 20)")
+    parser.add_argument("--fights", type=int, default=2000, help="Combats par scenario (defaut: 2000)")
+    parser.add_argument("--seed", type=int, default=0, help="Premier seed; un combat = un seed (defaut: 0)")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS, help="Tours avant abandon")
+    parser.add_argument("--workers", type=int, default=1, help="Processus paralleles (defaut: 1)")
+    parser.add_argument("--monsters-dir", default="data/monsters", help="Catalogue de monstres")
+    parser.add_argument("--curves", action="store_true", help="Affiche les courbes de PV moyennes par tour")
+    parser.add_argument("--json", default="", help="Ecrit le resume complet (courbes incluses) dans ce fichier")
+    args = parser.parse_args()
+
+    unknown = [build for build in _csv(args.builds) if build not in _BUILDS]
+    if unknown:
+        parser.error(f"profil inconnu: {', '.join(unknown)}")
+    scenarios = _scenarios(args)
+    if not scenarios:
+        print("Aucun scenario (monstres introuvables ?)")
+        return
+
+    started = time.perf_counter()
+    seeds = range(args.seed, args.seed + max(1, args.fights))
+    results = simulate_batch(
+        scenarios,
+        seeds,
+        monsters_dir=args.monsters_dir,
+        max_turns=args.max_turns,
+        workers=max(1, args.workers),
+    )
+    elapsed = time.perf_counter() - started
+    summaries = [summarize(scenario, results[scenario]) for scenario in scenarios]
+
+    print(f"{'scenario':<72}{'victoire':>10}{'defaite':>9}{'tours':>8}{'med':>6}{'p90':>6}{'PV fin':>8}")
+    for summary in summaries:
+        print(
+            f"{summary.scenario.label[:71]:<72}{summary.win_rate:>10.1%}{summary.loss_rate:>9.1%}"
+            f"{summary.turns_mean:>8.1f}{summary.turns_median:>6.0f}{summary.turns_p90:>6.0f}{summary.hp_left_mean:>8.1f}"
+        )
+        if args.curves:
+            player = " ".join(f"{value:.0f}" for value in summary.player_hp_curve[:16])
+            enemy = " ".join(f"{value:.0f}" for value in summary.enemy_hp_curve[:16])
+            print(f"    PV joueur: {player}")
+            print(f"    PV ennemi: {enemy}")
+    total = sum(summary.fights for summary in summaries)
+    print(f"\n{total} combats en {elapsed:.2f}s ({total / max(elapsed, 1e-9):,.0f} combats/s)")
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps([summary.as_dict() for summary in summaries], ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()